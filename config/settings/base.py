@@ -435,6 +435,11 @@ GHOSTWRITER_DJANGO_Q_SCHEDULE_TASKS = {
         "args": [],
         "kwargs": {},
     },
+    "ghostwriter.reporting.tasks.relint_report_templates": {
+        "label": "Re-lint Outdated Report Templates",
+        "args": [{"name": "force", "type": "bool", "required": False}],
+        "kwargs": {"force": {"type": "bool"}},
+    },
     "ghostwriter.rolodex.tasks.check_project_freshness": {
         "label": "Check Project Freshness",
         "args": [],
@@ -520,11 +525,37 @@ GHOSTWRITER_DJANGO_Q_SCHEDULE_TASKS = {
         "args": [],
         "kwargs": {},
     },
+    "ghostwriter.api.tasks.flush_token_usage": {
+        "label": "Record API Token Usage",
+        "args": [],
+        "kwargs": {},
+    },
+    "ghostwriter.api.tasks.delete_expired_uploads": {
+        "label": "Delete Expired Chunked Uploads",
+        "args": [],
+        "kwargs": {},
+    },
+    "ghostwriter.reporting.tasks.delete_expired_report_jobs": {
+        "label": "Delete Expired Report Generation Jobs",
+        "args": [],
+        "kwargs": {},
+    },
 }
 
 # These tasks are queued by Ghostwriter itself. They are accepted by the queue
 # worker but are intentionally omitted from the schedule admin choices.
 GHOSTWRITER_DJANGO_Q_INTERNAL_TASKS = {
+    "ghostwriter.reporting.tasks.generate_report_job": {
+        "args": [{"name": "job_id", "type": "int", "min": 1}],
+        "kwargs": {},
+    },
+    "ghostwriter.reporting.tasks.lint_report_template": {
+        "args": [
+            {"name": "template_id", "type": "int", "min": 1},
+            {"name": "document_name", "type": "str"},
+        ],
+        "kwargs": {"use_cache": {"type": "bool"}},
+    },
     "ghostwriter.shepherd.tasks.namecheap_reset_dns": {"allow_any_arguments": True},
     "ghostwriter.shepherd.tasks.test_aws_keys": {"allow_any_arguments": True},
     "ghostwriter.shepherd.tasks.test_digital_ocean": {"allow_any_arguments": True},
@@ -660,11 +691,42 @@ HASURA_ACTION_SECRET = env("HASURA_ACTION_SECRET")
 
 GRAPHQL_HOST = env("HASURA_GRAPHQL_SERVER_HOSTNAME", default="graphql_engine")
 
+# The cache that holds the session variables returned by the Hasura authentication webhook, e.g. 'default'
+# Set to ``None`` to resolve the credential of every GraphQL request
+GHOSTWRITER_HASURA_AUTH_CACHE = env("GHOSTWRITER_HASURA_AUTH_CACHE", default="default")
+# Number of seconds the webhook's session variables are cached; revocations and deactivations apply right away
+# Set to ``0`` to resolve the credential of every GraphQL request
+GHOSTWRITER_HASURA_AUTH_CACHE_TTL = env.int("GHOSTWRITER_HASURA_AUTH_CACHE_TTL", default=30)
+# The cache that counts the uses of API tokens until a scheduled task writes them in bulk ('default' in production)
+# Set to ``None`` to write at most one use per token every 5 minutes while the request is served
+GHOSTWRITER_TOKEN_USAGE_CACHE = env("GHOSTWRITER_TOKEN_USAGE_CACHE", default=None)
+
 # Maximum file size (bytes) for API uploads and inline base64 download responses
 # Uploads exceeding this limit are rejected with 413 during request parsing
 # Downloads exceeding this limit are rejected with 413 before the file is read
 # Admins can override via the ``GHOSTWRITER_MAX_FILE_SIZE`` environment variable
 GHOSTWRITER_MAX_FILE_SIZE = env.int("GHOSTWRITER_MAX_FILE_SIZE", default=10 * 1024 * 1024)  # 10 MB
+# Number of seconds the signed URLs returned by the GraphQL download actions can be used to fetch the file
+# Set to a higher value if clients need longer to fetch every chunk of their largest files
+GHOSTWRITER_SIGNED_DOWNLOAD_TTL = env.int("GHOSTWRITER_SIGNED_DOWNLOAD_TTL", default=600)
+# Internal Nginx location that serves the media files of signed downloads ('/protected-media/' in production)
+# Set to an empty string to stream the files from Django one chunk at a time
+GHOSTWRITER_DOWNLOAD_ACCEL_REDIRECT = env("GHOSTWRITER_DOWNLOAD_ACCEL_REDIRECT", default="")
+# Maximum size (bytes) of evidence files, report templates, and recordings uploaded in chunks to ``/api/uploads``
+# Set to a higher value to accept larger files; chunked uploads never hold the whole file in memory
+GHOSTWRITER_MAX_CHUNKED_UPLOAD_SIZE = env.int("GHOSTWRITER_MAX_CHUNKED_UPLOAD_SIZE", default=1024 * 1024 * 1024)  # 1 GB
+# Maximum size (bytes) of each chunk sent to ``/api/uploads``
+# Set to a lower value to shorten the requests that carry the chunks
+GHOSTWRITER_UPLOAD_CHUNK_SIZE = env.int("GHOSTWRITER_UPLOAD_CHUNK_SIZE", default=8 * 1024 * 1024)  # 8 MB
+# Number of seconds an unfinished chunked upload can be resumed after its last chunk arrived
+# Set to a higher value to give clients on unreliable connections longer to resume
+GHOSTWRITER_UPLOAD_EXPIRY = env.int("GHOSTWRITER_UPLOAD_EXPIRY", default=24 * 60 * 60)
+# Directory that holds the chunks of unfinished uploads; on the media volume, finished files are moved, not copied
+# Set to another directory with room for the largest concurrent uploads if the media volume is small
+GHOSTWRITER_UPLOAD_TEMP_DIR = env("GHOSTWRITER_UPLOAD_TEMP_DIR", default=str(APPS_DIR / "media" / "partial_uploads"))
+# Largest number of log entries the ``bulkCreateOplogEntries`` action accepts in one call
+# Set to a higher value to let integrations send larger batches in one transaction
+GHOSTWRITER_OPLOG_BULK_MAX_ENTRIES = env.int("GHOSTWRITER_OPLOG_BULK_MAX_ENTRIES", default=1000)
 
 REDIS_URL = env("REDIS_URL", default="redis://redis:6379")
 
@@ -672,6 +734,60 @@ REDIS_URL = env("REDIS_URL", default="redis://redis:6379")
 # ------------------------------------------------------------------------------
 TAGGIT_CASE_INSENSITIVE = True
 
+# Report Generation
+# ------------------------------------------------------------------------------
+# Number of worker processes used to render the formats of a multi-format bundle
+# (e.g., "Generate All" and archives) concurrently while a request is served
+# Set to ``0`` to render every format in the requesting process, one after another. Background generation jobs
+# and scheduled archiving always do this, because django-q workers are daemonic processes that cannot start workers
+GHOSTWRITER_REPORT_RENDER_WORKERS = env.int("GHOSTWRITER_REPORT_RENDER_WORKERS", default=0)
+
+# Maximum number of compiled rich text templates kept in memory by each process
+# Set to ``0`` to compile rich text every time it is rendered
+GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE_SIZE = env.int("GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE_SIZE", default=1024)
+# The cache that should be used to share preprocessed rich text between processes, e.g. 'default'
+# Set to ``None`` to preprocess rich text in each process
+GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE = env("GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE", default=None)
+# Maximum number of parsed Word templates kept in memory by each process
+# Set to ``0`` to read the template file for every export
+GHOSTWRITER_DOCX_TEMPLATE_CACHE_SIZE = env.int("GHOSTWRITER_DOCX_TEMPLATE_CACHE_SIZE", default=8)
+# Maximum number of rich text fields converted to Word content kept in memory by each process
+# Set to ``0`` to convert every rich text field on every export
+GHOSTWRITER_DOCX_SUBDOC_CACHE_SIZE = env.int("GHOSTWRITER_DOCX_SUBDOC_CACHE_SIZE", default=1024)
+# Maximum number of parsed PowerPoint templates kept in memory by each process
+# Set to ``0`` to read the template file for every export
+GHOSTWRITER_PPTX_TEMPLATE_CACHE_SIZE = env.int("GHOSTWRITER_PPTX_TEMPLATE_CACHE_SIZE", default=8)
+# Write spreadsheets row by row through temporary files, so memory use does not grow with the number of rows
+# Set to ``False`` to build spreadsheets in memory
+GHOSTWRITER_XLSX_CONSTANT_MEMORY = env.bool("GHOSTWRITER_XLSX_CONSTANT_MEMORY", default=True)
+# Worksheets added to XLSX reports after the findings: any of ``observations``, ``oplog``, and ``infrastructure``
+# Leave empty to export only the findings
+GHOSTWRITER_XLSX_EXTRA_SHEETS = env.list("GHOSTWRITER_XLSX_EXTRA_SHEETS", default=[])
+# Parser whose tree the rich text converters walk: ``lxml`` walks the parsed tree directly
+# Set to ``bs4`` to build a BeautifulSoup tree first (slower, but produces the same documents)
+GHOSTWRITER_RICH_TEXT_PARSER = env("GHOSTWRITER_RICH_TEXT_PARSER", default="lxml")
+# Resolution, in pixels per inch, that evidence images are downscaled to for the width they are displayed at
+# Set to ``0`` to embed the original uploads
+GHOSTWRITER_EVIDENCE_IMAGE_DPI = env.int("GHOSTWRITER_EVIDENCE_IMAGE_DPI", default=200)
+# Number of minutes of finished report generation jobs whose profiles are summed up by the
+# report generation metrics endpoint
+GHOSTWRITER_REPORT_METRICS_WINDOW = env.int("GHOSTWRITER_REPORT_METRICS_WINDOW", default=60)
+# Number of seconds finished report generation jobs, and the documents they generated, are kept for download
+# Set to a higher value to keep generated documents longer; a scheduled task deletes them every hour
+GHOSTWRITER_REPORT_JOB_TTL = env.int("GHOSTWRITER_REPORT_JOB_TTL", default=7 * 24 * 60 * 60)  # 7 days
+# Number of seconds after which a pending or running report generation job is failed, e.g. after a worker crash
+# Set to a higher value if generating your largest reports takes longer than the queue's task timeout
+GHOSTWRITER_REPORT_JOB_STALE_AFTER = env.int("GHOSTWRITER_REPORT_JOB_STALE_AFTER", default=Q_CLUSTER["timeout"])
+# Lint uploaded templates in a background task and push the results to the browser when they are ready
+# Set to ``False`` to lint templates while they are saved
+GHOSTWRITER_TEMPLATE_LINT_ASYNC = env.bool("GHOSTWRITER_TEMPLATE_LINT_ASYNC", default=True)
+# Number of seconds after which a template still waiting for its background lint is queued again by the next re-lint
+# Set to a higher value if the queue is often busy for longer than this, to avoid linting templates twice
+GHOSTWRITER_TEMPLATE_LINT_PENDING_TIMEOUT = env.int("GHOSTWRITER_TEMPLATE_LINT_PENDING_TIMEOUT", default=60 * 60)
+# The cache that memoizes lint results by the contents of the template file, e.g. 'default'
+# Set to ``None`` to lint every uploaded template
+GHOSTWRITER_TEMPLATE_LINT_CACHE = env("GHOSTWRITER_TEMPLATE_LINT_CACHE", default="default")
+
 # spaCy NLP Configuration
 # ------------------------------------------------------------------------------
 # https://spacy.io/usage/models
@@ -5,6 +5,8 @@ from .base import env
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secret-key
 SECRET_KEY = env("DJANGO_SECRET_KEY")
+# https://docs.djangoproject.com/en/dev/ref/settings/#secret-key-fallbacks
+SECRET_KEY_FALLBACKS = env.list("DJANGO_SECRET_KEY_FALLBACKS", default=[])
 # https://docs.djangoproject.com/en/dev/ref/settings/#allowed-hosts
 hosts = env("DJANGO_ALLOWED_HOSTS", default="ghostwriter.local localhost host.docker.internal")
 ALLOWED_HOSTS = hosts.split(" ")
@@ -35,6 +37,9 @@ CACHES = {
     }
 }
 
+# The web and queue processes share the Redis cache, so API token uses can be counted there and written in bulk
+GHOSTWRITER_TOKEN_USAGE_CACHE = env("GHOSTWRITER_TOKEN_USAGE_CACHE", default="default")
+
 # SECURITY
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#secure-proxy-ssl-header
@@ -141,6 +146,9 @@ LOGGING = {
 
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Nginx sends the files of signed downloads from the ``/protected-media/`` location in ``nginx_common.conf``
+# Set to an empty string to stream them from Django instead
+GHOSTWRITER_DOWNLOAD_ACCEL_REDIRECT = env("GHOSTWRITER_DOWNLOAD_ACCEL_REDIRECT", default="/protected-media/")
 
 # Include files in `production.d`. These are added in alphabetical order - using a numeric prefix
 # like `10-subconfig.py` can be used to order inclusions
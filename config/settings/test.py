@@ -37,5 +37,14 @@ PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
+# GHOSTWRITER
+# ------------------------------------------------------------------------------
+# Lint templates while they are saved, as there is no Django Q cluster to run the task
+GHOSTWRITER_TEMPLATE_LINT_ASYNC = False
+# Resolve every webhook credential, as the test database reuses primary keys the cache would remember between tests
+GHOSTWRITER_HASURA_AUTH_CACHE = None
+# Write token uses right away, as no scheduled task flushes them
+GHOSTWRITER_TOKEN_USAGE_CACHE = None
+
 # Your stuff...
 # ------------------------------------------------------------------------------
@@ -9,6 +9,7 @@ from django.db import models
 from django.http.request import HttpRequest
 
 # Ghostwriter Libraries
+from ghostwriter.api import auth_cache
 from ghostwriter.api.models import (
     AbstractAPIKey,
     APIKey,
@@ -27,11 +28,12 @@ class APIKeyModelAdmin(admin.ModelAdmin):
         "created",
         "expiry_date",
         "last_used_at",
+        "usage_count",
         "_has_expired",
         "revoked",
     )
     list_filter = ("created",)
-    readonly_fields = ("identifier", "token_prefix", "secret_hash", "last_used_at")
+    readonly_fields = ("identifier", "token_prefix", "secret_hash", "last_used_at", "usage_count")
     search_fields = ("name", "token_prefix", "user__username", "user__email")
 
     def has_add_permission(self, request: HttpRequest) -> bool:
@@ -109,6 +111,7 @@ class ServiceTokenAdmin(admin.ModelAdmin):
         "has_expired",
         "revoked",
         "last_used_at",
+        "usage_count",
         "scope_display",
     )
     list_filter = (
@@ -123,7 +126,7 @@ class ServiceTokenAdmin(admin.ModelAdmin):
         "created_by__username",
         "token_prefix",
     )
-    readonly_fields = ("token_prefix", "secret_hash", "created", "last_used_at")
+    readonly_fields = ("token_prefix", "secret_hash", "created", "last_used_at", "usage_count")
     actions = ("revoke_tokens",)
     inlines = (ServiceTokenPermissionInline,)
 
@@ -140,7 +143,10 @@ class ServiceTokenAdmin(admin.ModelAdmin):
 
     @admin.action(description="Revoke selected service tokens")
     def revoke_tokens(self, request: HttpRequest, queryset):
-        updated = queryset.filter(revoked=False).update(revoked=True)
+        revoked = queryset.filter(revoked=False)
+        token_ids = list(revoked.values_list("pk", flat=True))
+        updated = revoked.update(revoked=True)
+        auth_cache.invalidate(*(("service_token", token_id) for token_id in token_ids))
         self.message_user(
             request, f"Revoked {updated} service token(s).", level=messages.SUCCESS
         )
@@ -0,0 +1,218 @@
+"""This contains the cache of the session variables returned by the Hasura authentication webhook."""
+
+# Standard Libraries
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+
+# Django Imports
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+# Using __name__ resolves to ghostwriter.api.auth_cache
+logger = logging.getLogger(__name__)
+
+# Seconds between flushes of each process's hit and miss counts to the shared cache
+METRICS_FLUSH_INTERVAL = 10
+
+# Prometheus name and help text of each counter
+METRICS = {
+    "hit": ("ghostwriter_hasura_auth_cache_hits_total", "Authentication webhook requests answered from the cache"),
+    "miss": (
+        "ghostwriter_hasura_auth_cache_misses_total",
+        "Authentication webhook requests that had to resolve the credential",
+    ),
+    "invalidation": (
+        "ghostwriter_hasura_auth_cache_invalidations_total",
+        "Invalidations of cached webhook responses, e.g. on revocation or deactivation",
+    ),
+}
+
+# Changed by every invalidation, so responses resolved while one committed are not cached
+EPOCH_KEY = "hasura_auth_epoch"
+
+_counts_lock = threading.Lock()
+_counts = dict.fromkeys(METRICS, 0)
+_last_flush = time.monotonic()
+
+
+def _auth_cache():
+    alias = getattr(settings, "GHOSTWRITER_HASURA_AUTH_CACHE", None)
+    if not alias or getattr(settings, "GHOSTWRITER_HASURA_AUTH_CACHE_TTL", 0) <= 0:
+        return None
+    return caches[alias]
+
+
+def cache_key(token: str) -> str:
+    """Returns the cache key of the webhook response for the bearer `token`, which is never stored itself."""
+    return f"hasura_auth:{hashlib.sha256(token.encode('utf-8')).hexdigest()}"
+
+
+def dependency_key(kind: str, pk) -> str:
+    """Returns the key of the generation of the object (e.g., ``("user", 1)``) a cached response depends on."""
+    return f"hasura_auth_dep:{kind}:{pk}"
+
+
+def _count(outcome: str, amount: int = 1):
+    with _counts_lock:
+        _counts[outcome] += amount
+        if time.monotonic() - _last_flush < METRICS_FLUSH_INTERVAL:
+            return
+    flush_metrics()
+
+
+def flush_metrics():
+    """Add this process's hit, miss, and invalidation counts to the totals kept in the shared cache."""
+    global _last_flush  # pylint: disable=global-statement
+    with _counts_lock:
+        counts = {outcome: count for outcome, count in _counts.items() if count}
+        _counts.update(dict.fromkeys(_counts, 0))
+        _last_flush = time.monotonic()
+    cache = _auth_cache()
+    if cache is None or not counts:
+        return
+    try:
+        for outcome, count in counts.items():
+            key = f"hasura_auth_metrics:{outcome}"
+            cache.add(key, 0, None)
+            cache.incr(key, count)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to record the Hasura authentication cache metrics", exc_info=True)
+
+
+def get_metrics() -> dict[str, int]:
+    """Returns the hit, miss, and invalidation counts of every process."""
+    flush_metrics()
+    cache = _auth_cache()
+    if cache is None:
+        return dict.fromkeys(METRICS, 0)
+    try:
+        totals = cache.get_many([f"hasura_auth_metrics:{outcome}" for outcome in METRICS])
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to read the Hasura authentication cache metrics", exc_info=True)
+        totals = {}
+    return {outcome: totals.get(f"hasura_auth_metrics:{outcome}", 0) for outcome in METRICS}
+
+
+def format_metrics(metrics: dict[str, int]) -> str:
+    """Formats the counts returned by `get_metrics` in the Prometheus text format."""
+    lines = []
+    for outcome, (name, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {metrics.get(outcome, 0)}")
+    return "\n".join(lines) + "\n"
+
+
+def get_cached_variables(token: str) -> tuple[dict, int | None] | None:
+    """
+    Returns the session variables cached for the bearer `token` and the ID of the API key or service token it
+    identifies, unless nothing was cached or any object the variables depend on was changed since.
+    """
+    cache = _auth_cache()
+    if cache is None:
+        return None
+    try:
+        entry = cache.get(cache_key(token))
+        if entry is not None:
+            dependencies = entry["dependencies"]
+            if cache.get_many(list(dependencies)) == dependencies:
+                _count("hit")
+                return entry["variables"], entry.get("token_id")
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to read the cached Hasura authentication", exc_info=True)
+    _count("miss")
+    return None
+
+
+def read_epoch() -> str | None:
+    """
+    Returns the invalidation epoch to pass to `cache_variables`. Read it before resolving the credential, so an
+    invalidation that commits while the credential is resolved keeps the response from being cached.
+    """
+    cache = _auth_cache()
+    if cache is None:
+        return None
+    try:
+        cache.add(EPOCH_KEY, uuid.uuid4().hex, None)
+        return cache.get(EPOCH_KEY)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to read the Hasura authentication cache epoch", exc_info=True)
+        return None
+
+
+def cache_variables(
+    token: str,
+    variables: dict,
+    dependencies,
+    epoch: str | None,
+    expires_at: datetime | None = None,
+    token_id: int | None = None,
+):
+    """
+    Cache the session variables for the bearer `token` for up to ``GHOSTWRITER_HASURA_AUTH_CACHE_TTL`` seconds,
+    but never past `expires_at`, the expiry of the credential. `token_id` is the ID of the API key or service
+    token, so cached requests can still be counted as uses of it.
+
+    `dependencies` are the ``(kind, pk)`` pairs of the objects that authorized the credential (e.g., the user and
+    their session). The response stops being used once any of them is passed to `invalidate`. `epoch` is the
+    value `read_epoch` returned before the credential was resolved; nothing is cached if anything was
+    invalidated since, because the credential may have been resolved before the invalidation committed.
+    """
+    cache = _auth_cache()
+    if cache is None or epoch is None:
+        return
+    timeout = settings.GHOSTWRITER_HASURA_AUTH_CACHE_TTL
+    if expires_at is not None:
+        timeout = min(timeout, int((expires_at - timezone.now()).total_seconds()))
+        if timeout <= 0:
+            return
+    keys = [dependency_key(kind, pk) for kind, pk in dependencies]
+    try:
+        generations = cache.get_many(keys)
+        missing = [key for key in keys if key not in generations]
+        if missing:
+            for key in missing:
+                cache.add(key, uuid.uuid4().hex, None)
+            # Re-read the generations in case another process added them first
+            generations = cache.get_many(keys)
+            if len(generations) != len(keys):
+                return
+        # Invalidations change the epoch before deleting generations, so one that deleted a generation before
+        # it was read above has changed the epoch by now
+        if cache.get(EPOCH_KEY) != epoch:
+            return
+        entry = {"variables": variables, "dependencies": generations, "token_id": token_id}
+        cache.set(cache_key(token), entry, timeout)
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.warning("Unable to cache the Hasura authentication", exc_info=True)
+
+
+def invalidate(*dependencies):
+    """
+    Stop using the cached session variables of every credential that depends on one of the ``(kind, pk)``
+    `dependencies`, once the current transaction commits.
+    """
+    if _auth_cache() is None or not dependencies:
+        return
+    keys = [dependency_key(kind, pk) for kind, pk in dependencies]
+
+    def delete_generations():
+        cache = _auth_cache()
+        if cache is None:
+            return
+        try:
+            cache.set(EPOCH_KEY, uuid.uuid4().hex, None)
+            cache.delete_many(keys)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Unable to invalidate the cached Hasura authentication for %s", keys, exc_info=True)
+            return
+        _count("invalidation", len(keys))
+
+    # Invalidating before the change is visible would let a concurrent request cache the old state again
+    transaction.on_commit(delete_generations)
@@ -0,0 +1,30 @@
+"""This contains the system checks of the GraphQL application's settings."""
+
+# Django Imports
+from django.conf import settings
+from django.core import checks
+
+# Cache backends that keep their entries in each process, so the web and queue processes never see each other's
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.dummy.DummyCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+@checks.register(checks.Tags.caches)
+def check_token_usage_cache(app_configs, **kwargs):
+    """Warn when API token uses are buffered in a cache the task that writes them cannot read."""
+    alias = getattr(settings, "GHOSTWRITER_TOKEN_USAGE_CACHE", None)
+    if not alias:
+        return []
+    backend = settings.CACHES.get(alias, {}).get("BACKEND")
+    if backend not in PROCESS_LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        checks.Warning(
+            f"GHOSTWRITER_TOKEN_USAGE_CACHE names the {alias!r} cache, which is local to each process, so the "
+            "flush_token_usage task never sees the API token uses the web server buffers in it.",
+            hint="Set GHOSTWRITER_TOKEN_USAGE_CACHE to a cache shared by every process (e.g. Redis) or to None.",
+            id="ghostwriter.WT001",
+        )
+    ]
@@ -0,0 +1,157 @@
+"""This contains the signed, ranged downloads of evidence files and recordings for the GraphQL API."""
+
+# Standard Libraries
+import mimetypes
+import os
+import re
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+# Django Imports
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import content_disposition_header, http_date
+
+# Ghostwriter Libraries
+from ghostwriter.modules.streaming import stream_response
+from ghostwriter.oplog.models import OplogEntryRecording
+from ghostwriter.reporting.models import Evidence
+
+SIGNED_DOWNLOAD_SALT = "ghostwriter.api.downloads"
+
+# Number of bytes read from disk at a time while streaming part of a file
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Model and file field of each kind of download
+DOWNLOADS = {
+    "evidence": (Evidence, "document"),
+    "recording": (OplogEntryRecording, "recording_file"),
+}
+
+RANGE_RE = re.compile(r"^bytes=(?P<first>\d*)-(?P<last>\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a ``Range`` header asks for bytes past the end of the file."""
+
+
+def sign_download(kind: str, obj) -> tuple[str, datetime]:
+    """
+    Returns the path of a signed URL that downloads the file of `obj`, a `kind` of object in ``DOWNLOADS``, and
+    when it expires. Anyone with the URL can download the file until then, so only return it to principals
+    that can read the object.
+    """
+    _, field_name = DOWNLOADS[kind]
+    payload = {"kind": kind, "pk": obj.pk, "name": getattr(obj, field_name).name}
+    token = signing.dumps(payload, salt=SIGNED_DOWNLOAD_SALT, compress=True)
+    expires_at = timezone.now() + timedelta(seconds=settings.GHOSTWRITER_SIGNED_DOWNLOAD_TTL)
+    return reverse("api:graphql_signed_download", kwargs={"token": token}), expires_at
+
+
+def load_download(token: str):
+    """
+    Returns the object and file a signed download `token` identifies. Raises ``signing.SignatureExpired`` or
+    ``signing.BadSignature`` for expired or forged tokens and ``Http404`` when the object or its file is gone
+    or the file was replaced after the URL was signed.
+    """
+    payload = signing.loads(token, salt=SIGNED_DOWNLOAD_SALT, max_age=settings.GHOSTWRITER_SIGNED_DOWNLOAD_TTL)
+    try:
+        model, field_name = DOWNLOADS[payload["kind"]]
+    except KeyError as exception:
+        raise signing.BadSignature("Unknown download") from exception
+    obj = model.objects.filter(pk=payload["pk"]).first()
+    field_file = getattr(obj, field_name, None)
+    if not field_file or field_file.name != payload["name"]:
+        raise Http404
+    return obj, field_file
+
+
+def requested_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Returns the first and last byte of a ``Range`` request `header` for a file of `size` bytes, or ``None`` to
+    send the whole file. Headers that are malformed or ask for several ranges are ignored, as RFC 9110 allows.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None or not (match["first"] or match["last"]):
+        return None
+    if match["first"]:
+        first = int(match["first"])
+        if match["last"] and int(match["last"]) < first:
+            return None
+        last = int(match["last"]) if match["last"] else size - 1
+    else:
+        # A suffix range, e.g. ``bytes=-500`` for the last 500 bytes
+        first = max(size - int(match["last"]), 0)
+        last = size - 1
+    if first >= size or last < first:
+        raise RangeNotSatisfiable
+    return first, min(last, size - 1)
+
+
+def _read_range(path: str, first: int, last: int):
+    with open(path, "rb") as file:
+        file.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            chunk = file.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(request, field_file, filename: str) -> HttpResponse:
+    """
+    Returns a response that sends the stored `field_file` as an attachment named `filename` without reading
+    it into memory, honoring a single-part ``Range`` request so clients can fetch large files in parallel chunks.
+
+    With ``GHOSTWRITER_DOWNLOAD_ACCEL_REDIRECT`` set, as it is in production, Nginx sends the file (and handles
+    the ranges) instead.
+    """
+    try:
+        path = field_file.path
+        stat = os.stat(path)
+    except (FileNotFoundError, ValueError) as exception:
+        raise Http404 from exception
+    size = stat.st_size
+    etag = f'"{size:x}-{stat.st_mtime_ns:x}"'
+    last_modified = http_date(stat.st_mtime)
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    accel_redirect = getattr(settings, "GHOSTWRITER_DOWNLOAD_ACCEL_REDIRECT", "")
+    if accel_redirect:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = f"{accel_redirect.rstrip('/')}/{quote(field_file.name)}"
+    else:
+        byte_range = None
+        # A stale ``If-Range`` validator means the client's earlier chunks are from another file
+        if request.headers.get("If-Range", etag) in (etag, last_modified):
+            try:
+                byte_range = requested_range(request.headers.get("Range", ""), size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+        length = size if byte_range is None else byte_range[1] - byte_range[0] + 1
+        if request.method == "HEAD":
+            response = HttpResponse(content_type=content_type)
+        elif byte_range is None:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+        else:
+            response = StreamingHttpResponse(_read_range(path, *byte_range), content_type=content_type)
+        if byte_range is not None:
+            response.status_code = 206
+            response["Content-Range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+        response["Content-Length"] = str(length)
+        response["Accept-Ranges"] = "bytes"
+
+    response["Content-Disposition"] = content_disposition_header(True, filename)
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    response["Cache-Control"] = "private, no-store"
+    response["X-Content-Type-Options"] = "nosniff"
+    return stream_response(request, response)
@@ -461,7 +461,30 @@ class Base64BytesField(forms.Field):
         return blob
 
 
-class ApiEvidenceForm(forms.ModelForm):
+class ChunkedUploadFormMixin:
+    """
+    Lets an upload form take its file from a chunked upload to ``/api/uploads`` instead of the base64-encoded
+    ``file_base64`` input. With ``chunked=True``, the input is dropped and the form validates the other inputs
+    alone until the complete file is passed as ``file_obj``.
+    """
+
+    def __init__(self, *args, chunked=False, file_obj=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chunked = chunked
+        self.file_obj = file_obj
+        if chunked:
+            self.fields.pop("file_base64")
+
+    def get_file(self):
+        """Returns the uploaded file, or ``None`` while the chunks of a chunked upload are still arriving."""
+        if self.chunked:
+            return self.file_obj
+        if "file_base64" not in self.cleaned_data:
+            return None
+        return ContentFile(self.cleaned_data["file_base64"], name=self.cleaned_data.get("filename"))
+
+
+class ApiEvidenceForm(ChunkedUploadFormMixin, forms.ModelForm):
     file_base64 = Base64BytesField(required=True)
     filename = forms.CharField(required=True)
 
@@ -530,10 +553,7 @@ class ApiEvidenceForm(forms.ModelForm):
 
     def save(self, commit=True):
         instance = super().save(False)
-        blob = ContentFile(
-            self.cleaned_data["file_base64"], name=self.cleaned_data["filename"]
-        )
-        instance.document = blob
+        instance.document = self.get_file()
         instance.uploaded_by = self.user_obj
         if commit:
             instance.save()
@@ -541,7 +561,7 @@ class ApiEvidenceForm(forms.ModelForm):
         return instance
 
 
-class ApiReportTemplateForm(forms.ModelForm):
+class ApiReportTemplateForm(ChunkedUploadFormMixin, forms.ModelForm):
     file_base64 = Base64BytesField(required=True)
     filename = forms.CharField(required=True)
 
@@ -639,12 +659,13 @@ class ApiReportTemplateForm(forms.ModelForm):
                 )
 
         # Check if the file is a valid Microsoft Word or PowerPoint document
-        if "filename" in cleaned_data:
+        template_file = self.get_file()
+        file_field = None if self.chunked else "file_base64"
+        if "filename" in cleaned_data and template_file is not None:
             if ext[1:].lower() in DOCX_ALLOWED_EXTENSIONS:
                 try:
-                    Document(
-                        ContentFile(self.cleaned_data["file_base64"], name=filename)
-                    )
+                    template_file.seek(0)
+                    Document(template_file)
                 except ValueError as e:
                     logger.error(
                         "Could not open this template. %s, from %s as a Microsoft Word document: %s",
@@ -653,7 +674,7 @@ class ApiReportTemplateForm(forms.ModelForm):
                         e,
                     )
                     self.add_error(
-                        "file_base64",
+                        file_field,
                         ValidationError(
                             "Could not open this template as a Microsoft Word document",
                             code="invalid",
@@ -662,9 +683,8 @@ class ApiReportTemplateForm(forms.ModelForm):
 
             if ext[1:].lower() in PPTX_ALLOWED_EXTENSIONS:
                 try:
-                    Presentation(
-                        ContentFile(self.cleaned_data["file_base64"], name=filename)
-                    )
+                    template_file.seek(0)
+                    Presentation(template_file)
                 except ValueError as e:
                     logger.error(
                         "Could not open this template. %s, from %s as a Microsoft PowerPoint document: %s",
@@ -673,7 +693,7 @@ class ApiReportTemplateForm(forms.ModelForm):
                         e,
                     )
                     self.add_error(
-                        "file_base64",
+                        file_field,
                         ValidationError(
                             "Could not open this template as a Microsoft PowerPoint document",
                             code="invalid",
@@ -683,10 +703,7 @@ class ApiReportTemplateForm(forms.ModelForm):
 
     def save(self, commit=True):
         instance = super().save(False)
-        blob = ContentFile(
-            self.cleaned_data["file_base64"], name=self.cleaned_data["filename"]
-        )
-        instance.document = blob
+        instance.document = self.get_file()
         instance.uploaded_by = self.user_obj
         if commit:
             instance.save()
@@ -694,7 +711,7 @@ class ApiReportTemplateForm(forms.ModelForm):
         return instance
 
 
-class ApiOplogRecordingForm(forms.Form):
+class ApiOplogRecordingForm(ChunkedUploadFormMixin, forms.Form):
     """Validate and prepare an Asciinema recording upload for an :model:`oplog.OplogEntry`."""
 
     file_base64 = Base64BytesField(required=True)
@@ -0,0 +1,62 @@
+"""Benchmark verifying the secrets of API keys and service tokens."""
+
+# Standard Libraries
+import secrets
+import time
+
+# Django Imports
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand, CommandError
+
+# Ghostwriter Libraries
+from ghostwriter.api.models import TOKEN_HASH_ALGORITHM, hash_token_secret, verify_token_secret
+
+
+def verifications_per_second(secret: str, secret_hash: str, seconds: float) -> float:
+    """Verify `secret` against `secret_hash` for about `seconds` on one core and return the verification rate."""
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while True:
+        verify_token_secret(secret, secret_hash)
+        count += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            return count / (now - started)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how many token secrets one core verifies per second with the HMAC-SHA256 token hashes and with "
+        "the password hashes that tokens were stored with before."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=2.0,
+            help="Number of seconds to verify secrets with each hash (default: 2)",
+        )
+
+    def handle(self, *args, **options):
+        if options["seconds"] <= 0:
+            raise CommandError("--seconds must be greater than 0")
+
+        secret = secrets.token_urlsafe(32)
+        hashes = {
+            get_hasher().algorithm: make_password(secret),
+            TOKEN_HASH_ALGORITHM: hash_token_secret(secret),
+        }
+        rates = {}
+        for algorithm, secret_hash in hashes.items():
+            rates[algorithm] = verifications_per_second(secret, secret_hash, options["seconds"])
+            self.stdout.write(f"{algorithm:<16} {rates[algorithm]:14,.1f} verifications/s per core")
+
+        password_algorithm = next(iter(hashes))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{TOKEN_HASH_ALGORITHM} verifies {rates[TOKEN_HASH_ALGORITHM] / rates[password_algorithm]:,.0f}x "
+                f"as many secrets per second as {password_algorithm}"
+            )
+        )
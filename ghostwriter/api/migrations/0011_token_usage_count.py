@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-17
+
+# Django Imports
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("api", "0010_service_token_infrastructure_access_views"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="apikey",
+            name="usage_count",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of requests authenticated with the API key",
+            ),
+        ),
+        migrations.AddField(
+            model_name="servicetoken",
+            name="usage_count",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of requests authenticated with the service token",
+            ),
+        ),
+    ]
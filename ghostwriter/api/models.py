@@ -2,21 +2,27 @@
 
 # Standard Libraries
 import logging
+import os
 import re
 import secrets
+import threading
 import typing
 import uuid
-from datetime import timedelta
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 
 # Django Imports
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.hashers import check_password
+from django.core.cache import caches
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
 
 # Ghostwriter Libraries
+from ghostwriter.api import auth_cache
 from ghostwriter.api.utils import (
     USER_JWT_TYPE,
     generate_jwt,
@@ -29,6 +35,9 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 TOKEN_EXPIRY_WARNING_WINDOW = timedelta(days=7)
 CONTROL_CHARACTER_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+# Prefix of the token secret hashes made by ``hash_token_secret``; older hashes were made by ``make_password``
+TOKEN_HASH_ALGORITHM = "hmac_sha256"
+TOKEN_HASH_KEY_SALT = "ghostwriter.api.models.token_secret"
 
 
 def _log_safe(value: typing.Any) -> str:
@@ -44,6 +53,51 @@ def _log_reason(reason: str | None) -> str:
     return f": {_log_safe(reason)}" if reason else ""
 
 
+def hash_token_secret(secret: str, key: str | None = None) -> str:
+    """
+    Hash the secret of an API key or service token with HMAC-SHA256, keyed by ``SECRET_KEY`` (or `key`).
+
+    Token secrets are random 256-bit values, so they do not need the slow, salted hashing that protects passwords
+    from guessing, and verifying the digest takes microseconds instead of tens of milliseconds.
+    """
+    digest = salted_hmac(TOKEN_HASH_KEY_SALT, secret, secret=key, algorithm="sha256").hexdigest()
+    return f"{TOKEN_HASH_ALGORITHM}${digest}"
+
+
+def verify_token_secret(secret: str, secret_hash: str | None) -> tuple[bool, bool]:
+    """
+    Check `secret` against a hash made by ``hash_token_secret`` or, for older tokens, ``make_password``.
+
+    Returns whether the secret matches and whether the hash should be replaced by ``hash_token_secret(secret)``,
+    because it is a password hash or was keyed by one of the ``SECRET_KEY_FALLBACKS``.
+    """
+    if not secret_hash:
+        return False, False
+    if secret_hash.startswith(f"{TOKEN_HASH_ALGORITHM}$"):
+        if constant_time_compare(secret_hash, hash_token_secret(secret)):
+            return True, False
+        for key in settings.SECRET_KEY_FALLBACKS:
+            if constant_time_compare(secret_hash, hash_token_secret(secret, key)):
+                return True, True
+        return False, False
+    valid = check_password(secret, secret_hash)
+    return valid, valid
+
+
+def _check_token_secret(token: "AbstractAPIKey | ServiceToken", secret: str) -> bool:
+    """Check the secret of `token`, upgrading its stored hash to ``hash_token_secret`` on success."""
+    valid, upgrade = verify_token_secret(secret, token.secret_hash)
+    if valid and upgrade and token.pk is not None:
+        secret_hash = hash_token_secret(secret)
+        # Only replace the hash that was verified, in case the token was regenerated in the meantime
+        type(token)._default_manager.filter(pk=token.pk, secret_hash=token.secret_hash).update(
+            secret_hash=secret_hash
+        )
+        token.secret_hash = secret_hash
+        logger.info("Upgraded the secret hash of %s %s", type(token).__name__, token.pk)
+    return valid
+
+
 def _expires_within_warning_window(expiry_date) -> bool:
     if expiry_date is None:
         return False
@@ -63,7 +117,202 @@ class ServiceTokenProjectScope(models.TextChoices):
     ALL_ACCESSIBLE = "all_accessible", "All Accessible Projects"
 
 
-class BaseAPIKeyManager(models.Manager):
+def _token_usage_cache():
+    alias = getattr(settings, "GHOSTWRITER_TOKEN_USAGE_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _redis_client(cache):
+    """Returns the Redis client behind `cache` if it is a ``django_redis`` cache, or ``None``."""
+    get_client = getattr(getattr(cache, "client", None), "get_client", None)
+    return get_client(write=True) if get_client is not None else None
+
+
+# Guards the sets of used token IDs kept in caches that are not backed by Redis
+_usage_ids_lock = threading.Lock()
+
+
+class TokenUsageManagerMixin:
+    """
+    Records the uses of tokens without writing to the database while the request is served.
+
+    Uses are counted in ``GHOSTWRITER_TOKEN_USAGE_CACHE``, and the IDs of the tokens used are added to a set, so
+    ``flush_usage`` only reads the counts of those tokens. It adds them to the tokens' ``usage_count`` and
+    ``last_used_at`` with one ``UPDATE`` per batch; the ``ghostwriter.api.tasks.flush_token_usage`` task runs it
+    every minute. Without the cache, or if it fails, a use is written while the request is served, but only if the
+    token's recorded last use is older than ``last_used_update_interval``; ``usage_count`` then counts only the uses
+    that were written.
+    """
+
+    usage_flush_batch_size = 1000
+    last_used_update_interval = timedelta(minutes=5)
+
+    def _usage_keys(self, token_id: int) -> tuple[str, str]:
+        label = self.model._meta.label_lower
+        return f"token_usage:{label}:{token_id}:count", f"token_usage:{label}:{token_id}:last"
+
+    def _used_ids_key(self) -> str:
+        return f"token_usage:{self.model._meta.label_lower}:used"
+
+    def _add_used_id(self, usage_cache, token_id: int) -> None:
+        redis = _redis_client(usage_cache)
+        if redis is not None:
+            redis.sadd(usage_cache.make_key(self._used_ids_key()), token_id)
+            return
+        # Other caches have no atomic set, so this is only safe within one process
+        with _usage_ids_lock:
+            used_ids = usage_cache.get(self._used_ids_key(), set())
+            used_ids.add(token_id)
+            usage_cache.set(self._used_ids_key(), used_ids, None)
+
+    def _pop_used_ids(self, usage_cache, count: int) -> list[int]:
+        redis = _redis_client(usage_cache)
+        if redis is not None:
+            return [int(token_id) for token_id in redis.spop(usage_cache.make_key(self._used_ids_key()), count)]
+        with _usage_ids_lock:
+            used_ids = usage_cache.get(self._used_ids_key(), set())
+            popped = sorted(used_ids)[:count]
+            used_ids.difference_update(popped)
+            if used_ids:
+                usage_cache.set(self._used_ids_key(), used_ids, None)
+            else:
+                usage_cache.delete(self._used_ids_key())
+        return popped
+
+    def record_usage(self, token: "AbstractAPIKey | ServiceToken", used_at=None) -> None:
+        """Count a use of the token at `used_at` (now by default)."""
+        used_at = used_at or timezone.now()
+        self.record_usage_by_id(token.pk, used_at)
+        token.last_used_at = used_at
+
+    def record_usage_by_id(self, token_id: int, used_at=None) -> None:
+        """Count a use of the token with the primary key `token_id`, e.g. one authenticated from a cache."""
+        used_at = used_at or timezone.now()
+        usage_cache = _token_usage_cache()
+        if usage_cache is not None:
+            count_key, last_key = self._usage_keys(token_id)
+            try:
+                usage_cache.add(count_key, 0, None)
+                # ``django_redis`` returns ``None`` instead of raising when it ignores connection errors
+                if usage_cache.incr(count_key) is not None:
+                    usage_cache.set(last_key, used_at.timestamp(), None)
+                    # Added after counting, so a flush that took the ID before this use finds it again next time
+                    self._add_used_id(usage_cache, token_id)
+                    return
+                logger.warning(
+                    "Unable to buffer the use of %s %s, so writing it now", self.model._meta.verbose_name, token_id
+                )
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Unable to buffer the use of %s %s, so writing it now",
+                    self.model._meta.verbose_name,
+                    token_id,
+                    exc_info=True,
+                )
+        self.write_stale_usage(token_id, used_at)
+
+    def write_stale_usage(self, token_id: int, used_at: datetime) -> bool:
+        """
+        Write a use of the token with the primary key `token_id` if its last use is missing or older than
+        ``last_used_update_interval``, so unbuffered uses write at most once per interval. Returns whether it was
+        written.
+        """
+        stale_before = used_at - self.last_used_update_interval
+        updated = (
+            self.filter(pk=token_id)
+            .filter(models.Q(last_used_at__isnull=True) | models.Q(last_used_at__lte=stale_before))
+            .update(usage_count=models.F("usage_count") + 1, last_used_at=used_at)
+        )
+        return bool(updated)
+
+    def write_usage(self, usage: dict[int, tuple[int, datetime | None]]) -> int:
+        """
+        Add the uses in `usage`, which maps token IDs to ``(number of uses, time of the last use)``, to the
+        tokens with one ``UPDATE``. Returns the number of tokens that were updated.
+        """
+        if not usage:
+            return 0
+        changes = {
+            "usage_count": models.Case(
+                *(
+                    models.When(pk=token_id, then=models.F("usage_count") + count)
+                    for token_id, (count, _) in usage.items()
+                ),
+                default=models.F("usage_count"),
+                output_field=self.model._meta.get_field("usage_count"),
+            )
+        }
+        # Uses can be flushed out of order, so never move the timestamp back
+        last_used = [
+            models.When(
+                models.Q(pk=token_id) & (models.Q(last_used_at__isnull=True) | models.Q(last_used_at__lt=used_at)),
+                then=models.Value(used_at),
+            )
+            for token_id, (_, used_at) in usage.items()
+            if used_at is not None
+        ]
+        if last_used:
+            changes["last_used_at"] = models.Case(
+                *last_used,
+                default=models.F("last_used_at"),
+                output_field=self.model._meta.get_field("last_used_at"),
+            )
+        return self.filter(pk__in=list(usage)).update(**changes)
+
+    def flush_usage(self) -> int:
+        """Write the uses buffered in ``GHOSTWRITER_TOKEN_USAGE_CACHE`` and return the number of tokens used."""
+        usage_cache = _token_usage_cache()
+        if usage_cache is None:
+            return 0
+        flushed = 0
+        while batch := self._pop_used_ids(usage_cache, self.usage_flush_batch_size):
+            keys = {token_id: self._usage_keys(token_id) for token_id in batch}
+            values = usage_cache.get_many([key for pair in keys.values() for key in pair])
+            usage = {}
+            for token_id, (count_key, last_key) in keys.items():
+                count = values.get(count_key) or 0
+                if count < 0:
+                    # Left below zero by an older flush that raced an eviction, so it holds no uses to write
+                    usage_cache.delete(count_key)
+                elif count:
+                    last_used = values.get(last_key)
+                    used_at = datetime.fromtimestamp(last_used, tz=dt_timezone.utc) if last_used else None
+                    usage[token_id] = (count, used_at)
+            try:
+                self.write_usage(usage)
+            except Exception:
+                # Keep the uses for the next flush
+                for token_id in batch:
+                    self._add_used_id(usage_cache, token_id)
+                raise
+            for token_id, (count, _) in usage.items():
+                # Subtract what was written, keeping the uses counted since the buffer was read
+                try:
+                    remaining = usage_cache.decr(keys[token_id][0], count)
+                except ValueError:
+                    # The count was evicted or the token deleted in the meantime
+                    continue
+                if remaining is not None and remaining < 0:
+                    # The count was evicted and started again, so never leave it owing uses to the next flush
+                    usage_cache.delete(keys[token_id][0])
+            flushed += len(usage)
+        logger.debug("Wrote the buffered uses of %s %s", flushed, self.model._meta.verbose_name_plural)
+        return flushed
+
+    def discard_usage(self, token_id: int) -> None:
+        """Drop the buffered uses of a deleted token."""
+        usage_cache = _token_usage_cache()
+        if usage_cache is None:
+            return
+        try:
+            usage_cache.delete_many(self._usage_keys(token_id))
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning(
+                "Unable to discard the buffered uses of %s %s", self.model._meta.verbose_name, token_id, exc_info=True
+            )
+
+
+class BaseAPIKeyManager(TokenUsageManagerMixin, models.Manager):
     """
     Baseline API key manager used for ``APIKeyManager``.
 
@@ -71,7 +320,6 @@ class BaseAPIKeyManager(models.Manager):
     """
 
     token_prefix = "gwat"
-    last_used_update_interval = timedelta(minutes=5)
 
     def _build_token(self) -> tuple[str, str, str]:
         prefix = secrets.token_hex(8)
@@ -81,7 +329,7 @@ class BaseAPIKeyManager(models.Manager):
     def generate_token(self, obj: "AbstractAPIKey") -> tuple[None, str]:
         prefix, secret, token = self._build_token()
         obj.token_prefix = prefix
-        obj.secret_hash = make_password(secret)
+        obj.secret_hash = hash_token_secret(secret)
         obj.token = ""
         obj.last_used_at = None
         return None, token
@@ -144,23 +392,6 @@ class BaseAPIKeyManager(models.Manager):
 
         return entry
 
-    def record_usage(self, token: "AbstractAPIKey", used_at=None) -> bool:
-        """Update last_used_at only when it is missing or stale."""
-        used_at = used_at or timezone.now()
-        stale_before = used_at - self.last_used_update_interval
-        updated = (
-            self.filter(pk=token.pk)
-            .filter(
-                models.Q(last_used_at__isnull=True)
-                | models.Q(last_used_at__lte=stale_before)
-            )
-            .update(last_used_at=used_at)
-        )
-        if updated:
-            token.last_used_at = used_at
-            logger.debug("Recorded last-used timestamp for API token %s", token.pk)
-        return bool(updated)
-
 
 class APIKeyManager(BaseAPIKeyManager):
     pass
@@ -198,6 +429,11 @@ class AbstractAPIKey(models.Model):
         help_text="Once API key expires, clients cannot use it anymore",
     )
     last_used_at = models.DateTimeField(blank=True, null=True)
+    usage_count = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of requests authenticated with the API key",
+    )
     revoked = models.BooleanField(
         blank=True,
         default=False,
@@ -231,9 +467,7 @@ class AbstractAPIKey(models.Model):
         return _expires_within_warning_window(self.expiry_date)
 
     def check_secret(self, secret: str) -> bool:
-        if not self.secret_hash:
-            return False
-        return check_password(secret, self.secret_hash)
+        return _check_token_secret(self, secret)
 
     def is_valid(self, key: str) -> bool:
         if self.revoked or self.has_expired or not self.user.is_active:
@@ -383,9 +617,8 @@ class ServicePrincipal(models.Model):
         return self.name
 
 
-class ServiceTokenManager(models.Manager):
+class ServiceTokenManager(TokenUsageManagerMixin, models.Manager):
     token_prefix = "gwst"
-    last_used_update_interval = timedelta(minutes=5)
 
     def _build_token(self) -> tuple[str, str, str]:
         prefix = secrets.token_hex(8)
@@ -397,7 +630,7 @@ class ServiceTokenManager(models.Manager):
         kwargs.pop("id", None)
         prefix, secret, token = self._build_token()
         obj = self.model(
-            token_prefix=prefix, secret_hash=make_password(secret), **kwargs
+            token_prefix=prefix, secret_hash=hash_token_secret(secret), **kwargs
         )
         with transaction.atomic():
             obj.save()
@@ -414,7 +647,7 @@ class ServiceTokenManager(models.Manager):
     def generate_token(self, obj: "ServiceToken") -> tuple[None, str]:
         prefix, secret, token = self._build_token()
         obj.token_prefix = prefix
-        obj.secret_hash = make_password(secret)
+        obj.secret_hash = hash_token_secret(secret)
         obj.last_used_at = None
         return None, token
 
@@ -505,6 +738,7 @@ class ServiceTokenManager(models.Manager):
         """Revoke one token without attempting to un-revoke anything."""
         if self.filter(pk=token.pk, revoked=False).update(revoked=True):
             token.revoked = True
+            auth_cache.invalidate(("service_token", token.pk))
             logger.warning(
                 "Revoked service token %s (%s)%s",
                 token.pk,
@@ -522,6 +756,8 @@ class ServiceTokenManager(models.Manager):
             revoked=True
         )
         if deactivated_principals or revoked_tokens:
+            # The cached authentication of these tokens depends on their creator
+            auth_cache.invalidate(("user", user.pk))
             logger.warning(
                 "Deactivated %s service principal(s) and revoked %s service token(s) for inactive user %s%s",
                 deactivated_principals,
@@ -538,6 +774,7 @@ class ServiceTokenManager(models.Manager):
                 pk=service_principal.pk, active=True
             ).update(active=False)
             service_principal.active = False
+            auth_cache.invalidate(("service_principal", service_principal.pk))
             logger.warning(
                 "Deactivated service principal %s (%s)%s",
                 service_principal.pk,
@@ -552,6 +789,7 @@ class ServiceTokenManager(models.Manager):
             service_principal=service_principal, revoked=False
         ).update(revoked=True)
         if revoked_tokens:
+            auth_cache.invalidate(("service_principal", service_principal.pk))
             logger.warning(
                 "Revoked %s service token(s) for service principal %s (%s)%s",
                 revoked_tokens,
@@ -560,23 +798,6 @@ class ServiceTokenManager(models.Manager):
                 _log_reason(reason),
             )
 
-    def record_usage(self, token: "ServiceToken", used_at=None) -> bool:
-        """Update last_used_at only when it is missing or stale."""
-        used_at = used_at or timezone.now()
-        stale_before = used_at - self.last_used_update_interval
-        updated = (
-            self.filter(pk=token.pk)
-            .filter(
-                models.Q(last_used_at__isnull=True)
-                | models.Q(last_used_at__lte=stale_before)
-            )
-            .update(last_used_at=used_at)
-        )
-        if updated:
-            token.last_used_at = used_at
-            logger.debug("Recorded last-used timestamp for service token %s", token.pk)
-        return bool(updated)
-
     def is_valid(self, token: str) -> bool:
         try:
             self.get_valid_from_token(token)
@@ -603,6 +824,11 @@ class ServiceToken(models.Model):
         help_text="Once the token expires, clients cannot use it anymore",
     )
     last_used_at = models.DateTimeField(blank=True, null=True)
+    usage_count = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of requests authenticated with the service token",
+    )
     revoked = models.BooleanField(
         blank=True,
         default=False,
@@ -633,7 +859,7 @@ class ServiceToken(models.Model):
         return _expires_within_warning_window(self.expiry_date)
 
     def check_secret(self, secret: str) -> bool:
-        return check_password(secret, self.secret_hash)
+        return _check_token_secret(self, secret)
 
     def clean(self) -> None:
         self._validate_revoked()
@@ -1293,3 +1519,39 @@ class ServiceTokenPermission(models.Model):
     def __str__(self) -> str:
         resource_id = self.resource_id if self.resource_id is not None else "*"
         return f"{self.resource_type}:{resource_id}:{self.action}"
+
+
+class ResumableUpload(models.Model):
+    """
+    Tracks a file a user uploads in chunks with the ``/api/uploads`` endpoints. The bytes received so far are
+    kept in ``GHOSTWRITER_UPLOAD_TEMP_DIR`` until the last chunk arrives and the file is saved as evidence, a
+    report template, or an oplog entry's recording.
+    """
+
+    class Kind(models.TextChoices):
+        EVIDENCE = "evidence", "Evidence"
+        REPORT_TEMPLATE = "report_template", "Report Template"
+        OPLOG_RECORDING = "oplog_recording", "Oplog Recording"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="resumable_uploads")
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Size of the complete file in bytes")
+    offset = models.PositiveBigIntegerField(default=0, help_text="Number of bytes received so far")
+    metadata = models.JSONField(
+        default=dict, blank=True, help_text="Inputs of the upload action, other than the file, to save the file with"
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ("-created",)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size} bytes)"
+
+    @property
+    def part_path(self) -> str:
+        """Path of the file holding the bytes received so far."""
+        return os.path.join(settings.GHOSTWRITER_UPLOAD_TEMP_DIR, f"{self.pk}.part")
@@ -0,0 +1,124 @@
+"""This contains all the model Signals used by the API application."""
+
+# Standard Libraries
+import logging
+import os
+
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+# 3rd Party Libraries
+from django_q.models import Schedule
+
+# Ghostwriter Libraries
+from ghostwriter.api import auth_cache
+from ghostwriter.api.models import (
+    APIKey,
+    ResumableUpload,
+    ServicePrincipal,
+    ServiceToken,
+    ServiceTokenPermission,
+    UserSession,
+)
+
+User = get_user_model()
+
+# Using __name__ resolves to ghostwriter.api.signals
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_auth(sender, instance, **kwargs):
+    """Invalidate the cached authentication of the :model:`users.User` entry's credentials and service tokens."""
+    # Logging in only updates ``last_login``, which does not affect authorization
+    if kwargs.get("update_fields") == frozenset({"last_login"}):
+        return
+    auth_cache.invalidate(("user", instance.pk))
+
+
+@receiver(post_save, sender=APIKey)
+@receiver(post_delete, sender=APIKey)
+def invalidate_api_key_auth(sender, instance, **kwargs):
+    """Invalidate the cached authentication of an :model:`api.APIKey` entry, e.g. after it is revoked."""
+    auth_cache.invalidate(("api_key", instance.pk))
+
+
+@receiver(post_delete, sender=APIKey)
+@receiver(post_delete, sender=ServiceToken)
+def discard_token_usage(sender, instance, **kwargs):
+    """Drop the buffered uses of a deleted :model:`api.APIKey` or :model:`api.ServiceToken` entry."""
+    sender.objects.discard_usage(instance.pk)
+
+
+# Maintenance tasks scheduled after migrating, unless they are already scheduled
+DEFAULT_SCHEDULES = (
+    {
+        "func": "ghostwriter.api.tasks.flush_token_usage",
+        "name": "Record API Token Usage",
+        "schedule_type": Schedule.MINUTES,
+        "minutes": 1,
+    },
+    {
+        "func": "ghostwriter.api.tasks.delete_expired_uploads",
+        "name": "Delete Expired Chunked Uploads",
+        "schedule_type": Schedule.HOURLY,
+    },
+)
+
+
+@receiver(post_migrate)
+def schedule_maintenance_tasks(sender, **kwargs):
+    """Schedule the tasks that record API token usage and delete expired uploads, unless they already exist."""
+    if sender.name != "ghostwriter.api":
+        return
+    schedules = Schedule.objects.using(kwargs.get("using", DEFAULT_DB_ALIAS))
+    for schedule in DEFAULT_SCHEDULES:
+        defaults = {key: value for key, value in schedule.items() if key != "func"}
+        try:
+            schedules.get_or_create(func=schedule["func"], defaults={**defaults, "repeats": -1})
+        except ValidationError:
+            # The server's task policy does not allow the task
+            logger.warning("Unable to schedule the %s task", schedule["func"], exc_info=True)
+
+
+@receiver(post_save, sender=UserSession)
+@receiver(post_delete, sender=UserSession)
+def invalidate_session_auth(sender, instance, **kwargs):
+    """Invalidate the cached authentication of an :model:`api.UserSession` entry, e.g. after it is revoked."""
+    auth_cache.invalidate(("session", instance.pk))
+
+
+@receiver(post_save, sender=ServicePrincipal)
+@receiver(post_delete, sender=ServicePrincipal)
+def invalidate_service_principal_auth(sender, instance, **kwargs):
+    """Invalidate the cached authentication of every token of an :model:`api.ServicePrincipal` entry."""
+    auth_cache.invalidate(("service_principal", instance.pk))
+
+
+@receiver(post_save, sender=ServiceToken)
+@receiver(post_delete, sender=ServiceToken)
+def invalidate_service_token_auth(sender, instance, **kwargs):
+    """Invalidate the cached authentication of an :model:`api.ServiceToken` entry, e.g. after it is revoked."""
+    auth_cache.invalidate(("service_token", instance.pk))
+
+
+@receiver(post_save, sender=ServiceTokenPermission)
+@receiver(post_delete, sender=ServiceTokenPermission)
+def invalidate_service_token_permission_auth(sender, instance, **kwargs):
+    """Invalidate the cached scope of the :model:`api.ServiceToken` an :model:`api.ServiceTokenPermission` grants."""
+    auth_cache.invalidate(("service_token", instance.token_id))
+
+
+@receiver(post_delete, sender=ResumableUpload)
+def delete_upload_part(sender, instance, **kwargs):
+    """Delete the bytes an unfinished :model:`api.ResumableUpload` received so far."""
+    try:
+        os.remove(instance.part_path)
+    except FileNotFoundError:
+        # The upload never received a chunk, or its file was moved into storage
+        pass
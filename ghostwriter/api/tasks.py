@@ -0,0 +1,37 @@
+"""This contains tasks to be run using Django Q and Redis."""
+
+# Standard Libraries
+import logging
+
+# Django Imports
+from django.utils import timezone
+
+# Ghostwriter Libraries
+from ghostwriter.api.models import APIKey, ResumableUpload, ServiceToken
+
+# Using __name__ resolves to ghostwriter.api.tasks
+logger = logging.getLogger(__name__)
+
+
+def flush_token_usage():
+    """
+    Write the uses of :model:`api.APIKey` and :model:`api.ServiceToken` entries buffered in
+    ``GHOSTWRITER_TOKEN_USAGE_CACHE`` to their usage counts and last-used timestamps.
+    """
+    counts = {
+        "api_keys": APIKey.objects.flush_usage(),
+        "service_tokens": ServiceToken.objects.flush_usage(),
+    }
+    if any(counts.values()):
+        logger.info(
+            "Recorded the uses of %(api_keys)s API key(s) and %(service_tokens)s service token(s)", counts
+        )
+    return counts
+
+
+def delete_expired_uploads():
+    """Delete the :model:`api.ResumableUpload` entries, and the bytes received, that can no longer be resumed."""
+    deleted, _ = ResumableUpload.objects.filter(expires_at__lt=timezone.now()).delete()
+    if deleted:
+        logger.info("Deleted %s expired chunked upload(s)", deleted)
+    return deleted
@@ -52,6 +52,7 @@ DISALLOWED_SERVICE_HEADERS = {
 }
 
 EXPECTED_SERVICE_ACTIONS = {
+    "bulkCreateOplogEntries",
     "downloadEvidence",
     "downloadOplogRecording",
     "finding_by_tag",
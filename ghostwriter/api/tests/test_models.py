@@ -1,12 +1,14 @@
 # Standard Libraries
 import logging
 from datetime import timedelta
+from unittest.mock import patch
 
 # Django Imports
-from django.contrib.auth.hashers import check_password
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import caches
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, connection, transaction
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
 # Ghostwriter Libraries
@@ -18,6 +20,7 @@ from ghostwriter.api.models import (
     ServiceTokenPermission,
     ServiceTokenPreset,
     UserSession,
+    hash_token_secret,
 )
 from ghostwriter.factories import (
     ClientFactory,
@@ -175,23 +178,164 @@ class ApiKeyModelTests(TestCase):
         token_obj, _ = APIKey.objects.create_token(user=self.user, name="Usage Token")
         first_used_at = timezone.now()
         recent_used_at = first_used_at + timedelta(minutes=1)
-        stale_used_at = (
-            first_used_at
-            + APIKey.objects.last_used_update_interval
-            + timedelta(seconds=1)
-        )
+        stale_used_at = first_used_at + APIKey.objects.last_used_update_interval + timedelta(seconds=1)
 
-        self.assertTrue(APIKey.objects.record_usage(token_obj, used_at=first_used_at))
+        APIKey.objects.record_usage(token_obj, used_at=first_used_at)
         token_obj.refresh_from_db()
         self.assertEqual(token_obj.last_used_at, first_used_at)
+        self.assertEqual(token_obj.usage_count, 1)
 
-        self.assertFalse(APIKey.objects.record_usage(token_obj, used_at=recent_used_at))
+        with self.assertNumQueries(1):
+            APIKey.objects.record_usage(token_obj, used_at=recent_used_at)
         token_obj.refresh_from_db()
         self.assertEqual(token_obj.last_used_at, first_used_at)
+        self.assertEqual(token_obj.usage_count, 1)
 
-        self.assertTrue(APIKey.objects.record_usage(token_obj, used_at=stale_used_at))
+        APIKey.objects.record_usage(token_obj, used_at=stale_used_at)
         token_obj.refresh_from_db()
         self.assertEqual(token_obj.last_used_at, stale_used_at)
+        self.assertEqual(token_obj.usage_count, 2)
+
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_record_usage_falls_back_when_cache_ignores_errors(self):
+        caches["default"].clear()
+        token_obj, _ = APIKey.objects.create_token(user=self.user, name="Usage Token")
+        used_at = timezone.now()
+
+        # ``django_redis`` returns ``None`` when ``IGNORE_EXCEPTIONS`` hides a connection error
+        with patch.object(caches["default"], "incr", return_value=None):
+            APIKey.objects.record_usage(token_obj, used_at=used_at)
+            APIKey.objects.record_usage(token_obj, used_at=used_at + timedelta(minutes=1))
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.last_used_at, used_at)
+        self.assertEqual(token_obj.usage_count, 1)
+        self.assertEqual(APIKey.objects.flush_usage(), 0)
+
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_flush_never_writes_or_leaves_negative_counts(self):
+        caches["default"].clear()
+        token_obj, _ = APIKey.objects.create_token(user=self.user, name="Usage Token")
+        count_key, _ = APIKey.objects._usage_keys(token_obj.pk)
+        APIKey.objects.record_usage(token_obj)
+        caches["default"].set(count_key, -3, None)
+
+        self.assertEqual(APIKey.objects.flush_usage(), 0)
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.usage_count, 0)
+        self.assertIsNone(caches["default"].get(count_key))
+
+        # The count is evicted and counted again before the flush subtracts what it read
+        APIKey.objects.record_usage(token_obj)
+        APIKey.objects.record_usage(token_obj)
+        get_many = caches["default"].get_many
+
+        def evict_after_reading(keys):
+            values = get_many(keys)
+            caches["default"].set(count_key, 1, None)
+            return values
+
+        with patch.object(caches["default"], "get_many", side_effect=evict_after_reading):
+            self.assertEqual(APIKey.objects.flush_usage(), 1)
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.usage_count, 2)
+        self.assertIsNone(caches["default"].get(count_key))
+
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_record_usage_is_buffered_until_flushed(self):
+        caches["default"].clear()
+        token_obj, _ = APIKey.objects.create_token(user=self.user, name="Usage Token")
+        other_token, _ = APIKey.objects.create_token(user=self.user, name="Unused Token")
+        first_used_at = timezone.now()
+        last_used_at = first_used_at + timedelta(minutes=1)
+
+        with self.assertNumQueries(0):
+            APIKey.objects.record_usage(token_obj, used_at=first_used_at)
+            APIKey.objects.record_usage_by_id(token_obj.pk, used_at=last_used_at)
+        token_obj.refresh_from_db()
+        self.assertIsNone(token_obj.last_used_at)
+        self.assertEqual(token_obj.usage_count, 0)
+
+        self.assertEqual(APIKey.objects.flush_usage(), 1)
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.last_used_at, last_used_at)
+        self.assertEqual(token_obj.usage_count, 2)
+        other_token.refresh_from_db()
+        self.assertIsNone(other_token.last_used_at)
+        self.assertEqual(other_token.usage_count, 0)
+
+        # Flushed uses are not written again
+        self.assertEqual(APIKey.objects.flush_usage(), 0)
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.usage_count, 2)
+
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_flush_reads_and_writes_only_used_tokens(self):
+        caches["default"].clear()
+        used_tokens = [APIKey.objects.create_token(user=self.user, name=f"Used Token {index}")[0] for index in range(3)]
+        unused_token, _ = APIKey.objects.create_token(user=self.user, name="Unused Token")
+        used_at = timezone.now()
+        for count, token_obj in enumerate(used_tokens, start=1):
+            for _ in range(count):
+                APIKey.objects.record_usage(token_obj, used_at=used_at)
+
+        # One UPDATE for every used token, without reading the other tokens
+        with self.assertNumQueries(1):
+            self.assertEqual(APIKey.objects.flush_usage(), 3)
+        for count, token_obj in enumerate(used_tokens, start=1):
+            token_obj.refresh_from_db()
+            self.assertEqual(token_obj.usage_count, count)
+            self.assertEqual(token_obj.last_used_at, used_at)
+        unused_token.refresh_from_db()
+        self.assertEqual(unused_token.usage_count, 0)
+
+        # Tokens used again after a flush are found by the next one
+        APIKey.objects.record_usage(used_tokens[0], used_at=used_at)
+        with self.assertNumQueries(1):
+            self.assertEqual(APIKey.objects.flush_usage(), 1)
+        used_tokens[0].refresh_from_db()
+        self.assertEqual(used_tokens[0].usage_count, 2)
+
+    def test_usage_cache_must_be_shared_by_every_process(self):
+        from ghostwriter.api.checks import check_token_usage_cache
+
+        with override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default"):
+            self.assertEqual([warning.id for warning in check_token_usage_cache(None)], ["ghostwriter.WT001"])
+        with override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE=None):
+            self.assertEqual(check_token_usage_cache(None), [])
+
+    def test_secret_is_hashed_with_hmac(self):
+        token_obj, token = APIKey.objects.create_token(user=self.user, name="HMAC Token")
+        secret = token.split("_", 2)[2]
+        self.assertTrue(token_obj.secret_hash.startswith("hmac_sha256$"))
+        self.assertEqual(token_obj.secret_hash, hash_token_secret(secret))
+        self.assertTrue(token_obj.check_secret(secret))
+        self.assertFalse(token_obj.check_secret("incorrect-secret"))
+
+    def test_password_hash_is_upgraded_on_first_use(self):
+        token_obj, token = APIKey.objects.create_token(user=self.user, name="Legacy Token")
+        secret = token.split("_", 2)[2]
+        legacy_hash = make_password(secret)
+        APIKey.objects.filter(pk=token_obj.pk).update(secret_hash=legacy_hash)
+
+        self.assertFalse(APIKey.objects.get(pk=token_obj.pk).check_secret("incorrect-secret"))
+        self.assertEqual(APIKey.objects.get(pk=token_obj.pk).secret_hash, legacy_hash)
+
+        self.assertEqual(APIKey.objects.get_valid_from_token(token), token_obj)
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.secret_hash, hash_token_secret(secret))
+        self.assertTrue(APIKey.objects.is_valid(token))
+
+    def test_hash_keyed_by_old_secret_key_is_upgraded(self):
+        with override_settings(SECRET_KEY="old-secret-key"):
+            token_obj, token = APIKey.objects.create_token(user=self.user, name="Old Key Token")
+        secret = token.split("_", 2)[2]
+
+        with override_settings(SECRET_KEY="new-secret-key"):
+            self.assertFalse(APIKey.objects.is_valid(token))
+        with override_settings(SECRET_KEY="new-secret-key", SECRET_KEY_FALLBACKS=["old-secret-key"]):
+            self.assertTrue(APIKey.objects.is_valid(token))
+            token_obj.refresh_from_db()
+            self.assertEqual(token_obj.secret_hash, hash_token_secret(secret))
 
     def test_create_token_escapes_control_characters_in_log_name(self):
         logging.disable(logging.NOTSET)
@@ -364,6 +508,14 @@ class ServiceTokenModelTests(TestCase):
         self.assertTrue(check_password("service-secret", first_token.secret_hash))
         self.assertTrue(check_password("service-secret", second_token.secret_hash))
 
+    def test_password_hash_is_upgraded_on_first_use(self):
+        token_obj = ServiceTokenFactory()
+
+        self.assertTrue(token_obj.check_secret("service-secret"))
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.secret_hash, hash_token_secret("service-secret"))
+        self.assertTrue(token_obj.check_secret("service-secret"))
+
     def test_oplog_rw_preset_emits_hasura_oplog_scope(self):
         principal = ServicePrincipal.objects.create(
             name="Mythic Sync", created_by=self.user
@@ -1937,7 +2089,9 @@ class ServiceTokenModelTests(TestCase):
         self.assertFalse(expired_obj.expires_soon)
         self.assertFalse(valid_obj.expires_soon)
 
-    def test_record_usage_throttles_recent_updates(self):
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_record_usage_is_buffered_until_flushed(self):
+        caches["default"].clear()
         principal = ServicePrincipal.objects.create(
             name="Usage Service", created_by=self.user
         )
@@ -1946,28 +2100,41 @@ class ServiceTokenModelTests(TestCase):
             created_by=self.user,
             service_principal=principal,
         )
-        first_used_at = timezone.now()
-        recent_used_at = first_used_at + timedelta(minutes=1)
-        stale_used_at = (
-            first_used_at
-            + ServiceToken.objects.last_used_update_interval
-            + timedelta(seconds=1)
-        )
+        used_at = timezone.now()
 
-        self.assertTrue(
-            ServiceToken.objects.record_usage(token_obj, used_at=first_used_at)
-        )
+        with self.assertNumQueries(0):
+            ServiceToken.objects.record_usage(token_obj, used_at=used_at)
         token_obj.refresh_from_db()
-        self.assertEqual(token_obj.last_used_at, first_used_at)
+        self.assertEqual(token_obj.usage_count, 0)
 
-        self.assertFalse(
-            ServiceToken.objects.record_usage(token_obj, used_at=recent_used_at)
-        )
+        self.assertEqual(ServiceToken.objects.flush_usage(), 1)
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.last_used_at, used_at)
+        self.assertEqual(token_obj.usage_count, 1)
+
+    def test_record_usage_throttles_recent_updates(self):
+        token_obj = ServiceTokenFactory()
+        first_used_at = timezone.now()
+        recent_used_at = first_used_at + timedelta(minutes=1)
+        stale_used_at = first_used_at + ServiceToken.objects.last_used_update_interval + timedelta(seconds=1)
+
+        ServiceToken.objects.record_usage(token_obj, used_at=first_used_at)
+        ServiceToken.objects.record_usage(token_obj, used_at=recent_used_at)
         token_obj.refresh_from_db()
         self.assertEqual(token_obj.last_used_at, first_used_at)
+        self.assertEqual(token_obj.usage_count, 1)
 
-        self.assertTrue(
-            ServiceToken.objects.record_usage(token_obj, used_at=stale_used_at)
-        )
+        ServiceToken.objects.record_usage(token_obj, used_at=stale_used_at)
         token_obj.refresh_from_db()
         self.assertEqual(token_obj.last_used_at, stale_used_at)
+        self.assertEqual(token_obj.usage_count, 2)
+
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_deleting_token_discards_buffered_usage(self):
+        caches["default"].clear()
+        token_obj = ServiceTokenFactory()
+        token_id = token_obj.pk
+        ServiceToken.objects.record_usage(token_obj)
+
+        token_obj.delete()
+        self.assertEqual(caches["default"].get_many(ServiceToken.objects._usage_keys(token_id)), {})
@@ -1,9 +1,11 @@
 # Standard Libraries
 import base64
 import copy
+import gzip
 import json
 import logging
 import os
+import tempfile
 from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from http import HTTPStatus
@@ -13,6 +15,7 @@ from threading import Barrier
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.core.cache import caches
 from django.core.files.base import ContentFile
 from django.db import close_old_connections, connection
 from django.http import JsonResponse
@@ -34,9 +37,10 @@ from allauth.mfa.models import Authenticator
 from allauth.mfa.totp.internal.auth import TOTP, generate_totp_secret
 
 # Ghostwriter Libraries
-from ghostwriter.api import utils
+from ghostwriter.api import auth_cache, utils
 from ghostwriter.api.models import (
     APIKey,
+    ResumableUpload,
     ServicePrincipal,
     ServiceToken,
     ServiceTokenPermission,
@@ -44,6 +48,7 @@ from ghostwriter.api.models import (
     ServiceTokenProjectScope,
     UserSession,
 )
+from ghostwriter.api.tasks import delete_expired_uploads, flush_token_usage
 from ghostwriter.api.views import HasuraActionView, JwtRequiredMixin
 from ghostwriter.commandcenter.models import GeneralConfiguration
 from ghostwriter.factories import (
@@ -76,6 +81,8 @@ from ghostwriter.factories import (
     UserFactory,
 )
 from ghostwriter.modules.reportwriter import jinja_string_literal, prepare_jinja2_env
+from ghostwriter.oplog.ingest import BULK_INGEST_SESSION_VARIABLE
+from ghostwriter.oplog.models import OplogEntry, OplogEntryRecording
 from ghostwriter.oplog.utils import (
     CAST_GZIP_TOO_LARGE_UPLOAD_MESSAGE,
     get_cast_decompressed_bytes,
@@ -852,33 +859,30 @@ class HasuraWebhookTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertJSONEqual(force_str(response.content), data)
 
-    def test_graphql_webhook_throttles_api_token_last_used_at(self):
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_graphql_webhook_buffers_api_token_usage(self):
+        caches["default"].clear()
         token_obj, token = APIKey.objects.create_token(
             user=self.user, name="Usage Token"
         )
 
-        response = self.client.get(
-            self.uri,
-            content_type="application/json",
-            **{
-                "HTTP_AUTHORIZATION": f"Bearer {token}",
-            },
-        )
-        self.assertEqual(response.status_code, 200)
+        for _ in range(2):
+            response = self.client.get(
+                self.uri,
+                content_type="application/json",
+                **{
+                    "HTTP_AUTHORIZATION": f"Bearer {token}",
+                },
+            )
+            self.assertEqual(response.status_code, 200)
         token_obj.refresh_from_db()
-        first_used_at = token_obj.last_used_at
-        self.assertIsNotNone(first_used_at)
+        self.assertIsNone(token_obj.last_used_at)
+        self.assertEqual(token_obj.usage_count, 0)
 
-        response = self.client.get(
-            self.uri,
-            content_type="application/json",
-            **{
-                "HTTP_AUTHORIZATION": f"Bearer {token}",
-            },
-        )
-        self.assertEqual(response.status_code, 200)
+        flush_token_usage()
         token_obj.refresh_from_db()
-        self.assertEqual(token_obj.last_used_at, first_used_at)
+        self.assertIsNotNone(token_obj.last_used_at)
+        self.assertEqual(token_obj.usage_count, 2)
 
     def test_graphql_webhook_with_project_read_service_token(self):
         project = ProjectFactory()
@@ -1011,7 +1015,9 @@ class HasuraWebhookTests(TestCase):
             token_obj.get_current_project_read_ids(),
         )
 
-    def test_graphql_webhook_throttles_service_token_last_used_at(self):
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_graphql_webhook_buffers_service_token_usage(self):
+        caches["default"].clear()
         project = ProjectFactory()
         ProjectAssignmentFactory(project=project, operator=self.user)
         principal = ServicePrincipal.objects.create(
@@ -1030,28 +1036,23 @@ class HasuraWebhookTests(TestCase):
             ],
         )
 
-        response = self.client.get(
-            self.uri,
-            content_type="application/json",
-            **{
-                "HTTP_AUTHORIZATION": f"Bearer {token}",
-            },
-        )
-        self.assertEqual(response.status_code, 200)
+        for _ in range(2):
+            response = self.client.get(
+                self.uri,
+                content_type="application/json",
+                **{
+                    "HTTP_AUTHORIZATION": f"Bearer {token}",
+                },
+            )
+            self.assertEqual(response.status_code, 200)
         token_obj.refresh_from_db()
-        first_used_at = token_obj.last_used_at
-        self.assertIsNotNone(first_used_at)
+        self.assertIsNone(token_obj.last_used_at)
+        self.assertEqual(token_obj.usage_count, 0)
 
-        response = self.client.get(
-            self.uri,
-            content_type="application/json",
-            **{
-                "HTTP_AUTHORIZATION": f"Bearer {token}",
-            },
-        )
-        self.assertEqual(response.status_code, 200)
+        flush_token_usage()
         token_obj.refresh_from_db()
-        self.assertEqual(token_obj.last_used_at, first_used_at)
+        self.assertIsNotNone(token_obj.last_used_at)
+        self.assertEqual(token_obj.usage_count, 2)
 
     def test_graphql_webhook_revokes_service_token_for_inactive_creator(self):
         project = ProjectFactory()
@@ -1242,6 +1243,140 @@ class HasuraWebhookTests(TestCase):
         self.assertJSONEqual(force_str(response.content), self.public_data)
 
 
+@override_settings(GHOSTWRITER_HASURA_AUTH_CACHE="default", GHOSTWRITER_HASURA_AUTH_CACHE_TTL=30)
+class HasuraWebhookCacheTests(TestCase):
+    """Collection of tests for the cached responses of :view:`api:GraphqlAuthenticationWebhook`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(password=PASSWORD)
+        cls.mgr_user = UserFactory(password=PASSWORD, role="manager")
+        cls.uri = reverse("api:graphql_webhook")
+        cls.metrics_uri = reverse("api:graphql_webhook_metrics")
+
+    def setUp(self):
+        # Drop the counts of earlier tests, too
+        auth_cache.flush_metrics()
+        caches["default"].clear()
+        self.client = Client()
+        self.client_mgr = Client()
+        self.client_mgr.login(username=self.mgr_user.username, password=PASSWORD)
+
+    def get_webhook(self, token):
+        return self.client.get(
+            self.uri,
+            content_type="application/json",
+            **{
+                "HTTP_AUTHORIZATION": f"Bearer {token}",
+            },
+        )
+
+    def test_cached_response_skips_session_lookup(self):
+        _, token = generate_user_jwt(self.user)
+        first = self.get_webhook(token)
+        self.assertEqual(first.status_code, 200)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get_webhook(token)
+        self.assertEqual(second.status_code, 200)
+        self.assertJSONEqual(force_str(second.content), force_str(first.content))
+        self.assertFalse(any("api_usersession" in query["sql"] for query in queries.captured_queries))
+
+    def test_revoking_session_invalidates_cached_response(self):
+        session, _, token = UserSession.objects.create_token(self.user)
+        self.assertEqual(self.get_webhook(token).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            session.revoke()
+        self.assertEqual(self.get_webhook(token).status_code, 401)
+
+    def test_deactivating_user_invalidates_cached_response(self):
+        _, token = APIKey.objects.create_token(user=self.user, name="Cached Token")
+        self.assertEqual(self.get_webhook(token).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.get_webhook(token).status_code, 401)
+
+    def test_revoking_service_token_invalidates_cached_response(self):
+        oplog = OplogFactory()
+        ProjectAssignmentFactory(project=oplog.project, operator=self.user)
+        principal = ServicePrincipal.objects.create(name="Cached Service", created_by=self.user)
+        token_obj, token = ServiceToken.objects.create_token(
+            name="Cached Service Token",
+            created_by=self.user,
+            service_principal=principal,
+            permissions=ServiceToken.build_permissions_for_preset(ServiceTokenPreset.OPLOG_RW, oplog_id=oplog.id),
+        )
+        self.assertEqual(self.get_webhook(token).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ServiceToken.objects.revoke_token(token_obj)
+        self.assertEqual(self.get_webhook(token).status_code, 401)
+
+    def test_revocation_while_resolving_is_not_cached(self):
+        from unittest.mock import patch
+
+        session, _, token = UserSession.objects.create_token(self.user)
+        get_valid_from_payload = UserSession.objects.get_valid_from_payload
+
+        def resolve_then_revoke(payload):
+            # The session is revoked after the webhook read it, but before the response is cached
+            resolved = get_valid_from_payload(payload)
+            with self.captureOnCommitCallbacks(execute=True):
+                session.revoke()
+            return resolved
+
+        with patch.object(UserSession.objects, "get_valid_from_payload", side_effect=resolve_then_revoke):
+            self.assertEqual(self.get_webhook(token).status_code, 200)
+        self.assertIsNone(caches["default"].get(auth_cache.cache_key(token)))
+        self.assertEqual(self.get_webhook(token).status_code, 401)
+
+    def test_invalidation_since_epoch_was_read_is_not_cached(self):
+        epoch = auth_cache.read_epoch()
+        with self.captureOnCommitCallbacks(execute=True):
+            auth_cache.invalidate(("user", self.mgr_user.pk))
+        auth_cache.cache_variables("token", {"X-Hasura-Role": "user"}, [("user", self.user.pk)], epoch)
+        self.assertIsNone(auth_cache.get_cached_variables("token"))
+
+        auth_cache.cache_variables(
+            "token", {"X-Hasura-Role": "user"}, [("user", self.user.pk)], auth_cache.read_epoch()
+        )
+        self.assertEqual(auth_cache.get_cached_variables("token"), ({"X-Hasura-Role": "user"}, None))
+
+    @override_settings(GHOSTWRITER_TOKEN_USAGE_CACHE="default")
+    def test_cached_requests_count_as_token_uses(self):
+        token_obj, token = APIKey.objects.create_token(user=self.user, name="Counted Token")
+        self.get_webhook(token)
+        self.get_webhook(token)
+
+        flush_token_usage()
+        token_obj.refresh_from_db()
+        self.assertEqual(token_obj.usage_count, 2)
+
+    def test_failed_authentication_is_not_cached(self):
+        _, token = APIKey.objects.create_token(user=self.user, name="Expired Token", expiry_date=timezone.now())
+        self.assertEqual(self.get_webhook(token).status_code, 401)
+        self.assertIsNone(caches["default"].get(auth_cache.cache_key(token)))
+
+    def test_metrics_count_hits_and_misses(self):
+        _, token = generate_user_jwt(self.user)
+        self.get_webhook(token)
+        self.get_webhook(token)
+
+        response = self.client_mgr.get(self.metrics_uri)
+        self.assertEqual(response.status_code, 200)
+        metrics = force_str(response.content)
+        self.assertIn("ghostwriter_hasura_auth_cache_hits_total 1", metrics)
+        self.assertIn("ghostwriter_hasura_auth_cache_misses_total 1", metrics)
+
+    def test_metrics_require_privileged_user(self):
+        self.client.login(username=self.user.username, password=PASSWORD)
+        response = self.client.get(self.metrics_uri)
+        self.assertEqual(response.status_code, 403)
+
+
 # Tests related to Hasura Actions
 
 
@@ -3155,6 +3290,21 @@ class GraphqlOplogEntryEventTests(TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_graphql_oplogentry_create_event_skips_bulk_ingested_entry(self):
+        data = copy.deepcopy(self.sample_data)
+        data["event"]["session_variables"] = {BULK_INGEST_SESSION_VARIABLE: "true"}
+        # The entry is not re-saved, so an ID that does not exist is never looked up
+        data["event"]["data"]["new"]["id"] = self.oplog_entry.id + 1000
+        response = self.client.post(
+            self.create_uri,
+            content_type="application/json",
+            data=data,
+            **{
+                "HTTP_HASURA_ACTION_SECRET": f"{ACTION_SECRET}",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+
     def test_graphql_oplogentry_update_event(self):
         response = self.client.post(
             self.update_uri,
@@ -6863,6 +7013,402 @@ class GraphqlDownloadEvidenceViewTests(TestCase):
         self.assertIn("fileBase64", result)
 
 
+class GraphqlSignedDownloadTests(TestCase):
+    """Collection of tests for :view:`api.GraphqlSignedDownload`."""
+
+    content = b"0123456789" * 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(password=PASSWORD, role="user", is_active=True)
+        cls.project = ProjectFactory()
+        ProjectAssignmentFactory(project=cls.project, operator=cls.user)
+        cls.report = ReportFactory(project=cls.project)
+        cls.uri = reverse("api:graphql_download_evidence")
+
+    def setUp(self):
+        self.client = Client()
+        _, self.user_token = generate_user_jwt(self.user)
+        self.evidence = EvidenceFactory(report=self.report)
+        self.evidence.document.save("signed_evidence.txt", ContentFile(self.content), save=True)
+
+    def get_signed_url(self):
+        response = self.client.post(
+            self.uri,
+            json.dumps({"input": {"evidenceId": self.evidence.id, "signedUrl": True}}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {self.user_token}",
+            HTTP_HASURA_ACTION_SECRET=ACTION_SECRET,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        result = response.json()
+        self.assertIsNone(result["fileBase64"])
+        self.assertIsNotNone(result["signedUrlExpiresAt"])
+        return result["signedUrl"][result["signedUrl"].index("/api/"):]
+
+    def test_signed_url_skips_inline_size_limit(self):
+        with override_settings(GHOSTWRITER_MAX_FILE_SIZE=1):
+            signed_url = self.get_signed_url()
+
+        response = self.client.get(signed_url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+        self.assertEqual(response["Content-Length"], str(len(self.content)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    def test_range_requests_return_partial_content(self):
+        signed_url = self.get_signed_url()
+
+        response = self.client.get(signed_url, HTTP_RANGE="bytes=10-19")
+        self.assertEqual(response.status_code, HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), self.content[10:20])
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(self.content)}")
+        self.assertEqual(response["Content-Length"], "10")
+
+        response = self.client.get(signed_url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(response.status_code, HTTPStatus.PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), self.content[-5:])
+
+        response = self.client.get(signed_url, HTTP_RANGE="bytes=95-")
+        self.assertEqual(b"".join(response.streaming_content), self.content[95:])
+
+    def test_unsatisfiable_range_is_rejected(self):
+        response = self.client.get(self.get_signed_url(), HTTP_RANGE=f"bytes={len(self.content)}-")
+        self.assertEqual(response.status_code, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.content)}")
+
+    def test_multiple_ranges_and_stale_if_range_return_whole_file(self):
+        signed_url = self.get_signed_url()
+
+        response = self.client.get(signed_url, HTTP_RANGE="bytes=0-1,5-6")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+        response = self.client.get(signed_url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(b"".join(response.streaming_content), self.content)
+
+        etag = response["ETag"]
+        response = self.client.get(signed_url, HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, HTTPStatus.PARTIAL_CONTENT)
+
+    def test_head_returns_size_without_body(self):
+        response = self.client.head(self.get_signed_url())
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response["Content-Length"], str(len(self.content)))
+        self.assertEqual(response.content, b"")
+
+    def test_expired_url_is_rejected(self):
+        signed_url = self.get_signed_url()
+        with override_settings(GHOSTWRITER_SIGNED_DOWNLOAD_TTL=-1):
+            response = self.client.get(signed_url)
+        self.assertEqual(response.status_code, HTTPStatus.GONE)
+
+    def test_tampered_url_is_rejected(self):
+        response = self.client.get(self.get_signed_url() + "x")
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    def test_replaced_file_is_not_served(self):
+        signed_url = self.get_signed_url()
+        self.evidence.document.save("replacement.txt", ContentFile(b"replacement"), save=True)
+
+        response = self.client.get(signed_url)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @override_settings(GHOSTWRITER_DOWNLOAD_ACCEL_REDIRECT="/protected-media/")
+    def test_accel_redirect_hands_file_to_nginx(self):
+        response = self.client.get(self.get_signed_url(), HTTP_RANGE="bytes=0-1")
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.evidence.document.name}")
+        self.assertEqual(response.content, b"")
+
+
+@override_settings(GHOSTWRITER_UPLOAD_TEMP_DIR=tempfile.mkdtemp())
+class ResumableUploadTests(TestCase):
+    """Collection of tests for :view:`api.ResumableUploadCreate` and :view:`api.ResumableUploadDetail`."""
+
+    content = b"0123456789" * 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(password=PASSWORD, role="user", is_active=True)
+        cls.other_user = UserFactory(password=PASSWORD, role="user", is_active=True)
+        cls.project = ProjectFactory()
+        ProjectAssignmentFactory(project=cls.project, operator=cls.user)
+        cls.report = ReportFactory(project=cls.project)
+        cls.oplog_entry = OplogEntryFactory(oplog_id__project=cls.project)
+        cls.uri = reverse("api:resumable_upload_create")
+
+    def setUp(self):
+        self.client = Client()
+        _, self.user_token = generate_user_jwt(self.user)
+        _, self.other_user_token = generate_user_jwt(self.other_user)
+
+    def create(self, data, token=None):
+        return self.client.post(
+            self.uri,
+            json.dumps(data),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {token or self.user_token}",
+        )
+
+    def create_evidence_upload(self, size=None):
+        response = self.create(
+            {
+                "kind": "evidence",
+                "filename": "chunked.txt",
+                "size": len(self.content) if size is None else size,
+                "friendly_name": "Chunked Evidence",
+                "report": self.report.pk,
+            }
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED, response.content)
+        return response.json()
+
+    def put(self, upload_url, chunk, offset, token=None):
+        return self.client.put(
+            upload_url,
+            data=chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+            HTTP_AUTHORIZATION=f"Bearer {token or self.user_token}",
+        )
+
+    def test_chunks_are_saved_as_evidence(self):
+        upload = self.create_evidence_upload()
+        self.assertEqual(upload["offset"], 0)
+
+        response = self.put(upload["uploadUrl"], self.content[:40], 0)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response["Upload-Offset"], "40")
+
+        response = self.put(upload["uploadUrl"], self.content[40:], 40)
+        self.assertEqual(response.status_code, HTTPStatus.CREATED, response.content)
+        evidence = Evidence.objects.get(pk=response.json()["id"])
+        self.assertEqual(evidence.friendly_name, "Chunked Evidence")
+        self.assertEqual(evidence.document.read(), self.content)
+        self.assertFalse(ResumableUpload.objects.filter(pk=upload["uploadId"]).exists())
+
+    def test_upload_resumes_from_offset(self):
+        upload = self.create_evidence_upload()
+        self.put(upload["uploadUrl"], self.content[:40], 0)
+
+        # A client that lost track of the offset is told where to resume
+        response = self.put(upload["uploadUrl"], self.content[20:], 20)
+        self.assertEqual(response.status_code, HTTPStatus.CONFLICT)
+        self.assertEqual(response["Upload-Offset"], "40")
+
+        response = self.client.get(upload["uploadUrl"], HTTP_AUTHORIZATION=f"Bearer {self.user_token}")
+        self.assertEqual(response.json()["offset"], 40)
+
+        response = self.put(upload["uploadUrl"], self.content[40:], 40)
+        self.assertEqual(response.status_code, HTTPStatus.CREATED, response.content)
+        self.assertEqual(Evidence.objects.get(pk=response.json()["id"]).document.read(), self.content)
+
+    def test_chunk_past_size_is_rejected(self):
+        upload = self.create_evidence_upload(size=10)
+        response = self.put(upload["uploadUrl"], self.content[:20], 0)
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(response["Upload-Offset"], "0")
+
+    @override_settings(GHOSTWRITER_UPLOAD_CHUNK_SIZE=10)
+    def test_chunk_larger_than_limit_is_rejected(self):
+        upload = self.create_evidence_upload()
+        response = self.put(upload["uploadUrl"], self.content[:20], 0)
+        self.assertEqual(response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+    @override_settings(GHOSTWRITER_MAX_CHUNKED_UPLOAD_SIZE=10)
+    def test_file_larger_than_limit_is_rejected(self):
+        response = self.create({"kind": "evidence", "filename": "chunked.txt", "size": 11, "report": self.report.pk})
+        self.assertEqual(response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+    def test_inputs_are_validated_before_chunks_are_sent(self):
+        response = self.create({"kind": "evidence", "filename": "chunked.exe", "size": 10, "report": self.report.pk})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+        response = self.create({"kind": "unknown", "filename": "chunked.txt", "size": 10})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+        response = self.create(
+            {"kind": "oplog_recording", "filename": "session.cast", "size": 10, "oplogEntryId": self.oplog_entry.pk},
+            token=self.other_user_token,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+        self.assertFalse(ResumableUpload.objects.exists())
+
+    def test_uploads_of_other_users_are_hidden(self):
+        upload = self.create_evidence_upload()
+        response = self.put(upload["uploadUrl"], self.content, 0, token=self.other_user_token)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_expired_upload_is_not_resumed(self):
+        upload = self.create_evidence_upload()
+        ResumableUpload.objects.filter(pk=upload["uploadId"]).update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.put(upload["uploadUrl"], self.content, 0)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+        self.assertEqual(delete_expired_uploads(), 1)
+        self.assertFalse(ResumableUpload.objects.exists())
+
+    def test_deleting_upload_removes_chunks(self):
+        upload = self.create_evidence_upload()
+        self.put(upload["uploadUrl"], self.content[:40], 0)
+        part_path = ResumableUpload.objects.get(pk=upload["uploadId"]).part_path
+        self.assertTrue(os.path.exists(part_path))
+
+        response = self.client.delete(upload["uploadUrl"], HTTP_AUTHORIZATION=f"Bearer {self.user_token}")
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+        self.assertFalse(os.path.exists(part_path))
+
+    def test_recording_is_saved(self):
+        raw = b'{"version": 2, "width": 80, "height": 24}\n[0.5, "o", "chunked"]\n'
+        compressed = gzip.compress(raw)
+        response = self.create(
+            {
+                "kind": "oplog_recording",
+                "filename": "session.cast.gz",
+                "size": len(compressed),
+                "oplogEntryId": self.oplog_entry.pk,
+            }
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED, response.content)
+        upload_url = response.json()["uploadUrl"]
+
+        self.assertEqual(self.put(upload_url, compressed[:10], 0).status_code, HTTPStatus.OK)
+        response = self.put(upload_url, compressed[10:], 10)
+        self.assertEqual(response.status_code, HTTPStatus.CREATED, response.content)
+        self.assertEqual(response.json()["oplogEntryId"], self.oplog_entry.pk)
+        recording = OplogEntryRecording.objects.get(pk=response.json()["id"])
+        self.assertIn("chunked", recording.recording_text)
+
+    def test_recording_that_is_not_gzip_is_rejected_early(self):
+        response = self.create(
+            {
+                "kind": "oplog_recording",
+                "filename": "session.cast.gz",
+                "size": len(self.content),
+                "oplogEntryId": self.oplog_entry.pk,
+            }
+        )
+        upload_id = response.json()["uploadId"]
+
+        response = self.put(response.json()["uploadUrl"], self.content[:10], 0)
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertFalse(ResumableUpload.objects.filter(pk=upload_id).exists())
+
+
+class GraphqlBulkCreateOplogEntriesTests(TestCase):
+    """Collection of tests for :view:`api.GraphqlBulkCreateOplogEntries`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(password=PASSWORD, role="user", is_active=True)
+        cls.other_user = UserFactory(password=PASSWORD, role="user", is_active=True)
+        cls.oplog = OplogFactory()
+        ProjectAssignmentFactory(project=cls.oplog.project, operator=cls.user)
+        cls.other_oplog = OplogFactory()
+        cls.uri = reverse("api:graphql_bulk_create_oplog_entries")
+
+    def setUp(self):
+        self.client = Client()
+        _, self.user_token = generate_user_jwt(self.user)
+        _, self.other_user_token = generate_user_jwt(self.other_user)
+
+    def _post(self, entries, token=None, oplog_id=None):
+        return self.client.post(
+            self.uri,
+            json.dumps({"input": {"oplogId": oplog_id or self.oplog.id, "entries": entries}}),
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {token or self.user_token}",
+            HTTP_HASURA_ACTION_SECRET=ACTION_SECRET,
+        )
+
+    def _entries(self, count, prefix="task"):
+        return [
+            {
+                "entryIdentifier": f"{prefix}-{index}",
+                "startDate": "2024-06-01T12:00:00Z",
+                "command": f"shell whoami {index}",
+                "description": '<p onclick="alert(1)">Checked the user context</p>',
+                "tags": ["att&ck:T1033", "discovery"],
+            }
+            for index in range(count)
+        ]
+
+    def test_entries_are_created_with_tags(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self._post(self._entries(3))
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        result = response.json()
+        self.assertEqual(result["created"], 3)
+        self.assertEqual(result["updated"], 0)
+        # The whole batch is broadcast once
+        self.assertEqual(len(callbacks), 1)
+
+        entries = OplogEntry.objects.filter(pk__in=result["entryIds"])
+        self.assertEqual(entries.count(), 3)
+        for entry in entries:
+            self.assertEqual(entry.oplog_id, self.oplog)
+            self.assertEqual(set(entry.tags.names()), {"att&ck:T1033", "discovery"})
+            self.assertNotIn("onclick", entry.description)
+            self.assertIsNotNone(entry.end_date)
+
+    def test_entries_with_known_identifiers_are_updated(self):
+        existing = OplogEntryFactory(oplog_id=self.oplog, entry_identifier="task-0", tool="poseidon")
+        existing.tags.add("evidence")
+
+        response = self._post(self._entries(2) + [{"entryIdentifier": "task-1", "output": "CORP\\operator"}])
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        result = response.json()
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(result["entryIds"][0], existing.pk)
+        self.assertEqual(result["entryIds"][1], result["entryIds"][2])
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.command, "shell whoami 0")
+        self.assertEqual(existing.tool, "poseidon")
+        self.assertEqual(set(existing.tags.names()), {"att&ck:T1033", "discovery", "evidence"})
+        merged = OplogEntry.objects.get(pk=result["entryIds"][1])
+        self.assertEqual(merged.command, "shell whoami 1")
+        self.assertEqual(merged.output, "CORP\\operator")
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        self._post(self._entries(1, prefix="warm-up"))
+        with CaptureQueriesContext(connection) as small_batch:
+            self._post(self._entries(5, prefix="small"))
+        with CaptureQueriesContext(connection) as large_batch:
+            self._post(self._entries(100, prefix="large"))
+        self.assertEqual(len(small_batch.captured_queries), len(large_batch.captured_queries))
+
+    def test_invalid_entry_rejects_batch(self):
+        entries = self._entries(2)
+        entries[1]["startDate"] = "yesterday"
+        response = self._post(entries)
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn("entries[1].startDate", response.json()["message"])
+        self.assertFalse(OplogEntry.objects.filter(oplog_id=self.oplog).exists())
+
+    @override_settings(GHOSTWRITER_OPLOG_BULK_MAX_ENTRIES=2)
+    def test_batch_larger_than_limit_is_rejected(self):
+        response = self._post(self._entries(3))
+        self.assertEqual(response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+    def test_user_without_access_is_rejected(self):
+        response = self._post(self._entries(1), token=self.other_user_token)
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+        self.assertFalse(OplogEntry.objects.filter(oplog_id=self.oplog).exists())
+
+    def test_service_token_is_limited_to_its_oplog(self):
+        token = create_oplog_rw_service_token(self.user, self.oplog)
+        response = self._post(self._entries(2), token=token)
+        self.assertEqual(response.status_code, HTTPStatus.OK, response.content)
+        self.assertEqual(response.json()["created"], 2)
+
+        response = self._post(self._entries(2), token=token, oplog_id=self.other_oplog.id)
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+
 class GraphqlLinkOplogEvidenceTests(TestCase):
     """Collection of tests for :view:`api.GraphqlLinkOplogEvidence`."""
 
@@ -7528,3 +8074,19 @@ class GraphqlDownloadRecordingTests(TestCase):
 
         self.assertEqual(response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
         self.assertEqual(response.json()["extensions"]["code"], "FileTooLargeForInline")
+
+    def test_download_recording_signed_url(self):
+        """Test that a signed URL streams the recording regardless of GHOSTWRITER_MAX_FILE_SIZE."""
+        with override_settings(GHOSTWRITER_MAX_FILE_SIZE=1):
+            response = self._post(
+                {"oplogEntryId": self.oplog_entry.id, "signedUrl": True}, self.user_token
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        result = response.json()
+        self.assertIsNone(result["fileBase64"])
+        signed_url = result["signedUrl"]
+        response = self.client.get(signed_url[signed_url.index("/api/"):])
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.recording.recording_file.seek(0)
+        self.assertEqual(b"".join(response.streaming_content), self.recording.recording_file.read())
@@ -0,0 +1,65 @@
+"""This contains the storage of the chunks of files uploaded to the ``/api/uploads`` endpoints."""
+
+# Standard Libraries
+import os
+
+# Django Imports
+from django.conf import settings
+from django.core.files import File
+
+# Number of bytes read from the request and written to disk at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+class IncompleteChunk(Exception):
+    """Raised when the request ends before all the bytes of a chunk were received."""
+
+
+class ChunkedUploadFile(File):
+    """
+    The complete file of an :model:`api.ResumableUpload`. Storage backends that support
+    ``temporary_file_path`` move it into place instead of copying it.
+    """
+
+    def __init__(self, upload):
+        self._part_path = upload.part_path
+        super().__init__(open(self._part_path, "rb"), name=upload.filename)
+
+    def temporary_file_path(self) -> str:
+        return self._part_path
+
+
+def write_chunk(upload, stream, length: int) -> None:
+    """
+    Append `length` bytes read from `stream` to the bytes received for `upload` without holding more than
+    ``STREAM_CHUNK_SIZE`` bytes in memory. Anything written past ``upload.offset`` by an interrupted request is
+    discarded first. If the stream ends early or fails, the partial chunk is discarded too and the exception
+    (``IncompleteChunk`` if the stream ran out) is raised.
+    """
+    os.makedirs(settings.GHOSTWRITER_UPLOAD_TEMP_DIR, exist_ok=True)
+    descriptor = os.open(upload.part_path, os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(descriptor, "r+b") as part:
+        part.truncate(upload.offset)
+        part.seek(upload.offset)
+        remaining = length
+        try:
+            while remaining > 0:
+                data = stream.read(min(STREAM_CHUNK_SIZE, remaining))
+                if not data:
+                    raise IncompleteChunk(f"Received {length - remaining} of {length} bytes")
+                part.write(data)
+                remaining -= len(data)
+        except Exception:
+            part.truncate(upload.offset)
+            raise
+
+
+def read_head(upload, length: int) -> bytes:
+    """Returns up to the first `length` bytes received for `upload`."""
+    try:
+        with open(upload.part_path, "rb") as part:
+            return part.read(length)
+    except FileNotFoundError:
+        return b""
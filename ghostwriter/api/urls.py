@@ -18,6 +18,8 @@ from ghostwriter.api.views import (
     ServiceTokenRevoke,
     GraphqlAttachFinding,
     GraphqlAuthenticationWebhook,
+    GraphqlAuthenticationWebhookMetrics,
+    GraphqlBulkCreateOplogEntries,
     GraphqlCheckoutDomain,
     GraphqlCheckoutServer,
     GraphqlUserCreate,
@@ -47,6 +49,9 @@ from ghostwriter.api.views import (
     GraphqlLinkOplogEvidence,
     GraphqlUploadOplogRecording,
     GraphqlDownloadRecording,
+    GraphqlSignedDownload,
+    ResumableUploadCreate,
+    ResumableUploadDetail,
     CheckEditPermissions,
     CollabTokenRefresh,
     GetTags,
@@ -62,6 +67,7 @@ urlpatterns = [
     path("test", csrf_exempt(GraphqlTestView.as_view()), name="graphql_test"),
     path("test_event", csrf_exempt(GraphqlEventTestView.as_view()), name="graphql_event_test"),
     path("webhook", csrf_exempt(GraphqlAuthenticationWebhook.as_view()), name="graphql_webhook"),
+    path("webhook/metrics", GraphqlAuthenticationWebhookMetrics.as_view(), name="graphql_webhook_metrics"),
     path("login", csrf_exempt(GraphqlLoginAction.as_view()), name="graphql_login"),
     path("whoami", csrf_exempt(GraphqlWhoami.as_view()), name="graphql_whoami"),
     path("createUser", csrf_exempt(GraphqlUserCreate.as_view()), name="graphql_create_user"),
@@ -87,9 +93,13 @@ urlpatterns = [
     path("attachFinding", csrf_exempt(GraphqlAttachFinding.as_view()), name="graphql_attach_finding"),
     path("uploadEvidence", csrf_exempt(GraphqlUploadEvidenceView.as_view()), name="graphql_upload_evidence"),
     path("uploadReportTemplate", csrf_exempt(GraphqlUploadReportTemplateView.as_view()), name="graphql_upload_report_template"),
+    path("bulkCreateOplogEntries", csrf_exempt(GraphqlBulkCreateOplogEntries.as_view()), name="graphql_bulk_create_oplog_entries"),
     path("linkOplogEvidence", csrf_exempt(GraphqlLinkOplogEvidence.as_view()), name="graphql_link_oplog_evidence"),
     path("uploadOplogRecording", csrf_exempt(GraphqlUploadOplogRecording.as_view()), name="graphql_upload_oplog_recording"),
     path("downloadOplogRecording", csrf_exempt(GraphqlDownloadRecording.as_view()), name="graphql_download_oplog_recording"),
+    path("download/<str:token>", GraphqlSignedDownload.as_view(), name="graphql_signed_download"),
+    path("uploads", csrf_exempt(ResumableUploadCreate.as_view()), name="resumable_upload_create"),
+    path("uploads/<uuid:upload_id>", csrf_exempt(ResumableUploadDetail.as_view()), name="resumable_upload_detail"),
     # Events
     path("event/domain/update", csrf_exempt(GraphqlDomainUpdateEvent.as_view()), name="graphql_domain_update_event"),
     path(
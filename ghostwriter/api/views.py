@@ -8,7 +8,7 @@ import os
 import uuid
 from asgiref.sync import async_to_sync
 from base64 import b64encode
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from http import HTTPStatus
 from socket import gaierror
 
@@ -16,11 +16,13 @@ from socket import gaierror
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, get_user_model
+from django.core import signing
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.files.base import ContentFile
+from django.db import DatabaseError, transaction
 from django.db.models import Q
 from django.db.utils import IntegrityError
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse, UnreadablePostError
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils import timezone as django_timezone
@@ -36,7 +38,7 @@ from dateutil.parser import parse as parse_date
 from dateutil.parser._parser import ParserError
 
 # Ghostwriter Libraries
-from ghostwriter.api import utils
+from ghostwriter.api import auth_cache, downloads, uploads, utils
 from ghostwriter.api.forms import (
     ApiEvidenceForm,
     ApiKeyForm,
@@ -47,6 +49,7 @@ from ghostwriter.api.forms import (
 )
 from ghostwriter.api.models import (
     APIKey,
+    ResumableUpload,
     ServicePrincipal,
     ServiceToken,
     ServiceTokenPermission,
@@ -62,9 +65,17 @@ from ghostwriter.modules.model_utils import (
 )
 from ghostwriter.modules.passive_voice.detector import get_detector
 from ghostwriter.modules.reportwriter import jinja_string_literal
+from ghostwriter.modules.reportwriter.images import delete_derivatives
 from ghostwriter.modules.reportwriter.report.json import ExportReportJson
-from ghostwriter.oplog.models import OplogEntry, OplogEntryEvidence, OplogEntryRecording
-from ghostwriter.oplog.utils import extract_cast_text, validate_cast_gzip_upload
+from ghostwriter.oplog.ingest import BulkIngestError, ingest_entries, ingested_in_bulk
+from ghostwriter.oplog.models import Oplog, OplogEntry, OplogEntryEvidence, OplogEntryRecording
+from ghostwriter.oplog.utils import (
+    CAST_INVALID_GZIP_UPLOAD_MESSAGE,
+    CAST_PARSE_TOO_LARGE_WARNING,
+    extract_cast_text,
+    get_cast_parse_input_bytes,
+    validate_cast_gzip_upload,
+)
 from ghostwriter.reporting.models import (
     Evidence,
     Finding,
@@ -137,6 +148,7 @@ class HasuraView(View):
     # Initialize default class attributes
     user_obj = None
     api_key_obj = None
+    user_session_obj = None
     service_principal_obj = None
     service_token_obj = None
     encoded_token = None
@@ -171,6 +183,7 @@ class HasuraView(View):
         # Try to pull the bearer credential from the request header
         self.user_obj = None
         self.api_key_obj = None
+        self.user_session_obj = None
         self.service_principal_obj = None
         self.service_token_obj = None
         self.encoded_token = utils.get_bearer_token_from_request(request)
@@ -220,6 +233,7 @@ class HasuraView(View):
                         except UserSession.DoesNotExist:
                             return self.invalid_token_response()
                         self.user_obj = session.user
+                        self.user_session_obj = session
                     elif token_type == utils.COLLAB_JWT_TYPE:
                         if not self.allow_collab_jwt:
                             return self.invalid_token_response()
@@ -718,6 +732,11 @@ class GraphqlAuthenticationWebhook(HasuraView):
     using the ``public`` user role with the username ``anonymous`` and user ID
     of ``-1``.
 
+    Hasura calls the webhook for every GraphQL request, so the session variables of
+    authenticated credentials are cached for ``GHOSTWRITER_HASURA_AUTH_CACHE_TTL``
+    seconds (see ``ghostwriter.api.auth_cache``). Revoking the credential or changing
+    the user, session, or service principal behind it invalidates them right away.
+
     Ref: https://hasura.io/docs/latest/graphql/core/auth/authentication/webhook/
     """
 
@@ -725,6 +744,51 @@ class GraphqlAuthenticationWebhook(HasuraView):
         "get",
     ]
     allow_collab_jwt = True
+    auth_cache_epoch = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.encoded_token and request.method.lower() in self.http_method_names:
+            cached = auth_cache.get_cached_variables(self.encoded_token)
+            if cached is not None:
+                data, token_id = cached
+                if token_id is not None:
+                    self.get_token_manager().record_usage_by_id(token_id)
+                return JsonResponse(data, status=200)
+            # Read before ``HasuraView`` resolves the credential, so a revocation in between is noticed
+            self.auth_cache_epoch = auth_cache.read_epoch()
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_token_manager(self):
+        """Return the manager of the opaque API token model the bearer credential belongs to."""
+        if self.encoded_token.startswith(f"{ServiceToken.objects.token_prefix}_"):
+            return ServiceToken.objects
+        return APIKey.objects
+
+    def get_auth_cache_dependencies(self):
+        """
+        Return the ``(kind, pk)`` pairs of the objects that authorized the credential
+        and the date the credential expires, if any.
+        """
+        if self.service_token_obj:
+            token = self.service_token_obj
+            principal = self.service_principal_obj
+            dependencies = [
+                ("service_token", token.pk),
+                ("service_principal", principal.pk),
+                ("user", token.created_by_id),
+                ("user", principal.created_by_id),
+            ]
+            return dependencies, token.expiry_date
+        if self.api_key_obj:
+            dependencies = [("user", self.user_obj.pk), ("api_key", self.api_key_obj.pk)]
+            return dependencies, self.api_key_obj.expiry_date
+        if self.user_session_obj:
+            dependencies = [("user", self.user_obj.pk), ("session", self.user_session_obj.pk)]
+            return dependencies, self.user_session_obj.expires_at
+        expires_at = None
+        if self.jwt_payload and self.jwt_payload.get("exp"):
+            expires_at = datetime.fromtimestamp(self.jwt_payload["exp"], tz=pytz.utc)
+        return [("user", self.user_obj.pk)], expires_at
 
     def get_collab_claim(self, claim, default=utils.COLLAB_NO_ID):
         if not self.jwt_payload:
@@ -791,9 +855,37 @@ class GraphqlAuthenticationWebhook(HasuraView):
         else:
             data["X-Hasura-User-Id"] = f"{user_id}"
 
+        if self.user_obj or self.service_token_obj:
+            dependencies, expires_at = self.get_auth_cache_dependencies()
+            token = self.service_token_obj or self.api_key_obj
+            auth_cache.cache_variables(
+                self.encoded_token,
+                data,
+                dependencies,
+                self.auth_cache_epoch,
+                expires_at,
+                token_id=token.pk if token else None,
+            )
         return JsonResponse(data, status=200)
 
 
+class GraphqlAuthenticationWebhookMetrics(utils.RoleBasedAccessControlMixin, View):
+    """
+    Return the number of authentication webhook requests answered from the cache and
+    resolved from the database, in the Prometheus text format.
+    """
+
+    def test_func(self):
+        return utils.verify_user_is_privileged(self.request.user)
+
+    def handle_no_permission(self):
+        return HttpResponse("You do not have permission to access that.", status=403, content_type="text/plain")
+
+    def get(self, *args, **kwargs):
+        metrics = auth_cache.format_metrics(auth_cache.get_metrics())
+        return HttpResponse(metrics, content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 class GraphqlLoginAction(HasuraActionView):
     """Authentication and JWT generation logic for the Hasura ``login`` action."""
 
@@ -979,12 +1071,15 @@ class GraphqlDownloadEvidence(JwtRequiredMixin, HasuraActionView):
     """
     Return a download URL and base64-encoded evidence file for authenticated users with project view access.
 
-    Files larger than ``GHOSTWRITER_MAX_FILE_SIZE`` are rejected with 413.
+    Files larger than ``GHOSTWRITER_MAX_FILE_SIZE`` are rejected with 413 unless ``signedUrl`` is set.
 
     **Parameters**
 
     ``evidenceId``
         The ID of the evidence to download
+    ``signedUrl``
+        Return a short-lived signed URL that streams the file (and supports ``Range`` requests) instead of
+        the base64-encoded file
     """
 
     required_inputs = [
@@ -1030,17 +1125,24 @@ class GraphqlDownloadEvidence(JwtRequiredMixin, HasuraActionView):
         )
         download_url = f"{base_url}{evidence_path}"
 
+        signed_url = signed_url_expires_at = encoded_data = None
         try:
-            if evidence.document.size > settings.GHOSTWRITER_MAX_FILE_SIZE:
+            file_size = evidence.document.size
+            if self.input.get("signedUrl"):
+                signed_path, expires_at = downloads.sign_download("evidence", evidence)
+                signed_url = f"{base_url}{signed_path}"
+                signed_url_expires_at = expires_at.isoformat()
+            elif file_size > settings.GHOSTWRITER_MAX_FILE_SIZE:
                 return JsonResponse(
                     utils.generate_hasura_error_payload(
-                        "File is too large to return inline; use the download URL instead",
+                        "File is too large to return inline; request a signed URL instead",
                         "FileTooLargeForInline",
                     ),
                     status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
                 )
-            file_data = evidence.document.read()
-            encoded_data = b64encode(file_data).decode("utf-8")
+            else:
+                file_data = evidence.document.read()
+                encoded_data = b64encode(file_data).decode("utf-8")
         except FileNotFoundError:
             logger.error(
                 "Evidence file not found during read: %s", evidence.document.path
@@ -1067,6 +1169,8 @@ class GraphqlDownloadEvidence(JwtRequiredMixin, HasuraActionView):
                 "friendlyName": evidence.friendly_name,
                 "downloadUrl": download_url,
                 "fileBase64": encoded_data,
+                "signedUrl": signed_url,
+                "signedUrlExpiresAt": signed_url_expires_at,
             }
         )
 
@@ -1362,6 +1466,84 @@ class GraphqlUploadReportTemplateView(JwtRequiredMixin, HasuraActionView):
         )
 
 
+class GraphqlBulkCreateOplogEntries(JwtRequiredMixin, HasuraActionView):
+    """
+    Endpoint for saving a batch of :model:`oplog.OplogEntry` entries in one transaction with the
+    ``bulkCreateOplogEntries`` action. Entries with the ``entryIdentifier`` of an entry already in the log update
+    it instead. Viewers of the log receive the whole batch in one WebSocket message.
+
+    **Inputs**
+
+    ``oplogId``
+        The ID of the log to save the entries in
+    ``entries``
+        The entries, with the same fields as ``oplogEntry`` rows and a list of ``tags`` to add to each
+    """
+
+    required_inputs = [
+        "oplogId",
+        "entries",
+    ]
+    # Batches of entries with command output outgrow ``DATA_UPLOAD_MAX_MEMORY_SIZE``
+    allow_large_input = True
+
+    def get_service_token_permission_requirements(self) -> tuple[dict[str, object], ...]:
+        try:
+            oplog_id = int(self.input["oplogId"])
+        except (KeyError, TypeError, ValueError):
+            oplog_id = None
+        # Entries may be created or, by their identifiers, updated
+        return tuple(
+            {
+                "resource_type": ServiceTokenPermission.ResourceType.OPLOG,
+                "action": action,
+                "resource_id": oplog_id,
+            }
+            for action in (ServiceTokenPermission.Action.CREATE, ServiceTokenPermission.Action.UPDATE)
+        )
+
+    def post(self, request, *args, **kwargs):
+        entries = self.input["entries"]
+        if not isinstance(entries, list):
+            return JsonResponse(
+                utils.generate_hasura_error_payload("The entries must be a list", "InvalidRequestBody"),
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        if len(entries) > settings.GHOSTWRITER_OPLOG_BULK_MAX_ENTRIES:
+            return JsonResponse(
+                utils.generate_hasura_error_payload(
+                    f"Send at most {settings.GHOSTWRITER_OPLOG_BULK_MAX_ENTRIES} entries at a time", "PayloadTooLarge"
+                ),
+                status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        try:
+            oplog = Oplog.objects.select_related("project").get(id=self.input["oplogId"])
+        except (Oplog.DoesNotExist, TypeError, ValueError):
+            return JsonResponse(
+                utils.generate_hasura_error_payload("Oplog does not exist", "OplogDoesNotExist"),
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        # Service tokens were authorized for this log by ``get_service_token_permission_requirements``
+        if self.service_token_obj is None and not OplogEntry.user_can_create(self.user_obj, oplog):
+            return JsonResponse(
+                utils.generate_hasura_error_payload("Unauthorized access", "Unauthorized"),
+                status=HTTPStatus.UNAUTHORIZED,
+            )
+
+        try:
+            result = ingest_entries(oplog, entries)
+        except BulkIngestError as exception:
+            return JsonResponse(
+                utils.generate_hasura_error_payload("\n".join(exception.errors), "Invalid"),
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        return JsonResponse(
+            {"created": result.created, "updated": result.updated, "entryIds": result.entry_ids},
+            status=self.status,
+        )
+
+
 class GraphqlLinkOplogEvidence(JwtRequiredMixin, HasuraActionView):
     """
     Endpoint for linking an existing :model:`reporting.Evidence` to an
@@ -1523,10 +1705,15 @@ class GraphqlDownloadRecording(JwtRequiredMixin, HasuraActionView):
     """
     Return a download URL and base64-encoded recording file for authenticated users with proper permissions.
 
+    Files larger than ``GHOSTWRITER_MAX_FILE_SIZE`` are rejected with 413 unless ``signedUrl`` is set.
+
     **Parameters**
 
     ``oplogEntryId``
         The ID of the oplog entry whose recording should be downloaded
+    ``signedUrl``
+        Return a short-lived signed URL that streams the file (and supports ``Range`` requests) instead of
+        the base64-encoded file
     """
 
     required_inputs = [
@@ -1601,17 +1788,24 @@ class GraphqlDownloadRecording(JwtRequiredMixin, HasuraActionView):
         )
         download_url = f"{base_url}{download_path}"
 
+        signed_url = signed_url_expires_at = encoded_data = None
         try:
-            if recording.recording_file.size > settings.GHOSTWRITER_MAX_FILE_SIZE:
+            file_size = recording.recording_file.size
+            if self.input.get("signedUrl"):
+                signed_path, expires_at = downloads.sign_download("recording", recording)
+                signed_url = f"{base_url}{signed_path}"
+                signed_url_expires_at = expires_at.isoformat()
+            elif file_size > settings.GHOSTWRITER_MAX_FILE_SIZE:
                 return JsonResponse(
                     utils.generate_hasura_error_payload(
-                        "File is too large to return inline; use the download URL instead",
+                        "File is too large to return inline; request a signed URL instead",
                         "FileTooLargeForInline",
                     ),
                     status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
                 )
-            file_data = recording.recording_file.read()
-            encoded_data = b64encode(file_data).decode("utf-8")
+            else:
+                file_data = recording.recording_file.read()
+                encoded_data = b64encode(file_data).decode("utf-8")
         except FileNotFoundError:
             logger.error(
                 "Recording file not found during read: %s",
@@ -1639,11 +1833,324 @@ class GraphqlDownloadRecording(JwtRequiredMixin, HasuraActionView):
                 "filename": recording.filename,
                 "downloadUrl": download_url,
                 "fileBase64": encoded_data,
+                "signedUrl": signed_url,
+                "signedUrlExpiresAt": signed_url_expires_at,
             },
             status=self.status,
         )
 
 
+class GraphqlSignedDownload(View):
+    """
+    Stream the evidence file or recording identified by a signed URL returned by the ``downloadEvidence`` and
+    ``downloadOplogRecording`` actions. The URL authorizes the download until it expires, so no session or
+    token is required. Single-part ``Range`` requests are honored.
+    """
+
+    http_method_names = ["get", "head"]
+
+    def get(self, request, token, *args, **kwargs):
+        try:
+            obj, field_file = downloads.load_download(token)
+        except signing.SignatureExpired:
+            return HttpResponse("This download URL has expired", status=HTTPStatus.GONE, content_type="text/plain")
+        except signing.BadSignature:
+            return HttpResponse("Invalid download URL", status=HTTPStatus.FORBIDDEN, content_type="text/plain")
+        return downloads.file_response(request, field_file, obj.filename)
+
+
+class ResumableUploadView(JwtRequiredMixin, HasuraView):
+    """
+    Base view for the ``/api/uploads`` endpoints. They accept evidence files, report templates, and oplog
+    recordings in chunks of raw bytes streamed to disk, so a file never has to fit in memory (as it does when
+    sent base64-encoded to an upload action), and an interrupted upload resumes from the last chunk received.
+    """
+
+    def post_authentication(self, request, *args, **kwargs):
+        # Files are saved on behalf of a user, as with the upload actions
+        if self.user_obj is None:
+            return JsonResponse(
+                utils.generate_hasura_error_payload("Unauthorized access", "Unauthorized"),
+                status=HTTPStatus.UNAUTHORIZED,
+            )
+        return None
+
+    def get_form(self, upload: ResumableUpload, file_obj=None):
+        """Returns the upload action's form bound to the inputs of `upload` and, once complete, its file."""
+        data = {**upload.metadata, "filename": upload.filename}
+        if upload.kind == ResumableUpload.Kind.EVIDENCE:
+            return ApiEvidenceForm(
+                data,
+                user_obj=self.user_obj,
+                report_queryset=utils.get_reports_list(self.user_obj),
+                chunked=True,
+                file_obj=file_obj,
+            )
+        if upload.kind == ResumableUpload.Kind.REPORT_TEMPLATE:
+            return ApiReportTemplateForm(data, user_obj=self.user_obj, chunked=True, file_obj=file_obj)
+        data["oplog_entry_id"] = data.get("oplogEntryId")
+        return ApiOplogRecordingForm(data, chunked=True, file_obj=file_obj)
+
+    def check_upload(self, upload: ResumableUpload, file_obj=None):
+        """
+        Validate the inputs of `upload`, and its file once every chunk arrived, like the matching upload action.
+        Returns the bound form, the :model:`oplog.OplogEntry` of a recording, and an error response if invalid.
+        """
+        form = self.get_form(upload, file_obj)
+        if not form.is_valid():
+            message = "\n\n".join(
+                f"{k}: " + " ".join(str(err) for err in v) for k, v in form.errors.items()
+            )
+            return form, None, JsonResponse(
+                utils.generate_hasura_error_payload(message, "Invalid"), status=HTTPStatus.BAD_REQUEST
+            )
+        if upload.kind != ResumableUpload.Kind.OPLOG_RECORDING:
+            return form, None, None
+
+        entry = (
+            OplogEntry.objects.select_related("oplog_id__project")
+            .filter(pk=form.cleaned_data["oplog_entry_id"])
+            .first()
+        )
+        if entry is None:
+            return form, None, JsonResponse(
+                utils.generate_hasura_error_payload("Oplog entry does not exist", "OplogEntryDoesNotExist"),
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        if not entry.user_can_edit(self.user_obj):
+            return form, None, JsonResponse(
+                utils.generate_hasura_error_payload("Unauthorized access", "Unauthorized"),
+                status=HTTPStatus.UNAUTHORIZED,
+            )
+        return form, entry, None
+
+    def status_response(self, upload: ResumableUpload, status: int = HTTPStatus.OK) -> JsonResponse:
+        response = JsonResponse(
+            {
+                "uploadId": str(upload.pk),
+                "kind": upload.kind,
+                "filename": upload.filename,
+                "size": upload.size,
+                "offset": upload.offset,
+                "chunkSize": settings.GHOSTWRITER_UPLOAD_CHUNK_SIZE,
+                "expiresAt": upload.expires_at.isoformat(),
+                "uploadUrl": reverse("api:resumable_upload_detail", kwargs={"upload_id": upload.pk}),
+            },
+            status=status,
+        )
+        response["Upload-Offset"] = str(upload.offset)
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def error_response(self, message: str, code: str, status: int, upload: ResumableUpload | None = None):
+        response = JsonResponse(utils.generate_hasura_error_payload(message, code), status=status)
+        if upload is not None:
+            # Tells the client where to resume
+            response["Upload-Offset"] = str(upload.offset)
+        return response
+
+
+class ResumableUploadCreate(ResumableUploadView):
+    """
+    Start a chunked upload with ``POST /api/uploads``.
+
+    The JSON body holds the ``kind`` of file (``evidence``, ``report_template``, or ``oplog_recording``), its
+    ``filename`` and total ``size`` in bytes, and the other inputs of the matching upload action (e.g.,
+    ``report`` and ``friendly_name`` for evidence or ``oplogEntryId`` for a recording). The inputs are
+    validated before any chunk is sent.
+    """
+
+    def post(self, request, *args, **kwargs):
+        try:
+            data = json.loads(request.body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            data = None
+        if not isinstance(data, dict):
+            return self.error_response(
+                "The request body must be a JSON object", "InvalidRequestBody", HTTPStatus.BAD_REQUEST
+            )
+
+        kind = data.pop("kind", None)
+        filename = data.pop("filename", None)
+        size = data.pop("size", None)
+        data.pop("file_base64", None)
+        if kind not in ResumableUpload.Kind.values:
+            choices = ", ".join(ResumableUpload.Kind.values)
+            return self.error_response(
+                f"The kind of upload must be one of: {choices}", "InvalidRequestBody", HTTPStatus.BAD_REQUEST
+            )
+        if not isinstance(filename, str) or not 0 < len(filename) <= 255:
+            return self.error_response(
+                "A filename of up to 255 characters is required", "InvalidRequestBody", HTTPStatus.BAD_REQUEST
+            )
+        if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+            return self.error_response(
+                "The size must be a positive number of bytes", "InvalidRequestBody", HTTPStatus.BAD_REQUEST
+            )
+        if size > settings.GHOSTWRITER_MAX_CHUNKED_UPLOAD_SIZE:
+            return self.error_response("File is too large", "PayloadTooLarge", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+        upload = ResumableUpload(
+            user=self.user_obj,
+            kind=kind,
+            filename=filename,
+            size=size,
+            metadata=data,
+            expires_at=django_timezone.now() + timedelta(seconds=settings.GHOSTWRITER_UPLOAD_EXPIRY),
+        )
+        _, _, error_response = self.check_upload(upload)
+        if error_response is not None:
+            return error_response
+        upload.save()
+        return self.status_response(upload, status=HTTPStatus.CREATED)
+
+
+class ResumableUploadDetail(ResumableUploadView):
+    """
+    Send the chunks of a chunked upload started with ``POST /api/uploads``.
+
+    ``PUT`` appends the raw bytes in the body at the ``Upload-Offset`` header, which must match the number of
+    bytes received so far. The response to the last chunk describes the saved evidence file, report template,
+    or recording. ``GET`` (or ``HEAD``) returns the offset to resume from and ``DELETE`` cancels the upload.
+    """
+
+    http_method_names = ["get", "head", "put", "delete"]
+
+    def get_upload(self, upload_id, lock: bool = False) -> ResumableUpload | None:
+        uploads_queryset = ResumableUpload.objects.filter(user=self.user_obj, expires_at__gte=django_timezone.now())
+        if lock:
+            uploads_queryset = uploads_queryset.select_for_update(nowait=True)
+        return uploads_queryset.filter(pk=upload_id).first()
+
+    def not_found_response(self) -> JsonResponse:
+        return self.error_response("Upload does not exist or has expired", "UploadNotFound", HTTPStatus.NOT_FOUND)
+
+    def get(self, request, upload_id, *args, **kwargs):
+        upload = self.get_upload(upload_id)
+        if upload is None:
+            return self.not_found_response()
+        return self.status_response(upload)
+
+    def delete(self, request, upload_id, *args, **kwargs):
+        upload = self.get_upload(upload_id)
+        if upload is None:
+            return self.not_found_response()
+        upload.delete()
+        return HttpResponse(status=HTTPStatus.NO_CONTENT)
+
+    def put(self, request, upload_id, *args, **kwargs):
+        try:
+            offset = int(request.headers["Upload-Offset"])
+        except (KeyError, ValueError):
+            return self.error_response(
+                "An ``Upload-Offset`` header is required", "InvalidRequestBody", HTTPStatus.BAD_REQUEST
+            )
+        try:
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return self.error_response(
+                "A ``Content-Length`` header is required", "InvalidRequestBody", HTTPStatus.LENGTH_REQUIRED
+            )
+        if length > settings.GHOSTWRITER_UPLOAD_CHUNK_SIZE:
+            return self.error_response(
+                f"Chunks cannot be larger than {settings.GHOSTWRITER_UPLOAD_CHUNK_SIZE} bytes",
+                "PayloadTooLarge",
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    upload = self.get_upload(upload_id, lock=True)
+            except DatabaseError:
+                return self.error_response(
+                    "Another chunk of this upload is being received", "UploadInProgress", HTTPStatus.CONFLICT
+                )
+            if upload is None:
+                return self.not_found_response()
+            if offset != upload.offset:
+                return self.error_response(
+                    f"Expected the chunk at offset {upload.offset}", "OffsetMismatch", HTTPStatus.CONFLICT, upload
+                )
+            if not 0 < length <= upload.size - upload.offset:
+                return self.error_response(
+                    f"The chunk must hold between 1 and {upload.size - upload.offset} bytes",
+                    "InvalidRequestBody",
+                    HTTPStatus.BAD_REQUEST,
+                    upload,
+                )
+
+            try:
+                uploads.write_chunk(upload, request, length)
+            except (uploads.IncompleteChunk, UnreadablePostError):
+                logger.warning("Received an incomplete chunk of upload %s", upload.pk, exc_info=True)
+                return self.error_response(
+                    "The chunk ended early; resume from the offset", "IncompleteChunk", HTTPStatus.BAD_REQUEST, upload
+                )
+
+            # Reject a recording that is not gzip-compressed as soon as the first bytes arrive
+            gzip_header_size = len(uploads.GZIP_MAGIC)
+            if (
+                upload.kind == ResumableUpload.Kind.OPLOG_RECORDING
+                and upload.filename.lower().endswith(".cast.gz")
+                and upload.offset < gzip_header_size <= upload.offset + length
+                and uploads.read_head(upload, gzip_header_size) != uploads.GZIP_MAGIC
+            ):
+                upload.delete()
+                return self.error_response(CAST_INVALID_GZIP_UPLOAD_MESSAGE, "Invalid", HTTPStatus.BAD_REQUEST)
+
+            upload.offset += length
+            upload.expires_at = django_timezone.now() + timedelta(seconds=settings.GHOSTWRITER_UPLOAD_EXPIRY)
+            upload.save(update_fields=["offset", "expires_at"])
+            if upload.offset < upload.size:
+                return self.status_response(upload)
+            return self.complete(upload)
+
+    def complete(self, upload: ResumableUpload) -> JsonResponse:
+        """Save the complete file of `upload` like the matching upload action and delete the upload."""
+        with uploads.ChunkedUploadFile(upload) as file_obj:
+            form, entry, response = self.check_upload(upload, file_obj)
+            if response is None and upload.kind == ResumableUpload.Kind.OPLOG_RECORDING:
+                response = self.save_recording(upload, entry, file_obj)
+            elif response is None:
+                instance = form.save()
+                response = JsonResponse({"id": instance.pk, "uploadId": str(upload.pk)}, status=HTTPStatus.CREATED)
+        # The complete file was moved into place or was invalid, so the upload cannot be resumed either way
+        upload.delete()
+        return response
+
+    def save_recording(self, upload: ResumableUpload, entry: OplogEntry, file_obj) -> JsonResponse:
+        """Save the recording like ``GraphqlUploadOplogRecording``, reading the file into memory only to index it."""
+        if upload.filename.lower().endswith(".cast.gz"):
+            # Decompresses the file a chunk at a time
+            error_message, error_status = validate_cast_gzip_upload(file_obj)
+            if error_message:
+                status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE if error_status == 413 else HTTPStatus.BAD_REQUEST
+                code = "PayloadTooLarge" if error_status == 413 else "Invalid"
+                return self.error_response(error_message, code, status)
+        if upload.size <= get_cast_parse_input_bytes():
+            file_obj.seek(0)
+            recording_text, text_warning = extract_cast_text(file_obj.read())
+        else:
+            recording_text, text_warning = "", CAST_PARSE_TOO_LARGE_WARNING
+
+        # Replace any existing recording
+        try:
+            entry.recording.delete()
+        except OplogEntryRecording.DoesNotExist:
+            logger.debug("Oplog entry %s has no existing recording to replace.", entry.id, exc_info=True)
+
+        file_obj.seek(0)
+        recording = OplogEntryRecording(oplog_entry=entry, uploaded_by=self.user_obj)
+        recording.recording_file = file_obj
+        recording.recording_text = recording_text
+        recording.save()
+        response_data = {"id": recording.pk, "oplogEntryId": entry.pk, "uploadId": str(upload.pk)}
+        if text_warning:
+            response_data["warning"] = text_warning
+        return JsonResponse(response_data, status=HTTPStatus.CREATED)
+
+
 class GraphqlGenerateCodenameAction(JwtRequiredMixin, HasuraActionView):
     """
     Endpoint for generating a unique codename that can be used for a :model:`rolodex.Project` or other purposes.
@@ -1799,6 +2306,9 @@ class GraphqlOplogEntryCreateEvent(HasuraEventView):
     """Event webhook to fire :model:`oplog.OplogEntry` insert signals."""
 
     def post(self, request, *args, **kwargs):
+        if ingested_in_bulk(self.data.get("event") or {}):
+            # ``bulkCreateOplogEntries`` already did what the signals do for the whole batch
+            return JsonResponse(self.data, status=self.status)
         instance = OplogEntry.objects.get(id=self.new_data["id"])
         instance.save()
         return JsonResponse(self.data, status=self.status)
@@ -1808,6 +2318,8 @@ class GraphqlOplogEntryUpdateEvent(HasuraEventView):
     """Event webhook to fire :model:`oplog.OplogEntry` update signals."""
 
     def post(self, request, *args, **kwargs):
+        if ingested_in_bulk(self.data.get("event") or {}):
+            return JsonResponse(self.data, status=self.status)
         instance = OplogEntry.objects.get(id=self.new_data["id"])
         instance.save()
         return JsonResponse(self.data, status=self.status)
@@ -1961,6 +2473,7 @@ class GraphqlEvidenceUpdateEvent(HasuraEventView):
 
         if delete_old_evidence:
             path = os.path.join(settings.MEDIA_ROOT, self.old_data["document"])
+            delete_derivatives(path)
             if os.path.exists(path):
                 try:
                     os.remove(path)
@@ -514,6 +514,10 @@ class RestrictedAdminTests(SimpleTestCase):
 
 
 class SchedulePolicyIntegrationTests(TestCase):
+    def setUp(self):
+        # Drop the maintenance schedules added after migrating, so the scheduler only sees each test's rows
+        Schedule.objects.all().delete()
+
     def test_model_save_signal_rejects_disallowed_schedule(self):
         with self.assertRaises(ValidationError) as raised:
             Schedule.objects.create(
@@ -30,6 +30,10 @@ class ReportExportError(Exception):
         self.location = location
         self.code_context = code_context
 
+    def __reduce__(self):
+        # Keep the location and code context when sent between processes
+        return (self.__class__, (self.display_text, self.location, self.code_context))
+
     def __str__(self) -> str:
         text = self.display_text
         ends_with_period = text.rstrip()[-1:] == "."
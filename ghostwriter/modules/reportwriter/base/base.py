@@ -3,8 +3,9 @@ import io
 import json
 import logging
 import re
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Any, Callable, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
 # Django Imports
 from django.core.serializers.json import DjangoJSONEncoder
@@ -27,17 +28,143 @@ from ghostwriter.modules.reportwriter.base.html_rich_text import (
     rich_text_template,
 )
 
+if TYPE_CHECKING:
+    # Ghostwriter Libraries
+    from ghostwriter.modules.reportwriter.profiling import ExportProfile
+
 logger = logging.getLogger(__name__)
 
+# Phases reported to `ExportBase.progress_callback`, in the order they occur
+PHASE_SERIALIZE = "serialize"
+PHASE_RICH_TEXT = "rich_text"
+PHASE_RENDER = "render"
+PHASE_SAVE = "save"
+EXPORT_PHASES = (PHASE_SERIALIZE, PHASE_RICH_TEXT, PHASE_RENDER, PHASE_SAVE)
+
+
+_JSON_PRIMITIVES = (str, int, float, bool, type(None))
+
 
 def materialize_jinja_context(value: Any) -> Any:
-    """Return a detached context containing only exact JSON primitive types."""
+    """
+    Return a detached context containing only exact JSON primitive types.
+
+    This is the same as a `json.dumps` (with `DjangoJSONEncoder`) and `json.loads` round trip, done in a
+    single pass without building the intermediate JSON string.
+    """
+    return _materialize(value, DjangoJSONEncoder(), set())
+
+
+def _materialize(value: Any, encoder: DjangoJSONEncoder, active: set[int]) -> Any:
+    value_type = type(value)
+    if value_type in _JSON_PRIMITIVES:
+        return value
+    if isinstance(value, (dict, list, tuple)):
+        if id(value) in active:
+            raise TypeError("Jinja export contexts must not contain circular references")
+        active.add(id(value))
+        try:
+            # Primitives are checked inline, as most values are and a call for each one would double the cost
+            if isinstance(value, dict):
+                return {
+                    key if type(key) is str else _materialize_key(key): (
+                        item if type(item) in _JSON_PRIMITIVES else _materialize(item, encoder, active)
+                    )
+                    for key, item in value.items()
+                }
+            return [
+                item if type(item) in _JSON_PRIMITIVES else _materialize(item, encoder, active) for item in value
+            ]
+        finally:
+            active.discard(id(value))
+    # Subclasses of primitives are encoded as their base type, like `json.dumps` does. The base type's methods are
+    # called directly, as subclasses may override them; e.g., `SafeString.__str__` returns the `SafeString` itself.
+    if isinstance(value, str):
+        return str.__str__(value)
+    if isinstance(value, int):
+        return int(int.__repr__(value))
+    if isinstance(value, float):
+        return float(float.__repr__(value))
     try:
-        return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
-    except (TypeError, ValueError) as exc:
-        raise TypeError(
-            "Jinja export contexts must contain only JSON-serializable values"
-        ) from exc
+        encoded = encoder.default(value)
+    except TypeError as exc:
+        raise TypeError("Jinja export contexts must contain only JSON-serializable values") from exc
+    return _materialize(encoded, encoder, active)
+
+
+def _materialize_key(key: Any) -> str:
+    """Converts a dict key to the string `json.dumps` would write for it."""
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return json.dumps(float(float.__repr__(key)))
+    raise TypeError("Jinja export contexts must contain only JSON-serializable values")
+
+
+def copy_item(container: dict | list, key) -> Any:
+    """
+    Replaces the dict or list at `container[key]` with a shallow copy and returns the copy.
+
+    Exporters build their contexts on top of `ExportBase.data`, which may be shared with other exporters.
+    Copying each container on the path to a change, instead of the whole data, leaves everything else
+    shared. `container` must already be a copy.
+    """
+    item = container[key]
+    if isinstance(item, dict):
+        item = item.copy()
+    elif isinstance(item, list):
+        item = list(item)
+    container[key] = item
+    return item
+
+
+class SerializedSnapshot:
+    """
+    An object serialized and materialized into a Jinja context once, for sharing between exporters.
+
+    Pass it as the `snapshot` argument of `ExportBase` to skip serialization. Exporters never modify
+    `data` in place (see `copy_item`), so the same snapshot can be fed to every exporter of a bundle.
+    """
+    __slots__ = ("input_object", "data")
+
+    input_object: Any
+    data: Any
+
+    def __init__(
+        self,
+        input_object: Any,
+        *,
+        object_serializer: Callable[[Any], Any] | None = None,
+    ):
+        serialized_data = (
+            object_serializer(input_object)
+            if object_serializer is not None
+            else input_object
+        )
+        object.__setattr__(self, "input_object", input_object)
+        object.__setattr__(self, "data", materialize_jinja_context(serialized_data))
+
+    @classmethod
+    def from_data(cls, input_object: Any, data: Any) -> "SerializedSnapshot":
+        """
+        Wraps data that was already serialized and materialized from `input_object`, such as the
+        `data` of a snapshot sent to another process.
+        """
+        snapshot = cls.__new__(cls)
+        object.__setattr__(snapshot, "input_object", input_object)
+        object.__setattr__(snapshot, "data", data)
+        return snapshot
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
 
 
 class ExportBase:
@@ -50,6 +177,12 @@ class ExportBase:
     * `data`: The object passed into `__init__` run through the supplied serializer,
       usually a dict, for passing into a Jinja environment
     * `jinja_env`: Jinja2 environment for templating
+    * `progress_callback`: Optional function called with the name of each export phase as it starts
+      (see `EXPORT_PHASES`)
+    * `profile`: Optional `ExportProfile` recording the time spent in each phase, section and rich text field
+
+    If a `SerializedSnapshot` of `input_object` is passed as `snapshot`, its data is used as-is
+    instead of serializing the object again.
     """
     input_object: Any
     data: Any
@@ -59,6 +192,8 @@ class ExportBase:
     evidences_by_id: dict
     preview_extra_field_model_label: str | None
     preview_extra_field_name: str | None
+    progress_callback: Callable[[str], None] | None
+    profile: "ExportProfile | None"
 
     def __init__(
         self,
@@ -67,17 +202,29 @@ class ExportBase:
         is_raw: bool = False,
         jinja_debug: bool = False,
         object_serializer: Callable[[Any], Any] | None = None,
+        progress_callback: Callable[[str], None] | None = None,
+        profile: "ExportProfile | None" = None,
+        snapshot: SerializedSnapshot | None = None,
     ):
         self.evidences_by_id = {}
         self.extra_fields_spec_cache = {}
         self.preview_extra_field_model_label = None
         self.preview_extra_field_name = None
+        self.progress_callback = progress_callback
+        self.profile = profile
 
         if jinja_debug:
             self.jinja_env, self.jinja_undefined_variables = prepare_jinja2_env(debug=True)
         else:
             self.jinja_env = prepare_jinja2_env(debug=False)
             self.jinja_undefined_variables = None
+        self.report_progress(PHASE_SERIALIZE)
+        if snapshot is not None:
+            if snapshot.input_object is not input_object:
+                raise ValueError("The snapshot was not created from the object being exported")
+            self.input_object = None if is_raw else input_object
+            self.data = snapshot.data
+            return
         if is_raw:
             self.input_object = None
             serialized_data = input_object
@@ -90,6 +237,32 @@ class ExportBase:
             )
         self.data = materialize_jinja_context(serialized_data)
 
+    def report_progress(self, phase: str):
+        """
+        Notifies the `progress_callback` and `profile`, if any, that the export has entered `phase`.
+        """
+        if self.profile is not None:
+            self.profile.start_phase(phase)
+        if self.progress_callback is not None:
+            self.progress_callback(phase)
+
+    def profile_section(self, name: str):
+        """
+        Returns a context manager that times its block as the section `name` of the `profile`, if any.
+        """
+        if self.profile is None:
+            return nullcontext()
+        return self.profile.section(name)
+
+    def profile_location(self, location: str | None):
+        """
+        Returns a context manager that times its block as the rendering of the rich text at `location` in the
+        `profile`, if any.
+        """
+        if self.profile is None:
+            return nullcontext()
+        return self.profile.location(location)
+
     def extra_field_specs_for(self, model: Model) -> Iterable[ExtraFieldSpec]:
         """
         Gets (and caches) the set of extra fields for a model class.
@@ -1,21 +1,38 @@
-from typing import Tuple, List
+from collections import OrderedDict
+from typing import NamedTuple, Tuple, List
+import copy
+import hashlib
 import io
+import json
 import logging
 import os
 import re
+import threading
 
+from django.conf import settings
 from docx import Document
 from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.image.exceptions import UnrecognizedImageError
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from docx.opc.exceptions import PackageNotFoundError
+from docx.opc.oxml import serialize_part_xml
+from docx.oxml import parse_xml
 from docx.oxml.ns import qn
 from docx.shared import Inches, Pt
 from docxtpl import DocxTemplate, RichText as DocxRichText
+from jinja2 import meta
+from lxml import etree
+from markupsafe import Markup
 
 from ghostwriter.commandcenter.models import CompanyInformation, ReportConfiguration
 from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
-from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.modules.reportwriter.base.base import (
+    PHASE_RENDER,
+    PHASE_RICH_TEXT,
+    PHASE_SAVE,
+    ExportBase,
+)
 from ghostwriter.modules.reportwriter.base.html_rich_text import (
     HtmlAndObject,
     RichTextBase,
@@ -38,9 +55,226 @@ EXPECTED_STYLES = [
     "footnote reference",  # Lowercase to match style name
 ] + [f"Heading {i}" for i in range(1, 7)]
 
+# Core document properties that are rendered as templates (see `ExportDocxBase.render_properties`)
+TEMPLATED_PROPERTIES = (
+    "author",
+    "category",
+    "comments",
+    "content_status",
+    "identifier",
+    "keywords",
+    "language",
+    "subject",
+    "title",
+    "version",
+)
+
 _img_desc_replace_re = re.compile(r"^\s*\[\s*([a-zA-Z0-9_]+)\s*\]\s*(.*)$")
 
 
+class _PreloadedDocxTemplate(DocxTemplate):
+    """
+    `DocxTemplate` that starts from an already parsed document instead of reading `template_file`.
+
+    The template file is still used for anything docxtpl reads from it directly (e.g. media replacement),
+    and reloading after a render reads the file as usual.
+    """
+
+    def __init__(self, template_file, document):
+        self._preloaded_docx = document
+        super().__init__(template_file)
+        if self._preloaded_docx is not None:
+            self.docx = self._preloaded_docx
+            self._preloaded_docx = None
+
+    def init_docx(self, *args, **kwargs):
+        if self._preloaded_docx is not None:
+            self.docx = self._preloaded_docx
+            self._preloaded_docx = None
+            self.is_rendered = False
+            return
+        super().init_docx(*args, **kwargs)
+
+
+class DocxTemplateCache:
+    """
+    Per-process LRU of parsed DOCX templates.
+
+    Entries are keyed by the :model:`reporting.ReportTemplate` id plus the path, modification time and size
+    of its file, so a replaced file is never served from the cache, even by processes that did not see the
+    change. Every export gets its own deep copy of the parsed package, which is much cheaper than
+    unzipping and parsing the template again.
+    """
+
+    def __init__(self):
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, report_template: ReportTemplate) -> DocxTemplate:
+        """Returns a `DocxTemplate` for the template's document, parsing the file only on a cache miss."""
+        path = report_template.document.path
+        max_size = getattr(settings, "GHOSTWRITER_DOCX_TEMPLATE_CACHE_SIZE", 0)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Let docxtpl report the missing file
+            return DocxTemplate(path)
+        if max_size <= 0:
+            return DocxTemplate(path)
+
+        key = (report_template.pk, path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+
+        if document is None:
+            document = Document(path)
+            with self._lock:
+                # Drop older versions of the same template
+                for stale_key in [k for k in self._documents if k[0] == report_template.pk]:
+                    del self._documents[stale_key]
+                self._documents[key] = document
+                while len(self._documents) > max_size:
+                    self._documents.popitem(last=False)
+
+        return _PreloadedDocxTemplate(path, copy.deepcopy(document))
+
+    def invalidate(self, template_id):
+        """Removes every cached version of a :model:`reporting.ReportTemplate`."""
+        with self._lock:
+            for key in [k for k in self._documents if k[0] == template_id]:
+                del self._documents[key]
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+
+    def __len__(self):
+        return len(self._documents)
+
+
+docx_template_cache = DocxTemplateCache()
+
+# Bump when the conversion of rich text to DOCX changes, so subdocuments cached before are not reused
+DOCX_SUBDOC_CACHE_VERSION = 1
+
+# Attributes that refer to a relationship of the part the XML belongs to
+_RELATIONSHIP_ATTRIBUTES = (qn("r:id"), qn("r:embed"), qn("r:link"))
+
+_referenced_evidence_re = re.compile(r"""data-(?:gw-evidence|evidence-id)=["']?(\d+)""")
+_referenced_image_re = re.compile(r"""data-gw-image=["']?([^"'\s>]+)""")
+
+
+class CachedSubdoc(NamedTuple):
+    """
+    A rich text field converted to DOCX, in a form that can be added to any export from the same template.
+    """
+
+    # The ``<w:body>`` element holding the converted content
+    body_xml: bytes
+    # Relationship ID used in ``body_xml`` -> ``("image", path)`` or ``("external", reltype, target)``
+    relationships: dict[str, tuple]
+    # Numbering ID created for ``body_xml`` -> the ``<w:abstractNum>`` element it uses
+    numberings: dict[str, bytes]
+
+
+class DocxSubdocCache:
+    """
+    Per-process LRU of rich text fields converted to DOCX subdocuments.
+
+    Entries are keyed by a hash of everything the conversion reads: the rendered HTML, the evidence files
+    and images it references, the template and its file, and the global report configuration. Re-exporting
+    a report therefore only converts the rich text that changed since the last export.
+    """
+
+    def __init__(self):
+        self._subdocs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedSubdoc | None:
+        with self._lock:
+            subdoc = self._subdocs.get(key)
+            if subdoc is not None:
+                self._subdocs.move_to_end(key)
+            return subdoc
+
+    def put(self, key: str, subdoc: CachedSubdoc):
+        max_size = getattr(settings, "GHOSTWRITER_DOCX_SUBDOC_CACHE_SIZE", 0)
+        with self._lock:
+            self._subdocs[key] = subdoc
+            self._subdocs.move_to_end(key)
+            while len(self._subdocs) > max_size:
+                self._subdocs.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._subdocs.clear()
+
+    def __len__(self):
+        return len(self._subdocs)
+
+
+docx_subdoc_cache = DocxSubdocCache()
+
+
+def _file_signature(path) -> tuple | None:
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _model_signature(instance) -> dict:
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def _numbering_element(part):
+    """Returns the ``<w:numbering>`` element of `part`, or ``None`` if the template has no numbering part."""
+    try:
+        return part.numbering_part.numbering_definitions._numbering  # pylint: disable=protected-access
+    except NotImplementedError:
+        return None
+
+
+def _footnotes_part(part):
+    """Returns the footnotes part of the document `part`, or ``None`` if the document has no footnotes."""
+    for rel in part.rels.values():
+        if not rel.is_external and rel.reltype == RT.FOOTNOTES:
+            return rel.target_part
+    return None
+
+
+def _footnote_template_variables(word_doc: DocxTemplate, jinja_env) -> set[str]:
+    """
+    Returns the top-level variables referenced by the footnotes of `word_doc`. docxtpl renders footnotes,
+    but ``get_undeclared_template_variables`` only scans the body, headers, and footers.
+    """
+    footnotes_part = _footnotes_part(word_doc.get_docx().part)
+    if footnotes_part is None:
+        return set()
+    xml = footnotes_part.blob
+    if isinstance(xml, bytes):
+        xml = xml.decode("utf-8")
+    return meta.find_undeclared_variables(jinja_env.parse(word_doc.patch_xml(xml)))
+
+
+def remove_extra_separator_paragraphs(footnotes) -> bool:
+    """
+    Removes all but the first paragraph, which holds the separator line, from the separator and
+    continuationSeparator footnotes (ids -1 and 0) of a ``<w:footnotes>`` element. Returns whether any
+    paragraphs were removed.
+    """
+    modified = False
+    for footnote in footnotes:
+        if footnote.get(qn("w:id")) in ("-1", "0"):
+            for para in list(footnote.iterchildren(qn("w:p")))[1:]:
+                footnote.remove(para)
+                modified = True
+    return modified
+
+
 class ExportDocxBase(ExportBase):
     """
     Base class for exporting DOCX (Word) documents.
@@ -91,7 +325,7 @@ class ExportDocxBase(ExportBase):
 
         # Create Word document writer using the specified template file
         try:
-            self.word_doc = DocxTemplate(report_template.document.path)
+            self.word_doc = docx_template_cache.load(report_template)
         except PackageNotFoundError as err:
             logger.exception(
                 "Failed to load the provided template document: %s",
@@ -109,27 +343,36 @@ class ExportDocxBase(ExportBase):
 
         self.global_report_config = ReportConfiguration.get_solo()
         self.company_config = CompanyInformation.get_solo()
+        # Next free drawing and bookmark IDs, shared by every rich text subdoc so IDs stay unique in the document
+        self.next_drawing_id = None
+        self.next_bookmark_id = 1000
 
     def run(self) -> io.BytesIO:
         try:
-            self.create_styles()
-            self.replace_images()
+            with self.profile_section("docx_styles_and_images"):
+                self.create_styles()
+                self.replace_images()
 
-            rich_text_context = self.map_rich_texts()
+            self.report_progress(PHASE_RICH_TEXT)
+            with self.profile_section("map_rich_texts"):
+                rich_text_context = self.map_rich_texts()
             docx_context = RichTextBase.deep_copy_process_html(
                 rich_text_context,
                 self.render_rich_text_docx,
             )
 
-            ReportExportTemplateError.map_errors(
-                lambda: self.word_doc.render(
-                    docx_context, self.jinja_env, autoescape=True
-                ),
-                "the DOCX template",
-            )
-            ReportExportTemplateError.map_errors(
-                lambda: self.render_properties(docx_context), "the DOCX properties"
-            )
+            self.report_progress(PHASE_RENDER)
+            with self.profile_section("docx_render"):
+                ReportExportTemplateError.map_errors(
+                    lambda: self.word_doc.render(
+                        docx_context, self.jinja_env, autoescape=True
+                    ),
+                    "the DOCX template",
+                )
+            with self.profile_section("docx_properties"):
+                ReportExportTemplateError.map_errors(
+                    lambda: self.render_properties(docx_context), "the DOCX properties"
+                )
         except UnrecognizedImageError as err:
             raise ReportExportTemplateError(
                 f"Could not load an image: {err}", "the DOCX template"
@@ -146,15 +389,17 @@ class ExportDocxBase(ExportBase):
                 "the DOCX template",
             ) from err
 
-        out = io.BytesIO()
-        self.word_doc.save(out)
-
-        # Post-process to clean up separator footnotes (remove extra empty paragraphs)
-        out = self._cleanup_footnote_separators(out)
+        self.report_progress(PHASE_SAVE)
+        # Clean up separator footnotes (remove extra empty paragraphs)
+        with self.profile_section("docx_footnote_cleanup"):
+            self._cleanup_footnote_separators()
 
+        out = io.BytesIO()
+        with self.profile_section("docx_save"):
+            self.word_doc.save(out)
         return out
 
-    def _cleanup_footnote_separators(self, docx_bytes: io.BytesIO) -> io.BytesIO:
+    def _cleanup_footnote_separators(self):
         """
         Remove extra empty paragraphs from separator footnotes.
 
@@ -162,53 +407,29 @@ class ExportDocxBase(ExportBase):
         continuationSeparator footnotes, which causes unwanted spacing between
         the footnote separator line and the actual footnotes.
 
-        This post-processes the saved DOCX to avoid interfering with docxtpl's
-        template rendering.
+        This runs on the rendered document just before it is saved, so it does
+        not interfere with docxtpl's template rendering and the document is
+        only serialized once.
         """
         try:
-            docx_bytes.seek(0)
-            doc = Document(docx_bytes)
+            # `get_docx` would reload the template now that it is rendered
+            footnotes_part = _footnotes_part(self.word_doc.docx.part)
+            if footnotes_part is None:
+                return
 
-            # Access the footnotes part (requires accessing internal python-docx members)
             # pylint: disable=protected-access
-            if (
-                not hasattr(doc._part, "_footnotes_part")
-                or doc._part._footnotes_part is None
-            ):
-                docx_bytes.seek(0)
-                return docx_bytes
-
-            footnotes_part = doc._part._footnotes_part
-            footnotes_element = footnotes_part._element
+            footnotes_element = getattr(footnotes_part, "_element", None)
+            if footnotes_element is not None:
+                remove_extra_separator_paragraphs(footnotes_element)
+            else:
+                # Footnotes loaded as a plain part are only held as bytes, which docxtpl renders into
+                footnotes_element = parse_xml(footnotes_part.blob)
+                if remove_extra_separator_paragraphs(footnotes_element):
+                    footnotes_part._blob = serialize_part_xml(footnotes_element)
             # pylint: enable=protected-access
-
-            modified = False
-            for footnote in footnotes_element:
-                # Only clean separator footnotes (id=-1 or id=0)
-                footnote_id = footnote.get(qn("w:id"))
-                if footnote_id in ("-1", "0"):
-                    # Find all paragraph elements
-                    paragraphs = list(footnote.iterchildren(qn("w:p")))
-                    # Keep only the first paragraph (which contains the separator)
-                    for para in paragraphs[1:]:
-                        footnote.remove(para)
-                        modified = True
-
-            if modified:
-                # Save the modified document
-                out = io.BytesIO()
-                doc.save(out)
-                out.seek(0)
-                return out
-
-            docx_bytes.seek(0)
-            return docx_bytes
-
         except Exception as e:  # pylint: disable=broad-exception-caught
             # Log but don't fail the report generation
             logger.warning("Failed to cleanup footnote separators: %s", e)
-            docx_bytes.seek(0)
-            return docx_bytes
 
     def create_styles(self):
         """
@@ -276,19 +497,7 @@ class ExportDocxBase(ExportBase):
         """
         Renders templates inside of the word doc properties
         """
-        attrs = [
-            "author",
-            "category",
-            "comments",
-            "content_status",
-            "identifier",
-            "keywords",
-            "language",
-            "subject",
-            "title",
-            "version",
-        ]
-        for attr in attrs:
+        for attr in TEMPLATED_PROPERTIES:
             template_src = getattr(self.word_doc.core_properties, attr)
             if not template_src:
                 continue
@@ -310,23 +519,189 @@ class ExportDocxBase(ExportBase):
         if isinstance(rich_text, HtmlAndObject):
             return rich_text.exporter_object
 
+        location = getattr(rich_text, "location", None)
+
         def render():
+            # Subdocs are rendered while the template renders, so this time is also part of "docx_render"
+            with self.profile_section("docx_rich_text"), self.profile_location(location):
+                return render_subdoc()
+
+        def render_subdoc():
+            html = ReportExportTemplateError.map_errors(rich_text.__html__, location)
+            use_cache = not self.linting and getattr(settings, "GHOSTWRITER_DOCX_SUBDOC_CACHE_SIZE", 0) > 0
+            if use_cache:
+                cache_key = self.subdoc_cache_key(html)
+                cached = docx_subdoc_cache.get(cache_key)
+                if cached is not None:
+                    spliced = self.splice_cached_subdoc(cached)
+                    if spliced is not None:
+                        return spliced
+
+            part = self.word_doc.get_docx().part
+            numbering = _numbering_element(part)
+            numbering_ids = set(numbering.xpath("w:num/@w:numId")) if numbering is not None else set()
+
             doc = self.word_doc.new_subdoc()
-            ReportExportTemplateError.map_errors(
+            converter = ReportExportTemplateError.map_errors(
                 lambda: HtmlToDocxWithEvidence.run(
-                    rich_text.__html__(),
+                    html,
                     doc=doc,
                     evidences=self.evidences_by_id,
                     report_template=self.report_template,
                     global_report_config=self.global_report_config,
                     images=self.image_replacements,
                 ),
-                getattr(rich_text, "location", None),
+                location,
             )
+            self.renumber_subdoc_ids(doc.element.body)
+            if use_cache:
+                cached = self.capture_subdoc(doc, converter, numbering_ids)
+                if cached is not None:
+                    docx_subdoc_cache.put(cache_key, cached)
             return doc
 
         return LazySubdocRender(render)
 
+    def subdoc_cache_key(self, html: str) -> str:
+        """
+        Returns the `docx_subdoc_cache` key for converting `html`, covering everything else the conversion reads.
+        """
+        evidences = {}
+        for evidence_id in sorted(set(_referenced_evidence_re.findall(html))):
+            evidence = self.evidences_by_id.get(int(evidence_id))
+            if evidence is not None:
+                path = os.path.join(settings.MEDIA_ROOT, evidence["path"])
+                evidences[evidence_id] = [evidence, _file_signature(path)]
+        images = {}
+        for name in sorted(set(_referenced_image_re.findall(html))):
+            path = self.image_replacements.get(name)
+            images[name] = [path, _file_signature(path)]
+
+        signature = json.dumps(
+            [
+                DOCX_SUBDOC_CACHE_VERSION,
+                html,
+                evidences,
+                images,
+                _model_signature(self.report_template),
+                _file_signature(self.report_template.document.path),
+                _model_signature(self.global_report_config),
+                getattr(settings, "GHOSTWRITER_EVIDENCE_IMAGE_DPI", 0),
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+    def capture_subdoc(self, doc, converter: HtmlToDocxWithEvidence, numbering_ids: set) -> CachedSubdoc | None:
+        """
+        Returns a `CachedSubdoc` of the subdocument `doc` converted by `converter`, or ``None`` if it
+        depends on parts of this export that cannot be recreated in another (e.g. footnotes).
+
+        `numbering_ids` are the numbering IDs that existed before the conversion.
+        """
+        body = doc.element.body
+        if next(body.iter(qn("w:footnoteReference")), None) is not None:
+            return None
+
+        part = self.word_doc.get_docx().part
+        relationships = {}
+        for element in body.iter():
+            for attribute in _RELATIONSHIP_ATTRIBUTES:
+                r_id = element.get(attribute)
+                if r_id is None or r_id in relationships:
+                    continue
+                if r_id in converter.image_paths:
+                    relationships[r_id] = ("image", converter.image_paths[r_id])
+                    continue
+                relationship = part.rels.get(r_id)
+                if relationship is None or not relationship.is_external:
+                    return None
+                relationships[r_id] = ("external", relationship.reltype, relationship.target_ref)
+
+        numberings = {}
+        new_numbering_ids = {element.get(qn("w:val")) for element in body.iter(qn("w:numId"))} - numbering_ids
+        if new_numbering_ids:
+            numbering = _numbering_element(part)
+            for numbering_id in new_numbering_ids:
+                abstract_numbering_ids = numbering.xpath(f'w:num[@w:numId="{numbering_id}"]/w:abstractNumId/@w:val')
+                if not abstract_numbering_ids:
+                    return None
+                abstract_numbering = numbering.xpath(f'w:abstractNum[@w:abstractNumId="{abstract_numbering_ids[0]}"]')
+                if not abstract_numbering:
+                    return None
+                numberings[numbering_id] = etree.tostring(abstract_numbering[0])
+
+        if body.sectPr is not None:
+            body.remove(body.sectPr)
+        return CachedSubdoc(etree.tostring(body), relationships, numberings)
+
+    def splice_cached_subdoc(self, cached: CachedSubdoc) -> Markup | None:
+        """
+        Adds the relationships and numbering a `CachedSubdoc` needs to this export and returns its XML,
+        ready to be inserted by the template. Returns ``None`` if a file it embeds has gone missing.
+        """
+        if any(target[0] == "image" and not os.path.exists(target[1]) for target in cached.relationships.values()):
+            return None
+
+        part = self.word_doc.get_docx().part
+        relationship_ids = {}
+        for r_id, target in cached.relationships.items():
+            if target[0] == "image":
+                relationship_ids[r_id], _ = part.get_or_add_image(target[1])
+            else:
+                relationship_ids[r_id] = part.relate_to(target[2], target[1], is_external=True)
+
+        numbering_ids = {}
+        if cached.numberings:
+            numbering = _numbering_element(part)
+            for numbering_id, abstract_numbering_xml in cached.numberings.items():
+                # Same as `ListTracking.create`, with the cached level definitions
+                abstract_numbering_id = (
+                    max((int(id) for id in numbering.xpath("w:abstractNum/@w:abstractNumId")), default=-1) + 1
+                )
+                abstract_numbering = parse_xml(abstract_numbering_xml)
+                abstract_numbering.set(qn("w:abstractNumId"), str(abstract_numbering_id))
+                numbering.insert(0, abstract_numbering)
+                numbering_ids[numbering_id] = str(numbering.add_num(abstract_numbering_id).numId)
+
+        body = parse_xml(cached.body_xml)
+        for element in body.iter():
+            for attribute in _RELATIONSHIP_ATTRIBUTES:
+                r_id = element.get(attribute)
+                if r_id in relationship_ids:
+                    element.set(attribute, relationship_ids[r_id])
+        if numbering_ids:
+            for element in body.iter(qn("w:numId")):
+                numbering_id = element.get(qn("w:val"))
+                if numbering_id in numbering_ids:
+                    element.set(qn("w:val"), numbering_ids[numbering_id])
+        self.renumber_subdoc_ids(body)
+        # Same as docxtpl's `Subdoc`
+        return Markup(re.sub(r"</?w:body[^>]*>", "", etree.tostring(body, encoding="unicode")))
+
+    def renumber_subdoc_ids(self, body):
+        """
+        Gives the drawings and bookmarks of a rich text subdoc's `body` IDs no other subdoc of this export uses.
+
+        Each subdoc is converted on its own, so they would otherwise all number their drawings from the template's
+        next free ID and their bookmarks from 1000. Like `HtmlToDocxWithEvidence._add_picture`, the template is only
+        searched for its highest drawing ID once, and IDs are counted from there.
+        """
+        if self.next_drawing_id is None:
+            self.next_drawing_id = self.word_doc.get_docx().part.next_id
+        for doc_pr in body.iter(qn("wp:docPr")):
+            doc_pr.set("id", str(self.next_drawing_id))
+            self.next_drawing_id += 1
+
+        bookmark_ids = {}
+        for element in body.iter(qn("w:bookmarkStart"), qn("w:bookmarkEnd")):
+            bookmark_id = element.get(qn("w:id"))
+            if bookmark_id not in bookmark_ids:
+                bookmark_ids[bookmark_id] = str(self.next_bookmark_id)
+                self.next_bookmark_id += 1
+            element.set(qn("w:id"), bookmark_ids[bookmark_id])
+
     def replace_images(self):
         """
         Replaces images whose alt text contains an item from `self.image_replacements`.
@@ -406,8 +781,19 @@ class ExportDocxBase(ExportBase):
         Returns two lists: a list of warnings and a list of errors.
         Linting passes if the errors list is empty.
         """
+        warnings, errors, _ = cls.lint_template(report_template)
+        return warnings, errors
+
+    @classmethod
+    def lint_template(cls, report_template: ReportTemplate) -> Tuple[List[str], List[str], List[str] | None]:
+        """
+        Like `lint`, but also returns the top-level context variables the template references in its body,
+        headers, footers, footnotes, and document properties, sorted. These are `None` if the template could not
+        be analyzed.
+        """
         warnings = []
         errors = []
+        referenced_variables = None
 
         logger.info("Linting docx file %r", report_template.document.path)
         try:
@@ -417,7 +803,7 @@ class ExportDocxBase(ExportBase):
                     report_template.document.path,
                 )
                 errors.append("Template file does not exist – upload it again")
-                return warnings, errors
+                return warnings, errors, referenced_variables
 
             lint_data = cls.generate_lint_data()
             exporter = cls(
@@ -434,11 +820,26 @@ class ExportDocxBase(ExportBase):
                 ),
                 "the DOCX template",
             )
+            undeclared_variables |= ReportExportTemplateError.map_errors(
+                lambda: _footnote_template_variables(exporter.word_doc, exporter.jinja_env),
+                "the DOCX template's footnotes",
+            )
             for variable in undeclared_variables:
                 if variable not in lint_data:
                     warnings.append(
                         "Potential undefined variable: {!r}".format(variable)
                     )
+            property_variables = set()
+            for attr in TEMPLATED_PROPERTIES:
+                template_src = getattr(exporter.word_doc.core_properties, attr)
+                if template_src:
+                    property_variables |= ReportExportTemplateError.map_errors(
+                        lambda template_src=template_src: meta.find_undeclared_variables(
+                            exporter.jinja_env.parse(template_src)
+                        ),
+                        f"DOCX property {attr}",
+                    )
+            referenced_variables = sorted(set(undeclared_variables) | property_variables)
 
             document_styles = exporter.word_doc.get_docx().styles
             for style in EXPECTED_STYLES:
@@ -510,7 +911,7 @@ class ExportDocxBase(ExportBase):
         logger.info(
             "Linting finished: %d warnings, %d errors", len(warnings), len(errors)
         )
-        return warnings, errors
+        return warnings, errors, referenced_variables
 
     def bloodhound_heading_offset(self) -> int:
         return self.report_template.bloodhound_heading_offset
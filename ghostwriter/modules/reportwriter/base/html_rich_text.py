@@ -1,10 +1,19 @@
 # Standard Libraries
+import hashlib
 import html as html_lib
+import logging
 import re
 import secrets
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from types import CodeType
 from typing import Any, Callable
 
+# Django Imports
+from django.conf import settings
+from django.core.cache import caches
+
 # 3rd Party Libraries
 import bs4
 import jinja2
@@ -14,6 +23,8 @@ from markupsafe import Markup
 from ghostwriter.modules.reportwriter import ReportSandboxedEnvironment, jinja_funcs
 from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
 
+logger = logging.getLogger(__name__)
+
 _H = [f"h{n}" for n in range(1, 7)]
 JINJA_LITERAL_ATTRIBUTE = "data-gw-jinja-literal"
 JINJA_REFERENCE_ENCODED_ATTRIBUTE = "data-gw-ref-encoded"
@@ -150,6 +161,128 @@ def remove_trailing_empty_paragraphs(body):
         break
 
 
+# Bump whenever the rich text preprocessing changes so stale preprocessed rich text is not reused
+RICH_TEXT_TEMPLATE_CACHE_VERSION = 1
+
+
+class RichTextTemplateCache:
+    """
+    Bounded LRU of compiled rich text, keyed by a hash of the source HTML and the configuration of
+    the Jinja environment that compiled it.
+
+    Entries are the Jinja code object and the literal fragments of a `CompiledRichTextTemplate`,
+    which are bound to a new `jinja2.Template` for every environment. When the
+    ``GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE`` setting names a Django cache, the preprocessed Jinja
+    source and literal fragments are also shared through it (e.g., Redis) so other processes can skip
+    preprocessing the same text. Compiled code is never shared: each process compiles the shared
+    source with its own sandboxed environment, so nothing read from the shared cache is executed.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(env: jinja2.Environment, text: str) -> str:
+        """Returns the cache key for compiling `text` with `env`."""
+        env_class = type(env)
+        config = "|".join(
+            (
+                str(RICH_TEXT_TEMPLATE_CACHE_VERSION),
+                f"{env_class.__module__}.{env_class.__qualname__}",
+                repr(env.autoescape),
+                ",".join(sorted(env.filters)),
+                ",".join(sorted(env.tests)),
+            )
+        )
+        digest = hashlib.sha256()
+        digest.update(config.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return f"rich_text_template:{digest.hexdigest()}"
+
+    @staticmethod
+    def source_key(text: str) -> str:
+        """Returns the shared cache key for the preprocessed source of `text`."""
+        digest = hashlib.sha256()
+        digest.update(str(RICH_TEXT_TEMPLATE_CACHE_VERSION).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return f"rich_text_source:{digest.hexdigest()}"
+
+    @staticmethod
+    def _shared_cache():
+        alias = getattr(settings, "GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE", None)
+        return caches[alias] if alias else None
+
+    def get(self, key: str) -> tuple[CodeType, dict[str, str]] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: tuple[CodeType, dict[str, str]]):
+        self._store(key, entry)
+
+    def get_source(self, text: str) -> tuple[str, dict[str, str]] | None:
+        """
+        Returns the preprocessed Jinja source and literal fragments of `text` shared by another process, if any.
+        """
+        shared_cache = self._shared_cache()
+        if shared_cache is None:
+            return None
+        try:
+            shared_entry = shared_cache.get(self.source_key(text))
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Unable to read preprocessed rich text from the shared cache", exc_info=True)
+            return None
+        if shared_entry is None:
+            return None
+        try:
+            source, literal_fragments = shared_entry
+            valid = isinstance(source, str) and all(
+                isinstance(placeholder, str) and isinstance(fragment, str)
+                for placeholder, fragment in literal_fragments.items()
+            )
+        except (AttributeError, TypeError, ValueError):
+            valid = False
+        if not valid:
+            logger.warning("Ignoring malformed preprocessed rich text in the shared cache")
+            return None
+        return source, literal_fragments
+
+    def set_source(self, text: str, source: str, literal_fragments: dict[str, str]):
+        """Shares the preprocessed Jinja source and literal fragments of `text` with other processes."""
+        shared_cache = self._shared_cache()
+        if shared_cache is None:
+            return
+        try:
+            shared_cache.set(self.source_key(text), (source, literal_fragments))
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Unable to write preprocessed rich text to the shared cache", exc_info=True)
+
+    def _store(self, key: str, entry: tuple[CodeType, dict[str, str]]):
+        max_size = getattr(settings, "GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE_SIZE", 0)
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+rich_text_template_cache = RichTextTemplateCache()
+
+
 def rich_text_template(
     env: jinja2.Environment,
     text: str,
@@ -157,10 +290,33 @@ def rich_text_template(
     """
     Compile rich text into Ghostwriter's sandboxed rich-text template wrapper.
 
-    Literal data is excluded from Jinja parsing and restored after rendering.
+    Literal data is excluded from Jinja parsing and restored after rendering. Identical text
+    compiled by an identically configured environment is served from `rich_text_template_cache`.
     """
     _require_report_sandbox(env)
 
+    key = RichTextTemplateCache.key(env, text)
+    entry = rich_text_template_cache.get(key)
+    if entry is None:
+        shared = rich_text_template_cache.get_source(text)
+        source, literal_fragments = shared or _preprocess_rich_text(text)
+        entry = (_compile_rich_text(env, source), literal_fragments)
+        rich_text_template_cache.set(key, entry)
+        if shared is None:
+            rich_text_template_cache.set_source(text, source, literal_fragments)
+    code, literal_fragments = entry
+
+    return CompiledRichTextTemplate(
+        env.template_class.from_code(env, code, env.make_globals(None)),
+        literal_fragments,
+    )
+
+
+def _preprocess_rich_text(text: str) -> tuple[str, dict[str, str]]:
+    """
+    Convert rich text into Jinja source. Returns the source and the literal fragments to restore
+    after rendering.
+    """
     # Remove generated literal data from the source before any normalization can
     # assemble or interpret Jinja delimiters.
     text, literal_fragments = _extract_jinja_literal_fragments(text)
@@ -191,16 +347,15 @@ def rich_text_template(
     _process_prefix(text, soup, "p")
     _process_prefix(text, soup, "tr")
     _process_prefix(text, soup, "td")
-    text = str(soup)
+    return str(soup), literal_fragments
+
 
-    # Compile
+def _compile_rich_text(env: jinja2.Environment, source: str) -> CodeType:
+    """Compile the Jinja source of preprocessed rich text with `env`."""
     try:
-        return CompiledRichTextTemplate(
-            env.from_string(text),
-            literal_fragments,
-        )
+        return env.compile(source)
     except jinja2.TemplateSyntaxError as err:
-        line = text.splitlines()[err.lineno - 1]
+        line = source.splitlines()[err.lineno - 1]
         raise ReportExportTemplateError(str(err), code_context=line) from err
 
 
@@ -256,17 +411,29 @@ class RichTextBase(ABC):
         value: Any, process_html: Callable[["RichTextBase"], Any]
     ):
         """
-        Deep copies a value, mapping any `RichTextBase` subclasses through `process_html`.
+        Copies a value, mapping any `RichTextBase` subclasses through `process_html`.
+
+        Only the dicts and lists containing rich text (directly or further down) are copied. Any others are
+        returned as-is and shared with `value`, so they must not be modified by the caller.
         """
         if isinstance(value, RichTextBase):
             return process_html(value)
         if isinstance(value, dict):
-            return {
-                k: RichTextBase.deep_copy_process_html(v, process_html)
-                for k, v in value.items()
-            }
+            changed = False
+            result = {}
+            for k, v in value.items():
+                processed = RichTextBase.deep_copy_process_html(v, process_html)
+                changed = changed or processed is not v
+                result[k] = processed
+            return result if changed else value
         if isinstance(value, list):
-            return [RichTextBase.deep_copy_process_html(v, process_html) for v in value]
+            changed = False
+            result = []
+            for v in value:
+                processed = RichTextBase.deep_copy_process_html(v, process_html)
+                changed = changed or processed is not v
+                result.append(processed)
+            return result if changed else value
         return value
 
 
@@ -2,7 +2,7 @@
 import json
 import io
 
-from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.modules.reportwriter.base.base import PHASE_SAVE, ExportBase
 
 
 class ExportBaseJson(ExportBase):
@@ -12,6 +12,7 @@ class ExportBaseJson(ExportBase):
     Runs `json.dump` over `self.data` and returns the result.
     """
     def run(self) -> io.BytesIO:
+        self.report_progress(PHASE_SAVE)
         s_out = io.TextIOWrapper(io.BytesIO(), "utf-8", write_through=True)
         json.dump(self.data, s_out, indent=4, ensure_ascii=True)
         s_out.flush()
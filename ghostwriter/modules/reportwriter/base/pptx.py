@@ -1,14 +1,19 @@
 
+from collections import OrderedDict
+import copy
 import io
 import logging
 import os
+import threading
 from datetime import date
-from typing import List, Tuple
+from typing import List, NamedTuple, Tuple
 
 from django.conf import settings
 from django.utils.dateformat import format as dateformat
 from bs4 import BeautifulSoup
 from pptx import Presentation
+from pptx.opc.packuri import PackURI
+from pptx.parts.image import Image as PptxImage, ImagePart
 from pptx.parts.presentation import PresentationPart
 from pptx.exc import PackageNotFoundError
 from pptx.oxml import parse_xml
@@ -17,7 +22,7 @@ from pptx.enum.text import MSO_AUTO_SIZE
 
 from ghostwriter.commandcenter.models import CompanyInformation
 from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
-from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.modules.reportwriter.base.base import PHASE_SAVE, ExportBase
 from ghostwriter.modules.reportwriter.base.html_rich_text import LazilyRenderedTemplate
 from ghostwriter.modules.reportwriter.richtext.pptx import HtmlToPptxWithEvidence
 from ghostwriter.reporting.models import ReportTemplate
@@ -25,6 +30,201 @@ from ghostwriter.reporting.models import ReportTemplate
 logger = logging.getLogger(__name__)
 
 
+class PptxLayoutIndex:
+    """
+    What exporters look up in a template's slide layouts, worked out once per layout instead of for every slide.
+
+    For each layout, this keeps the placeholder shapes a new slide gets, so further slides copy them instead of
+    cloning each placeholder from the layout again, and the positions of its footer, slide number, and date
+    placeholders. Layouts are identified by part name, so one index serves every copy of the same template.
+    """
+
+    def __init__(self):
+        self._placeholders: dict[str, list] = {}
+        self._footers: dict[str, tuple[int, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def add_slide(self, presentation, slide_layout):
+        """Adds and returns a slide using `slide_layout`, like ``presentation.slides.add_slide``."""
+        slides = presentation.slides
+        r_id, slide = slides.part.add_slide(slide_layout)
+        key = str(slide_layout.part.partname)
+        with self._lock:
+            placeholders = self._placeholders.get(key)
+        if placeholders is None:
+            slide.shapes.clone_layout_placeholders(slide_layout)
+            placeholders = [copy.deepcopy(element) for element in slide.shapes._spTree.iter_shape_elms()]
+            with self._lock:
+                self._placeholders[key] = placeholders
+        else:
+            sp_tree = slide.shapes._spTree
+            for element in placeholders:
+                sp_tree.insert_element_before(copy.deepcopy(element), "p:extLst")
+        slides._sldIdLst.add_sldId(r_id)
+        return slide
+
+    def footer_placeholders(self, slide_layout) -> tuple[int, int, int]:
+        """
+        Returns the positions of the footer, slide number, and date placeholders among the placeholders of
+        `slide_layout`, with ``-1`` for those it does not have.
+        """
+        key = str(slide_layout.part.partname)
+        with self._lock:
+            positions = self._footers.get(key)
+        if positions is None:
+            footer = slide_number = date_position = -1
+            for position, place in enumerate(slide_layout.placeholders):
+                if "Footer" in place.name:
+                    footer = position
+                if "Slide Number" in place.name:
+                    slide_number = position
+                if "Date" in place.name:
+                    date_position = position
+            positions = (footer, slide_number, date_position)
+            with self._lock:
+                self._footers[key] = positions
+        return positions
+
+
+class PptxPackageIndex:
+    """
+    Indexes the parts of one presentation being exported.
+
+    python-pptx walks every part of the package to name each new part (e.g., each notes slide) and to find an
+    existing copy of each added image. That makes adding slides slower the larger the deck gets. Once installed on
+    a package, this answers those lookups from sets and dictionaries instead, and also reuses the image part of an
+    image file added before without reading the file again.
+    """
+
+    def __init__(self, package):
+        self._package = package
+        self._partnames = None
+        self._next_numbers: dict[str, int] = {}
+        self._next_image_number = None
+        self._images_by_sha1 = None
+        self._images_by_path: dict[str, ImagePart] = {}
+
+    def install(self):
+        """Makes the package use this index."""
+        self._package.next_partname = self.next_partname
+        self._package.next_image_partname = self.next_image_partname
+        self._package.get_or_add_image_part = self.get_or_add_image_part
+        return self
+
+    def next_partname(self, tmpl: str) -> PackURI:
+        number = self._next_numbers.get(tmpl)
+        if number is None:
+            # Parts can be added without this index (e.g., slides), so look at the package again for new kinds
+            self._partnames = {part.partname for part in self._package.iter_parts()}
+            prefix = tmpl[: (tmpl % 42).find("42")]
+            number = sum(1 for partname in self._partnames if partname.startswith(prefix)) + 1
+        while tmpl % number in self._partnames:
+            number += 1
+        partname = PackURI(tmpl % number)
+        self._partnames.add(partname)
+        self._next_numbers[tmpl] = number + 1
+        return partname
+
+    def next_image_partname(self, ext: str) -> PackURI:
+        if self._next_image_number is None:
+            self._next_image_number = 1 + max(
+                (
+                    part.partname.idx
+                    for part in self._package.iter_parts()
+                    if part.partname.startswith("/ppt/media/image") and part.partname.idx is not None
+                ),
+                default=0,
+            )
+        partname = PackURI("/ppt/media/image%d.%s" % (self._next_image_number, ext))
+        self._next_image_number += 1
+        return partname
+
+    def get_or_add_image_part(self, image_file):
+        if isinstance(image_file, str) and image_file in self._images_by_path:
+            return self._images_by_path[image_file]
+        if self._images_by_sha1 is None:
+            self._images_by_sha1 = {
+                image_part.sha1: image_part
+                for image_part in self._package._image_parts
+                if hasattr(image_part, "sha1")
+            }
+        image = PptxImage.from_file(image_file)
+        image_part = self._images_by_sha1.get(image.sha1)
+        if image_part is None:
+            image_part = ImagePart.new(self._package, image)
+            self._images_by_sha1[image.sha1] = image_part
+        if isinstance(image_file, str):
+            self._images_by_path[image_file] = image_part
+        return image_part
+
+
+class CachedPptxTemplate(NamedTuple):
+    """A parsed PPTX template and the index of its slide layouts."""
+
+    presentation: PresentationPart
+    layout_index: PptxLayoutIndex
+
+
+class PptxTemplateCache:
+    """
+    Per-process LRU of parsed PPTX templates and their `PptxLayoutIndex`.
+
+    Entries are keyed by the :model:`reporting.ReportTemplate` id plus the path, modification time and size
+    of its file, so a replaced file is never served from the cache. Every export gets its own deep copy of the
+    parsed presentation, which is much cheaper than unzipping and parsing the template again.
+    """
+
+    def __init__(self):
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, report_template: ReportTemplate) -> CachedPptxTemplate:
+        """Returns a presentation for the template's document, parsing the file only on a cache miss."""
+        path = report_template.document.path
+        max_size = getattr(settings, "GHOSTWRITER_PPTX_TEMPLATE_CACHE_SIZE", 0)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Let python-pptx report the missing file
+            return CachedPptxTemplate(Presentation(path), PptxLayoutIndex())
+        if max_size <= 0:
+            return CachedPptxTemplate(Presentation(path), PptxLayoutIndex())
+
+        key = (report_template.pk, path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._templates.get(key)
+            if cached is not None:
+                self._templates.move_to_end(key)
+
+        if cached is None:
+            cached = CachedPptxTemplate(Presentation(path), PptxLayoutIndex())
+            with self._lock:
+                # Drop older versions of the same template
+                for stale_key in [k for k in self._templates if k[0] == report_template.pk]:
+                    del self._templates[stale_key]
+                self._templates[key] = cached
+                while len(self._templates) > max_size:
+                    self._templates.popitem(last=False)
+
+        return CachedPptxTemplate(copy.deepcopy(cached.presentation), cached.layout_index)
+
+    def invalidate(self, template_id):
+        """Removes every cached version of a :model:`reporting.ReportTemplate`."""
+        with self._lock:
+            for key in [k for k in self._templates if k[0] == template_id]:
+                del self._templates[key]
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+    def __len__(self):
+        return len(self._templates)
+
+
+pptx_template_cache = PptxTemplateCache()
+
+
 class ExportBasePptx(ExportBase):
     """
     Base class for exporting Pptx (PowerPoint) files
@@ -34,6 +234,7 @@ class ExportBasePptx(ExportBase):
     """
     report_template: ReportTemplate
     ppt_presentation: PresentationPart
+    layout_index: PptxLayoutIndex
     company_config: CompanyInformation
     linting: bool
 
@@ -60,7 +261,7 @@ class ExportBasePptx(ExportBase):
         self.report_template = report_template
 
         try:
-            self.ppt_presentation = Presentation(report_template.document.path)
+            self.ppt_presentation, self.layout_index = pptx_template_cache.load(report_template)
         except PackageNotFoundError as err:
             raise ReportExportTemplateError("Template document file could not be found - try re-uploading it") from err
         except Exception:
@@ -70,40 +271,41 @@ class ExportBasePptx(ExportBase):
             )
             raise
 
+        PptxPackageIndex(self.ppt_presentation.part.package).install()
         self.company_config = CompanyInformation.get_solo()
 
+    def add_slide(self, slide_layout):
+        """Adds a slide using `slide_layout` to the presentation and returns it."""
+        return self.layout_index.add_slide(self.ppt_presentation, slide_layout)
+
     def render_rich_text_pptx(self, rich_text: LazilyRenderedTemplate, slide, shape):
         """
         Renders a `LazilyRenderedTemplate`, converting the HTML from the TinyMCE rich text editor and inserting it into the passed in shape and slide.
         Converts HTML from the TinyMCE rich text editor and inserts it into the passed in slide and shape
         """
-        ReportExportTemplateError.map_errors(
-            lambda: HtmlToPptxWithEvidence.run(
-                rich_text.render_html(),
-                slide=slide,
-                shape=shape,
-                evidences=self.evidences_by_id,
-            ),
-            getattr(rich_text, "location", None)
-        )
+        location = getattr(rich_text, "location", None)
+        with self.profile_location(location):
+            ReportExportTemplateError.map_errors(
+                lambda: HtmlToPptxWithEvidence.run(
+                    rich_text.render_html(),
+                    slide=slide,
+                    shape=shape,
+                    evidences=self.evidences_by_id,
+                ),
+                location,
+            )
 
     def process_footers(self):
         """
         Add footer elements (if there is one) to all slides based on the footer placeholder in the template
         """
         for slide_idx, slide in enumerate(self.ppt_presentation.slides):
-            date_placeholder_idx = -1
-            footer_placeholder_idx = -1
-            slide_number_placeholder_idx = -1
             slide_layout = slide.slide_layout
-
-            for placeholder_idx, place in enumerate(slide_layout.placeholders):
-                if "Footer" in place.name:
-                    footer_placeholder_idx = placeholder_idx
-                if "Slide Number" in place.name:
-                    slide_number_placeholder_idx = placeholder_idx
-                if "Date" in place.name:
-                    date_placeholder_idx = placeholder_idx
+            (
+                footer_placeholder_idx,
+                slide_number_placeholder_idx,
+                date_placeholder_idx,
+            ) = self.layout_index.footer_placeholders(slide_layout)
 
             # Skip the title slide at index 0
             if slide_idx > 0:
@@ -124,8 +326,10 @@ class ExportBasePptx(ExportBase):
                     date_placeholder.text = dateformat(date.today(), settings.DATE_FORMAT)
 
     def run(self):
+        self.report_progress(PHASE_SAVE)
         out = io.BytesIO()
-        self.ppt_presentation.save(out)
+        with self.profile_section("pptx_save"):
+            self.ppt_presentation.save(out)
         return out
 
     @classmethod
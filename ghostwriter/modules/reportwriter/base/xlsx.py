@@ -1,10 +1,15 @@
 
 import io
+import json
+from typing import Iterable
 
+from django.conf import settings
+from xlsxwriter.utility import xl_col_to_name
 from xlsxwriter.workbook import Workbook
+from xlsxwriter.worksheet import Worksheet
 
 from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
-from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.modules.reportwriter.base.base import PHASE_SAVE, ExportBase
 from ghostwriter.modules.reportwriter.base.html_rich_text import LazilyRenderedTemplate
 from ghostwriter.modules.reportwriter.richtext.plain_text import html_to_plain_text
 
@@ -15,6 +20,10 @@ class ExportXlsxBase(ExportBase):
 
     Subclasses should override `run` to add data to the `workbook` field, using `process_rich_text_xlsx`
     to template and convert rich text fields, then return `super().run()` to save and return the workbook.
+
+    Unless ``GHOSTWRITER_XLSX_CONSTANT_MEMORY`` is disabled, the workbook is written in xlsxwriter's constant memory
+    mode: each row is flushed to a temporary file once the next row is started, so rows must be written in order,
+    one worksheet at a time. `write_sheet` writes a whole worksheet from an iterable of rows that way.
     """
     output_file: io.BytesIO
     workbook: Workbook
@@ -22,11 +31,15 @@ class ExportXlsxBase(ExportBase):
     def __init__(self, object, *args, **kwargs):
         super().__init__(object, *args, **kwargs)
         self.output = io.BytesIO()
-        self.workbook = Workbook(self.output, {
-            "in_memory": True,
+        options = {
             "strings_to_formulas": False,
             "strings_to_urls": False,
-        })
+        }
+        if getattr(settings, "GHOSTWRITER_XLSX_CONSTANT_MEMORY", False):
+            options["constant_memory"] = True
+        else:
+            options["in_memory"] = True
+        self.workbook = Workbook(self.output, options)
 
     @classmethod
     def mime_type(cls) -> str:
@@ -41,14 +54,70 @@ class ExportXlsxBase(ExportBase):
         Renders a `LazilyRenderedTemplate`, converting the HTML from the TinyMCE rich text editor to a plain text string
         for use in XLSX cells
         """
-        return ReportExportTemplateError.map_errors(
-            lambda: html_to_plain_text(
-                rich_text.render_html(),
-                self.evidences_by_id,
-            ),
-            getattr(rich_text, "location", None),
-        )
+        location = getattr(rich_text, "location", None)
+        with self.profile_location(location):
+            return ReportExportTemplateError.map_errors(
+                lambda: html_to_plain_text(
+                    rich_text.render_html(),
+                    self.evidences_by_id,
+                ),
+                location,
+            )
+
+    def write_extra_field_xlsx(self, field_spec, value, render_rich_text=True) -> str:
+        """
+        Converts the value of an extra field to the text of a cell. Rich text is rendered as a template, unless
+        `render_rich_text` is false (e.g., for oplog entries, whose values are never templates).
+        """
+        if field_spec.type == "rich_text":
+            if render_rich_text:
+                return self.render_rich_text_xlsx(value)
+            return html_to_plain_text(str(value), self.evidences_by_id)
+        if field_spec.type == "json":
+            return json.dumps(value)
+        return str(value)
+
+    def write_sheet(
+        self,
+        name: str,
+        headers: list[str],
+        rows: Iterable[list],
+        header_format=None,
+        widths: dict[int, int] | None = None,
+        default_width: int = 30,
+    ) -> Worksheet:
+        """
+        Adds a worksheet named `name` with a row of `headers` and an autofilter, writing `rows` as they are
+        produced, so a generator over a queryset's `iterator()` never holds more than one row in memory.
+
+        Each row is a list of cells, each a value or a ``(value, format)`` tuple. Numbers are written as numbers,
+        `None` as an empty cell, and anything else as a string. `widths` maps column indexes to their width, and
+        the other columns are `default_width` wide.
+        """
+        worksheet = self.workbook.add_worksheet(name)
+        worksheet.set_column(0, len(headers) - 1, default_width)
+        for col, width in (widths or {}).items():
+            worksheet.set_column(col, col, width)
+        for col, header in enumerate(headers):
+            worksheet.write_string(0, col, header, header_format)
+
+        row = 0
+        with self.profile_section(f"xlsx_sheet_{name.lower().replace(' ', '_')}"):
+            for row, cells in enumerate(rows, start=1):
+                for col, cell in enumerate(cells):
+                    value, cell_format = cell if isinstance(cell, tuple) else (cell, None)
+                    if value is None:
+                        worksheet.write_blank(row, col, None, cell_format)
+                    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                        worksheet.write_number(row, col, value, cell_format)
+                    else:
+                        worksheet.write_string(row, col, str(value), cell_format)
+
+        worksheet.autofilter("A1:{}{}".format(xl_col_to_name(len(headers) - 1), row + 1))
+        return worksheet
 
     def run(self) -> io.BytesIO:
-        self.workbook.close()
+        self.report_progress(PHASE_SAVE)
+        with self.profile_section("xlsx_save"):
+            self.workbook.close()
         return self.output
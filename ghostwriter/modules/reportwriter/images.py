@@ -0,0 +1,137 @@
+"""
+Resampled copies ("derivatives") of evidence images, sized for how they are displayed in exported documents.
+
+Uploaded screenshots are often far larger than the space they fill on a page. Exporters embed a derivative
+downscaled to the display width at ``GHOSTWRITER_EVIDENCE_IMAGE_DPI`` instead of the original upload. Each
+derivative is created on first use and stored in a ``derivatives`` directory next to the original, named by the
+original's content hash and the target width, so it is reused by later exports until the original changes.
+"""
+
+# Standard Libraries
+import glob
+import hashlib
+import logging
+import math
+import os
+import tempfile
+from functools import lru_cache
+
+# Django Imports
+from django.conf import settings
+
+# 3rd Party Libraries
+from PIL import Image, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIRECTORY = "derivatives"
+
+# Pillow formats derivatives are created for, with the options used to recompress them
+_SAVE_OPTIONS = {
+    "PNG": {"optimize": True},
+    "JPEG": {"quality": 85, "optimize": True},
+}
+
+
+def _content_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as image_file:
+        for chunk in iter(lambda: image_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def derivative_path(file_path: str, content_hash: str, target_width: int) -> str:
+    """Returns where the derivative of `file_path` with `target_width` pixels is stored."""
+    directory, filename = os.path.split(file_path)
+    stem, extension = os.path.splitext(filename)
+    return os.path.join(
+        directory,
+        DERIVATIVES_DIRECTORY,
+        f"{stem}.{content_hash[:16]}.{target_width}w{extension}",
+    )
+
+
+def export_image_path(file_path: str, width_inches: float) -> str:
+    """
+    Returns the path of the image to embed for `file_path` displayed at `width_inches`.
+
+    This is a derivative resampled to the configured DPI if the original is wider than needed, or the original
+    itself if it is already small enough, derivatives are disabled, or the image could not be processed.
+    """
+    dpi = getattr(settings, "GHOSTWRITER_EVIDENCE_IMAGE_DPI", 0)
+    if not dpi or not width_inches:
+        return file_path
+    target_width = math.ceil(width_inches * dpi)
+
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return file_path
+
+    path = _export_image_path(file_path, stat.st_mtime_ns, stat.st_size, target_width)
+    if path != file_path and not os.path.exists(path):
+        # The derivative was deleted since it was created
+        _export_image_path.cache_clear()
+        path = _export_image_path(file_path, stat.st_mtime_ns, stat.st_size, target_width)
+    return path
+
+
+@lru_cache(maxsize=4096)
+def _export_image_path(file_path: str, mtime_ns: int, size: int, target_width: int) -> str:
+    """
+    Does the work of `export_image_path`. The original's modification time and size are part of the memoization
+    key so a replaced original is processed again, while images kept as-is are not re-examined on every export.
+    """
+    try:
+        path = derivative_path(file_path, _content_hash(file_path), target_width)
+        if os.path.exists(path):
+            return path
+        return _create_derivative(file_path, path, target_width)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError, ValueError):
+        logger.warning("Could not create a derivative of %s, so using the original image", file_path, exc_info=True)
+        return file_path
+
+
+def _create_derivative(file_path: str, path: str, target_width: int) -> str:
+    with Image.open(file_path) as image:
+        image_format = image.format
+        if image_format not in _SAVE_OPTIONS or image.width <= target_width:
+            return file_path
+
+        target_height = max(1, round(image.height * target_width / image.width))
+        resized = image.resize((target_width, target_height), Image.LANCZOS)
+        save_options = dict(_SAVE_OPTIONS[image_format])
+        if "exif" in image.info:
+            save_options["exif"] = image.info["exif"]
+        if "dpi" in image.info:
+            save_options["dpi"] = image.info["dpi"]
+
+        # Write to a temporary file first so concurrent exports never embed a partially written image
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=os.path.splitext(path)[1])
+        try:
+            with os.fdopen(fd, "wb") as derivative_file:
+                resized.save(derivative_file, format=image_format, **save_options)
+            if os.path.getsize(temp_path) >= os.path.getsize(file_path):
+                # Recompressing did not help, so keep using the original
+                os.remove(temp_path)
+                return file_path
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    return path
+
+
+def delete_derivatives(file_path: str):
+    """Deletes every derivative created from the image at `file_path`."""
+    directory, filename = os.path.split(file_path)
+    stem, extension = os.path.splitext(filename)
+    pattern = os.path.join(directory, DERIVATIVES_DIRECTORY, f"{glob.escape(stem)}.{'[0-9a-f]' * 16}.*w{glob.escape(extension)}")
+    for path in glob.glob(pattern):
+        try:
+            os.remove(path)
+        except OSError:  # pragma: no cover
+            logger.warning("Failed to delete evidence image derivative %s", path)
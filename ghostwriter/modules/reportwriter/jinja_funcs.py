@@ -348,7 +348,8 @@ def raw_mk_evidence(evidence_id) -> Markup:
 
 def replace_blanks(list_of_dicts, placeholder=""):
     """
-    Replace blank strings in a dictionary with a placeholder string.
+    Replace blank strings in a dictionary with a placeholder string. The dictionaries are copied, so the
+    report data passed in is left unchanged.
 
     **Parameters**
 
@@ -357,10 +358,9 @@ def replace_blanks(list_of_dicts, placeholder=""):
     """
 
     try:
-        for d in list_of_dicts:
-            for key, value in d.items():
-                if value is None:
-                    d[key] = placeholder
+        list_of_dicts = [
+            {key: placeholder if value is None else value for key, value in d.items()} for d in list_of_dicts
+        ]
     except (AttributeError, TypeError) as e:
         logger.exception("Error parsing ``list_of_dicts`` as a list of dictionaries: %s", list_of_dicts)
         raise InvalidFilterValue(
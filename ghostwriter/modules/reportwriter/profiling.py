@@ -0,0 +1,185 @@
+"""
+Per-phase profiling of report exports.
+
+An `ExportProfile` passed to an exporter as `profile` records the wall time and database queries of each export
+phase (see `EXPORT_PHASES`), the time spent in named sections of the exporters (e.g., converting HTML to OOXML or
+saving the document), and the slowest rich text fields by their location (e.g., "the description of finding X").
+"""
+
+# Standard Libraries
+import heapq
+import time
+from contextlib import contextmanager
+from typing import Iterable
+
+# Django Imports
+from django.db import connection
+
+# Ghostwriter Libraries
+from ghostwriter.modules.reportwriter.base.base import EXPORT_PHASES
+
+# Number of rich text locations kept in `ExportProfile.as_dict`
+SLOWEST_LOCATIONS = 10
+
+
+class ExportProfile:
+    """
+    Collects where the time of one or more exports went.
+
+    Phases are entered through `ExportBase.report_progress`, and a phase lasts until the next one starts or the
+    profile is finished. Entering a phase again, e.g. when a bundle exports several documents, adds to its totals.
+    Queries are only counted inside `capture`.
+    """
+
+    def __init__(self):
+        self.phases: dict[str, dict] = {}
+        self.sections: dict[str, dict] = {}
+        self.locations: dict[str, float] = {}
+        self.seconds = 0.0
+        self.queries = 0
+        self._phase = None
+        self._phase_started = 0.0
+        self._phase_queries = 0
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def capture(self):
+        """
+        Times the enclosed block and counts its database queries. The current phase is finished when it exits.
+        """
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self._count_query):
+                yield self
+        finally:
+            self.finish_phase()
+            self.seconds += time.perf_counter() - started
+
+    def start_phase(self, phase: str):
+        """Finishes the current phase, if any, and starts timing `phase`."""
+        self.finish_phase()
+        self._phase = phase
+        self._phase_started = time.perf_counter()
+        self._phase_queries = self.queries
+
+    def finish_phase(self):
+        """Adds the time and queries since the current phase started to its totals."""
+        if self._phase is None:
+            return
+        totals = self.phases.setdefault(self._phase, {"seconds": 0.0, "queries": 0})
+        totals["seconds"] += time.perf_counter() - self._phase_started
+        totals["queries"] += self.queries - self._phase_queries
+        self._phase = None
+
+    @contextmanager
+    def section(self, name: str):
+        """Times the enclosed block as part of the section `name`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            totals = self.sections.setdefault(name, {"seconds": 0.0, "calls": 0})
+            totals["seconds"] += time.perf_counter() - started
+            totals["calls"] += 1
+
+    @contextmanager
+    def location(self, location: str | None):
+        """
+        Times the enclosed block as the rendering of the rich text at `location`. Rich text that includes other
+        rich text is timed including the time spent on the included fields.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            location = location or "an unnamed rich text field"
+            self.locations[location] = self.locations.get(location, 0.0) + time.perf_counter() - started
+
+    def merge(self, data: dict):
+        """
+        Adds the sections and rich text locations of another profile, as returned by `as_dict`, to this one.
+
+        Used for documents rendered in another process, whose phases already overlap with this profile's.
+        """
+        for section in data.get("sections", ()):
+            totals = self.sections.setdefault(section["section"], {"seconds": 0.0, "calls": 0})
+            totals["seconds"] += section["seconds"]
+            totals["calls"] += section["calls"]
+        for location in data.get("slowest_locations", ()):
+            self.locations[location["location"]] = self.locations.get(location["location"], 0.0) + location["seconds"]
+        self.queries += data.get("queries", 0)
+
+    def as_dict(self, slowest_locations: int = SLOWEST_LOCATIONS) -> dict:
+        """Returns the profile as JSON serializable data, with times in seconds."""
+        phase_order = {phase: index for index, phase in enumerate(EXPORT_PHASES)}
+        return {
+            "seconds": round(self.seconds, 4),
+            "queries": self.queries,
+            "phases": [
+                {"phase": phase, "seconds": round(totals["seconds"], 4), "queries": totals["queries"]}
+                for phase, totals in sorted(self.phases.items(), key=lambda item: phase_order.get(item[0], len(phase_order)))
+            ],
+            "sections": [
+                {"section": name, "seconds": round(totals["seconds"], 4), "calls": totals["calls"]}
+                for name, totals in sorted(self.sections.items(), key=lambda item: -item[1]["seconds"])
+            ],
+            "slowest_locations": [
+                {"location": location, "seconds": round(seconds, 4)}
+                for location, seconds in heapq.nlargest(
+                    slowest_locations, self.locations.items(), key=lambda item: item[1]
+                )
+            ],
+        }
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _metric_line(name: str, labels: dict, value) -> str:
+    label_text = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+    return f"{name}{{{label_text}}} {value}"
+
+
+def format_metrics(profiles: Iterable[tuple[dict, dict]]) -> str:
+    """
+    Sums up profiles, as returned by `ExportProfile.as_dict`, in the Prometheus text format.
+
+    `profiles` yields ``(labels, profile)`` pairs. The labels (e.g., the export type) are added to every sample
+    of that profile.
+    """
+    metrics = {
+        "ghostwriter_report_generation_profiles": ("Number of profiled report generations", {}),
+        "ghostwriter_report_generation_seconds": ("Total wall time of profiled report generations", {}),
+        "ghostwriter_report_generation_queries": ("Total database queries of profiled report generations", {}),
+        "ghostwriter_report_generation_phase_seconds": ("Total wall time spent in each export phase", {}),
+        "ghostwriter_report_generation_phase_queries": ("Total database queries made in each export phase", {}),
+        "ghostwriter_report_generation_section_seconds": ("Total wall time spent in each exporter section", {}),
+    }
+
+    def add(name, labels, value):
+        samples = metrics[name][1]
+        key = tuple(labels.items())
+        samples[key] = samples.get(key, 0) + value
+
+    for labels, profile in profiles:
+        add("ghostwriter_report_generation_profiles", labels, 1)
+        add("ghostwriter_report_generation_seconds", labels, profile.get("seconds", 0))
+        add("ghostwriter_report_generation_queries", labels, profile.get("queries", 0))
+        for phase in profile.get("phases", ()):
+            phase_labels = {**labels, "phase": phase["phase"]}
+            add("ghostwriter_report_generation_phase_seconds", phase_labels, phase["seconds"])
+            add("ghostwriter_report_generation_phase_queries", phase_labels, phase["queries"])
+        for section in profile.get("sections", ()):
+            add("ghostwriter_report_generation_section_seconds", {**labels, "section": section["section"]}, section["seconds"])
+
+    lines = []
+    for name, (help_text, samples) in metrics.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for key, value in samples.items():
+            lines.append(_metric_line(name, dict(key), round(value, 4)))
+    return "\n".join(lines) + "\n"
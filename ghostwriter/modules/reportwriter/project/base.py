@@ -5,7 +5,7 @@ from ghostwriter.commandcenter.models import ExtraFieldSpec
 from ghostwriter.modules.custom_serializers import FullProjectSerializer
 from ghostwriter.modules.linting_utils import LINTER_CONTEXT
 from ghostwriter.modules.reportwriter import jinja_funcs
-from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.modules.reportwriter.base.base import ExportBase, copy_item
 from ghostwriter.modules.reportwriter.base.html_rich_text import HtmlRichText, offset_headings
 from ghostwriter.oplog.models import OplogEntry
 from ghostwriter.reporting.models import Report
@@ -31,7 +31,7 @@ class ExportProjectBase(ExportBase):
         super().__init__(*args, **kwargs)
 
     def map_rich_texts(self):
-        base_context = copy.deepcopy(self.data)
+        base_context = self.data.copy()
         rich_text_context = ChainMap(ExportProjectBase.rich_text_jinja_overlay(self.data), base_context)
 
         # Fields on Project
@@ -69,54 +69,66 @@ class ExportProjectBase(ExportBase):
         """
         Helper for processing the project-related rich text fields in both the `ProjectSerializer` and
         `ReportDataSerializer`.
+
+        `base_context` must be a shallow copy of the exporter's data. Every container changed below is
+        copied first with `copy_item`, so the exporter's data itself is left untouched.
         """
 
         # Client
-        base_context["client"]["description_rt"] = ex.create_lazy_template(
-            f"the description of client {base_context['client']['name']}",
-            base_context["client"]["description"],
+        client = copy_item(base_context, "client")
+        client["description_rt"] = ex.create_lazy_template(
+            f"the description of client {client['name']}",
+            client["description"],
             rich_text_context,
         )
-        base_context["client"]["address_rt"] = ex.create_lazy_template(
-            f"the address of client {base_context['client']['name']}",
-            base_context["client"]["address"],
+        client["address_rt"] = ex.create_lazy_template(
+            f"the address of client {client['name']}",
+            client["address"],
             rich_text_context,
         )
         ex.process_extra_fields(
-            f"client {base_context['client']['name']}",
-            base_context["client"]["extra_fields"],
+            f"client {client['name']}",
+            copy_item(client, "extra_fields"),
             Client,
             rich_text_context,
         )
 
         # Project
-        base_context["project"]["description_rt"] = ex.create_lazy_template(
-            "the project description", base_context["project"]["description"], rich_text_context
+        project = copy_item(base_context, "project")
+        project["description_rt"] = ex.create_lazy_template(
+            "the project description", project["description"], rich_text_context
         )
-        base_context["project"]["collab_note_rt"] = ex.create_lazy_template(
-            "the project collab note", base_context["project"]["collab_note"], rich_text_context
+        project["collab_note_rt"] = ex.create_lazy_template(
+            "the project collab note", project["collab_note"], rich_text_context
         )
-        ex.process_extra_fields("the project", base_context["project"]["extra_fields"], Project, rich_text_context)
+        ex.process_extra_fields("the project", copy_item(project, "extra_fields"), Project, rich_text_context)
 
         # Assignments
-        for assignment in base_context["team"]:
+        team = copy_item(base_context, "team")
+        for i, assignment in enumerate(team):
             if isinstance(assignment, dict):
                 if assignment["description"]:
+                    assignment = copy_item(team, i)
                     assignment["description_rt"] = ex.create_lazy_template(
                         f"the description of person {assignment['name']}", assignment["description"], rich_text_context
                     )
 
         # Contacts
-        for contact in base_context["client"]["contacts"]:
+        contacts = copy_item(client, "contacts")
+        for i, contact in enumerate(contacts):
             if isinstance(contact, dict):
                 if contact["description"]:
+                    contact = copy_item(contacts, i)
                     contact["description_rt"] = ex.create_lazy_template(
                         f"the description of contact {contact['name']}", contact["description"], rich_text_context
                     )
 
         # Objectives
-        for objective in base_context["objectives"]:
+        objectives = copy_item(base_context, "objectives")
+        for i, objective in enumerate(objectives):
             if isinstance(objective, dict):
+                if objective["description"] or objective["result"]:
+                    objective = copy_item(objectives, i)
                 if objective["description"]:
                     objective["description_rt"] = ex.create_lazy_template(
                         f"the description of objective {objective['objective']}",
@@ -131,25 +143,31 @@ class ExportProjectBase(ExportBase):
                     )
 
         # Scope Lists
-        for scope_list in base_context["scope"]:
+        scope = copy_item(base_context, "scope")
+        for i, scope_list in enumerate(scope):
             if isinstance(scope_list, dict):
                 if scope_list["description"]:
+                    scope_list = copy_item(scope, i)
                     scope_list["description_rt"] = ex.create_lazy_template(
                         f"the description of scope {scope_list['name']}", scope_list["description"], rich_text_context
                     )
 
         # Targets
-        for target in base_context["targets"]:
+        targets = copy_item(base_context, "targets")
+        for i, target in enumerate(targets):
             if isinstance(target, dict):
                 if target["description"]:
+                    target = copy_item(targets, i)
                     target["description_rt"] = ex.create_lazy_template(
                         f"the description of target {target['ip_address']}", target["description"], rich_text_context
                     )
 
         # Deconfliction Events
-        for event in base_context["deconflictions"]:
+        deconflictions = copy_item(base_context, "deconflictions")
+        for i, event in enumerate(deconflictions):
             if isinstance(event, dict):
                 if event["description"]:
+                    event = copy_item(deconflictions, i)
                     event["description_rt"] = ex.create_lazy_template(
                         f"the description of deconfliction event {event['title']}",
                         event["description"],
@@ -157,51 +175,73 @@ class ExportProjectBase(ExportBase):
                     )
 
         # White Cards
-        for card in base_context["whitecards"]:
+        whitecards = copy_item(base_context, "whitecards")
+        for i, card in enumerate(whitecards):
             if isinstance(card, dict):
                 if card["description"]:
+                    card = copy_item(whitecards, i)
                     card["description_rt"] = ex.create_lazy_template(
                         f"the description of whitecard {card['title']}", card["description"], rich_text_context
                     )
 
         # Infrastructure
-        for domain in base_context["infrastructure"]["domains"]:
+        infrastructure = copy_item(base_context, "infrastructure")
+        domains = copy_item(infrastructure, "domains")
+        for i in range(len(domains)):
+            domain = copy_item(domains, i)
             if domain["description"]:
                 domain["description_rt"] = ex.create_lazy_template(
                     f"the description of domain {domain.get('domain')}",
                     domain["description"],
                     rich_text_context,
                 )
-            ex.process_extra_fields(f"domain {domain['domain']}", domain["extra_fields"], Domain, rich_text_context)
-        for server in base_context["infrastructure"]["cloud"]:
+            ex.process_extra_fields(
+                f"domain {domain['domain']}", copy_item(domain, "extra_fields"), Domain, rich_text_context
+            )
+        cloud = copy_item(infrastructure, "cloud")
+        for i, server in enumerate(cloud):
             if server["description"]:
+                server = copy_item(cloud, i)
                 server["description_rt"] = ex.create_lazy_template(
                     f"the description of cloud server {server.get('name')}",
                     server["description"],
                     rich_text_context,
                 )
-        for server in base_context["infrastructure"]["servers"]:
+        servers = copy_item(infrastructure, "servers")
+        for i in range(len(servers)):
+            server = copy_item(servers, i)
             if server["description"]:
                 server["description_rt"] = ex.create_lazy_template(
                     f"the description of domain {server.get('name')}",
                     server["description"],
                     rich_text_context,
                 )
-            ex.process_extra_fields(f"server {server['name']}", server["extra_fields"], StaticServer, rich_text_context)
+            ex.process_extra_fields(
+                f"server {server['name']}", copy_item(server, "extra_fields"), StaticServer, rich_text_context
+            )
 
-        # Logs
-        for log in base_context["logs"]:
-            for entry in log["entries"]:
-                ex.process_literal_extra_fields(
-                    f"log entry {entry['description']} of log {log['name']}",
-                    entry["extra_fields"],
-                    OplogEntry,
-                )
+        # Logs, which are left shared unless there are extra fields to fill in
+        if ex.extra_field_specs_for(OplogEntry):
+            logs = copy_item(base_context, "logs")
+            for i in range(len(logs)):
+                log = copy_item(logs, i)
+                entries = copy_item(log, "entries")
+                for j in range(len(entries)):
+                    entry = copy_item(entries, j)
+                    ex.process_literal_extra_fields(
+                        f"log entry {entry['description']} of log {log['name']}",
+                        copy_item(entry, "extra_fields"),
+                        OplogEntry,
+                    )
 
         # BloodHound findings
         if base_context.get("bloodhound"):
-            for finding in base_context["bloodhound"]["findings"]:
+            bloodhound = copy_item(base_context, "bloodhound")
+            bloodhound_findings = copy_item(bloodhound, "findings")
+            for i, finding in enumerate(bloodhound_findings):
                 if finding.get("assets"):
+                    finding = copy_item(bloodhound_findings, i)
+                    copy_item(finding, "assets")
                     id = finding.get("id")
                     finding["assets"]["references"] = HtmlRichText(
                         offset_headings(finding["assets"]["references"], bloodhound_heading_offset),
@@ -10,6 +10,7 @@ from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
 from pptx.util import Inches
 import pptx
 
+from ghostwriter.modules.reportwriter.base.base import PHASE_RENDER, PHASE_RICH_TEXT
 from ghostwriter.modules.reportwriter.base.pptx import SLD_LAYOUT_TITLE, SLD_LAYOUT_TITLE_AND_CONTENT, ExportBasePptx, delete_paragraph, get_textframe, write_bullet, write_objective_list
 from ghostwriter.modules.reportwriter.project.base import ExportProjectBase
 
@@ -178,7 +179,7 @@ class ProjectSlidesMixin:
     def create_project_slides(self, base_context):
         # Add a title slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, f'{self.data["client"]["name"]} {self.data["project"]["type"]}')
 
@@ -215,7 +216,7 @@ class ProjectSlidesMixin:
 
         # Add Agenda slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Agenda")
         body_shape = self.get_placeholder_or_textbox(shapes, 1)
@@ -234,7 +235,7 @@ class ProjectSlidesMixin:
 
         # Add Introduction slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Introduction")
         body_shape = self.get_placeholder_or_textbox(shapes, 1)
@@ -251,7 +252,7 @@ class ProjectSlidesMixin:
 
         # Add Assessment Details slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Assessment Details")
         body_shape = self.get_placeholder_or_textbox(shapes, 1)
@@ -306,13 +307,13 @@ class ProjectSlidesMixin:
 
         # Add Methodology slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Methodology")
 
         # Add Timeline slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Assessment Timeline")
         body_shape = self.get_placeholder_or_textbox(shapes, 1)
@@ -359,14 +360,16 @@ class ProjectSlidesMixin:
 
         # Add Attack Path Overview slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Attack Path Overview")
 
 
 class ExportProjectPptx(ExportBasePptx, ExportProjectBase, ProjectSlidesMixin):
     def run(self) -> io.BytesIO:
+        self.report_progress(PHASE_RICH_TEXT)
         base_context = self.map_rich_texts()
+        self.report_progress(PHASE_RENDER)
         self.create_project_slides(base_context)
         self.process_footers()
         return super().run()
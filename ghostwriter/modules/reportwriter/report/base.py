@@ -2,6 +2,9 @@ from collections import ChainMap
 import copy
 from functools import partial
 import html
+import logging
+import re
+from jinja2 import TemplateSyntaxError, meta
 from markupsafe import Markup
 from docxtpl import RichText as DocxRichText
 
@@ -9,7 +12,12 @@ from ghostwriter.commandcenter.models import ExtraFieldSpec
 from ghostwriter.modules.custom_serializers import ReportDataSerializer
 from ghostwriter.modules.linting_utils import LINTER_CONTEXT
 from ghostwriter.modules.reportwriter import jinja_funcs
-from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.modules.reportwriter.base.base import (
+    ExportBase,
+    SerializedSnapshot,
+    copy_item,
+    materialize_jinja_context,
+)
 from ghostwriter.modules.reportwriter.base.html_rich_text import HtmlAndObject
 from ghostwriter.modules.reportwriter.project.base import ExportProjectBase
 from ghostwriter.oplog.models import OplogEntry
@@ -17,16 +25,83 @@ from ghostwriter.reporting.models import Finding, Observation, Report
 from ghostwriter.rolodex.models import Client, Project
 from ghostwriter.shepherd.models import Domain, StaticServer
 
+logger = logging.getLogger(__name__)
 
-def serialize_report(report, *, include_bloodhound=True):
-    """Serialize a report for export without depending on exporter state."""
-    excludes = ["id"]
+
+# Sections of the report data that are expensive to serialize and that exporters can skip when their template
+# never uses them, with the placeholder left in their place (`None` to leave the section out entirely)
+OPTIONAL_REPORT_SECTIONS = {
+    "logs": [],
+    "tools": [],
+    "infrastructure": {"domains": [], "cloud": [], "servers": []},
+    "bloodhound": None,
+}
+
+
+def serialize_report(report, *, include_bloodhound=True, skip_sections=()):
+    """
+    Serialize a report for export without depending on exporter state.
+
+    Sections in `skip_sections` (keys of `OPTIONAL_REPORT_SECTIONS`) are not serialized, and are replaced with
+    their placeholder.
+    """
+    excludes = ["id", *skip_sections]
     if not include_bloodhound:
         excludes.append("bloodhound")
-    return ReportDataSerializer(
+    data = ReportDataSerializer(
         report,
         exclude=excludes,
     ).data
+    for section in skip_sections:
+        if OPTIONAL_REPORT_SECTIONS[section] is not None:
+            data[section] = copy.deepcopy(OPTIONAL_REPORT_SECTIONS[section])
+    return data
+
+
+def serialize_report_sections(report, sections) -> dict:
+    """Serialize only the named top-level `sections` of a report's data."""
+    serializer = ReportDataSerializer(report)
+    data = {}
+    for section in sections:
+        field = serializer.fields[section]
+        value = field.to_representation(field.get_attribute(report))
+        # Match the normalization `CustomModelSerializer` applies to the full data
+        data[section] = "" if value is None else value
+    return data
+
+
+def _sections_in_rich_text(value, sections) -> set[str]:
+    """
+    Returns which of `sections` are named in any Jinja template string within `value`. The check is by
+    name only, so it can report sections the templates do not actually use, but never misses one.
+    """
+    section_re = re.compile(r"\b(" + "|".join(re.escape(section) for section in sections) + r")\b")
+    found = set()
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+        elif isinstance(value, str) and ("{{" in value or "{%" in value):
+            found.update(section_re.findall(value))
+    return found
+
+
+def serialize_report_snapshot(report, *, include_bloodhound=True) -> SerializedSnapshot:
+    """
+    Serialize a report once for every exporter of a multi-format bundle.
+
+    Exporters given the snapshot must be created with the same `include_bloodhound` value.
+    """
+    return SerializedSnapshot(
+        report,
+        object_serializer=partial(
+            serialize_report,
+            include_bloodhound=include_bloodhound,
+        ),
+    )
 
 
 class ExportReportBase(ExportBase):
@@ -35,16 +110,47 @@ class ExportReportBase(ExportBase):
 
     Configures report serialization and provides helpers for creating Jinja
     contexts.
+
+    Sections of the report data listed in `unused_sections` (see `OPTIONAL_REPORT_SECTIONS`) are not serialized,
+    unless rich text in the report refers to them. They are loaded later if `load_sections` is called for them,
+    e.g. when a filename template uses them.
     """
     include_bloodhound: bool
+    skipped_sections: set[str]
 
-    def __init__(self, *args, include_bloodhound=True, **kwargs):
+    def __init__(self, *args, include_bloodhound=True, unused_sections=(), **kwargs):
         self.include_bloodhound = include_bloodhound
+        self.skipped_sections = set()
+        if not kwargs.get("is_raw") and kwargs.get("snapshot") is None:
+            self.skipped_sections = set(unused_sections) & OPTIONAL_REPORT_SECTIONS.keys()
+            if not include_bloodhound:
+                self.skipped_sections.discard("bloodhound")
         kwargs["object_serializer"] = partial(
             serialize_report,
             include_bloodhound=include_bloodhound,
+            skip_sections=sorted(self.skipped_sections),
         )
         super().__init__(*args, **kwargs)
+        if self.skipped_sections:
+            # Rich text is rendered with the whole report data as its context
+            self.load_sections(_sections_in_rich_text(self.data, self.skipped_sections))
+
+    def load_sections(self, sections):
+        """Serializes any of the `sections` that were skipped, and adds them to `data`."""
+        sections = self.skipped_sections & set(sections)
+        if not sections:
+            return
+        logger.info("Loading report sections %s, which were skipped during serialization", sorted(sections))
+        self.data.update(materialize_jinja_context(serialize_report_sections(self.input_object, sorted(sections))))
+        self.skipped_sections -= sections
+
+    def render_filename(self, filename_template, ext=None):
+        if self.skipped_sections:
+            try:
+                self.load_sections(meta.find_undeclared_variables(self.jinja_env.parse(filename_template)))
+            except TemplateSyntaxError:
+                pass  # Reported when the filename is rendered
+        return super().render_filename(filename_template, ext)
 
     def severity_rich_text(self, text: str, severity_color: str) -> str | DocxRichText:
         """
@@ -67,7 +173,7 @@ class ExportReportBase(ExportBase):
         return HtmlAndObject(rich_html, exporter_rich)
 
     def map_rich_texts(self):
-        base_context = copy.deepcopy(self.data)
+        base_context = self.data.copy()
         rich_text_overlay = ExportProjectBase.rich_text_jinja_overlay(self.data)
         rich_text_overlay["mk_evidence"] = jinja_funcs.mk_evidence
         rich_text_overlay["_evidences"] = self.create_evidences_lookup(self.data["evidence"])
@@ -88,7 +194,9 @@ class ExportReportBase(ExportBase):
         )
 
         # Findings
-        for finding in base_context["findings"]:
+        findings = copy_item(base_context, "findings")
+        for i in range(len(findings)):
+            finding = copy_item(findings, i)
             finding_overlay = {
                 "finding": finding,
                 "_old_dot_vars": rich_text_overlay["_old_dot_vars"].copy(),
@@ -137,15 +245,22 @@ class ExportReportBase(ExportBase):
             finding["references_rt"] = finding_render("the references section", finding["references"])
 
             self.process_extra_fields(
-                f"finding {finding['title']}", finding["extra_fields"], Finding, finding_rich_text_context
+                f"finding {finding['title']}",
+                copy_item(finding, "extra_fields"),
+                Finding,
+                finding_rich_text_context,
             )
 
         # Severity values
-        for severity in base_context["severities"]:
+        severities = copy_item(base_context, "severities")
+        for i in range(len(severities)):
+            severity = copy_item(severities, i)
             severity["severity_rt"] = self._severity_rich_text(severity["severity"], severity["severity_color"])
 
         # Observations
-        for observation in base_context["observations"]:
+        observations = copy_item(base_context, "observations")
+        for i in range(len(observations)):
+            observation = copy_item(observations, i)
             if observation["description"]:
                 observation["description_rt"] = self.create_lazy_template(
                     f"the description of observation {observation['title']}",
@@ -153,11 +268,14 @@ class ExportReportBase(ExportBase):
                     rich_text_context,
                 )
             self.process_extra_fields(
-                f"observation {observation['title']}", observation["extra_fields"], Observation, rich_text_context
+                f"observation {observation['title']}",
+                copy_item(observation, "extra_fields"),
+                Observation,
+                rich_text_context,
             )
 
         # Report extra fields
-        self.process_extra_fields("the report", base_context["extra_fields"], Report, rich_text_context)
+        self.process_extra_fields("the report", copy_item(base_context, "extra_fields"), Report, rich_text_context)
 
         return base_context
 
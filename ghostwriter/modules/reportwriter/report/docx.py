@@ -2,7 +2,7 @@
 from docxtpl import RichText
 
 from ghostwriter.modules.reportwriter.base.docx import ExportDocxBase
-from ghostwriter.modules.reportwriter.report.base import ExportReportBase
+from ghostwriter.modules.reportwriter.report.base import OPTIONAL_REPORT_SECTIONS, ExportReportBase
 
 
 class ExportReportDocx(ExportDocxBase, ExportReportBase):
@@ -11,6 +11,10 @@ class ExportReportDocx(ExportDocxBase, ExportReportBase):
         if not kwargs.get("is_raw"):
             if object.project.client.logo:
                 image_replacements["CLIENT_LOGO"] = object.project.client.logo.path
+            # Skip serializing sections the template never uses, if the linter recorded which ones it does
+            referenced_variables = kwargs["report_template"].referenced_variables
+            if referenced_variables is not None:
+                kwargs.setdefault("unused_sections", OPTIONAL_REPORT_SECTIONS.keys() - referenced_variables)
         super().__init__(object, image_replacements=image_replacements, **kwargs)
 
     def severity_rich_text(self, text, severity_color):
@@ -5,6 +5,7 @@ from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
 from pptx.util import Inches
 import pptx
 
+from ghostwriter.modules.reportwriter.base.base import PHASE_RENDER, PHASE_RICH_TEXT
 from ghostwriter.modules.reportwriter.base.pptx import SLD_LAYOUT_TITLE_AND_CONTENT, ExportBasePptx, delete_paragraph, get_textframe, prepare_for_pptx, write_bullet
 from ghostwriter.modules.reportwriter.project.pptx import ProjectSlidesMixin
 from ghostwriter.modules.reportwriter.report.base import ExportReportBase
@@ -15,7 +16,9 @@ class ExportReportPptx(ExportBasePptx, ExportReportBase, ProjectSlidesMixin):
     def run(self) -> io.BytesIO:
         """Generate a complete PowerPoint slide deck for the current report."""
 
+        self.report_progress(PHASE_RICH_TEXT)
         base_context = self.map_rich_texts()
+        self.report_progress(PHASE_RENDER)
 
         # Loop through the findings to create slides
         findings_stats = {}
@@ -31,7 +34,7 @@ class ExportReportPptx(ExportBasePptx, ExportReportBase, ProjectSlidesMixin):
 
         # Add Observations slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Positive Observations")
         body_shape = self.get_placeholder_or_textbox(shapes, 1)
@@ -72,7 +75,7 @@ class ExportReportPptx(ExportBasePptx, ExportReportBase, ProjectSlidesMixin):
         # Create slide for each observation
         for observation in base_context["observations"]:
             slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-            observation_slide = self.ppt_presentation.slides.add_slide(slide_layout)
+            observation_slide = self.add_slide(slide_layout)
             shapes = observation_slide.shapes
 
             # Prepare text frame
@@ -108,7 +111,7 @@ class ExportReportPptx(ExportBasePptx, ExportReportBase, ProjectSlidesMixin):
 
         # Add Findings Overview Slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Findings Overview")
         body_shape = self.get_placeholder_or_textbox(shapes, 1)
@@ -162,7 +165,7 @@ class ExportReportPptx(ExportBasePptx, ExportReportBase, ProjectSlidesMixin):
         # Create slide for each finding
         for finding in base_context["findings"]:
             slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-            finding_slide = self.ppt_presentation.slides.add_slide(slide_layout)
+            finding_slide = self.add_slide(slide_layout)
             shapes = finding_slide.shapes
 
             # Prepare text frame
@@ -237,19 +240,19 @@ class ExportReportPptx(ExportBasePptx, ExportReportBase, ProjectSlidesMixin):
 
         # Add Recommendations slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Recommendations")
 
         # Add Next Steps slide
         slide_layout = self.ppt_presentation.slide_layouts[SLD_LAYOUT_TITLE_AND_CONTENT]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         _ = self.get_title_or_textbox(shapes, "Next Steps")
 
         # Add final slide (use the last slide layout)
         slide_layout = self.ppt_presentation.slide_layouts[-1]
-        slide = self.ppt_presentation.slides.add_slide(slide_layout)
+        slide = self.add_slide(slide_layout)
         shapes = slide.shapes
         body_shape = self.get_placeholder_or_textbox(
             shapes,
@@ -1,19 +1,50 @@
 import io
-import json
 import logging
 
 import bs4
-from xlsxwriter.utility import xl_col_to_name
+from django.conf import settings
 
+from ghostwriter.modules.reportwriter.base.base import PHASE_RENDER, PHASE_RICH_TEXT
 from ghostwriter.modules.reportwriter.base.xlsx import ExportXlsxBase
-from ghostwriter.modules.reportwriter.report.base import ExportReportBase
-from ghostwriter.reporting.models import Finding
+from ghostwriter.modules.reportwriter.report.base import OPTIONAL_REPORT_SECTIONS, ExportReportBase
+from ghostwriter.oplog.models import OplogEntry
+from ghostwriter.reporting.models import Finding, Observation
+from ghostwriter.shepherd.models import History, ServerHistory, TransientServer
 
 
 logger = logging.getLogger(__name__)
 
+# Worksheets that can be added after the findings, in the order they are written
+EXTRA_SHEETS = ("observations", "oplog", "infrastructure")
+
+# Number of rows fetched from the database at a time for the worksheets streamed from querysets
+QUERY_CHUNK_SIZE = 2000
+
+
+def _format_date(value) -> str:
+    return value.isoformat() if value else ""
+
 
 class ExportReportXlsx(ExportXlsxBase, ExportReportBase):
+    """
+    Exports a report's findings as a spreadsheet, optionally followed by the worksheets named in `extra_sheets`
+    (see `EXTRA_SHEETS`, and ``GHOSTWRITER_XLSX_EXTRA_SHEETS`` for the default).
+
+    The oplog and infrastructure worksheets are streamed from the database rather than from the serialized report,
+    so those sections of the report are not serialized unless rich text refers to them.
+    """
+    extra_sheets: tuple[str, ...]
+
+    def __init__(self, *args, extra_sheets=None, **kwargs):
+        if extra_sheets is None:
+            extra_sheets = getattr(settings, "GHOSTWRITER_XLSX_EXTRA_SHEETS", ())
+        unknown = set(extra_sheets) - set(EXTRA_SHEETS)
+        if unknown:
+            raise ValueError(f"Unknown XLSX worksheets: {', '.join(sorted(unknown))}")
+        self.extra_sheets = tuple(sheet for sheet in EXTRA_SHEETS if sheet in extra_sheets)
+        kwargs.setdefault("unused_sections", OPTIONAL_REPORT_SECTIONS.keys())
+        super().__init__(*args, **kwargs)
+
     def prepare_valid_evidence_names(self):
         """
         Cache report evidence friendly names once for supporting-evidence lookups.
@@ -90,13 +121,166 @@ class ExportReportXlsx(ExportXlsxBase, ExportReportBase):
                 rich_texts.append(field_spec.value_of(finding["extra_fields"]))
         return rich_texts
 
+    def finding_rows(self, findings, findings_extra_field_specs, formats):
+        """Yields the cells of the Findings worksheet, one finding at a time."""
+        for finding in findings:
+            severity_format = formats["severity"](finding["severity_color"])
+            if isinstance(finding["cvss_score"], float):
+                cvss_score = finding["cvss_score"]
+            else:
+                cvss_score = str(finding["cvss_score"]) if finding["cvss_score"] is not None else ""
+            row = [
+                (finding["title"], formats["bold"]),
+                (finding["severity"], severity_format),
+                (cvss_score, severity_format),
+                (str(finding["cvss_vector"]) if finding["cvss_vector"] is not None else "", severity_format),
+                (
+                    self.render_rich_text_xlsx(finding["affected_entities_rt"])
+                    if finding["affected_entities"]
+                    else "N/A",
+                    formats["asset"],
+                ),
+                (self.render_rich_text_xlsx(finding["description_rt"]), formats["wrap"]),
+                (self.render_rich_text_xlsx(finding["impact_rt"]), formats["wrap"]),
+                (self.render_rich_text_xlsx(finding["recommendation_rt"]), formats["wrap"]),
+                (self.render_rich_text_xlsx(finding["replication_steps_rt"]), formats["wrap"]),
+                (self.render_rich_text_xlsx(finding["host_detection_techniques_rt"]), formats["wrap"]),
+                (self.render_rich_text_xlsx(finding["network_detection_techniques_rt"]), formats["wrap"]),
+                (self.render_rich_text_xlsx(finding["references_rt"]), formats["wrap"]),
+                (
+                    ", ".join(
+                        self.referenced_evidence_names(self.finding_rich_texts(finding, findings_extra_field_specs))
+                    ),
+                    formats["wrap"],
+                ),
+                (", ".join(finding["tags"]), formats["wrap"]),
+            ]
+            for field_spec in findings_extra_field_specs:
+                row.append(
+                    (self.write_extra_field_xlsx(field_spec, field_spec.value_of(finding["extra_fields"])), formats["wrap"])
+                )
+            yield row
+
+    def observation_rows(self, observations, extra_field_specs, formats):
+        """Yields the cells of the Observations worksheet, one observation at a time."""
+        for observation in observations:
+            row = [
+                (observation["title"], formats["bold"]),
+                (
+                    self.render_rich_text_xlsx(observation["description_rt"]) if observation["description"] else "",
+                    formats["wrap"],
+                ),
+                (", ".join(observation["tags"]), formats["wrap"]),
+            ]
+            for field_spec in extra_field_specs:
+                row.append(
+                    (
+                        self.write_extra_field_xlsx(field_spec, field_spec.value_of(observation["extra_fields"])),
+                        formats["wrap"],
+                    )
+                )
+            yield row
+
+    def oplog_rows(self, extra_field_specs, formats):
+        """Yields the cells of the Oplog worksheet, streaming the project's oplog entries from the database."""
+        if self.input_object is None:
+            return
+        entries = (
+            OplogEntry.objects.filter(oplog_id__project_id=self.input_object.project_id)
+            .select_related("oplog_id")
+            .prefetch_related("tags")
+            .order_by("oplog_id", "start_date", "id")
+        )
+        for entry in entries.iterator(chunk_size=QUERY_CHUNK_SIZE):
+            row = [
+                entry.oplog_id.name,
+                entry.entry_identifier,
+                _format_date(entry.start_date),
+                _format_date(entry.end_date),
+                entry.source_ip or "",
+                entry.dest_ip or "",
+                entry.tool or "",
+                entry.user_context or "",
+                (entry.command, formats["wrap"]),
+                (entry.description, formats["wrap"]),
+                (entry.output, formats["wrap"]),
+                (entry.comments, formats["wrap"]),
+                entry.operator_name or "",
+                ", ".join(tag.name for tag in entry.tags.all()),
+            ]
+            for field_spec in extra_field_specs:
+                # Oplog entries record what was run, so their values are never rendered as templates
+                row.append(
+                    self.write_extra_field_xlsx(
+                        field_spec, field_spec.value_of(entry.extra_fields), render_rich_text=False
+                    )
+                )
+            yield row
+
+    def infrastructure_rows(self, formats):
+        """
+        Yields the cells of the Infrastructure worksheet, streaming the project's domains, static servers, and
+        cloud servers from the database.
+        """
+        if self.input_object is None:
+            return
+        project_id = self.input_object.project_id
+        domains = (
+            History.objects.filter(project_id=project_id)
+            .select_related("domain", "activity_type")
+            .order_by("start_date", "id")
+        )
+        for history in domains.iterator(chunk_size=QUERY_CHUNK_SIZE):
+            yield [
+                "Domain",
+                history.domain.name,
+                "",
+                "",
+                history.activity_type.activity,
+                _format_date(history.start_date),
+                _format_date(history.end_date),
+                (history.description, formats["wrap"]),
+            ]
+        servers = (
+            ServerHistory.objects.filter(project_id=project_id)
+            .select_related("server", "server_role", "activity_type")
+            .order_by("start_date", "id")
+        )
+        for history in servers.iterator(chunk_size=QUERY_CHUNK_SIZE):
+            yield [
+                "Static Server",
+                history.server.name,
+                history.server.ip_address,
+                history.server_role.server_role,
+                history.activity_type.activity,
+                _format_date(history.start_date),
+                _format_date(history.end_date),
+                (history.description, formats["wrap"]),
+            ]
+        cloud = (
+            TransientServer.objects.filter(project_id=project_id)
+            .select_related("server_role", "activity_type")
+            .order_by("id")
+        )
+        for server in cloud.iterator(chunk_size=QUERY_CHUNK_SIZE):
+            yield [
+                "Cloud Server",
+                server.name,
+                server.ip_address,
+                server.server_role.server_role,
+                server.activity_type.activity,
+                "",
+                "",
+                (server.description, formats["wrap"]),
+            ]
+
     def run(self) -> io.BytesIO:
+        self.report_progress(PHASE_RICH_TEXT)
         context = self.map_rich_texts()
+        self.report_progress(PHASE_RENDER)
         self.prepare_valid_evidence_names()
 
-        # Create an in-memory Excel workbook with a named worksheet
         xlsx_doc = self.workbook
-        worksheet = xlsx_doc.add_worksheet("Findings")
 
         # Create a format for headers
         bold_format = xlsx_doc.add_format({"bold": True})
@@ -127,201 +311,82 @@ class ExportReportXlsx(ExportXlsxBase, ExportReportBase):
         wrap_format.set_text_wrap()
         wrap_format.set_align("vcenter")
 
-        # Create header row for findings
-        col = 0
-        headers = [
-            "Finding",
-            "Severity",
-            "CVSS Score",
-            "CVSS Vector",
-            "Affected Entities",
-            "Description",
-            "Impact",
-            "Recommendation",
-            "Replication Steps",
-            "Host Detection Techniques",
-            "Network Detection Techniques",
-            "References",
-            "Supporting Evidence",
-            "Tags",
-        ]
+        formats = {
+            "bold": bold_format,
+            "asset": asset_format,
+            "severity": get_severity_format,
+            "wrap": wrap_format,
+        }
 
+        # Rows are written as they are produced, so the worksheet never holds more than one finding
         findings_extra_field_specs = self.extra_field_specs_for(Finding)
-        column_count = len(headers) + len(findings_extra_field_specs)
-
-        # Create 30 width columns and then shrink severity to 10
-        for header in headers:
-            worksheet.write_string(0, col, header, bold_format)
-            col += 1
-        for field in findings_extra_field_specs:
-            worksheet.write_string(0, col, field.display_name, bold_format)
-            col += 1
-        worksheet.set_column(0, column_count - 1, 30)
-        worksheet.set_column(1, 1, 10)
-        worksheet.set_column(2, 2, 10)
-        worksheet.set_column(3, 3, 40)
-
-        # Loop through the findings to create the rest of the worksheet
-        col = 0
-        row = 1
-        for finding in context["findings"]:
-            # Finding Name
-            worksheet.write_string(
-                row,
-                col,
-                finding["title"],
-                bold_format,
-            )
-            col += 1
-
-            severity_format = get_severity_format(finding["severity_color"])
+        self.write_sheet(
+            "Findings",
+            [
+                "Finding",
+                "Severity",
+                "CVSS Score",
+                "CVSS Vector",
+                "Affected Entities",
+                "Description",
+                "Impact",
+                "Recommendation",
+                "Replication Steps",
+                "Host Detection Techniques",
+                "Network Detection Techniques",
+                "References",
+                "Supporting Evidence",
+                "Tags",
+                *(field.display_name for field in findings_extra_field_specs),
+            ],
+            self.finding_rows(context["findings"], findings_extra_field_specs, formats),
+            header_format=bold_format,
+            # Shrink severity and the CVSS score, and widen the CVSS vector
+            widths={1: 10, 2: 10, 3: 40},
+        )
 
-            # Severity and CVSS information
-            worksheet.write_string(
-                row,
-                col,
-                finding["severity"],
-                severity_format,
-            )
-            col += 1
-            if isinstance(finding["cvss_score"], float):
-                worksheet.write_number(row, col, finding["cvss_score"], severity_format)
-            else:
-                worksheet.write_string(
-                    row,
-                    col,
-                    str(finding["cvss_score"])
-                    if finding["cvss_score"] is not None
-                    else "",
-                    severity_format,
-                )
-            col += 1
-            worksheet.write_string(
-                row,
-                col,
-                str(finding["cvss_vector"])
-                if finding["cvss_vector"] is not None
-                else "",
-                severity_format,
-            )
-            col += 1
-
-            # Affected Entities
-            if finding["affected_entities"]:
-                worksheet.write_string(
-                    row,
-                    col,
-                    self.render_rich_text_xlsx(finding["affected_entities_rt"]),
-                    asset_format,
-                )
-            else:
-                worksheet.write_string(row, col, "N/A", asset_format)
-            col += 1
-
-            # Description
-            worksheet.write_string(
-                row,
-                col,
-                self.render_rich_text_xlsx(finding["description_rt"]),
-                wrap_format,
+        if "observations" in self.extra_sheets:
+            observation_extra_field_specs = self.extra_field_specs_for(Observation)
+            self.write_sheet(
+                "Observations",
+                ["Observation", "Description", "Tags", *(field.display_name for field in observation_extra_field_specs)],
+                self.observation_rows(context["observations"], observation_extra_field_specs, formats),
+                header_format=bold_format,
             )
-            col += 1
-
-            # Impact
-            worksheet.write_string(
-                row,
-                col,
-                self.render_rich_text_xlsx(finding["impact_rt"]),
-                wrap_format,
-            )
-            col += 1
-
-            # Recommendation
-            worksheet.write_string(
-                row,
-                col,
-                self.render_rich_text_xlsx(finding["recommendation_rt"]),
-                wrap_format,
-            )
-            col += 1
-
-            # Replication
-            worksheet.write_string(
-                row,
-                col,
-                self.render_rich_text_xlsx(finding["replication_steps_rt"]),
-                wrap_format,
-            )
-            col += 1
-
-            # Detection
-            worksheet.write_string(
-                row,
-                col,
-                self.render_rich_text_xlsx(finding["host_detection_techniques_rt"]),
-                wrap_format,
-            )
-            col += 1
-            worksheet.write_string(
-                row,
-                col,
-                self.render_rich_text_xlsx(finding["network_detection_techniques_rt"]),
-                wrap_format,
-            )
-            col += 1
-
-            # References
-            worksheet.write_string(
-                row,
-                col,
-                self.render_rich_text_xlsx(finding["references_rt"]),
-                wrap_format,
-            )
-            col += 1
-
-            # Supporting Evidence
-            worksheet.write_string(
-                row,
-                col,
-                ", ".join(
-                    self.referenced_evidence_names(
-                        self.finding_rich_texts(finding, findings_extra_field_specs)
-                    )
-                ),
-                wrap_format,
-            )
-            col += 1
-
-            # Tags
-            worksheet.write_string(
-                row,
-                col,
-                ", ".join(finding["tags"]),
-                wrap_format,
+
+        if "oplog" in self.extra_sheets:
+            oplog_extra_field_specs = self.extra_field_specs_for(OplogEntry)
+            self.write_sheet(
+                "Oplog",
+                [
+                    "Log",
+                    "Identifier",
+                    "Start Date",
+                    "End Date",
+                    "Source IP",
+                    "Destination IP",
+                    "Tool",
+                    "User Context",
+                    "Command",
+                    "Description",
+                    "Output",
+                    "Comments",
+                    "Operator",
+                    "Tags",
+                    *(field.display_name for field in oplog_extra_field_specs),
+                ],
+                self.oplog_rows(oplog_extra_field_specs, formats),
+                header_format=bold_format,
+                widths={1: 20, 2: 25, 3: 25, 4: 15, 5: 15},
             )
-            col += 1
 
-            # Extra fields
-            for field_spec in findings_extra_field_specs:
-                field_value = field_spec.value_of(finding["extra_fields"])
-                if field_spec.type == "rich_text":
-                    field_value = self.render_rich_text_xlsx(field_value)
-                elif field_spec.type == "json":
-                    field_value = json.dumps(field_value)
-                else:
-                    field_value = str(field_value)
-                worksheet.write_string(row, col, field_value, wrap_format)
-                col += 1
-
-            # Increment row counter and reset columns before moving on to next finding
-            row += 1
-            col = 0
-
-        # Add a filter to the worksheet
-        worksheet.autofilter(
-            "A1:{}{}".format(
-                xl_col_to_name(column_count - 1), len(self.data["findings"]) + 1
+        if "infrastructure" in self.extra_sheets:
+            self.write_sheet(
+                "Infrastructure",
+                ["Type", "Name", "IP Address", "Role", "Activity", "Start Date", "End Date", "Description"],
+                self.infrastructure_rows(formats),
+                header_format=bold_format,
+                widths={0: 15, 2: 20, 5: 15, 6: 15},
             )
-        )
 
         return super().run()
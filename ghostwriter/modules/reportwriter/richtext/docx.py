@@ -12,6 +12,7 @@ import docx
 from docx.document import Document as DocumentObject
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_BREAK, WD_COLOR_INDEX
 from docx.image.exceptions import UnrecognizedImageError
+from docx.oxml.shape import CT_Inline
 from docx.oxml.shared import OxmlElement, qn
 from docx.shared import Inches, Pt
 from docx.shared import RGBColor as DocxRgbColor
@@ -25,6 +26,7 @@ from ghostwriter.modules.reportwriter.extensions import (
     IMAGE_EXTENSIONS,
     TEXT_EXTENSIONS,
 )
+from ghostwriter.modules.reportwriter.images import export_image_path
 from ghostwriter.modules.reportwriter.richtext.ooxml import (
     BaseHtmlToOOXML,
     parse_styles,
@@ -467,6 +469,10 @@ class HtmlToDocxWithEvidence(HtmlToDocx):
         effective_alignment = self.report_template.get_effective_evidence_image_alignment(self.global_report_config)
         self.image_alignment = EVIDENCE_IMAGE_ALIGNMENT_MAP[effective_alignment]
         self.image_width = self.report_template.get_effective_evidence_image_width(self.global_report_config)
+        # Next free drawing ID of each story part images were added to
+        self.next_shape_ids = {}
+        # Path of the image file embedded for each image relationship ID used
+        self.image_paths = {}
 
     def text(self, el, *, par=None, **kwargs):
         if par is not None and getattr(par, "_gw_is_caption", False):
@@ -698,13 +704,12 @@ class HtmlToDocxWithEvidence(HtmlToDocx):
     def _make_image(self, par, file_path: str):
         par.alignment = self.image_alignment
         run = par.add_run()
-        run.add_picture(file_path, width=Inches(self.image_width))
+        inline_class = self._add_picture(run, file_path)
 
         if self.global_report_config.enable_borders:
             border_color = self.global_report_config.border_color
             border_width = self.global_report_config.border_weight
             # Add the border – see Ghostwriter Wiki for documentation
-            inline_class = run._r.xpath("//wp:inline")[-1]
             inline_class.attrib["distT"] = "0"
             inline_class.attrib["distB"] = "0"
             inline_class.attrib["distL"] = "0"
@@ -720,7 +725,7 @@ class HtmlToDocxWithEvidence(HtmlToDocx):
             inline_class.insert(1, effect_extent)
 
             # Find inline shape properties – ``pic:spPr``
-            pic_data = run._r.xpath("//pic:spPr")[-1]
+            pic_data = inline_class.xpath("./a:graphic/a:graphicData/pic:pic/pic:spPr")[0]
             # Assemble OXML for a solid border
             ln_xml = OxmlElement("a:ln")
             ln_xml.set("w", str(border_width))
@@ -731,6 +736,28 @@ class HtmlToDocxWithEvidence(HtmlToDocx):
             ln_xml.append(solidfill_xml)
             pic_data.append(ln_xml)
 
+    def _add_picture(self, run, file_path: str) -> CT_Inline:
+        """
+        Adds the image at `file_path` to `run` and returns its ``<wp:inline>`` element.
+
+        Does the same as `Run.add_picture`, except that drawing IDs are counted per part instead of
+        searching the whole part for the highest ID on every image, which is quadratic in the number
+        of images.
+        """
+        part = run.part
+        shape_id = self.next_shape_ids.get(part)
+        if shape_id is None:
+            shape_id = part.next_id
+        self.next_shape_ids[part] = shape_id + 1
+
+        image_path = export_image_path(file_path, self.image_width)
+        rid, image = part.get_or_add_image(image_path)
+        self.image_paths[rid] = image_path
+        cx, cy = image.scaled_dimensions(Inches(self.image_width), None)
+        inline = CT_Inline.new_pic_inline(shape_id, rid, image.filename, cx, cy)
+        run._r.add_drawing(inline)
+        return inline
+
     def _mk_figure_caption(self, par_caption, ref: str | None, caption_text: str):
         self.make_caption(par_caption, self.global_report_config.label_figure, ref)
         par_caption.add_run(self.global_report_config.prefix_figure)
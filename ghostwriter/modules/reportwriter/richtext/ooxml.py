@@ -3,8 +3,12 @@ import logging
 import re
 import typing
 
+# Django Imports
+from django.conf import settings
+
 # 3rd Party Libraries
 import bs4
+from lxml import etree
 
 # Ghostwriter Libraries
 from ghostwriter.modules.reportwriter.base.html_rich_text import (
@@ -16,6 +20,178 @@ logger = logging.getLogger(__name__)
 ALLOWED_HYPERLINK_PROTOCOLS = {"http", "https", "mailto", "tel"}
 
 
+class LxmlText(str):
+    """A text node of an `LxmlElement`. Like BeautifulSoup's strings, it has no `name`."""
+
+    __slots__ = ()
+    name = None
+
+    @property
+    def text(self) -> str:
+        return str(self)
+
+
+# Tags inside which BeautifulSoup keeps whitespace-only strings as they are
+WHITESPACE_PRESERVING_TAGS = frozenset({"pre", "textarea"})
+
+# ASCII whitespace, which BeautifulSoup collapses in whitespace-only strings
+ASCII_SPACES = str.maketrans("", "", " \n\t\f\r")
+
+# Tags whose strings BeautifulSoup gives a type of their own
+STRING_CONTAINER_TAGS = frozenset({"rp", "rt", "script", "style", "template"})
+
+
+class LxmlElement:
+    """
+    A view of an `lxml` element with the parts of BeautifulSoup's `Tag` interface the converters use (`name`,
+    `attrs`, `children`, `contents`, `text`, `get_text`, and `find`), so they can walk an `lxml` tree directly.
+
+    Its strings are the same as in BeautifulSoup's tree: ``class`` is split into a list, comments are text, and
+    whitespace-only text is collapsed to a single newline or space outside of ``pre`` tags. The `hidden` children
+    are left out, but not the text that follows them, like children removed from a BeautifulSoup tree.
+    """
+
+    __slots__ = ("element", "name", "preserve_whitespace", "hidden", "_attrs")
+
+    def __init__(self, element, preserve_whitespace: bool = False, hidden: frozenset = frozenset()):
+        self.element = element
+        self.name = element.tag
+        self.preserve_whitespace = preserve_whitespace or element.tag in WHITESPACE_PRESERVING_TAGS
+        self.hidden = hidden
+        self._attrs = None
+
+    @property
+    def attrs(self) -> dict:
+        if self._attrs is None:
+            attrs = dict(self.element.attrib)
+            if "class" in attrs:
+                attrs["class"] = attrs["class"].split()
+            self._attrs = attrs
+        return self._attrs
+
+    def _string(self, text: str) -> LxmlText:
+        if not self.preserve_whitespace and not text.translate(ASCII_SPACES):
+            return LxmlText("\n" if "\n" in text else " ")
+        return LxmlText(text)
+
+    def __iter__(self):
+        element = self.element
+        if element.text:
+            yield self._string(element.text)
+        for child in element:
+            if child in self.hidden:
+                pass
+            elif isinstance(child.tag, str):
+                yield LxmlElement(child, self.preserve_whitespace)
+            else:
+                # Comments and processing instructions
+                yield self._string(child.text or "")
+            if child.tail:
+                yield self._string(child.tail)
+
+    def __str__(self) -> str:
+        return etree.tostring(self.element, encoding="unicode", method="html", with_tail=False)
+
+    @property
+    def children(self):
+        return iter(self)
+
+    @property
+    def contents(self) -> list:
+        return list(self)
+
+    def _strings(self, container: str | None, wanted: str | None):
+        element = self.element
+        if element.tag in STRING_CONTAINER_TAGS:
+            container = element.tag
+        if element.text and container == wanted:
+            yield self._string(element.text)
+        for child in element:
+            if isinstance(child.tag, str) and child not in self.hidden:
+                yield from LxmlElement(child, self.preserve_whitespace)._strings(container, wanted)
+            if child.tail and container == wanted:
+                yield self._string(child.tail)
+
+    def get_text(self) -> str:
+        """
+        Returns the text of the element and its descendants, without comments. As in BeautifulSoup, the text inside
+        ``script``, ``style``, and the other `STRING_CONTAINER_TAGS` only counts towards those tags' own text.
+        """
+        container = next(
+            (ancestor.tag for ancestor in self.element.iterancestors() if ancestor.tag in STRING_CONTAINER_TAGS), None
+        )
+        wanted = self.name if self.name in STRING_CONTAINER_TAGS else None
+        return "".join(self._strings(container, wanted))
+
+    text = property(get_text)
+
+    def find(self, name=None, class_=None):
+        """Returns the first descendant element with the tag `name` and the class `class_`, if given."""
+        for element in self.element.iterdescendants(name) if name else self.element.iterdescendants():
+            if not isinstance(element.tag, str) or element in self.hidden:
+                continue
+            if class_ is None or class_ in (element.get("class") or "").split():
+                preserve_whitespace = any(
+                    ancestor.tag in WHITESPACE_PRESERVING_TAGS for ancestor in element.iterancestors()
+                )
+                return LxmlElement(element, preserve_whitespace)
+        return None
+
+
+def _trailing_empty_paragraphs(body) -> frozenset:
+    """Returns the children of an `lxml` ``body`` element that `remove_trailing_empty_paragraphs` would remove."""
+    empty = set()
+    for child in reversed(body):
+        if child.tail and child.tail.strip():
+            break
+        if not isinstance(child.tag, str):
+            if (child.text or "").strip():
+                break
+            continue
+        if (
+            child.tag == "p"
+            and not "".join(child.itertext()).strip()
+            and not any(isinstance(descendant.tag, str) for descendant in child.iterdescendants())
+        ):
+            empty.add(child)
+            continue
+        break
+    return frozenset(empty)
+
+
+def parse_body_bs4(text: str):
+    """Parses `text` with BeautifulSoup and returns its ``body`` tag, if any."""
+    tag = bs4.BeautifulSoup(text, "lxml").find("body")
+    if tag is not None:
+        remove_trailing_empty_paragraphs(tag)
+    return tag
+
+
+def parse_body_lxml(text: str) -> LxmlElement | None:
+    """
+    Parses `text` with the same `lxml` parser BeautifulSoup uses, and returns a view of its ``body`` element, if any.
+    """
+    # Feed the whole text at once, as BeautifulSoup does, so libxml2 recovers from invalid HTML the same way
+    parser = etree.HTMLParser(recover=True)
+    parser.feed(text)
+    root = parser.close()
+    if root is None:
+        return None
+    # Like BeautifulSoup, take the first ``body`` anywhere, as libxml2 may nest it or leave it after the root element
+    body = next((body for top in (root, *root.itersiblings()) for body in top.iter("body")), None)
+    if body is None:
+        return None
+    preserve_whitespace = any(ancestor.tag in WHITESPACE_PRESERVING_TAGS for ancestor in body.iterancestors())
+    return LxmlElement(body, preserve_whitespace, hidden=_trailing_empty_paragraphs(body))
+
+
+# Parsers the converters can walk, selected with the ``GHOSTWRITER_RICH_TEXT_PARSER`` setting
+HTML_PARSERS = {
+    "bs4": parse_body_bs4,
+    "lxml": parse_body_lxml,
+}
+
+
 def set_style_method(tag_name, style_key, style_value=True):
     """
     Creates and returns a `tag_*` method that sets a value in the `styles` dict
@@ -102,28 +278,38 @@ class BaseHtmlToOOXML:
     """
 
     text_tracking: TextTracking
+    # The `tag_*` method for each tag name, collected when the class is created
+    tag_handlers: dict[str, typing.Callable]
 
     def __init__(self):
         self.text_tracking = TextTracking()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.tag_handlers = {name[len("tag_") :]: getattr(cls, name) for name in dir(cls) if name.startswith("tag_")}
+
     @classmethod
     def run(cls, text: str, *args, **kwargs):
         """
         Parses the `text` as HTML and runs the class over the tree.
         Extra parameters are passed to the class's `__init__`.
+
+        The HTML is parsed with the parser named by the ``GHOSTWRITER_RICH_TEXT_PARSER`` setting (see `HTML_PARSERS`).
+        Both produce the same output, but walking the `lxml` tree directly is much faster than building a
+        BeautifulSoup tree first.
         """
-        soup = bs4.BeautifulSoup(text, "lxml")
-        tag = soup.find("body")
+        parse_body = HTML_PARSERS[getattr(settings, "GHOSTWRITER_RICH_TEXT_PARSER", "lxml")]
+        tag = parse_body(text)
         instance = cls(*args, **kwargs)
         if tag is not None:
-            remove_trailing_empty_paragraphs(tag)
             instance.process_children(tag.children)
         return instance
 
     def process(self, el, **kwargs):
         if el.name:
-            if hasattr(self, "tag_" + el.name):
-                getattr(self, "tag_" + el.name)(el, **kwargs)
+            handler = self.tag_handlers.get(el.name)
+            if handler is not None:
+                handler(self, el, **kwargs)
             else:
                 logger.warning("Unimplemented tag: %s, skipping", el.name)
         else:
@@ -139,7 +325,7 @@ class BaseHtmlToOOXML:
             # report an error.
             if el.strip():
                 raise ValueError(
-                    "found text node that was not enclosed in a paragraph or other block item: {!r}".format(el.text)
+                    "found text node that was not enclosed in a paragraph or other block item: {!r}".format(str(el))
                 )
             return
         run = par.add_run()
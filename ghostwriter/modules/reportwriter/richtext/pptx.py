@@ -13,6 +13,7 @@ from pptx.util import Inches, Pt
 
 # Ghostwriter Libraries
 from ghostwriter.modules.reportwriter.extensions import IMAGE_EXTENSIONS, TEXT_EXTENSIONS
+from ghostwriter.modules.reportwriter.images import export_image_path
 from ghostwriter.modules.reportwriter.richtext.ooxml import BaseHtmlToOOXML
 
 
@@ -238,4 +239,4 @@ class HtmlToPptxWithEvidence(HtmlToPptx):
             top = Inches(1.65)
             left = Inches(8)
             width = Inches(4.5)
-            slide.shapes.add_picture(file_path, left, top, width=width)
+            slide.shapes.add_picture(export_image_path(file_path, 4.5), left, top, width=width)
@@ -0,0 +1,40 @@
+"""This contains helpers for streaming responses without the server holding their whole content in memory."""
+
+# Standard Libraries
+from asgiref.sync import sync_to_async
+
+# Django Imports
+from django.core.handlers.asgi import ASGIRequest
+
+_EXHAUSTED = object()
+
+
+async def iterate_in_thread(iterator):
+    """
+    Yields the items of the synchronous `iterator`, producing each one with ``sync_to_async``, so only one item
+    is in memory at a time. Items are produced in the request's thread, so they can use its database connection.
+    """
+    iterator = iter(iterator)
+    try:
+        while True:
+            item = await sync_to_async(next)(iterator, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close)()
+
+
+def stream_response(request, response):
+    """
+    Make `response`, if it is a `StreamingHttpResponse` (or `FileResponse`), stream when `request` is served over
+    ASGI, and return it.
+
+    Under ASGI, Django reads a synchronous iterator into a list before sending any of it, so the whole file is
+    held in memory. Under WSGI the response is left as-is, so ``wsgi.file_wrapper`` can still send files.
+    """
+    if isinstance(request, ASGIRequest) and response.streaming and not response.is_async:
+        response.streaming_content = iterate_in_thread(response.streaming_content)
+    return response
@@ -0,0 +1,60 @@
+# Standard Libraries
+import io
+
+# Django Imports
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase
+
+# Ghostwriter Libraries
+from ghostwriter.modules.streaming import iterate_in_thread, stream_response
+
+
+class StreamResponseTests(SimpleTestCase):
+    """Collection of tests for streaming responses under ASGI and WSGI."""
+
+    async def test_asgi_response_is_produced_one_chunk_at_a_time(self):
+        produced = []
+
+        def content():
+            for chunk in (b"first", b"second"):
+                produced.append(chunk)
+                yield chunk
+
+        response = stream_response(AsyncRequestFactory().get("/"), StreamingHttpResponse(content()))
+        self.assertTrue(response.is_async)
+
+        chunks = aiter(response)
+        self.assertEqual(await anext(chunks), b"first")
+        self.assertEqual(produced, [b"first"])
+        self.assertEqual([chunk async for chunk in chunks], [b"second"])
+
+    async def test_asgi_file_response_keeps_headers(self):
+        response = stream_response(AsyncRequestFactory().get("/"), FileResponse(io.BytesIO(b"x" * 10000)))
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Length"], "10000")
+        self.assertEqual(b"".join([chunk async for chunk in response]), b"x" * 10000)
+
+    def test_wsgi_response_is_unchanged(self):
+        file = io.BytesIO(b"contents")
+        response = stream_response(RequestFactory().get("/"), FileResponse(file))
+        self.assertFalse(response.is_async)
+        self.assertIs(response.file_to_stream, file)
+
+    def test_asgi_response_that_does_not_stream_is_unchanged(self):
+        response = stream_response(AsyncRequestFactory().get("/"), HttpResponse(b"contents"))
+        self.assertEqual(response.content, b"contents")
+
+    async def test_iterator_is_closed(self):
+        closed = []
+
+        def content():
+            try:
+                yield b"first"
+                yield b"second"
+            finally:
+                closed.append(True)
+
+        chunks = iterate_in_thread(content())
+        self.assertEqual(await anext(chunks), b"first")
+        await chunks.aclose()
+        self.assertEqual(closed, [True])
@@ -0,0 +1,62 @@
+# Standard Libraries
+import io
+import zipfile
+
+# Django Imports
+from django.test import SimpleTestCase
+
+# Ghostwriter Libraries
+from ghostwriter.modules.zipstream import member_compression, open_member, stream_zip
+
+
+class StreamZipTests(SimpleTestCase):
+    """Collection of tests for building Zip files in chunks."""
+
+    def test_stream_is_valid_zip_file(self):
+        members = [("report.json", b'{"findings": []}' * 100), ("report.docx", b"docx"), ("evidence/shot.PNG", b"png")]
+
+        chunks = list(stream_zip(members))
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual([(name, zf.read(name)) for name in zf.namelist()], members)
+            self.assertEqual(
+                [info.compress_type for info in zf.infolist()],
+                [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED, zipfile.ZIP_STORED],
+            )
+
+    def test_members_are_yielded_as_they_are_consumed(self):
+        consumed = []
+
+        def members():
+            for name in ("a.txt", "b.txt"):
+                consumed.append(name)
+                yield name, b"contents"
+
+        stream = stream_zip(members())
+        next(stream)
+        self.assertEqual(consumed, ["a.txt"])
+        next(stream)
+        self.assertEqual(consumed, ["a.txt", "b.txt"])
+
+    def test_empty_stream(self):
+        with zipfile.ZipFile(io.BytesIO(b"".join(stream_zip([])))) as zf:
+            self.assertEqual(zf.namelist(), [])
+
+    def test_member_compression(self):
+        self.assertEqual(member_compression("report.xlsx"), zipfile.ZIP_STORED)
+        self.assertEqual(member_compression("evidence/photo.JPG"), zipfile.ZIP_STORED)
+        self.assertEqual(member_compression("evidence/output.txt"), zipfile.ZIP_DEFLATED)
+        self.assertEqual(member_compression("README"), zipfile.ZIP_DEFLATED)
+
+    def test_open_member(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            with open_member(zf, "evidence/shot.png", 3) as member:
+                member.write(b"png")
+            with open_member(zf, "evidence/log.txt", 3) as member:
+                member.write(b"log")
+        with zipfile.ZipFile(buffer) as zf:
+            self.assertEqual(zf.read("evidence/shot.png"), b"png")
+            self.assertEqual(zf.getinfo("evidence/shot.png").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.getinfo("evidence/log.txt").compress_type, zipfile.ZIP_DEFLATED)
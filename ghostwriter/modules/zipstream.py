@@ -0,0 +1,93 @@
+"""This contains helpers for building Zip files without holding the whole archive in memory."""
+
+# Standard Libraries
+import os
+import time
+import zipfile
+from typing import Iterable, Iterator
+
+# File extensions of formats that are already compressed, so deflating them again only costs time
+COMPRESSED_EXTENSIONS = frozenset(
+    {
+        ".7z",
+        ".avif",
+        ".bz2",
+        ".docx",
+        ".gif",
+        ".gz",
+        ".heic",
+        ".jpeg",
+        ".jpg",
+        ".mp4",
+        ".png",
+        ".pptx",
+        ".webp",
+        ".xlsx",
+        ".xz",
+        ".zip",
+    }
+)
+
+
+def member_compression(name: str) -> int:
+    """Returns the compression method to use for a Zip file member named `name`."""
+    if os.path.splitext(name)[1].lower() in COMPRESSED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def write_member(zf: zipfile.ZipFile, name: str, data: bytes):
+    """Writes `data` to `zf` as `name`, storing it as-is if it is already compressed."""
+    zf.writestr(name, data, compress_type=member_compression(name))
+
+
+def open_member(zf: zipfile.ZipFile, name: str, size: int = 0):
+    """
+    Opens a new member of `zf` named `name` for writing, storing it as-is if it is already compressed.
+    Pass the expected `size` so members larger than 2 GiB are written with Zip64 extensions.
+    """
+    zinfo = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = member_compression(name)
+    zinfo.external_attr = 0o600 << 16
+    return zf.open(zinfo, "w", force_zip64=size > zipfile.ZIP64_LIMIT)
+
+
+class ZipStreamBuffer:
+    """
+    A write-only file object for a `zipfile.ZipFile` whose output is handed on in chunks.
+
+    It is not seekable, so `zipfile` writes each member's sizes after its data instead of going back
+    to update its header. Call `drain` to take the bytes written since the last call.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(members: Iterable[tuple[str, bytes]]) -> Iterator[bytes]:
+    """
+    Builds a Zip file from the ``(name, data)`` pairs in `members` and yields it in chunks, one per
+    member as it is consumed and a final one with the central directory.
+
+    Only the member being written is held in memory, so this can back a `StreamingHttpResponse`.
+    """
+    buffer = ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members:
+            write_member(zf, name, data)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    yield buffer.drain()
@@ -0,0 +1,250 @@
+"""This contains the bulk ingestion of log entries sent by integrations (e.g., C2 server syncs)."""
+
+# Standard Libraries
+import json
+import logging
+from asgiref.sync import async_to_sync
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+from socket import gaierror
+
+# Django Imports
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# 3rd Party Libraries
+from channels.layers import get_channel_layer
+from taggit.models import Tag, TaggedItem
+
+# Ghostwriter Libraries
+from ghostwriter.modules.custom_serializers import OplogEntrySerializer
+from ghostwriter.oplog.models import Oplog, OplogEntry
+
+# Using __name__ resolves to ghostwriter.oplog.ingest
+logger = logging.getLogger(__name__)
+
+# Input names of the ``bulkCreateOplogEntries`` action (the ``oplogEntry`` column names in GraphQL) and their fields
+ENTRY_FIELDS = {
+    "entryIdentifier": "entry_identifier",
+    "startDate": "start_date",
+    "endDate": "end_date",
+    "sourceIp": "source_ip",
+    "destIp": "dest_ip",
+    "tool": "tool",
+    "userContext": "user_context",
+    "command": "command",
+    "description": "description",
+    "output": "output",
+    "comments": "comments",
+    "operatorName": "operator_name",
+    "extraFields": "extra_fields",
+}
+INPUT_NAMES = {field_name: input_name for input_name, field_name in ENTRY_FIELDS.items()}
+
+# Fields that cannot be null and default to an empty string
+TEXT_FIELDS = {"entry_identifier", "command", "description", "output", "comments"}
+
+# Session variable Hasura copies into the events of rows changed in a transaction that sets it
+BULK_INGEST_SESSION_VARIABLE = "x-hasura-ghostwriter-bulk-ingest"
+
+
+class BulkIngestError(Exception):
+    """Raised when a batch of log entries is invalid; ``errors`` holds a message for each problem."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+@dataclass
+class IngestResult:
+    """The outcome of `ingest_entries`; ``entry_ids`` holds the ID of the entry saved for each input, in order."""
+
+    created: int = 0
+    updated: int = 0
+    entry_ids: list[int] = field(default_factory=list)
+
+
+def ingested_in_bulk(event: dict) -> bool:
+    """Returns whether a Hasura event is for a row that `ingest_entries` already saved and broadcast."""
+    session_variables = event.get("session_variables") or {}
+    return session_variables.get(BULK_INGEST_SESSION_VARIABLE) == "true"
+
+
+def _clean_entry(oplog: Oplog, position: int, data) -> tuple[OplogEntry | None, set[str], list[str], list[str]]:
+    """
+    Validate the `data` of one entry like a model form would. Returns the unsaved entry, the names of the fields
+    `data` sets, its tags, and any error messages.
+    """
+    prefix = f"entries[{position}]"
+    if not isinstance(data, dict):
+        return None, set(), [], [f"{prefix}: must be an object"]
+
+    errors = [f"{prefix}.{name}: unknown field" for name in data if name not in ENTRY_FIELDS and name != "tags"]
+    values = {}
+    for input_name, field_name in ENTRY_FIELDS.items():
+        if input_name in data:
+            value = data[input_name]
+            if value is None and field_name in TEXT_FIELDS:
+                value = ""
+            elif value is None and field_name == "extra_fields":
+                value = {}
+            values[field_name] = value
+    if not isinstance(values.get("extra_fields", {}), dict):
+        errors.append(f"{prefix}.extraFields: must be an object")
+
+    tags = data.get("tags") or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        errors.append(f"{prefix}.tags: must be a list of strings")
+        tags = []
+    tags = [tag.strip() for tag in tags if tag.strip()]
+    max_length = Tag._meta.get_field("name").max_length
+    errors.extend(
+        f"{prefix}.tags: {tag!r} is longer than {max_length} characters" for tag in tags if len(tag) > max_length
+    )
+
+    entry = OplogEntry(oplog_id=oplog, **values)
+    try:
+        # The log and extra fields were checked already; skipping them avoids a query per entry
+        entry.full_clean(exclude=["oplog_id", "extra_fields"], validate_unique=False, validate_constraints=False)
+    except ValidationError as exception:
+        for field_name, messages in exception.message_dict.items():
+            name = INPUT_NAMES.get(field_name, field_name)
+            errors.extend(f"{prefix}.{name}: {message}" for message in messages)
+    return entry, set(values), tags, errors
+
+
+def _get_tags(names) -> dict[str, Tag]:
+    """Returns the tags named `names`, creating any that do not exist, keyed by the name passed in."""
+    names = set(names)
+    if not names:
+        return {}
+    if getattr(settings, "TAGGIT_CASE_INSENSITIVE", False):
+        existing = {}
+        matches = Tag.objects.filter(reduce(or_, (Q(name__iexact=name) for name in names))).order_by("pk")
+        for tag in matches:
+            existing.setdefault(tag.name.lower(), tag)
+        key = str.lower
+    else:
+        existing = {tag.name: tag for tag in Tag.objects.filter(name__in=names)}
+        key = str
+    tags = {}
+    for name in sorted(names):
+        if key(name) not in existing:
+            # New tags are rare and need a unique slug, which ``Tag.save()`` picks
+            existing[key(name)] = Tag.objects.create(name=name)
+        tags[name] = existing[key(name)]
+    return tags
+
+
+def broadcast_entries(oplog_id: int, entry_ids: list[int]):
+    """Send the log's WebSocket group one message with every entry in `entry_ids` that still exists."""
+    entries = (
+        OplogEntry.objects.filter(pk__in=entry_ids)
+        .select_related("recording")
+        .prefetch_related("tags")
+        .order_by("start_date", "pk")
+    )
+    try:
+        channel_layer = get_channel_layer()
+        serialized_entries = OplogEntrySerializer(entries, many=True).data
+        json_message = json.dumps({"action": "bulk_create", "data": serialized_entries})
+        async_to_sync(channel_layer.group_send)(
+            str(oplog_id), {"type": "send_oplog_entry", "text": json_message}
+        )
+    except gaierror:  # pragma: no cover
+        # WebSocket are unavailable (unit testing)
+        pass
+
+
+def ingest_entries(oplog: Oplog, entries: list) -> IngestResult:
+    """
+    Validate and save a batch of log `entries` (dictionaries keyed by the ``bulkCreateOplogEntries`` input names)
+    in `oplog` in one transaction, and broadcast them to the log's viewers in one WebSocket message.
+
+    An entry with the ``entryIdentifier`` of an entry already in the log updates that entry with the values it
+    sets instead; later entries in a batch update earlier ones the same way. Tags are added to the existing
+    ones. The entries are saved with bulk queries, so the ``OplogEntry`` save signals do not fire; the same work
+    (default dates, sanitizing, and the broadcast) is done here. Raises ``BulkIngestError`` if any entry is
+    invalid, in which case nothing is saved.
+    """
+    cleaned, errors = [], []
+    for position, data in enumerate(entries):
+        entry, fields, tags, entry_errors = _clean_entry(oplog, position, data)
+        cleaned.append((entry, fields, tags))
+        errors.extend(entry_errors)
+    if errors:
+        raise BulkIngestError(errors)
+
+    result = IngestResult()
+    now = timezone.now()
+    with transaction.atomic():
+        # Serializes batches sent to the same log, so two cannot both insert an identifier
+        Oplog.objects.select_for_update().get(pk=oplog.pk)
+        if connection.vendor == "postgresql":
+            # Hasura's event triggers would otherwise save and broadcast every row again
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('hasura.user', %s, true)",
+                    [json.dumps({BULK_INGEST_SESSION_VARIABLE: "true"})],
+                )
+
+        identifiers = {entry.entry_identifier for entry, _, _ in cleaned if entry.entry_identifier}
+        by_identifier = {}
+        for existing in OplogEntry.objects.filter(oplog_id=oplog, entry_identifier__in=identifiers).order_by("pk"):
+            by_identifier.setdefault(existing.entry_identifier, existing)
+
+        saved, to_create, to_update, updated_fields, tag_names = [], [], {}, {"updated_at"}, {}
+        for entry, fields, tags in cleaned:
+            target = by_identifier.get(entry.entry_identifier) if entry.entry_identifier else None
+            if target is None:
+                target = entry
+                to_create.append(target)
+                if entry.entry_identifier:
+                    by_identifier[entry.entry_identifier] = target
+            else:
+                for field_name in fields:
+                    setattr(target, field_name, getattr(entry, field_name))
+                if target.pk is not None:
+                    to_update[target.pk] = target
+                    updated_fields.update(fields)
+            saved.append(target)
+            tag_names.setdefault(id(target), set()).update(tags)
+
+        for entry in to_create:
+            # What ``oplog_pre_save`` and ``OplogEntry.save()`` do for entries saved one at a time
+            entry.start_date = entry.start_date or now
+            entry.end_date = entry.end_date or now
+            entry.updated_at = now
+            entry.sanitize_rich_fields()
+        for entry in to_update.values():
+            entry.updated_at = now
+            entry.sanitize_rich_fields()
+        OplogEntry.objects.bulk_create(to_create)
+        if to_update:
+            OplogEntry.objects.bulk_update(list(to_update.values()), sorted(updated_fields))
+
+        tags = _get_tags(name for names in tag_names.values() for name in names)
+        if tags:
+            content_type = ContentType.objects.get_for_model(OplogEntry)
+            TaggedItem.objects.bulk_create(
+                [
+                    TaggedItem(content_type=content_type, object_id=entry.pk, tag=tags[name])
+                    for entry in {id(entry): entry for entry in saved}.values()
+                    for name in tag_names[id(entry)]
+                ],
+                ignore_conflicts=True,
+            )
+
+        result.created = len(to_create)
+        result.updated = len(to_update)
+        result.entry_ids = [entry.pk for entry in saved]
+        entry_ids = list(dict.fromkeys(result.entry_ids))
+        transaction.on_commit(lambda: broadcast_entries(oplog.pk, entry_ids))
+    logger.info("Ingested %s new and %s updated entries into oplog %s", result.created, result.updated, oplog.pk)
+    return result
@@ -0,0 +1,119 @@
+"""Benchmark saving log entries one at a time against saving them in bulk."""
+
+# Standard Libraries
+import random
+import time
+from datetime import timedelta
+
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+# Ghostwriter Libraries
+from ghostwriter.oplog.ingest import ENTRY_FIELDS, broadcast_entries, ingest_entries
+from ghostwriter.oplog.management.commands.generate_log_entries import (
+    COMMANDS,
+    DESCRIPTIONS,
+    DEST_IPS,
+    OPERATORS,
+    SOURCE_IPS,
+    TAGS,
+    TOOLS,
+    USERS,
+)
+from ghostwriter.oplog.models import Oplog, OplogEntry
+
+
+class Rollback(Exception):
+    """Raised to roll back the entries saved by a benchmark."""
+
+
+def make_entry_data(index: int, base_time) -> dict:
+    """Build the ``bulkCreateOplogEntries`` input of an entry like a C2 server sync would send."""
+    start = base_time + timedelta(seconds=index)
+    return {
+        "entryIdentifier": f"benchmark-{index}",
+        "startDate": start,
+        "endDate": start + timedelta(seconds=random.randint(1, 300)),
+        "sourceIp": random.choice(SOURCE_IPS),
+        "destIp": random.choice(DEST_IPS),
+        "tool": random.choice(TOOLS),
+        "userContext": random.choice(USERS),
+        "operatorName": random.choice(OPERATORS),
+        "command": random.choice(COMMANDS),
+        "description": random.choice(DESCRIPTIONS),
+        "output": f"[Entry #{index}] Command completed successfully.",
+        "tags": random.sample(TAGS, random.randint(0, 3)),
+    }
+
+
+def save_one_at_a_time(oplog: Oplog, entries: list[dict]):
+    """Save every entry and its tags separately, firing the save and tag signals for each."""
+    for data in entries:
+        values = {ENTRY_FIELDS[name]: value for name, value in data.items() if name != "tags"}
+        entry = OplogEntry(oplog_id=oplog, **values)
+        entry.save()
+        entry.tags.add(*data["tags"])
+
+
+def save_in_bulk(oplog: Oplog, entries: list[dict], batch_size: int):
+    """Save the entries in batches of `batch_size` with one broadcast per batch."""
+    for first in range(0, len(entries), batch_size):
+        result = ingest_entries(oplog, entries[first : first + batch_size])
+        # The broadcast waits for a commit that the rolled-back benchmark never makes, so send it now
+        broadcast_entries(oplog.pk, result.entry_ids)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how many log entries per second are saved one at a time, as when integrations insert them "
+        "through GraphQL, and in bulk with the bulkCreateOplogEntries action. The entries are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("oplog_id", type=int, help="ID of the Oplog to save the entries in")
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=1000,
+            help="Number of entries to save with each method (default: 1000)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of entries in each bulk batch (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        if options["count"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--count and --batch-size must be at least 1")
+        try:
+            oplog = Oplog.objects.get(pk=options["oplog_id"])
+        except Oplog.DoesNotExist as exc:
+            raise CommandError(f"No Oplog found with ID {options['oplog_id']}.") from exc
+
+        base_time = timezone.now()
+        entries = [make_entry_data(index, base_time) for index in range(options["count"])]
+        methods = {
+            "one at a time": lambda: save_one_at_a_time(oplog, entries),
+            f"bulk ({options['batch_size']} per batch)": lambda: save_in_bulk(oplog, entries, options["batch_size"]),
+        }
+        rates = {}
+        for name, method in methods.items():
+            started = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    method()
+                    elapsed = time.perf_counter() - started
+                    raise Rollback
+            except Rollback:
+                pass
+            rates[name] = len(entries) / elapsed
+            self.stdout.write(f"{name:<24} {elapsed:8.3f}s {rates[name]:12,.1f} entries/s")
+
+        one_at_a_time, bulk = rates.values()
+        self.stdout.write(
+            self.style.SUCCESS(f"Bulk ingestion saves {bulk / one_at_a_time:,.1f}x as many entries per second")
+        )
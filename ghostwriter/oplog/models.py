@@ -279,9 +279,13 @@ class OplogEntry(models.Model):
     def user_can_delete(self, user) -> bool:
         return self.oplog_id.user_can_edit(user)
 
-    def save(self, *args, **kwargs):
+    def sanitize_rich_fields(self):
+        """Strip disallowed HTML tags and attributes from the rich-text fields."""
         self.description = _sanitize_rich_field(self.description)
         self.comments = _sanitize_rich_field(self.comments)
+
+    def save(self, *args, **kwargs):
+        self.sanitize_rich_fields()
         super().save(*args, **kwargs)
 
     def clean(self, *args, **kwargs):
@@ -6,7 +6,7 @@ import os
 # Django Imports
 from django.contrib import admin
 from django.urls import reverse
-from django.utils.html import format_html
+from django.utils.html import format_html, format_html_join
 
 # 3rd Party Libraries
 from import_export.admin import ImportExportMixin
@@ -25,6 +25,7 @@ from ghostwriter.reporting.models import (
     Observation,
     Report,
     ReportFindingLink,
+    ReportGenerationJob,
     ReportObservationLink,
     ReportTemplate,
     Severity,
@@ -195,6 +196,50 @@ class ReportAdmin(admin.ModelAdmin):
         return ", ".join(o.name for o in obj.tags.all())
 
 
+@admin.register(ReportGenerationJob)
+class ReportGenerationJobAdmin(admin.ModelAdmin):
+    list_display = ("report", "export_type", "status", "phase", "requested_by", "created", "finished")
+    list_filter = ("export_type", "status")
+    list_display_links = ("report", "export_type")
+    readonly_fields = ("created", "finished", "profile_report")
+    exclude = ("profile",)
+
+    def profile_report(self, obj):
+        """Display where the time of the generation went as tables of phases, sections and rich text fields."""
+        if not obj.profile:
+            return "Not profiled"
+        profile = obj.profile
+        table = '<table><thead><tr><th>{}</th><th>Seconds</th><th>{}</th></tr></thead><tbody>{}</tbody></table>'
+        return format_html(
+            "<p>{seconds} seconds, {queries} queries</p>" + table * 3,
+            "Phase",
+            "Queries",
+            format_html_join(
+                "",
+                "<tr><td>{}</td><td>{}</td><td>{}</td></tr>",
+                ((p["phase"], p["seconds"], p["queries"]) for p in profile.get("phases", ())),
+            ),
+            "Section",
+            "Calls",
+            format_html_join(
+                "",
+                "<tr><td>{}</td><td>{}</td><td>{}</td></tr>",
+                ((s["section"], s["seconds"], s["calls"]) for s in profile.get("sections", ())),
+            ),
+            "Slowest Rich Text",
+            "",
+            format_html_join(
+                "",
+                "<tr><td>{}</td><td>{}</td><td></td></tr>",
+                ((loc["location"], loc["seconds"]) for loc in profile.get("slowest_locations", ())),
+            ),
+            seconds=profile.get("seconds", 0),
+            queries=profile.get("queries", 0),
+        )
+
+    profile_report.short_description = "Profile"
+
+
 @admin.register(ReportFindingLink)
 class ReportFindingLinkAdmin(CollabAdminBase):
     list_display = ("report", "severity", "finding_type", "title", "complete", "tag_list")
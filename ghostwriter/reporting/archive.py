@@ -9,8 +9,8 @@ from django.db.transaction import atomic
 
 from ghostwriter.commandcenter.models import ReportConfiguration
 from ghostwriter.modules.exceptions import MissingTemplate
-from ghostwriter.modules.reportwriter.report.json import ExportReportJson
-from ghostwriter.modules.reportwriter.report.xlsx import ExportReportXlsx
+from ghostwriter.modules.zipstream import open_member
+from ghostwriter.reporting.generation import write_report_bundle
 from ghostwriter.reporting.models import Archive, Report
 
 def archive_report(report: Report):
@@ -33,14 +33,24 @@ def archive_report(report: Report):
 
     with tempfile.TemporaryFile("w+b") as arcfile:
         with zipfile.ZipFile(arcfile, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr("report.json", ExportReportJson(report).run().getvalue())
-            zf.writestr("report.xlsx", ExportReportXlsx(report).run().getvalue())
-            zf.writestr("report.docx", docx_template.exporter(report).run().getvalue())
-            zf.writestr("report.pptx", pptx_template.exporter(report).run().getvalue())
+            # Render every format, concurrently if a render pool is configured, and refuse to archive
+            # the report unless all of them succeeded
+            errors = write_report_bundle(
+                zf,
+                report,
+                [
+                    ("json", None, "report"),
+                    ("xlsx", None, "report"),
+                    ("docx", docx_template, "report"),
+                    ("pptx", pptx_template, "report"),
+                ],
+            )
+            if errors:
+                raise next(iter(errors.values()))
 
             for evi in evidences:
                 evi_file = evi.document
-                with zf.open("evidence/"+os.path.basename(evi_file.name), "w") as out_file:
+                with open_member(zf, "evidence/"+os.path.basename(evi_file.name), evi_file.size) as out_file:
                     copyfileobj(evi_file, out_file)
         arcfile.seek(0)
 
@@ -0,0 +1,523 @@
+"""
+This contains the benchmark suite for report generation.
+
+It builds synthetic reports with the model factories at several scales, times every exporter phase by phase (using
+the phases reported to ``progress_callback``), records the peak memory of each export, and compares the results to
+a stored baseline. Run it with the ``benchmark_exports`` management command.
+"""
+
+# Standard Libraries
+import gc
+import heapq
+import io
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+# Django Imports
+from django.db import transaction
+from django.db.models.functions import Length
+from django.test import override_settings
+
+# 3rd Party Libraries
+import docx
+import pptx
+from lxml import etree
+from PIL import Image
+
+# Ghostwriter Libraries
+from ghostwriter.commandcenter.models import ExtraFieldModel, ReportConfiguration
+from ghostwriter.modules.reportwriter.base.base import PHASE_SERIALIZE
+from ghostwriter.modules.reportwriter.base.docx import docx_subdoc_cache, docx_template_cache
+from ghostwriter.modules.reportwriter.base.pptx import pptx_template_cache
+from ghostwriter.modules.reportwriter.base.html_rich_text import rich_text_template_cache
+from ghostwriter.modules.reportwriter.project.docx import ExportProjectDocx
+from ghostwriter.modules.reportwriter.project.json import ExportProjectJson
+from ghostwriter.modules.reportwriter.project.pptx import ExportProjectPptx
+from ghostwriter.modules.reportwriter.report.base import serialize_report_snapshot
+from ghostwriter.modules.reportwriter.report.docx import ExportReportDocx
+from ghostwriter.modules.reportwriter.report.json import ExportReportJson
+from ghostwriter.modules.reportwriter.report.pptx import ExportReportPptx
+from ghostwriter.modules.reportwriter.report.xlsx import ExportReportXlsx
+from ghostwriter.modules.reportwriter.richtext.docx import HtmlToDocx, HtmlToDocxWithEvidence
+from ghostwriter.modules.reportwriter.richtext.ooxml import HTML_PARSERS
+from ghostwriter.modules.reportwriter.richtext.pptx import HtmlToPptx
+from ghostwriter.oplog.models import OplogEntry
+from ghostwriter.reporting.models import (
+    Finding,
+    Observation,
+    Report,
+    ReportFindingLink,
+    ReportObservationLink,
+    ReportTemplate,
+)
+
+# Bumped whenever the layout of the results changes, so older baselines are rejected instead of misread
+BASELINE_VERSION = 1
+
+# Phases and totals shorter than this are too noisy to compare against a baseline
+MIN_COMPARED_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class BenchmarkScale:
+    """The size of a synthetic report."""
+
+    name: str
+    findings: int
+    evidence: int
+    oplog_entries: int
+    extra_fields: int
+
+
+SCALES = {
+    scale.name: scale
+    for scale in (
+        BenchmarkScale("small", findings=10, evidence=5, oplog_entries=1_000, extra_fields=2),
+        BenchmarkScale("medium", findings=100, evidence=25, oplog_entries=1_000, extra_fields=5),
+        BenchmarkScale("large", findings=1_000, evidence=100, oplog_entries=100_000, extra_fields=10),
+        # Findings-heavy, for the slide decks
+        BenchmarkScale("deck", findings=300, evidence=30, oplog_entries=100, extra_fields=2),
+        # Log-heavy, for bundles, where serializing the log dominates
+        BenchmarkScale("oplog", findings=10, evidence=5, oplog_entries=50_000, extra_fields=2),
+    )
+}
+
+# Rich text fields whose largest values the rich text benchmark converts
+FINDING_RICH_TEXT_FIELDS = (
+    "description",
+    "impact",
+    "mitigation",
+    "replication_steps",
+    "host_detection_techniques",
+    "network_detection_techniques",
+    "references",
+)
+RICH_TEXT_FIELDS = (
+    (ReportFindingLink, FINDING_RICH_TEXT_FIELDS),
+    (Finding, FINDING_RICH_TEXT_FIELDS),
+    (ReportObservationLink, ("description",)),
+    (Observation, ("description",)),
+)
+
+# Exporters to benchmark, by name, with a function that creates one for a report
+EXPORTERS: dict[str, Callable] = {
+    "ExportReportDocx": lambda report, **kwargs: ExportReportDocx(
+        report, report_template=report.docx_template, **kwargs
+    ),
+    "ExportReportPptx": lambda report, **kwargs: ExportReportPptx(
+        report, report_template=report.pptx_template, **kwargs
+    ),
+    "ExportReportXlsx": lambda report, **kwargs: ExportReportXlsx(report, **kwargs),
+    "ExportReportJson": lambda report, **kwargs: ExportReportJson(report, **kwargs),
+    "ExportProjectDocx": lambda report, **kwargs: ExportProjectDocx(
+        report.project, report_template=report.docx_template, **kwargs
+    ),
+    "ExportProjectPptx": lambda report, **kwargs: ExportProjectPptx(
+        report.project, report_template=report.pptx_template, **kwargs
+    ),
+    "ExportProjectJson": lambda report, **kwargs: ExportProjectJson(report.project, **kwargs),
+}
+
+
+class ReportBundleExport:
+    """
+    Exports every format of a report bundle one after another, like "Generate All" does without a render pool.
+
+    With `shared_snapshot`, the report is serialized once and the snapshot is shared between the exporters, as
+    bundles are generated. Without it, every exporter serializes the report itself, for comparison.
+    """
+
+    def __init__(self, report: Report, *, shared_snapshot: bool, progress_callback=None):
+        self.report = report
+        self.shared_snapshot = shared_snapshot
+        self.progress_callback = progress_callback
+
+    def run(self):
+        snapshot = None
+        if self.shared_snapshot:
+            self.progress_callback(PHASE_SERIALIZE)
+            snapshot = serialize_report_snapshot(self.report)
+        for name in ("ExportReportDocx", "ExportReportPptx", "ExportReportXlsx", "ExportReportJson"):
+            EXPORTERS[name](self.report, snapshot=snapshot, progress_callback=self.progress_callback).run()
+
+
+# Every report format in one bundle, with and without sharing the serialized report between the exporters
+EXPORTERS["ReportBundle"] = lambda report, **kwargs: ReportBundleExport(report, shared_snapshot=True, **kwargs)
+EXPORTERS["ReportBundleUnshared"] = lambda report, **kwargs: ReportBundleExport(report, shared_snapshot=False, **kwargs)
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A measurement that got worse than its baseline by more than the allowed threshold."""
+
+    scale: str
+    exporter: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1
+
+    def __str__(self):
+        if self.metric == "peak_memory":
+            baseline, current = f"{self.baseline / 2**20:.1f} MiB", f"{self.current / 2**20:.1f} MiB"
+        else:
+            baseline, current = f"{self.baseline:.3f}s", f"{self.current:.3f}s"
+        return f"{self.scale} {self.exporter} {self.metric}: {baseline} -> {current} (+{self.change:.0%})"
+
+
+def _evidence_image() -> bytes:
+    """Returns a PNG the size of a typical full-screen screenshot."""
+    image = Image.linear_gradient("L").resize((1920, 1080)).convert("RGB")
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+def _extra_field_specs(model, count: int) -> list:
+    """Creates `count` extra fields for `model`, alternating between rich text and single line text."""
+    # Imported here because the factories are only installed in development environments
+    from ghostwriter.factories import (  # pylint: disable=import-outside-toplevel
+        ExtraFieldModelFactory,
+        ExtraFieldSpecFactory,
+    )
+
+    target_model = ExtraFieldModel.objects.filter(pk=model._meta.label).first()
+    if target_model is None:
+        target_model = ExtraFieldModelFactory(
+            model_internal_name=model._meta.label,
+            model_display_name=str(model._meta.verbose_name_plural),
+        )
+    return [
+        ExtraFieldSpecFactory(
+            internal_name=f"benchmark_{i}",
+            type="rich_text" if i % 2 == 0 else "single_line_text",
+            target_model=target_model,
+        )
+        for i in range(count)
+    ]
+
+
+def _extra_field_values(specs) -> dict:
+    return {
+        spec.internal_name: (
+            f"<p>Rich text for <strong>{spec.display_name}</strong></p>"
+            if spec.type == "rich_text"
+            else spec.display_name
+        )
+        for spec in specs
+    }
+
+
+def build_benchmark_report(scale: BenchmarkScale) -> Report:
+    """Creates a report of the given `scale` with the model factories."""
+    # Imported here because the factories are only installed in development environments
+    from factory.django import FileField  # pylint: disable=import-outside-toplevel
+
+    from ghostwriter.factories import (  # pylint: disable=import-outside-toplevel
+        EvidenceFactory,
+        FindingTypeFactory,
+        OplogEntryFactory,
+        OplogFactory,
+        ReportFactory,
+        ReportFindingLinkFactory,
+        SeverityFactory,
+        UserFactory,
+    )
+
+    report_fields = _extra_field_values(_extra_field_specs(Report, scale.extra_fields))
+    finding_fields = _extra_field_values(_extra_field_specs(Finding, scale.extra_fields))
+    entry_fields = _extra_field_values(_extra_field_specs(OplogEntry, scale.extra_fields))
+
+    report = ReportFactory(extra_fields=report_fields)
+
+    image = _evidence_image()
+    evidence_names = [f"benchmark_evidence_{i}" for i in range(scale.evidence)]
+    for name in evidence_names:
+        EvidenceFactory(
+            report=report,
+            friendly_name=name,
+            document=FileField(filename=f"{name}.png", data=image),
+        )
+
+    # Share the related objects, as creating them for every finding would dominate the setup time
+    severity = SeverityFactory()
+    finding_type = FindingTypeFactory()
+    user = UserFactory()
+    for i in range(scale.findings):
+        evidence = f"<p>{{{{.{evidence_names[i % scale.evidence]}}}}}</p>" if evidence_names else ""
+        ReportFindingLinkFactory(
+            report=report,
+            position=i + 1,
+            severity=severity,
+            finding_type=finding_type,
+            assigned_to=user,
+            description=(
+                f"<p>Finding {i} has a <strong>description</strong> with a list:</p>"
+                "<ul><li>First item</li><li>Second item with <a href='https://example.com'>a link</a></li></ul>"
+                f"{evidence}"
+            ),
+            extra_fields=finding_fields,
+        )
+
+    oplog = OplogFactory(project=report.project)
+    OplogEntry.objects.bulk_create(
+        OplogEntryFactory.build_batch(scale.oplog_entries, oplog_id=oplog, extra_fields=entry_fields),
+        batch_size=1_000,
+    )
+    return Report.objects.get(pk=report.pk)
+
+
+def clear_export_caches():
+    """Empties the caches exporters keep between exports, so each export starts cold."""
+    docx_template_cache.clear()
+    docx_subdoc_cache.clear()
+    pptx_template_cache.clear()
+    rich_text_template_cache.clear()
+
+
+def _run_export(create_exporter: Callable, report: Report) -> dict[str, float]:
+    """Runs one export and returns how long each phase took."""
+    marks = []
+    start = time.perf_counter()
+    exporter = create_exporter(report, progress_callback=lambda phase: marks.append((phase, time.perf_counter())))
+    exporter.run()
+    end = time.perf_counter()
+
+    # Any setup before the first phase is counted as part of it
+    phases = {}
+    if marks:
+        marks[0] = (marks[0][0], start)
+    for (phase, began), (_, ended) in zip(marks, marks[1:] + [(None, end)]):
+        phases[phase] = phases.get(phase, 0) + ended - began
+    phases["total"] = end - start
+    return phases
+
+
+def measure_export(
+    create_exporter: Callable, report: Report, *, repeat: int = 1, track_memory: bool = True, warm: bool = False
+) -> dict:
+    """
+    Measures exporting `report` with the exporter from `create_exporter`.
+
+    The export is timed `repeat` times and the fastest run is kept. Peak memory is measured in an additional run, as
+    tracing allocations slows the export down. Unless `warm` is set, the export caches are cleared before each run.
+    """
+    runs = []
+    for _ in range(repeat):
+        if not warm:
+            clear_export_caches()
+        gc.collect()
+        runs.append(_run_export(create_exporter, report))
+    phases = min(runs, key=lambda run: run["total"])
+    result = {"total": phases.pop("total"), "phases": phases, "peak_memory": None}
+
+    if track_memory:
+        if not warm:
+            clear_export_caches()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            _run_export(create_exporter, report)
+            result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(
+    scales: Iterable[BenchmarkScale],
+    exporters: Iterable[str] | None = None,
+    *,
+    repeat: int = 1,
+    track_memory: bool = True,
+    warm: bool = False,
+    on_result: Callable[[str, str, dict], None] | None = None,
+) -> dict:
+    """
+    Benchmarks each of the `exporters` (names from `EXPORTERS`, or all of them) at each of the `scales`.
+
+    The synthetic reports are rolled back and their files deleted afterwards. Returns the results in the format
+    stored as a baseline; `on_result` is called with each result as it is measured.
+    """
+    exporters = list(exporters or EXPORTERS)
+    results = {}
+    with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+        for scale in scales:
+            results[scale.name] = {}
+            with transaction.atomic():
+                report = build_benchmark_report(scale)
+                try:
+                    for name in exporters:
+                        result = measure_export(
+                            EXPORTERS[name], report, repeat=repeat, track_memory=track_memory, warm=warm
+                        )
+                        results[scale.name][name] = result
+                        if on_result is not None:
+                            on_result(scale.name, name, result)
+                finally:
+                    # Templates are stored outside of the media directory
+                    for template in (report.docx_template, report.pptx_template):
+                        template.document.delete(save=False)
+                    clear_export_caches()
+                    transaction.set_rollback(True)
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def load_baseline(path: str) -> dict:
+    """Loads results saved by `save_baseline`."""
+    with open(path, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"The baseline in {path} was saved by an incompatible version of the benchmarks")
+    return baseline
+
+
+def save_baseline(path: str, results: dict):
+    """Saves the results of `run_benchmarks` to compare later runs against."""
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> list[Regression]:
+    """
+    Returns every measurement in `results` that is more than `threshold` (a fraction, so 0.25 is 25%) worse
+    than in `baseline`. Scales and exporters missing from either side are skipped.
+    """
+    regressions = []
+    for scale, exporters in results["results"].items():
+        for exporter, current in exporters.items():
+            previous = baseline["results"].get(scale, {}).get(exporter)
+            if previous is None:
+                continue
+
+            measurements = [("total", previous["total"], current["total"])]
+            measurements.extend(
+                (f"phase:{phase}", previous["phases"][phase], duration)
+                for phase, duration in current["phases"].items()
+                if phase in previous["phases"]
+            )
+            for metric, before, after in measurements:
+                if before >= MIN_COMPARED_SECONDS and after > before * (1 + threshold):
+                    regressions.append(Regression(scale, exporter, metric, before, after))
+
+            before, after = previous.get("peak_memory"), current.get("peak_memory")
+            if before and after and after > before * (1 + threshold):
+                regressions.append(Regression(scale, exporter, "peak_memory", before, after))
+    return regressions
+
+
+def largest_rich_texts(limit: int = 20) -> list[tuple[str, str]]:
+    """
+    Returns the `limit` longest values of the `RICH_TEXT_FIELDS` as ``(location, HTML)`` pairs, longest first.
+    """
+    texts = []
+    for model, fields in RICH_TEXT_FIELDS:
+        for field in fields:
+            rows = (
+                model.objects.annotate(length=Length(field))
+                .filter(length__gt=0)
+                .order_by("-length")
+                .values_list("pk", field)[:limit]
+            )
+            texts.extend((f"the {field} of {model._meta.verbose_name} {pk}", html) for pk, html in rows)
+    return heapq.nlargest(limit, texts, key=lambda text: len(text[1]))
+
+
+def _convert_to_docx(html: str) -> tuple[float, bytes]:
+    doc = docx.Document()
+    start = time.perf_counter()
+    HtmlToDocx.run(html, doc, None)
+    return time.perf_counter() - start, etree.tostring(doc.element.body)
+
+
+def _convert_to_pptx(html: str) -> tuple[float, bytes]:
+    presentation = pptx.Presentation()
+    slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+    shape = slide.shapes.placeholders[1]
+    start = time.perf_counter()
+    HtmlToPptx.run(html, slide, shape)
+    return time.perf_counter() - start, etree.tostring(shape.text_frame._txBody)
+
+
+# Rich text conversions to benchmark, by output format, with a function that times one and returns its output
+RICH_TEXT_CONVERSIONS: dict[str, Callable[[str], tuple[float, bytes]]] = {
+    "docx": _convert_to_docx,
+    "pptx": _convert_to_pptx,
+}
+
+
+def benchmark_rich_text(
+    texts: Iterable[tuple[str, str]], parsers: Iterable[str] | None = None, *, repeat: int = 3
+) -> dict:
+    """
+    Times converting each of the ``(location, HTML)`` `texts` to every format in `RICH_TEXT_CONVERSIONS` with each of
+    the `parsers` (names from `HTML_PARSERS`, or all of them). The fastest of `repeat` runs of each conversion is kept.
+
+    Returns the total seconds by parser and format, and the locations of the texts whose output differs between the
+    parsers, which should be none.
+    """
+    parsers = list(parsers or HTML_PARSERS)
+    texts = list(texts)
+    seconds = {parser: dict.fromkeys(RICH_TEXT_CONVERSIONS, 0.0) for parser in parsers}
+    mismatches = []
+    for location, html in texts:
+        outputs = {}
+        for parser in parsers:
+            with override_settings(GHOSTWRITER_RICH_TEXT_PARSER=parser):
+                for output_format, convert in RICH_TEXT_CONVERSIONS.items():
+                    runs = [convert(html) for _ in range(repeat)]
+                    seconds[parser][output_format] += min(duration for duration, _ in runs)
+                    outputs.setdefault(output_format, set()).add(runs[0][1])
+        if any(len(output) > 1 for output in outputs.values()):
+            mismatches.append(location)
+    return {
+        "texts": len(texts),
+        "characters": sum(len(html) for _, html in texts),
+        "seconds": seconds,
+        "mismatches": mismatches,
+    }
+
+
+def benchmark_image_insertion(counts: Iterable[int], *, repeat: int = 3) -> dict[int, float]:
+    """
+    Times adding each of `counts` bordered evidence images to an empty Word document, keeping the fastest of `repeat`
+    runs. Returns the seconds taken per image for each count, which should stay about the same as the count grows.
+    """
+    report_config = ReportConfiguration.get_solo()
+    report_config.enable_borders = True
+    report_template = ReportTemplate()
+
+    per_image = {}
+    with tempfile.NamedTemporaryFile(suffix=".png") as image_file:
+        # Small enough to be embedded as-is, so only inserting the image is timed
+        Image.new("RGB", (64, 64)).save(image_file, format="PNG")
+        image_file.flush()
+        for count in counts:
+            runs = []
+            for _ in range(repeat):
+                doc = docx.Document()
+                converter = HtmlToDocxWithEvidence(
+                    doc,
+                    evidences={},
+                    report_template=report_template,
+                    global_report_config=report_config,
+                    images={},
+                )
+                start = time.perf_counter()
+                for _ in range(count):
+                    converter._make_image(doc.add_paragraph(), image_file.name)
+                runs.append(time.perf_counter() - start)
+            per_image[count] = min(runs) / count
+    return per_image
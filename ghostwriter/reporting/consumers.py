@@ -8,7 +8,7 @@ from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
 # Ghostwriter Libraries
-from ghostwriter.reporting.models import Report, ReportFindingLink
+from ghostwriter.reporting.models import Report, ReportFindingLink, ReportTemplate
 
 
 def user_can_access_report(report_id, user):
@@ -33,8 +33,20 @@ def user_can_access_report_finding(finding_id, user):
     return finding.user_can_view(user)
 
 
+def user_can_access_report_template(template_id, user):
+    """Return whether the user can connect to a report-template WebSocket group."""
+    if not user.is_active:
+        return False
+    try:
+        template = ReportTemplate.objects.get(pk=template_id)
+    except (ReportTemplate.DoesNotExist, ValueError, TypeError):
+        return False
+    return template.user_can_view(user)
+
+
 user_can_access_report_async = database_sync_to_async(user_can_access_report)
 user_can_access_report_finding_async = database_sync_to_async(user_can_access_report_finding)
+user_can_access_report_template_async = database_sync_to_async(user_can_access_report_template)
 
 
 class ReportConsumer(AsyncWebsocketConsumer):
@@ -109,3 +121,33 @@ class ReportFindingConsumer(AsyncWebsocketConsumer):
     async def message(self, event):
         message = event["message"]
         await self.send(text_data=json.dumps({"message": message}))
+
+
+class ReportTemplateConsumer(AsyncWebsocketConsumer):
+    """Handle notifications related to individual :model:`reporting.ReportTemplate` entries over WebSockets."""
+
+    def __init__(self):
+        super().__init__()
+        self.user = None
+        self.template_id = None
+        self.template_group_name = None
+
+    async def connect(self):
+        self.user = self.scope["user"]
+        self.template_id = self.scope["url_route"]["kwargs"]["template_id"]
+        if not await user_can_access_report_template_async(self.template_id, self.user):
+            await self.close(code=4403)
+            return
+
+        self.template_group_name = "template_%s" % self.template_id
+        await self.channel_layer.group_add(self.template_group_name, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        if self.user and self.template_group_name and self.user.is_active:
+            await self.channel_layer.group_discard(self.template_group_name, self.channel_name)
+
+    # Message type of ``status_update`` for lint results
+    async def status_update(self, event):
+        message = event["message"]
+        await self.send(text_data=json.dumps({"message": message}))
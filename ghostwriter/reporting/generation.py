@@ -0,0 +1,452 @@
+"""This contains the helpers used to generate report documents outside of the request cycle."""
+
+# Standard Libraries
+import io
+import json
+import logging
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from socket import gaierror
+
+# Django Imports
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+# 3rd Party Libraries
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+# Ghostwriter Libraries
+from ghostwriter.commandcenter.models import ReportConfiguration
+from ghostwriter.modules.exceptions import MissingTemplate
+from ghostwriter.modules.reportwriter import report_generation_queryset
+from ghostwriter.modules.reportwriter.base import ReportExportError
+from ghostwriter.modules.reportwriter.base.base import (
+    PHASE_RENDER,
+    PHASE_SAVE,
+    PHASE_SERIALIZE,
+    SerializedSnapshot,
+)
+from ghostwriter.modules.reportwriter.profiling import ExportProfile
+from ghostwriter.modules.reportwriter.report.base import serialize_report_snapshot
+from ghostwriter.modules.reportwriter.report.docx import ExportReportDocx
+from ghostwriter.modules.reportwriter.report.json import ExportReportJson
+from ghostwriter.modules.reportwriter.report.pptx import ExportReportPptx
+from ghostwriter.modules.reportwriter.report.xlsx import ExportReportXlsx
+from ghostwriter.modules.zipstream import write_member
+from ghostwriter.reporting.models import Report, ReportGenerationJob, ReportTemplate
+
+# Using __name__ resolves to ghostwriter.reporting.generation
+logger = logging.getLogger(__name__)
+
+# Formats generated for a full bundle, in the order they are generated
+BUNDLE_DOC_TYPES = ("docx", "pptx", "xlsx", "json")
+
+# Lazily created by `get_render_pool`
+_render_pool: ProcessPoolExecutor | None = None
+
+
+def get_report_template(report: Report, doc_type: str, report_config: ReportConfiguration | None = None):
+    """
+    Return the ``docx`` or ``pptx`` :model:`reporting.ReportTemplate` selected for the report,
+    falling back to the global default. Raises ``MissingTemplate`` if neither is set.
+    """
+    if report_config is None:
+        report_config = ReportConfiguration.get_solo()
+    if doc_type == "docx":
+        template = report.docx_template or report_config.default_docx_template
+    else:
+        template = report.pptx_template or report_config.default_pptx_template
+    if not template:
+        raise MissingTemplate()
+    return template
+
+
+def report_bundle_members(
+    report: Report, export_type: str, report_config: ReportConfiguration | None = None
+) -> list[tuple[str, ReportTemplate | None, str]]:
+    """
+    List the documents generated for an ``export_type`` (see :model:`reporting.ReportGenerationJob`).
+
+    Returns a list of ``(doc_type, template, filename_template)`` tuples.
+    """
+    if report_config is None:
+        report_config = ReportConfiguration.get_solo()
+    members = []
+    for doc_type in BUNDLE_DOC_TYPES:
+        if export_type not in (doc_type, "all"):
+            continue
+        if doc_type in ("docx", "pptx"):
+            template = get_report_template(report, doc_type, report_config)
+            members.append((doc_type, template, template.filename_override or report_config.report_filename))
+        else:
+            members.append((doc_type, None, report_config.report_filename))
+    if not members:
+        raise ValueError(f"Unknown export type: {export_type}")
+    return members
+
+
+def create_report_exporter(report: Report, doc_type: str, template: ReportTemplate | None = None, **kwargs):
+    """Create the exporter for one ``doc_type`` of a report."""
+    if doc_type == "docx":
+        return ExportReportDocx(report, report_template=template, **kwargs)
+    if doc_type == "pptx":
+        return ExportReportPptx(report, report_template=template, **kwargs)
+    if doc_type == "xlsx":
+        return ExportReportXlsx(report, **kwargs)
+    if doc_type == "json":
+        return ExportReportJson(report, **kwargs)
+    raise ValueError(f"Unknown export type: {doc_type}")
+
+
+def report_exporters(report: Report, export_type: str, *, progress_callback=None, profile: ExportProfile | None = None):
+    """
+    Build the exporters for an ``export_type`` (see :model:`reporting.ReportGenerationJob`).
+
+    Returns a list of ``(exporter, filename_template)`` tuples.
+    """
+    kwargs = {
+        "include_bloodhound": report.include_bloodhound_data,
+        "progress_callback": progress_callback,
+        "profile": profile,
+    }
+    if export_type == "all":
+        # Serialize the report once and share it between all of the exporters
+        kwargs["snapshot"] = serialize_report_snapshot(report, include_bloodhound=report.include_bloodhound_data)
+
+    return [
+        (create_report_exporter(report, doc_type, template, **kwargs), filename_template)
+        for doc_type, template, filename_template in report_bundle_members(report, export_type)
+    ]
+
+
+def _init_render_worker():
+    """Set up Django in a freshly spawned render worker process."""
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
+
+
+def get_render_pool() -> ProcessPoolExecutor | None:
+    """
+    Return the process pool used to render bundle members concurrently, or ``None`` if bundles
+    should be rendered in the current process.
+
+    Workers are spawned rather than forked so they never share the parent's database connections.
+    Daemonic processes cannot have children, so they always render in-process. This includes the django-q
+    workers, so background generation jobs (`generate_report_job`) and scheduled archiving always render serially.
+    """
+    global _render_pool  # pylint: disable=global-statement
+    workers = settings.GHOSTWRITER_REPORT_RENDER_WORKERS
+    if workers <= 0 or multiprocessing.current_process().daemon:
+        return None
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_render_worker,
+        )
+    return _render_pool
+
+
+def _discard_render_pool():
+    global _render_pool  # pylint: disable=global-statement
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def _enter_phase(phase, progress_callback, profile):
+    if profile is not None:
+        profile.start_phase(phase)
+    if progress_callback is not None:
+        progress_callback(phase)
+
+
+def _render_bundle_member(report_id, doc_type, template_id, filename_template, include_bloodhound, data):
+    """
+    Render one member of a bundle in a render worker process. Returns the filename, the file contents
+    and the member's profile (see `ExportProfile.as_dict`).
+    """
+    profile = ExportProfile()
+    with profile.capture():
+        report = report_generation_queryset().get(pk=report_id)
+        template = ReportTemplate.objects.get(pk=template_id) if template_id is not None else None
+        exporter = create_report_exporter(
+            report,
+            doc_type,
+            template,
+            include_bloodhound=include_bloodhound,
+            snapshot=SerializedSnapshot.from_data(report, data),
+            profile=profile,
+        )
+        filename, content = exporter.render_filename(filename_template), exporter.run().getvalue()
+    return filename, content, profile.as_dict()
+
+
+def iter_report_bundle(
+    report: Report,
+    members: list[tuple[str, ReportTemplate | None, str]],
+    *,
+    include_bloodhound: bool = True,
+    snapshot: SerializedSnapshot | None = None,
+    progress_callback=None,
+    profile: ExportProfile | None = None,
+):
+    """
+    Render the ``(doc_type, template, filename_template)`` members of a bundle (see
+    `report_bundle_members`) and yield ``(doc_type, filename, content, error)`` for each one.
+
+    Members are rendered concurrently in the render pool, if one is configured, and yielded as they
+    finish. A failed member does not stop the others; it is yielded with the exception as ``error``
+    and ``None`` for the filename and content.
+
+    If a `profile` is given, the sections and rich text fields of members rendered in the pool are added to it.
+    """
+    if snapshot is None:
+        snapshot = serialize_report_snapshot(report, include_bloodhound=include_bloodhound)
+
+    pool = get_render_pool()
+    if pool is None:
+        for doc_type, template, filename_template in members:
+            try:
+                exporter = create_report_exporter(
+                    report,
+                    doc_type,
+                    template,
+                    include_bloodhound=include_bloodhound,
+                    snapshot=snapshot,
+                    progress_callback=progress_callback,
+                    profile=profile,
+                )
+                filename, content = exporter.render_filename(filename_template), exporter.run().getvalue()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to generate the %s document for report %s", doc_type, report.pk)
+                yield doc_type, None, None, error
+                continue
+            yield doc_type, filename, content, None
+        return
+
+    _enter_phase(PHASE_RENDER, progress_callback, profile)
+    futures = {
+        pool.submit(
+            _render_bundle_member,
+            report.pk,
+            doc_type,
+            template.pk if template is not None else None,
+            filename_template,
+            include_bloodhound,
+            snapshot.data,
+        ): doc_type
+        for doc_type, template, filename_template in members
+    }
+    try:
+        for future in as_completed(futures):
+            doc_type = futures[future]
+            try:
+                filename, content, member_profile = future.result()
+            except BrokenProcessPool as error:
+                logger.exception(
+                    "Render worker died while generating the %s document for report %s", doc_type, report.pk
+                )
+                _discard_render_pool()
+                yield doc_type, None, None, error
+                continue
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.exception("Failed to generate the %s document for report %s", doc_type, report.pk)
+                yield doc_type, None, None, error
+                continue
+            if profile is not None:
+                profile.merge(member_profile)
+            yield doc_type, filename, content, None
+    finally:
+        # Nothing is waiting for the rest if the caller stopped early, e.g. because the client went away
+        for future in futures:
+            future.cancel()
+    _enter_phase(PHASE_SAVE, progress_callback, profile)
+
+
+def write_report_bundle(
+    zf: zipfile.ZipFile,
+    report: Report,
+    members: list[tuple[str, ReportTemplate | None, str]],
+    *,
+    include_bloodhound: bool = True,
+    snapshot: SerializedSnapshot | None = None,
+    progress_callback=None,
+    profile: ExportProfile | None = None,
+) -> dict[str, Exception]:
+    """
+    Render the members of a bundle with `iter_report_bundle` and write each document into ``zf``.
+
+    Returns the errors of the members that failed, keyed by ``doc_type``.
+    """
+    errors = {}
+    for doc_type, filename, content, error in iter_report_bundle(
+        report,
+        members,
+        include_bloodhound=include_bloodhound,
+        snapshot=snapshot,
+        progress_callback=progress_callback,
+        profile=profile,
+    ):
+        if error is not None:
+            errors[doc_type] = error
+        else:
+            write_member(zf, filename, content)
+    return errors
+
+
+def export_report(
+    report: Report, export_type: str, *, progress_callback=None, profile: ExportProfile | None = None
+) -> tuple[str, io.BytesIO]:
+    """
+    Generate the document(s) for an ``export_type``. Returns the filename and the file contents.
+
+    The ``all`` type produces a Zip file containing every format that could be generated. It
+    only fails if none of them could be.
+    """
+    if export_type != "all":
+        exporter, filename_template = report_exporters(
+            report, export_type, progress_callback=progress_callback, profile=profile
+        )[0]
+        filename = exporter.render_filename(filename_template)
+        return filename, exporter.run()
+
+    report_config = ReportConfiguration.get_solo()
+    members = report_bundle_members(report, export_type, report_config)
+    _enter_phase(PHASE_SERIALIZE, progress_callback, profile)
+    snapshot = serialize_report_snapshot(report, include_bloodhound=report.include_bloodhound_data)
+    zip_filename = ExportReportJson(report, snapshot=snapshot).render_filename(report_config.report_filename, ext="zip")
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "a") as zf:
+        errors = write_report_bundle(
+            zf,
+            report,
+            members,
+            include_bloodhound=report.include_bloodhound_data,
+            snapshot=snapshot,
+            progress_callback=progress_callback,
+            profile=profile,
+        )
+    if len(errors) == len(members):
+        raise next(iter(errors.values()))
+    zip_buffer.seek(0)
+    return zip_filename, zip_buffer
+
+
+def send_report_status(report_id: int, message: dict):
+    """Send a ``status_update`` message to the report's WebSocket group."""
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            "report_{}".format(report_id),
+            {
+                "type": "status_update",
+                "message": message,
+            },
+        )
+    except gaierror:
+        # WebSocket are unavailable (unit testing)
+        logger.debug("Unable to send report status update over WebSocket.", exc_info=True)
+
+
+def log_report_generation_profile(subject: str, profile: ExportProfile, **fields) -> dict:
+    """
+    Log the `profile` of a report generation as JSON, along with the `fields` that describe the generation (e.g.,
+    its export type and status), so log aggregators can pick it apart. Returns the profile as `ExportProfile.as_dict`.
+    """
+    data = profile.as_dict()
+    logger.info(
+        "%s profile: %s", subject, json.dumps({**fields, **data}), extra={"report_generation_profile": data}
+    )
+    return data
+
+
+def _log_report_generation_profile(job: ReportGenerationJob, profile: ExportProfile):
+    """Store the job's profile on it and log it."""
+    job.profile = log_report_generation_profile(
+        f"Report generation job {job.pk}",
+        profile,
+        job=job.pk,
+        export_type=job.export_type,
+        status=job.status,
+    )
+
+
+def _fail_report_generation_job(job: ReportGenerationJob, error: str, profile: ExportProfile) -> ReportGenerationJob:
+    job.status = ReportGenerationJob.Status.FAILED
+    job.error = error
+    job.finished = timezone.now()
+    _log_report_generation_profile(job, profile)
+    job.save(update_fields=["status", "error", "finished", "profile"])
+    send_report_status(job.report_id, {"status": "failed", "job": job.pk, "error": error})
+    return job
+
+
+def fail_stale_report_generation_jobs(stale_before) -> int:
+    """
+    Fail the pending and running :model:`reporting.ReportGenerationJob` entries created before `stale_before`,
+    e.g. because the worker running them crashed or the queue dropped them, so users can request them again.
+    Returns the number of jobs failed.
+    """
+    error = "The job did not finish in time, so the report generation worker may have stopped; try again"
+    failed = 0
+    stale_jobs = ReportGenerationJob.objects.filter(
+        status__in=[ReportGenerationJob.Status.PENDING, ReportGenerationJob.Status.RUNNING],
+        created__lt=stale_before,
+    )
+    for job in stale_jobs:
+        # Only fail the job if a worker did not finish it in the meantime
+        if ReportGenerationJob.objects.filter(pk=job.pk, status=job.status).update(
+            status=ReportGenerationJob.Status.FAILED, error=error, finished=timezone.now()
+        ):
+            send_report_status(job.report_id, {"status": "failed", "job": job.pk, "error": error})
+            failed += 1
+    return failed
+
+
+def run_report_generation_job(job: ReportGenerationJob):
+    """
+    Generate the document for a :model:`reporting.ReportGenerationJob` and store it on the job.
+
+    Progress phases and the final result are sent to the report's WebSocket group. Where the time went
+    is stored in the job's ``profile`` (see `ExportProfile`) and logged.
+    """
+    job.status = ReportGenerationJob.Status.RUNNING
+    job.save(update_fields=["status"])
+
+    def on_progress(phase):
+        job.phase = phase
+        job.save(update_fields=["phase"])
+        send_report_status(
+            job.report_id,
+            {"status": "progress", "job": job.pk, "phase": phase},
+        )
+
+    profile = ExportProfile()
+    try:
+        with profile.capture():
+            filename, output = export_report(
+                job.report, job.export_type, progress_callback=on_progress, profile=profile
+            )
+    except (ReportExportError, MissingTemplate, ValueError) as error:
+        logger.error("Report generation job %s failed: %s", job.pk, error)
+        return _fail_report_generation_job(job, str(error), profile)
+    except Exception:
+        logger.exception("Report generation job %s failed unexpectedly", job.pk)
+        return _fail_report_generation_job(job, "Encountered an unexpected error generating the document", profile)
+
+    job.filename = filename
+    job.output.save(f"{job.pk}_{filename}", ContentFile(output.getvalue()), save=False)
+    job.status = ReportGenerationJob.Status.SUCCESS
+    job.finished = timezone.now()
+    _log_report_generation_profile(job, profile)
+    job.save(update_fields=["filename", "output", "status", "finished", "profile"])
+    send_report_status(
+        job.report_id,
+        {"status": "success", "job": job.pk, "download_url": job.get_download_url()},
+    )
+    return job
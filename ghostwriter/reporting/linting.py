@@ -0,0 +1,285 @@
+"""This contains the background linting of uploaded :model:`reporting.ReportTemplate` files."""
+
+# Standard Libraries
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import timedelta
+from socket import gaierror
+
+# Django Imports
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+# 3rd Party Libraries
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django_q.tasks import async_task
+
+# Ghostwriter Libraries
+from ghostwriter.reporting.models import ReportTemplate
+
+# Using __name__ resolves to ghostwriter.reporting.linting
+logger = logging.getLogger(__name__)
+
+# Lint results stored while the linter task is queued or running
+PENDING_LINT_RESULT = {"result": "pending", "warnings": [], "errors": []}
+
+
+def send_template_lint_status(template_id: int, message: dict):
+    """Send a ``status_update`` message to the template's WebSocket group."""
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            "template_{}".format(template_id),
+            {
+                "type": "status_update",
+                "message": message,
+            },
+        )
+    except gaierror:
+        # WebSocket are unavailable (unit testing)
+        logger.debug("Unable to send template lint status update over WebSocket.", exc_info=True)
+
+
+def _store_lint_result(template: ReportTemplate):
+    # Update the row directly so saving does not fire the template's signals again
+    ReportTemplate.objects.filter(pk=template.pk).update(lint_result=template.lint_result)
+
+
+def _pending_lint_result(cache_key: str | None) -> dict:
+    # Lets `queue_stale_template_lints` queue the template again if its task never finishes
+    lint_result = dict(PENDING_LINT_RESULT, queued_at=timezone.now().isoformat())
+    if cache_key:
+        # Lets the task that lints an identical file resolve this template, too
+        lint_result["lint_key"] = cache_key
+    return lint_result
+
+
+def _queue_lint_task(template_id: int, document_name: str, use_cache: bool = True):
+    # Queue the task only once the new file and pending status are visible to the worker
+    transaction.on_commit(
+        lambda: async_task(
+            "ghostwriter.reporting.tasks.lint_report_template",
+            template_id,
+            document_name,
+            use_cache=use_cache,
+            group="Template Linting",
+        )
+    )
+    logger.info("Queued linting of template %s (%s)", template_id, document_name)
+
+
+def queue_template_lint(template: ReportTemplate):
+    """
+    Lint the template's current file and store the results.
+
+    Memoized results are applied right away. Otherwise, unless ``GHOSTWRITER_TEMPLATE_LINT_ASYNC`` is disabled, the
+    template is marked as pending and linted by a Django Q task, which pushes the results to the template's WebSocket
+    group when it finishes.
+    """
+    if not settings.GHOSTWRITER_TEMPLATE_LINT_ASYNC:
+        template.lint()
+        _store_lint_result(template)
+        return
+
+    cache_key = template.lint_cache_key()
+    lint_result = template.cached_lint_result(cache_key) if cache_key else None
+    if lint_result is not None:
+        logger.info("Using memoized lint results for template %s", template.pk)
+        template.lint_result = lint_result
+        _store_lint_result(template)
+        return
+
+    template.lint_result = _pending_lint_result(cache_key)
+    _store_lint_result(template)
+    _queue_lint_task(template.pk, template.document.name)
+
+
+def run_template_lint(template_id: int, document_name: str, use_cache: bool = True) -> str | None:
+    """
+    Lint the template's file and store the results, unless the file was replaced after the task was queued.
+    Templates pending on an identical file and configuration get the same results.
+
+    Returns the template's lint status, or `None` if the results were discarded.
+    """
+    try:
+        template = ReportTemplate.objects.select_related("doc_type").get(pk=template_id)
+    except ReportTemplate.DoesNotExist:
+        logger.warning("Template %s was deleted before it could be linted", template_id)
+        return None
+    if template.document.name != document_name:
+        logger.info("Template %s was replaced before it could be linted, so skipping %s", template_id, document_name)
+        return None
+
+    template.lint(use_cache=use_cache)
+    # Guard against the file being replaced while the linter ran
+    updated = ReportTemplate.objects.filter(pk=template_id, document=document_name).update(
+        lint_result=template.lint_result
+    )
+    if not updated:
+        logger.info("Template %s was replaced while it was linted, so discarding the results", template_id)
+        return None
+
+    status = template.get_status()
+    send_template_lint_status(template_id, {"status": status})
+
+    lint_key = template.lint_result.get("lint_key")
+    if lint_key:
+        duplicates = ReportTemplate.objects.filter(lint_result__result="pending", lint_result__lint_key=lint_key)
+        duplicate_ids = list(duplicates.values_list("pk", flat=True))
+        if duplicate_ids:
+            ReportTemplate.objects.filter(pk__in=duplicate_ids, lint_result__result="pending").update(
+                lint_result=template.lint_result
+            )
+            for duplicate_id in duplicate_ids:
+                send_template_lint_status(duplicate_id, {"status": status})
+            logger.info("Applied the lint results of template %s to identical templates %s", template_id, duplicate_ids)
+    return status
+
+
+def find_stale_templates(force: bool = False) -> tuple[list[tuple[str | None, list[ReportTemplate]]], int]:
+    """
+    Find the templates whose lint results were not produced for their current file and linter inputs.
+
+    Returns the stale templates as ``(lint key, templates)`` groups of identical templates, so each group needs to
+    be linted only once, and the number of templates whose results are current. Pass ``force=True`` to treat every
+    template as stale.
+    """
+    signature = ReportTemplate.lint_signature()
+    groups = {}
+    unreadable = []
+    current = 0
+    for template in ReportTemplate.objects.select_related("doc_type").order_by("pk"):
+        cache_key = template.lint_cache_key(signature)
+        if not force and template.lint_is_current(cache_key):
+            current += 1
+        elif cache_key is None:
+            # Templates whose file cannot be read are linted on their own to record the error
+            unreadable.append((None, [template]))
+        else:
+            groups.setdefault(cache_key, []).append(template)
+    return list(groups.items()) + unreadable, current
+
+
+def _mark_pending(cache_key: str | None, templates: list[ReportTemplate]):
+    ReportTemplate.objects.filter(pk__in=[template.pk for template in templates]).update(
+        lint_result=_pending_lint_result(cache_key)
+    )
+
+
+def _is_pending_on(template: ReportTemplate, cache_key: str) -> bool:
+    """
+    Whether the template is waiting for a task that lints `cache_key` and was queued less than
+    ``GHOSTWRITER_TEMPLATE_LINT_PENDING_TIMEOUT`` seconds ago. Older tasks are assumed to have crashed or been lost.
+    """
+    if template.get_status() != "pending" or template.lint_result.get("lint_key") != cache_key:
+        return False
+    queued_at = parse_datetime(template.lint_result.get("queued_at") or "")
+    if queued_at is None:
+        return False
+    return timezone.now() - queued_at < timedelta(seconds=settings.GHOSTWRITER_TEMPLATE_LINT_PENDING_TIMEOUT)
+
+
+def queue_stale_template_lints(force: bool = False) -> dict[str, int]:
+    """
+    Queue a Django Q task to lint each group of templates with stale lint results, so the cluster lints them
+    concurrently. Groups with memoized results get them right away.
+
+    Returns the number of templates that were current, updated from memoized results, and queued.
+    """
+    groups, current = find_stale_templates(force)
+    counts = {"current": current, "memoized": 0, "queued": 0}
+    for cache_key, templates in groups:
+        if not force and cache_key is not None and all(_is_pending_on(template, cache_key) for template in templates):
+            # Already queued recently, e.g. by an earlier change to the extra fields
+            counts["queued"] += len(templates)
+            continue
+        lint_result = None if force or cache_key is None else templates[0].cached_lint_result(cache_key)
+        if lint_result is not None:
+            ReportTemplate.objects.filter(pk__in=[template.pk for template in templates]).update(
+                lint_result=lint_result
+            )
+            for template in templates:
+                send_template_lint_status(template.pk, {"status": lint_result["result"]})
+            counts["memoized"] += len(templates)
+            continue
+        _mark_pending(cache_key, templates)
+        _queue_lint_task(templates[0].pk, templates[0].document.name, use_cache=not force)
+        counts["queued"] += len(templates)
+    logger.info(
+        "Re-linting templates: %(current)s current, %(memoized)s from memoized results, %(queued)s queued", counts
+    )
+    return counts
+
+
+def queue_relint():
+    """
+    Queue the task that re-lints templates with out of date lint results, unless ``GHOSTWRITER_TEMPLATE_LINT_ASYNC``
+    is disabled. Templates are then only re-linted by the ``relint_templates`` command or on request.
+    """
+    if not settings.GHOSTWRITER_TEMPLATE_LINT_ASYNC:
+        return
+    transaction.on_commit(lambda: async_task("ghostwriter.reporting.tasks.relint_report_templates", group="Template Linting"))
+
+
+def _init_lint_worker():
+    """Set up Django in a freshly spawned lint worker process."""
+    import django  # pylint: disable=import-outside-toplevel
+
+    django.setup()
+
+
+def _lint_group(members: list[tuple[int, str]], use_cache: bool) -> str | None:
+    """
+    Lint a group of identical templates, given as ``(id, document name)`` pairs, through its first member whose
+    file was not replaced in the meantime. The others get its results, as they are pending on the same key.
+    """
+    for template_id, document_name in members:
+        status = run_template_lint(template_id, document_name, use_cache=use_cache)
+        if status is not None:
+            return status
+    return None
+
+
+def relint_templates(force: bool = False, workers: int = 0, progress_callback=None) -> dict[str, int]:
+    """
+    Lint every template with stale lint results now, linting each group of identical templates once.
+
+    With more than one of `workers`, groups are linted concurrently in a pool of spawned processes. After each
+    group, `progress_callback` is called with the number of templates done, the number of stale templates, and the
+    status of the group. Returns the number of templates that were current, linted, and discarded because they
+    were replaced or deleted while linting.
+    """
+    groups, current = find_stale_templates(force)
+    counts = {"current": current, "linted": 0, "discarded": 0}
+    total = sum(len(templates) for _, templates in groups)
+    for cache_key, templates in groups:
+        _mark_pending(cache_key, templates)
+
+    done = 0
+
+    def finish(templates, status):
+        nonlocal done
+        done += len(templates)
+        counts["linted" if status else "discarded"] += len(templates)
+        if progress_callback is not None:
+            progress_callback(done, total, status)
+
+    jobs = [(templates, [(template.pk, template.document.name) for template in templates]) for _, templates in groups]
+    # Daemonic processes (e.g., django-q workers) cannot have children, so they always lint in-process
+    if workers > 1 and len(jobs) > 1 and not multiprocessing.current_process().daemon:
+        # Workers are spawned rather than forked so they never share this process's database connections
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_lint_worker,
+        ) as pool:
+            futures = {pool.submit(_lint_group, members, not force): templates for templates, members in jobs}
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+    else:
+        for templates, members in jobs:
+            finish(templates, _lint_group(members, not force))
+    return counts
@@ -0,0 +1,106 @@
+"""Benchmark report generation and compare the results against a stored baseline."""
+
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Ghostwriter Libraries
+from ghostwriter.reporting.benchmarks import (
+    EXPORTERS,
+    SCALES,
+    compare_to_baseline,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time every report exporter phase by phase against synthetic reports built with the test factories. "
+        "Requires the development dependencies; the synthetic data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            action="append",
+            choices=list(SCALES),
+            help="Report size to benchmark; repeat for several (default: small and medium)",
+        )
+        parser.add_argument(
+            "--exporter",
+            action="append",
+            choices=list(EXPORTERS),
+            help="Exporter to benchmark; repeat for several (default: all of them)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed runs of each export; the fastest is kept (default: 3)",
+        )
+        parser.add_argument(
+            "--no-memory",
+            action="store_true",
+            help="Skip the extra run of each export that measures peak memory",
+        )
+        parser.add_argument(
+            "--warm",
+            action="store_true",
+            help="Keep the export caches between runs instead of starting every export cold",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Path of a saved baseline to compare the results against",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Fraction by which a measurement may exceed the baseline before it is a regression (default: 0.25)",
+        )
+        parser.add_argument(
+            "--save",
+            metavar="PATH",
+            help="Save the results to PATH for use as a future baseline",
+        )
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        baseline = None
+        if options["baseline"]:
+            try:
+                baseline = load_baseline(options["baseline"])
+            except (OSError, ValueError) as error:
+                raise CommandError(f"Could not load the baseline: {error}") from error
+
+        scales = [SCALES[name] for name in options["scale"] or ("small", "medium")]
+        try:
+            results = run_benchmarks(
+                scales,
+                options["exporter"],
+                repeat=options["repeat"],
+                track_memory=not options["no_memory"],
+                warm=options["warm"],
+                on_result=self.write_result,
+            )
+        except ImportError as error:
+            raise CommandError(f"The benchmarks require the development dependencies: {error}") from error
+
+        if options["save"]:
+            save_baseline(options["save"], results)
+            self.stdout.write(f"Saved the results to {options['save']}")
+
+        if baseline is not None:
+            regressions = compare_to_baseline(results, baseline, options["threshold"])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f"REGRESSION {regression}"))
+            if regressions:
+                raise CommandError(f"{len(regressions)} measurement(s) regressed past the threshold")
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline"))
+
+    def write_result(self, scale, exporter, result):
+        phases = ", ".join(f"{phase} {duration:.3f}s" for phase, duration in result["phases"].items())
+        memory = f", peak {result['peak_memory'] / 2**20:.1f} MiB" if result["peak_memory"] is not None else ""
+        self.stdout.write(f"{scale:<8} {exporter:<18} {result['total']:8.3f}s ({phases}){memory}")
@@ -0,0 +1,75 @@
+"""Benchmark converting the largest rich text fields to Office XML with each HTML parser."""
+
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Ghostwriter Libraries
+from ghostwriter.modules.reportwriter.richtext.ooxml import HTML_PARSERS
+from ghostwriter.reporting.benchmarks import benchmark_image_insertion, benchmark_rich_text, largest_rich_texts
+
+
+class Command(BaseCommand):
+    help = (
+        "Time converting the largest finding and observation rich text fields to DOCX and PPTX with each HTML parser "
+        "the converters can walk, and check that every parser produces the same output. Optionally time inserting "
+        "evidence images into a Word document."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of rich text fields to convert, largest first (default: 20)",
+        )
+        parser.add_argument(
+            "--parser",
+            action="append",
+            choices=list(HTML_PARSERS),
+            help="HTML parser to benchmark; repeat for several (default: all of them)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Number of timed runs of each conversion; the fastest is kept (default: 3)",
+        )
+        parser.add_argument(
+            "--images",
+            type=int,
+            action="append",
+            help="Also time inserting this many evidence images into one Word document; repeat for several",
+        )
+
+    def handle(self, *args, **options):
+        if options["limit"] < 1:
+            raise CommandError("--limit must be at least 1")
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        if any(count < 1 for count in options["images"] or ()):
+            raise CommandError("--images must be at least 1")
+
+        texts = largest_rich_texts(options["limit"])
+        if not texts and not options["images"]:
+            raise CommandError("There are no rich text fields to benchmark")
+
+        mismatches = []
+        if texts:
+            results = benchmark_rich_text(texts, options["parser"], repeat=options["repeat"])
+            mismatches = results["mismatches"]
+            self.stdout.write(
+                f"Converted {results['texts']} rich text field(s), {results['characters']} characters in all"
+            )
+            for parser, seconds in results["seconds"].items():
+                formats = ", ".join(f"{output_format} {duration:.3f}s" for output_format, duration in seconds.items())
+                self.stdout.write(f"{parser:<6} {sum(seconds.values()):8.3f}s ({formats})")
+            for location in mismatches:
+                self.stdout.write(self.style.ERROR(f"MISMATCH {location}"))
+
+        if options["images"]:
+            per_image = benchmark_image_insertion(options["images"], repeat=options["repeat"])
+            for count, seconds in per_image.items():
+                self.stdout.write(f"{count:>6} image(s) {seconds * 1000:8.3f}ms per image")
+
+        if mismatches:
+            raise CommandError(f"The parsers produced different output for {len(mismatches)} field(s)")
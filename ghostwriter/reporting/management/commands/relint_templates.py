@@ -0,0 +1,45 @@
+"""Re-lint every report template whose lint results are out of date."""
+
+# Standard Libraries
+import os
+
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Ghostwriter Libraries
+from ghostwriter.reporting.linting import relint_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Lint every report template whose file, document type, paragraph style, or linter inputs (e.g., the extra "
+        "fields) changed since it was last linted. Identical templates are linted once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of processes that lint templates concurrently (default: the number of CPUs)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Lint every template, even if its lint results are current",
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1")
+
+        def progress(done, total, status):
+            self.stdout.write(f"[{done}/{total}] {status or 'discarded'}")
+
+        counts = relint_templates(force=options["force"], workers=options["workers"], progress_callback=progress)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Linted {counts['linted']} template(s); {counts['current']} were already current"
+                + (f" and {counts['discarded']} were replaced or deleted while linting." if counts["discarded"] else ".")
+            )
+        )
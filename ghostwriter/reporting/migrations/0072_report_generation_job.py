@@ -0,0 +1,120 @@
+# Generated by Django 5.2.14 on 2026-10-16 20:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reporting", "0071_protect_global_report_templates"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportGenerationJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "export_type",
+                    models.CharField(
+                        choices=[
+                            ("docx", "Word"),
+                            ("pptx", "PowerPoint"),
+                            ("xlsx", "Excel"),
+                            ("json", "JSON"),
+                            ("all", "All Formats"),
+                        ],
+                        help_text="The document format to generate",
+                        max_length=16,
+                        verbose_name="Export Type",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("success", "Success"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        help_text="Current status of the generation job",
+                        max_length=16,
+                        verbose_name="Status",
+                    ),
+                ),
+                (
+                    "phase",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="The export phase the job is currently running",
+                        max_length=32,
+                        verbose_name="Phase",
+                    ),
+                ),
+                (
+                    "error",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Error message if the job failed",
+                        verbose_name="Error",
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Filename to use when downloading the generated document",
+                        max_length=255,
+                        verbose_name="Filename",
+                    ),
+                ),
+                ("output", models.FileField(blank=True, upload_to="report_jobs/")),
+                (
+                    "created",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created"),
+                ),
+                (
+                    "finished",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Finished"
+                    ),
+                ),
+                (
+                    "report",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="reporting.report",
+                    ),
+                ),
+                (
+                    "requested_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Report generation job",
+                "verbose_name_plural": "Report generation jobs",
+                "ordering": ["report", "-created"],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.14 on 2026-10-16 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reporting", "0072_report_generation_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reportgenerationjob",
+            name="profile",
+            field=models.JSONField(
+                blank=True,
+                help_text="Time and database queries spent in each phase of the generation, and the slowest rich text fields",
+                null=True,
+                verbose_name="Profile",
+            ),
+        ),
+    ]
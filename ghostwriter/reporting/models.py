@@ -1,12 +1,14 @@
 """This contains all the database models used by the Reporting application."""
 
 # Standard Libraries
+import hashlib
 import json
 import logging
 import os
 
 # Django Imports
 from django.conf import settings
+from django.core.cache import caches
 from django.core.files.storage import FileSystemStorage
 from django.core.validators import MinValueValidator
 from django.db import models
@@ -25,6 +27,11 @@ from ghostwriter.reporting.validators import validate_evidence_extension
 # Using __name__ resolves to ghostwriter.reporting.models
 logger = logging.getLogger(__name__)
 
+# Bump when the linter changes in a way that should invalidate memoized lint results
+LINT_CACHE_VERSION = 1
+# Seconds memoized lint results are kept
+LINT_CACHE_TIMEOUT = 30 * 24 * 60 * 60
+
 
 def _text_choice_from_stored_value(text_choices, value):
     """Resolve a Django TextChoices member from a stored value, label, or case variant.
@@ -538,6 +545,19 @@ class ReportTemplate(models.Model):
                 )
         return result_code
 
+    @property
+    def referenced_variables(self) -> set[str] | None:
+        """
+        The top-level context variables the template references, as recorded by the linter. `None` if the linter
+        did not record them, or the template failed linting.
+        """
+        if self.get_status() not in ("success", "warning"):
+            return None
+        referenced_variables = self.lint_result.get("referenced_variables")
+        if not isinstance(referenced_variables, list):
+            return None
+        return set(referenced_variables)
+
     def exporter(self, object, **kwargs):
         """
         Returns an ExportBase subclass instance based on the template and the passed-in object.
@@ -586,31 +606,131 @@ class ReportTemplate(models.Model):
             f"Template for doc_type {self.doc_type.doc_type} and object {object} not implemented. Either this is a bug or an admin messed with the database."
         )
 
-    def lint(self):
+    @staticmethod
+    def lint_signature() -> str:
         """
-        Lints a `ReportTemplate`. Sets `self.lint_results` and returns a `results` object
-        for the frontend. Be sure to save the template afterwards.
+        Returns a fingerprint of everything the linter depends on besides the template itself: the extra fields it
+        fills in, the filters and tests of the sandboxed Jinja environment, and the linter's version.
+        """
+        # Import in function to avoid circular references
+        # Ghostwriter Libraries
+        from ghostwriter.commandcenter.models import ExtraFieldSpec
+        from ghostwriter.modules.reportwriter import prepare_jinja2_env
+
+        env, _ = prepare_jinja2_env(debug=True)
+        env_class = type(env)
+        extra_fields = ExtraFieldSpec.objects.order_by("target_model", "internal_name").values_list(
+            "target_model", "internal_name", "type"
+        )
+        return json.dumps(
+            [
+                LINT_CACHE_VERSION,
+                settings.VERSION,
+                f"{env_class.__module__}.{env_class.__qualname__}",
+                sorted(env.filters),
+                sorted(env.tests),
+                [list(field) for field in extra_fields],
+            ]
+        )
+
+    def lint_cache_key(self, signature: str | None = None) -> str | None:
         """
+        Returns the key lint results for this template are memoized under, or `None` if the template file cannot
+        be read.
 
+        The key covers the file's contents, the document type and paragraph style, and the `lint_signature`, so
+        results are reused for identical files but never after anything the linter depends on changed. Pass a
+        `signature` computed beforehand when keying many templates.
+        """
+        digest = hashlib.sha256()
         try:
-            warnings, errors = self.lint_raw()
-        except Exception:
-            logging.exception("Could not lint template %d (%s)", self.pk, self.document.path)
-            warnings = []
-            errors = ["Unexpected error while linting template"]
-
-        results = {
-            "warnings": warnings,
-            "errors": errors,
-        }
-        if errors:
-            results["result"] = "failed"
-        elif warnings:
-            results["result"] = "warning"
-        else:
-            results["result"] = "success"
-        self.lint_result = results.copy()
+            with open(self.document.path, "rb") as template_file:
+                for chunk in iter(lambda: template_file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        except (OSError, ValueError):
+            return None
+
+        config = [
+            self.doc_type.doc_type if self.doc_type else None,
+            self.p_style,
+            signature if signature is not None else self.lint_signature(),
+        ]
+        digest.update(b"\0")
+        digest.update(json.dumps(config).encode("utf-8"))
+        return f"template_lint:{digest.hexdigest()}"
+
+    def lint_is_current(self, cache_key: str | None) -> bool:
+        """Whether the stored lint results were produced under `cache_key`, i.e. for the current file and inputs."""
+        if cache_key is None or self.get_status() in ("unknown", "pending"):
+            return False
+        return self.lint_result.get("lint_key") == cache_key
+
+    @staticmethod
+    def _lint_cache():
+        alias = getattr(settings, "GHOSTWRITER_TEMPLATE_LINT_CACHE", None)
+        return caches[alias] if alias else None
+
+    def cached_lint_result(self, cache_key: str | None = None) -> dict | None:
+        """Returns the memoized lint results for the template's current file and configuration, if any."""
+        lint_cache = self._lint_cache()
+        if lint_cache is None:
+            return None
+        cache_key = cache_key or self.lint_cache_key()
+        if cache_key is None:
+            return None
+        try:
+            return lint_cache.get(cache_key)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.warning("Unable to read memoized lint results for template %s", self.pk, exc_info=True)
+            return None
+
+    def lint(self, use_cache: bool = True):
+        """
+        Lints a `ReportTemplate`. Sets `self.lint_results` and returns a `results` object
+        for the frontend. Be sure to save the template afterwards.
 
+        Results are memoized (see `lint_cache_key`), so an identical file is only linted once. Pass
+        ``use_cache=False`` to run the linter regardless; the new results still replace the memoized ones.
+        """
+        lint_cache = self._lint_cache()
+        cache_key = self.lint_cache_key()
+        lint_result = self.cached_lint_result(cache_key) if use_cache and cache_key else None
+
+        if lint_result is None:
+            cacheable = True
+            try:
+                warnings, errors, referenced_variables = self.lint_raw()
+            except Exception:
+                logging.exception("Could not lint template %d (%s)", self.pk, self.document.path)
+                warnings = []
+                errors = ["Unexpected error while linting template"]
+                referenced_variables = None
+                cacheable = False
+
+            lint_result = {
+                "warnings": warnings,
+                "errors": errors,
+            }
+            if referenced_variables is not None:
+                lint_result["referenced_variables"] = referenced_variables
+            if errors:
+                lint_result["result"] = "failed"
+            elif warnings:
+                lint_result["result"] = "warning"
+            else:
+                lint_result["result"] = "success"
+            if cache_key:
+                lint_result["lint_key"] = cache_key
+
+            if cacheable and cache_key and lint_cache is not None:
+                try:
+                    lint_cache.set(cache_key, lint_result, LINT_CACHE_TIMEOUT)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    logger.warning("Unable to memoize lint results for template %s", self.pk, exc_info=True)
+        self.lint_result = lint_result
+
+        # The referenced variables and the key are for exporters and re-linting, not for the frontend
+        results = {key: value for key, value in lint_result.items() if key not in ("referenced_variables", "lint_key")}
         if results["result"] == "success":
             results["message"] = "Template linter returned results with no errors or warnings."
         else:
@@ -620,30 +740,34 @@ class ReportTemplate(models.Model):
     def lint_raw(self):
         """
         Runs the linter and returns the results. Does not set the template's `lint_results`.
+
+        Returns lists of warnings and errors, and the sorted top-level context variables the template references,
+        or `None` if they are unknown.
         """
         # Import in function to avoid circular references
 
         # Check if doc_type is set
         if self.doc_type is None:
-            return [], ["Template has no document type set. Please edit the template and select a document type."]
+            return [], ["Template has no document type set. Please edit the template and select a document type."], None
 
 
         if self.doc_type.doc_type == "docx":
             # Ghostwriter Libraries
             from ghostwriter.modules.reportwriter.report.docx import ExportReportDocx
 
-            return ExportReportDocx.lint(report_template=self)
+            return ExportReportDocx.lint_template(report_template=self)
         if self.doc_type.doc_type == "project_docx":
             # Ghostwriter Libraries
             from ghostwriter.modules.reportwriter.project.docx import ExportProjectDocx
 
-            return ExportProjectDocx.lint(report_template=self)
+            return ExportProjectDocx.lint_template(report_template=self)
         if self.doc_type.doc_type == "pptx":
             # Report PPTX exporter exports more content, so use it to lint
             # Ghostwriter Libraries
             from ghostwriter.modules.reportwriter.report.pptx import ExportReportPptx
 
-            return ExportReportPptx.lint(template_loc=self.document.path)
+            warnings, errors = ExportReportPptx.lint(template_loc=self.document.path)
+            return warnings, errors, None
         raise ReportExportTemplateError(
             f"Lint for doc_type {self.doc_type.doc_type} not implemented. Either this is a bug or an admin messed with the database."
         )
@@ -1056,6 +1180,90 @@ class Archive(models.Model):
         return f"{self.report_archive.name}"
 
 
+class ReportGenerationJob(models.Model):
+    """
+    Stores an individual background report generation job, related to :model:`reporting.Report`
+    and :model:`users.User`.
+    """
+
+    class ExportType(models.TextChoices):
+        DOCX = "docx", "Word"
+        PPTX = "pptx", "PowerPoint"
+        XLSX = "xlsx", "Excel"
+        JSON = "json", "JSON"
+        ALL = "all", "All Formats"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCESS = "success", "Success"
+        FAILED = "failed", "Failed"
+
+    export_type = models.CharField(
+        "Export Type",
+        max_length=16,
+        choices=ExportType.choices,
+        help_text="The document format to generate",
+    )
+    status = models.CharField(
+        "Status",
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+        help_text="Current status of the generation job",
+    )
+    phase = models.CharField(
+        "Phase",
+        max_length=32,
+        default="",
+        blank=True,
+        help_text="The export phase the job is currently running",
+    )
+    error = models.TextField(
+        "Error",
+        default="",
+        blank=True,
+        help_text="Error message if the job failed",
+    )
+    filename = models.CharField(
+        "Filename",
+        max_length=255,
+        default="",
+        blank=True,
+        help_text="Filename to use when downloading the generated document",
+    )
+    output = models.FileField(upload_to="report_jobs/", blank=True)
+    profile = models.JSONField(
+        "Profile",
+        null=True,
+        blank=True,
+        help_text="Time and database queries spent in each phase of the generation, and the slowest rich text fields",
+    )
+    created = models.DateTimeField("Created", auto_now_add=True)
+    finished = models.DateTimeField("Finished", null=True, blank=True)
+    # Foreign Keys
+    report = models.ForeignKey("Report", on_delete=models.CASCADE)
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        ordering = ["report", "-created"]
+        verbose_name = "Report generation job"
+        verbose_name_plural = "Report generation jobs"
+
+    def __str__(self):
+        return f"{self.report} ({self.export_type}, {self.status})"
+
+    def get_download_url(self):
+        return reverse("reporting:report_job_download", args=[str(self.id)])
+
+    def user_can_view(self, user) -> bool:
+        return self.report.user_can_view(user)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.Status.SUCCESS, self.Status.FAILED)
+
+
 class FindingNote(models.Model):
     """Stores an individual finding note, related to :model:`reporting.Finding`."""
 
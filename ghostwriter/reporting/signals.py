@@ -5,12 +5,22 @@ import logging
 import os
 
 # Django Imports
-from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+# 3rd Party Libraries
+from django_q.models import Schedule
+
 # Ghostwriter Libraries
+from ghostwriter.commandcenter.models import ExtraFieldSpec
+from ghostwriter.modules.reportwriter.base.docx import docx_template_cache
+from ghostwriter.modules.reportwriter.base.pptx import pptx_template_cache
+from ghostwriter.reporting.linting import queue_relint, queue_template_lint
 from ghostwriter.reporting.models import (
+    ReportGenerationJob,
     ReportTemplate,
     Severity,
 )
@@ -45,12 +55,26 @@ def update_upload_date(sender, instance, **kwargs):
         instance.upload_date = timezone.now().date()
 
 
+@receiver(post_save, sender=ExtraFieldSpec)
+@receiver(post_delete, sender=ExtraFieldSpec)
+def relint_templates_for_extra_fields(sender, instance, **kwargs):
+    """
+    Re-lint :model:`reporting.ReportTemplate` entries when a :model:`commandcenter.ExtraFieldSpec`
+    changes, as the linter fills in the extra fields.
+    """
+    queue_relint()
+
+
 @receiver(post_save, sender=ReportTemplate)
 def clean_template(sender, instance, created, **kwargs):
     """
     Delete the old template file and lint the replacement file for an instance of
     :model:`reporting.ReportTemplate`.
     """
+    # Drop this process's parsed copy of the template; other processes notice the new file on their own
+    docx_template_cache.invalidate(instance.pk)
+    pptx_template_cache.invalidate(instance.pk)
+
     should_lint_template = False
     if hasattr(instance, "_current_template"):
         if instance._current_template:
@@ -87,19 +111,9 @@ def clean_template(sender, instance, created, **kwargs):
             should_lint_template = True
 
     if created or should_lint_template:
-        logger.info("Template file change detected, so starting linter")
-        logger.info(
-            "Linting newly uploaded template: %s",
-            instance.document.path,
-        )
-
+        logger.info("Template file change detected, so linting %s", instance.document.path)
         try:
-            instance.lint()
-
-            # Disconnect signal to save model and avoid infinite loop
-            post_save.disconnect(clean_template, sender=ReportTemplate)
-            instance.save()
-            post_save.connect(clean_template, sender=ReportTemplate)
+            queue_template_lint(instance)
         except Exception:  # pragma: no cover
             logger.exception("Failed to update new template with linting results")
 
@@ -107,6 +121,8 @@ def clean_template(sender, instance, created, **kwargs):
 @receiver(post_delete, sender=ReportTemplate)
 def remove_template_on_delete(sender, instance, **kwargs):
     """Deletes file from filesystem when related :model:`reporting.ReportTemplate` entry is deleted."""
+    docx_template_cache.invalidate(instance.pk)
+    pptx_template_cache.invalidate(instance.pk)
     if instance.document:
         if os.path.isfile(instance.document.path):
             try:
@@ -121,6 +137,46 @@ def remove_template_on_delete(sender, instance, **kwargs):
                 )
 
 
+@receiver(post_delete, sender=ReportGenerationJob)
+def remove_generated_report_on_delete(sender, instance, **kwargs):
+    """Deletes file from filesystem when related :model:`reporting.ReportGenerationJob` entry is deleted."""
+    if instance.output:
+        try:
+            instance.output.delete(save=False)
+        except Exception:  # pragma: no cover
+            logger.warning(
+                "Failed to delete file associated with %s %s: %s",
+                instance.__class__.__name__,
+                instance.id,
+                instance.output.name,
+            )
+
+
+# Maintenance tasks scheduled after migrating, unless they are already scheduled
+DEFAULT_SCHEDULES = (
+    {
+        "func": "ghostwriter.reporting.tasks.delete_expired_report_jobs",
+        "name": "Delete Expired Report Generation Jobs",
+        "schedule_type": Schedule.HOURLY,
+    },
+)
+
+
+@receiver(post_migrate)
+def schedule_maintenance_tasks(sender, **kwargs):
+    """Schedule the task that deletes expired report generation jobs, unless it already exists."""
+    if sender.name != "ghostwriter.reporting":
+        return
+    schedules = Schedule.objects.using(kwargs.get("using", DEFAULT_DB_ALIAS))
+    for schedule in DEFAULT_SCHEDULES:
+        defaults = {key: value for key, value in schedule.items() if key != "func"}
+        try:
+            schedules.get_or_create(func=schedule["func"], defaults={**defaults, "repeats": -1})
+        except ValidationError:
+            # The server's task policy does not allow the task
+            logger.warning("Unable to schedule the %s task", schedule["func"], exc_info=True)
+
+
 @receiver(pre_save, sender=Severity)
 def adjust_severity_weight_with_changes(sender, instance, **kwargs):
     """
@@ -6,9 +6,16 @@ import logging
 from datetime import date
 
 
+# Django Imports
+from django.conf import settings
+from django.utils import timezone
+
 # Ghostwriter Libraries
 from ghostwriter.modules.reportwriter import report_generation_queryset
 from ghostwriter.reporting.archive import archive_report
+from ghostwriter.reporting.generation import fail_stale_report_generation_jobs, run_report_generation_job
+from ghostwriter.reporting.linting import queue_stale_template_lints, run_template_lint
+from ghostwriter.reporting.models import ReportGenerationJob
 
 # Using __name__ resolves to ghostwriter.reporting.tasks
 logger = logging.getLogger(__name__)
@@ -27,3 +34,58 @@ def archive_projects():
             archive_report(report)
         except Exception: # pylint: disable=broad-exception-caught
             logger.exception("Error while archiving report %s", report.pk)
+
+
+def generate_report_job(job_id):
+    """
+    Generate the document(s) requested by a pending :model:`reporting.ReportGenerationJob`
+    and store the result on the job.
+    """
+    try:
+        job = ReportGenerationJob.objects.get(pk=job_id)
+    except ReportGenerationJob.DoesNotExist:
+        logger.error("Report generation job %s does not exist", job_id)
+        return None
+    if job.status != ReportGenerationJob.Status.PENDING:
+        logger.warning("Report generation job %s is not pending, so skipping it", job_id)
+        return job.status
+
+    job.report = report_generation_queryset().get(pk=job.report_id)
+    logger.info("Generating %s for report %s (job %s)", job.export_type, job.report_id, job.pk)
+    return run_report_generation_job(job).status
+
+
+def delete_expired_report_jobs():
+    """
+    Delete the :model:`reporting.ReportGenerationJob` entries, and their generated documents, that finished
+    more than ``GHOSTWRITER_REPORT_JOB_TTL`` seconds ago. Jobs still pending or running after
+    ``GHOSTWRITER_REPORT_JOB_STALE_AFTER`` seconds are failed first.
+    """
+    now = timezone.now()
+    stale_before = now - datetime.timedelta(seconds=settings.GHOSTWRITER_REPORT_JOB_STALE_AFTER)
+    failed = fail_stale_report_generation_jobs(stale_before)
+    if failed:
+        logger.warning("Failed %s report generation job(s) that never finished", failed)
+    deleted, _ = ReportGenerationJob.objects.filter(
+        finished__lt=now - datetime.timedelta(seconds=settings.GHOSTWRITER_REPORT_JOB_TTL)
+    ).delete()
+    if deleted:
+        logger.info("Deleted %s expired report generation job(s)", deleted)
+    return {"failed": failed, "deleted": deleted}
+
+
+def lint_report_template(template_id, document_name, use_cache=True):
+    """
+    Lint the file of a :model:`reporting.ReportTemplate` uploaded as `document_name` and
+    store the results on the template.
+    """
+    logger.info("Linting template %s (%s)", template_id, document_name)
+    return run_template_lint(template_id, document_name, use_cache=use_cache)
+
+
+def relint_report_templates(force=False):
+    """
+    Queue linting of every :model:`reporting.ReportTemplate` whose lint results are out of date,
+    e.g. after the extra fields changed. Pass ``force=True`` to lint every template again.
+    """
+    return queue_stale_template_lints(force=force)
@@ -0,0 +1,164 @@
+# Standard Libraries
+import os
+import tempfile
+from io import StringIO
+
+# Django Imports
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+# Ghostwriter Libraries
+from ghostwriter.factories import ObservationFactory, ReportFindingLinkFactory
+from ghostwriter.modules.reportwriter.base.base import PHASE_RENDER, PHASE_SAVE, PHASE_SERIALIZE
+from ghostwriter.reporting.benchmarks import (
+    BASELINE_VERSION,
+    BenchmarkScale,
+    benchmark_image_insertion,
+    benchmark_rich_text,
+    compare_to_baseline,
+    largest_rich_texts,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+from ghostwriter.reporting.models import Evidence, Report
+
+TINY = BenchmarkScale("tiny", findings=2, evidence=1, oplog_entries=10, extra_fields=2)
+
+
+def _results(total=1.0, render=0.5, peak_memory=1000):
+    return {
+        "version": BASELINE_VERSION,
+        "results": {
+            "small": {
+                "ExportReportDocx": {
+                    "total": total,
+                    "phases": {PHASE_SERIALIZE: 0.01, PHASE_RENDER: render},
+                    "peak_memory": peak_memory,
+                }
+            }
+        },
+    }
+
+
+class BaselineComparisonTests(SimpleTestCase):
+    """Verify benchmark results are compared against a baseline correctly."""
+
+    def test_results_within_threshold_pass(self):
+        self.assertEqual(compare_to_baseline(_results(total=1.2), _results(), 0.25), [])
+
+    def test_slower_total_and_phase_regress(self):
+        regressions = compare_to_baseline(_results(total=2.0, render=1.0), _results(), 0.25)
+        self.assertEqual({regression.metric for regression in regressions}, {"total", f"phase:{PHASE_RENDER}"})
+        self.assertAlmostEqual(regressions[0].change, 1.0)
+
+    def test_short_phases_are_not_compared(self):
+        results = _results()
+        results["results"]["small"]["ExportReportDocx"]["phases"][PHASE_SERIALIZE] = 0.04
+        self.assertEqual(compare_to_baseline(results, _results(), 0.25), [])
+
+    def test_peak_memory_regresses(self):
+        regressions = compare_to_baseline(_results(peak_memory=2000), _results(), 0.25)
+        self.assertEqual([regression.metric for regression in regressions], ["peak_memory"])
+        self.assertIn("MiB", str(regressions[0]))
+
+    def test_missing_entries_are_skipped(self):
+        baseline = _results()
+        baseline["results"] = {}
+        self.assertEqual(compare_to_baseline(_results(total=10), baseline, 0.25), [])
+
+    def test_baseline_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            save_baseline(path, _results())
+            self.assertEqual(load_baseline(path), _results())
+
+            save_baseline(path, {**_results(), "version": BASELINE_VERSION + 1})
+            with self.assertRaises(ValueError):
+                load_baseline(path)
+
+
+class RunBenchmarksTests(TestCase):
+    """Verify the benchmarks measure every phase and leave no data behind."""
+
+    def test_measures_each_exporter(self):
+        results = run_benchmarks([TINY], ["ExportReportDocx", "ExportReportJson"])
+
+        self.assertEqual(set(results["results"]["tiny"]), {"ExportReportDocx", "ExportReportJson"})
+        docx = results["results"]["tiny"]["ExportReportDocx"]
+        self.assertEqual(list(docx["phases"])[0], PHASE_SERIALIZE)
+        self.assertIn(PHASE_SAVE, docx["phases"])
+        self.assertAlmostEqual(docx["total"], sum(docx["phases"].values()))
+        self.assertGreater(docx["peak_memory"], 0)
+        self.assertFalse(Report.objects.exists())
+        self.assertFalse(Evidence.objects.exists())
+
+    def test_measures_bundles_with_and_without_a_shared_snapshot(self):
+        results = run_benchmarks([TINY], ["ReportBundle", "ReportBundleUnshared"])
+
+        self.assertEqual(set(results["results"]["tiny"]), {"ReportBundle", "ReportBundleUnshared"})
+        for bundle in results["results"]["tiny"].values():
+            self.assertEqual(list(bundle["phases"])[0], PHASE_SERIALIZE)
+            self.assertIn(PHASE_RENDER, bundle["phases"])
+        self.assertFalse(Report.objects.exists())
+
+    def test_command_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "baseline.json")
+            out = StringIO()
+            call_command(
+                "benchmark_exports", "--scale", "small", "--exporter", "ExportReportJson", "--repeat", "1",
+                "--save", path, stdout=out,
+            )
+            self.assertIn("ExportReportJson", out.getvalue())
+
+            baseline = load_baseline(path)
+            baseline["results"]["small"]["ExportReportJson"]["peak_memory"] = 1
+            save_baseline(path, baseline)
+            with self.assertRaisesRegex(CommandError, "regressed"):
+                call_command(
+                    "benchmark_exports", "--scale", "small", "--exporter", "ExportReportJson", "--repeat", "1",
+                    "--baseline", path, stdout=StringIO(),
+                )
+
+
+class RichTextBenchmarkTests(TestCase):
+    """Verify the rich text benchmark converts the largest fields with every parser."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.finding = ReportFindingLinkFactory(
+            description="<p>Description with a list:</p><ul><li>One</li><li>Two <b>bold</b></li></ul>" * 20,
+            impact="<p>Short impact</p>",
+        )
+        cls.observation = ObservationFactory(description="<p>Observation with <em>emphasis</em></p>" * 10)
+
+    def test_largest_rich_texts(self):
+        texts = largest_rich_texts(2)
+        self.assertEqual(len(texts), 2)
+        self.assertEqual(texts[0], (f"the description of Report finding {self.finding.pk}", self.finding.description))
+        self.assertGreaterEqual(len(texts[0][1]), len(texts[1][1]))
+
+    def test_parsers_produce_the_same_output(self):
+        results = benchmark_rich_text(largest_rich_texts(5), repeat=1)
+
+        self.assertEqual(results["texts"], 5)
+        self.assertEqual(set(results["seconds"]), {"bs4", "lxml"})
+        self.assertEqual(set(results["seconds"]["lxml"]), {"docx", "pptx"})
+        self.assertEqual(results["mismatches"], [])
+
+    def test_command(self):
+        out = StringIO()
+        call_command("benchmark_rich_text", "--limit", "3", "--parser", "lxml", "--repeat", "1", stdout=out)
+        self.assertIn("Converted 3 rich text field(s)", out.getvalue())
+        self.assertIn("lxml", out.getvalue())
+
+    def test_image_insertion(self):
+        per_image = benchmark_image_insertion([1, 20], repeat=1)
+        self.assertEqual(list(per_image), [1, 20])
+        self.assertTrue(all(seconds > 0 for seconds in per_image.values()))
+
+        out = StringIO()
+        call_command("benchmark_rich_text", "--limit", "1", "--repeat", "1", "--images", "5", stdout=out)
+        self.assertIn("5 image(s)", out.getvalue())
@@ -9,11 +9,13 @@ from ghostwriter.factories import (
     ProjectAssignmentFactory,
     ReportFactory,
     ReportFindingLinkFactory,
+    ReportTemplateFactory,
     UserFactory,
 )
 from ghostwriter.reporting.consumers import (
     user_can_access_report,
     user_can_access_report_finding,
+    user_can_access_report_template,
 )
 
 logging.disable(logging.CRITICAL)
@@ -28,6 +30,8 @@ class ReportingConsumerAccessTests(TestCase):
     def setUpTestData(cls):
         cls.report = ReportFactory()
         cls.finding = ReportFindingLinkFactory(report=cls.report)
+        cls.template = ReportTemplateFactory()
+        cls.client_template = ReportTemplateFactory(client=cls.report.project.client)
         cls.user = UserFactory(password=PASSWORD)
         cls.other_user = UserFactory(password=PASSWORD)
         cls.inactive_user = UserFactory(password=PASSWORD, is_active=False)
@@ -72,3 +76,23 @@ class ReportingConsumerAccessTests(TestCase):
 
     def test_none_finding_id_denies_socket_access(self):
         self.assertFalse(user_can_access_report_finding(None, self.user))
+
+    def test_active_user_can_access_global_template_socket(self):
+        self.assertTrue(user_can_access_report_template(self.template.id, self.other_user))
+
+    def test_assigned_user_can_access_client_template_socket(self):
+        self.assertTrue(user_can_access_report_template(self.client_template.id, self.user))
+
+    def test_unassigned_user_cannot_access_client_template_socket(self):
+        self.assertFalse(
+            user_can_access_report_template(self.client_template.id, self.other_user)
+        )
+
+    def test_inactive_user_cannot_access_template_socket(self):
+        self.assertFalse(
+            user_can_access_report_template(self.template.id, self.inactive_user)
+        )
+
+    def test_missing_template_denies_socket_access(self):
+        self.assertFalse(user_can_access_report_template(0, self.user))
+        self.assertFalse(user_can_access_report_template("abc", self.user))
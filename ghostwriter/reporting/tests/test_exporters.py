@@ -1,15 +1,59 @@
 """Regression tests for report and project exporter initialization."""
 
 # Standard Libraries
+import copy
+import datetime
+import decimal
+import io
 import json
-from unittest.mock import Mock
+import pickle
+import threading
+import uuid
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import Mock, patch
+from xml.etree import ElementTree
 
 # Django Imports
-from django.test import SimpleTestCase, TestCase
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.safestring import mark_safe
+
+# 3rd Party Libraries
+import factory
+from docx import Document
+from docx.oxml.ns import qn
+from PIL import Image
+from pptx import Presentation
 
 # Ghostwriter Libraries
-from ghostwriter.factories import ReportFactory
-from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.factories import (
+    EvidenceFactory,
+    HistoryFactory,
+    OplogEntryFactory,
+    OplogFactory,
+    ReportDocxTemplateFactory,
+    ReportFactory,
+    ReportFindingLinkFactory,
+    ReportObservationLinkFactory,
+    ReportPptxTemplateFactory,
+    ServerHistoryFactory,
+    TransientServerFactory,
+)
+from ghostwriter.modules.reportwriter.base import ReportExportError
+from ghostwriter.modules.reportwriter.base.base import (
+    ExportBase,
+    SerializedSnapshot,
+    copy_item,
+    materialize_jinja_context,
+)
+from ghostwriter.modules.reportwriter.base.docx import docx_subdoc_cache, docx_template_cache
+from ghostwriter.modules.reportwriter.base.pptx import PptxLayoutIndex, PptxPackageIndex, pptx_template_cache
+from ghostwriter.modules.reportwriter.profiling import ExportProfile, format_metrics
+from ghostwriter.modules.reportwriter.report.base import serialize_report_snapshot
 from ghostwriter.modules.reportwriter.project.docx import ExportProjectDocx
 from ghostwriter.modules.reportwriter.project.json import ExportProjectJson
 from ghostwriter.modules.reportwriter.project.pptx import ExportProjectPptx
@@ -17,6 +61,9 @@ from ghostwriter.modules.reportwriter.report.docx import ExportReportDocx
 from ghostwriter.modules.reportwriter.report.json import ExportReportJson
 from ghostwriter.modules.reportwriter.report.pptx import ExportReportPptx
 from ghostwriter.modules.reportwriter.report.xlsx import ExportReportXlsx
+from ghostwriter.modules.reportwriter.richtext.docx import HtmlToDocxWithEvidence
+from ghostwriter.reporting import generation
+from ghostwriter.reporting.models import Report, ReportFindingLink
 
 
 class ExportBaseInitializationTests(SimpleTestCase):
@@ -70,6 +117,82 @@ class ExportBaseInitializationTests(SimpleTestCase):
         with self.assertRaisesRegex(TypeError, "JSON-serializable"):
             ExportBase({"unsafe": object()}, is_raw=True)
 
+    def test_snapshot_bypasses_object_serializer(self):
+        input_object = object()
+        snapshot = SerializedSnapshot(input_object, object_serializer=Mock(return_value={"serialized": True}))
+        serializer = Mock(side_effect=AssertionError("snapshot data must not be serialized again"))
+
+        first = ExportBase(input_object, object_serializer=serializer, snapshot=snapshot)
+        second = ExportBase(input_object, object_serializer=serializer, snapshot=snapshot)
+
+        serializer.assert_not_called()
+        self.assertIs(first.input_object, input_object)
+        self.assertIs(first.data, snapshot.data)
+        self.assertIs(second.data, snapshot.data)
+
+    def test_snapshot_must_match_input_object(self):
+        snapshot = SerializedSnapshot({"a": 1})
+        with self.assertRaises(ValueError):
+            ExportBase({"a": 1}, snapshot=snapshot)
+
+    def test_snapshot_is_immutable(self):
+        snapshot = SerializedSnapshot({"a": 1})
+        with self.assertRaises(AttributeError):
+            snapshot.data = {}
+
+
+class MaterializeJinjaContextTests(SimpleTestCase):
+    """Verify the single-pass context builder matches a JSON round trip."""
+
+    def test_matches_json_round_trip(self):
+        class Label(str):
+            pass
+
+        value = {
+            "date": datetime.date(2024, 1, 2),
+            "time": datetime.datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc),
+            "duration": datetime.timedelta(hours=5),
+            "decimal": decimal.Decimal("1.50"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "tuple": (1, 2.5, None),
+            "label": Label("text"),
+            "safe": mark_safe("<b>bold</b>"),
+            mark_safe("safe key"): "safe key",
+            7: "int key",
+            2.5: "float key",
+            True: "bool key",
+            None: "none key",
+            "nested": [{"a": [True, False]}, []],
+        }
+
+        result = materialize_jinja_context(value)
+
+        self.assertEqual(result, json.loads(json.dumps(value, cls=DjangoJSONEncoder)))
+        self.assertIs(type(result["label"]), str)
+        # Marked-safe strings lose their `__html__`, so Jinja's autoescape still escapes them
+        self.assertIs(type(result["safe"]), str)
+        self.assertTrue(all(type(key) is str for key in result))
+
+    def test_rejects_circular_references(self):
+        value = {"a": []}
+        value["a"].append(value)
+        with self.assertRaisesRegex(TypeError, "circular"):
+            materialize_jinja_context(value)
+
+    def test_shared_values_are_allowed(self):
+        shared = {"a": 1}
+        self.assertEqual(materialize_jinja_context([shared, shared]), [{"a": 1}, {"a": 1}])
+
+    def test_copy_item(self):
+        original = {"a": {"b": 1}, "c": [1]}
+        container = original.copy()
+
+        copy_item(container, "a")["b"] = 2
+        copy_item(container, "c").append(2)
+
+        self.assertEqual(original, {"a": {"b": 1}, "c": [1]})
+        self.assertEqual(container, {"a": {"b": 2}, "c": [1, 2]})
+
 
 class ConcreteExporterInitializationTests(TestCase):
     """Verify every concrete exporter receives the correct serialized input."""
@@ -175,3 +298,690 @@ class ConcreteExporterInitializationTests(TestCase):
         self.assertEqual(project_exporter.data, raw_data)
         self.assertIsNot(report_exporter.data, raw_data)
         self.assertIsNot(project_exporter.data, raw_data)
+
+
+class SharedSnapshotTests(TestCase):
+    """Verify a shared report snapshot gives every exporter the same data for a fraction of the work."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.report = ReportFactory()
+        oplog = OplogFactory(project=cls.report.project)
+        OplogEntryFactory.create_batch(500, oplog_id=oplog)
+
+    def _create_exporters(self, **kwargs):
+        exporters = [
+            ExportReportJson(self.report, **kwargs),
+            ExportReportXlsx(self.report, **kwargs),
+            ExportReportDocx(self.report, report_template=self.report.docx_template, **kwargs),
+            ExportReportPptx(self.report, report_template=self.report.pptx_template, **kwargs),
+        ]
+        exporters[1].workbook.close()
+        return exporters
+
+    def test_snapshot_matches_individual_serialization(self):
+        # Serialize every section, even those the DOCX template does not use
+        separate = self._create_exporters(unused_sections=())
+        shared = self._create_exporters(snapshot=serialize_report_snapshot(self.report))
+        for separate_exporter, shared_exporter in zip(separate, shared):
+            with self.subTest(exporter=type(shared_exporter).__name__):
+                self.assertEqual(shared_exporter.data, separate_exporter.data)
+                self.assertIs(shared_exporter.data, shared[0].data)
+
+    def test_snapshot_serializes_large_oplog_once(self):
+        """Compare the queries needed to serialize a four format bundle with and without a snapshot."""
+        with CaptureQueriesContext(connection) as separate_queries:
+            self._create_exporters()
+        with CaptureQueriesContext(connection) as shared_queries:
+            self._create_exporters(snapshot=serialize_report_snapshot(self.report))
+
+        # Serialization dominates; sharing it should cut the work to roughly a quarter
+        self.assertLess(len(shared_queries) * 2, len(separate_queries))
+
+    def test_exports_leave_snapshot_unchanged(self):
+        snapshot = serialize_report_snapshot(self.report)
+        expected = copy.deepcopy(snapshot.data)
+
+        for exporter in self._create_exporters(snapshot=snapshot):
+            with self.subTest(exporter=type(exporter).__name__):
+                context = exporter.map_rich_texts()
+                self.assertEqual(snapshot.data, expected)
+                # Subtrees without rich text are shared instead of copied
+                self.assertIs(context["logs"], snapshot.data["logs"])
+
+        ExportReportDocx(self.report, report_template=self.report.docx_template, snapshot=snapshot).run()
+        self.assertEqual(snapshot.data, expected)
+
+
+class SelectiveSerializationTests(TestCase):
+    """Verify DOCX exports only serialize the optional report sections their template uses."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.report = ReportFactory()
+        oplog = OplogFactory(project=cls.report.project)
+        OplogEntryFactory.create_batch(3, oplog_id=oplog, tool="nmap")
+        cls.template = cls._create_template("{{ title }}{% for finding in findings %}{{ finding.title }}{% endfor %}")
+        cls.logs_template = cls._create_template("{% for log in logs %}{{ log.name }}{% endfor %}")
+
+    @staticmethod
+    def _create_template(text, footnote=None):
+        document = Document()
+        paragraph = document.add_paragraph(text)
+        if footnote is not None:
+            paragraph.add_footnote().add_paragraph(footnote)
+        out = io.BytesIO()
+        document.save(out)
+        template = ReportDocxTemplateFactory(document=factory.django.FileField(filename="template.docx", data=out.getvalue()))
+        # The factory mutes the signal that lints new templates
+        template.lint()
+        return template
+
+    def test_linter_records_referenced_variables(self):
+        self.assertEqual(self.template.referenced_variables, {"title", "findings"})
+        self.assertIn("logs", self.logs_template.referenced_variables)
+
+    def test_linter_records_variables_referenced_in_footnotes(self):
+        template = self._create_template("{{ title }}", footnote="{{ logs|length }} log entries")
+        self.assertEqual(template.referenced_variables, {"title", "logs"})
+
+        exporter = ExportReportDocx(self.report, report_template=template)
+        self.assertNotIn("logs", exporter.skipped_sections)
+        self.assertEqual(len(exporter.data["logs"][0]["entries"]), 3)
+
+    def test_unreferenced_sections_are_skipped(self):
+        exporter = ExportReportDocx(self.report, report_template=self.template)
+
+        self.assertEqual(exporter.skipped_sections, {"logs", "tools", "infrastructure", "bloodhound"})
+        self.assertEqual(exporter.data["logs"], [])
+        self.assertEqual(exporter.data["infrastructure"], {"domains": [], "cloud": [], "servers": []})
+        self.assertNotIn("bloodhound", exporter.data)
+        self.assertGreater(len(exporter.run().getvalue()), 0)
+
+    def test_referenced_sections_are_serialized(self):
+        exporter = ExportReportDocx(self.report, report_template=self.logs_template)
+
+        self.assertNotIn("logs", exporter.skipped_sections)
+        self.assertEqual(len(exporter.data["logs"][0]["entries"]), 3)
+
+    def test_skipping_sections_saves_queries(self):
+        with CaptureQueriesContext(connection) as full_queries:
+            ExportReportDocx(self.report, report_template=self.template, unused_sections=())
+        with CaptureQueriesContext(connection) as selective_queries:
+            ExportReportDocx(self.report, report_template=self.template)
+        self.assertLess(len(selective_queries), len(full_queries))
+
+    def test_sections_used_by_rich_text_are_serialized(self):
+        ReportFindingLinkFactory(report=self.report, description="<p>{{ tools|join(', ') }}</p>")
+
+        exporter = ExportReportDocx(self.report, report_template=self.template)
+
+        self.assertNotIn("tools", exporter.skipped_sections)
+        self.assertEqual(exporter.data["tools"], ["nmap"])
+        self.assertIn("logs", exporter.skipped_sections)
+
+    def test_sections_used_by_filename_are_loaded(self):
+        exporter = ExportReportDocx(self.report, report_template=self.template)
+
+        filename = exporter.render_filename("{{ logs[0].entries|length }} entries")
+
+        self.assertEqual(filename, "3 entries.docx")
+        self.assertNotIn("logs", exporter.skipped_sections)
+
+    def test_unanalyzed_template_serializes_everything(self):
+        self.template.lint_result = {"result": "success", "warnings": [], "errors": []}
+
+        exporter = ExportReportDocx(self.report, report_template=self.template)
+
+        self.assertEqual(exporter.skipped_sections, set())
+        self.assertEqual(len(exporter.data["logs"][0]["entries"]), 3)
+
+    def test_shared_snapshot_is_never_partial(self):
+        snapshot = serialize_report_snapshot(self.report)
+
+        exporter = ExportReportDocx(self.report, report_template=self.template, snapshot=snapshot)
+
+        self.assertEqual(exporter.skipped_sections, set())
+        self.assertIs(exporter.data, snapshot.data)
+
+
+class ExportProfileTests(TestCase):
+    """Verify exports record where their time and queries went."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.report = ReportFactory()
+        ReportFindingLinkFactory.create_batch(2, report=cls.report, description="<p>{{ 1 + 1 }}</p>")
+
+    def test_docx_export_records_phases_sections_and_locations(self):
+        profile = ExportProfile()
+        with profile.capture():
+            ExportReportDocx(self.report, report_template=self.report.docx_template, profile=profile).run()
+        data = profile.as_dict()
+
+        self.assertEqual([phase["phase"] for phase in data["phases"]], ["serialize", "rich_text", "render", "save"])
+        serialize = data["phases"][0]
+        self.assertGreater(serialize["queries"], 0)
+        self.assertLessEqual(sum(phase["queries"] for phase in data["phases"]), data["queries"])
+        self.assertGreaterEqual(data["seconds"], sum(phase["seconds"] for phase in data["phases"]) - 0.001)
+
+        sections = {section["section"] for section in data["sections"]}
+        self.assertTrue({"docx_render", "docx_save", "docx_footnote_cleanup"} <= sections)
+        # Include every location, as which ones are slowest depends on timing
+        all_locations = profile.as_dict(slowest_locations=len(profile.locations))["slowest_locations"]
+        locations = [location["location"] for location in all_locations]
+        finding = self.report.reportfindinglink_set.first()
+        self.assertIn(f"the description of finding {finding.title}", locations)
+
+    def test_exports_without_profile_are_unchanged(self):
+        exporter = ExportReportJson(self.report)
+        self.assertIsNone(exporter.profile)
+        with exporter.profile_section("anything"), exporter.profile_location("anywhere"):
+            pass
+        exporter.run()
+
+    def test_reentered_phases_accumulate(self):
+        profile = ExportProfile()
+        with profile.capture():
+            ExportReportJson(self.report, profile=profile).run()
+            ExportReportJson(self.report, profile=profile).run()
+        phases = {phase["phase"]: phase for phase in profile.as_dict()["phases"]}
+        self.assertEqual(list(phases), ["serialize", "save"])
+        self.assertGreater(phases["serialize"]["queries"], 0)
+
+    def test_merge_adds_sections_and_locations(self):
+        profile = ExportProfile()
+        with profile.section("docx_save"), profile.location("the title"):
+            pass
+        other = ExportProfile()
+        with other.section("docx_save"):
+            pass
+        other.locations["the title"] = 2.0
+        other.queries = 3
+        profile.merge(other.as_dict())
+
+        data = profile.as_dict()
+        self.assertEqual(data["sections"][0]["calls"], 2)
+        self.assertEqual(data["slowest_locations"][0]["location"], "the title")
+        self.assertGreaterEqual(data["slowest_locations"][0]["seconds"], 2.0)
+        self.assertEqual(data["queries"], 3)
+
+    def test_slowest_locations_are_limited(self):
+        profile = ExportProfile()
+        profile.locations = {f"field {i}": float(i) for i in range(20)}
+        locations = profile.as_dict(slowest_locations=3)["slowest_locations"]
+        self.assertEqual([location["location"] for location in locations], ["field 19", "field 18", "field 17"])
+
+    def test_format_metrics(self):
+        profile = {
+            "seconds": 2.5,
+            "queries": 10,
+            "phases": [{"phase": "serialize", "seconds": 1.0, "queries": 10}],
+            "sections": [{"section": "docx_save", "seconds": 0.5, "calls": 1}],
+            "slowest_locations": [],
+        }
+        text = format_metrics([({"export_type": "docx"}, profile), ({"export_type": "docx"}, profile)])
+        self.assertIn('ghostwriter_report_generation_profiles{export_type="docx"} 2', text)
+        self.assertIn('ghostwriter_report_generation_seconds{export_type="docx"} 5.0', text)
+        self.assertIn('ghostwriter_report_generation_phase_queries{export_type="docx",phase="serialize"} 20', text)
+        self.assertIn('ghostwriter_report_generation_section_seconds{export_type="docx",section="docx_save"} 1.0', text)
+        self.assertIn("# TYPE ghostwriter_report_generation_seconds gauge", text)
+
+
+class ExportReportXlsxTests(TestCase):
+    """Verify spreadsheets are streamed row by row and can include the oplog, observations, and infrastructure."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.report = ReportFactory()
+        ReportFindingLinkFactory(report=cls.report, title="XLSX Finding")
+        ReportObservationLinkFactory(report=cls.report, title="XLSX Observation")
+        oplog = OplogFactory(project=cls.report.project, name="XLSX Log")
+        for number in range(3):
+            OplogEntryFactory(oplog_id=oplog, command=f"whoami {number}")
+        OplogEntryFactory(command="in another project")
+        HistoryFactory(project=cls.report.project)
+        ServerHistoryFactory(project=cls.report.project)
+        TransientServerFactory(project=cls.report.project, name="xlsx-cloud")
+
+    def read_sheets(self, output) -> dict[str, list[list[str]]]:
+        namespace = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+        sheets = {}
+        with zipfile.ZipFile(output) as workbook:
+            self.assertNotIn("xl/sharedStrings.xml", workbook.namelist())
+            names = [
+                sheet.get("name")
+                for sheet in ElementTree.fromstring(workbook.read("xl/workbook.xml")).iter(f"{{{namespace['x']}}}sheet")
+            ]
+            for number, name in enumerate(names, start=1):
+                sheet = ElementTree.fromstring(workbook.read(f"xl/worksheets/sheet{number}.xml"))
+                sheets[name] = [
+                    ["".join(text.text or "" for text in cell.iter(f"{{{namespace['x']}}}t")) for cell in row]
+                    for row in sheet.iterfind(".//x:sheetData/x:row", namespace)
+                ]
+        return sheets
+
+    @override_settings(GHOSTWRITER_XLSX_CONSTANT_MEMORY=True, GHOSTWRITER_XLSX_EXTRA_SHEETS=[])
+    def test_findings_only_by_default(self):
+        exporter = ExportReportXlsx(self.report)
+        self.assertIn("logs", exporter.skipped_sections)
+        sheets = self.read_sheets(exporter.run())
+        self.assertEqual(list(sheets), ["Findings"])
+        self.assertEqual(sheets["Findings"][1][0], "XLSX Finding")
+
+    @override_settings(GHOSTWRITER_XLSX_CONSTANT_MEMORY=True)
+    def test_extra_sheets(self):
+        exporter = ExportReportXlsx(self.report, extra_sheets=["infrastructure", "oplog", "observations"])
+        sheets = self.read_sheets(exporter.run())
+
+        self.assertEqual(list(sheets), ["Findings", "Observations", "Oplog", "Infrastructure"])
+        self.assertEqual(sheets["Observations"][1][0], "XLSX Observation")
+        self.assertEqual(sorted(row[8] for row in sheets["Oplog"][1:]), ["whoami 0", "whoami 1", "whoami 2"])
+        self.assertEqual({row[0] for row in sheets["Oplog"][1:]}, {"XLSX Log"})
+        self.assertEqual([row[0] for row in sheets["Infrastructure"][1:]], ["Domain", "Static Server", "Cloud Server"])
+        self.assertEqual(sheets["Infrastructure"][3][1], "xlsx-cloud")
+
+    def test_oplog_is_streamed_in_chunks(self):
+        exporter = ExportReportXlsx(self.report, extra_sheets=["oplog"])
+        with patch("ghostwriter.modules.reportwriter.report.xlsx.QUERY_CHUNK_SIZE", 2):
+            rows = list(exporter.oplog_rows([], {"wrap": None}))
+        self.assertEqual(len(rows), 3)
+
+    def test_unknown_sheets_are_rejected(self):
+        with self.assertRaises(ValueError):
+            ExportReportXlsx(self.report, extra_sheets=["findings"])
+
+
+class ReversedRenderPool:
+    """
+    Stand-in for the render pool. Members are rendered in the calling thread, so they can read the test's data, but
+    their arguments and results are pickled as they would be for a worker process. The members then finish in the
+    reverse order they were submitted, one at a time, as the caller takes each result.
+    """
+
+    def __init__(self, size, errors=None):
+        self.size = size
+        self.errors = errors or {}
+        self.outcomes = []
+        self.taken = threading.Semaphore(0)
+        self.shutdown = Mock()
+
+    def submit(self, fn, *args):
+        args = pickle.loads(pickle.dumps(args))
+        future = Future()
+        doc_type = args[1]
+        if doc_type in self.errors:
+            self.outcomes.append((future, None, self.errors[doc_type]))
+        else:
+            self.outcomes.append((future, pickle.loads(pickle.dumps(fn(*args))), None))
+        if len(self.outcomes) == self.size:
+            threading.Thread(target=self._finish, daemon=True).start()
+        return future
+
+    def _finish(self):
+        for future, result, error in reversed(self.outcomes):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+            self.taken.acquire(timeout=10)
+
+
+class ReportBundleTests(TestCase):
+    """Verify multi-format bundles isolate failures between formats."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.report = ReportFactory()
+        cls.members = [
+            ("docx", cls.report.docx_template, "report"),
+            ("pptx", cls.report.pptx_template, "report"),
+            ("xlsx", None, "report"),
+            ("json", None, "report"),
+        ]
+
+    def _write_bundle(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "a") as zf:
+            errors = generation.write_report_bundle(zf, self.report, self.members)
+        with zipfile.ZipFile(buffer) as zf:
+            return errors, sorted(zf.namelist())
+
+    @override_settings(GHOSTWRITER_REPORT_RENDER_WORKERS=0)
+    def test_writes_every_format(self):
+        errors, names = self._write_bundle()
+        self.assertEqual(errors, {})
+        self.assertEqual(names, ["report.docx", "report.json", "report.pptx", "report.xlsx"])
+
+    @override_settings(GHOSTWRITER_REPORT_RENDER_WORKERS=0)
+    def test_office_documents_are_not_compressed_again(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "a") as zf:
+            generation.write_report_bundle(zf, self.report, self.members)
+        with zipfile.ZipFile(buffer) as zf:
+            compression = {info.filename: info.compress_type for info in zf.infolist()}
+        self.assertEqual(
+            compression,
+            {
+                "report.docx": zipfile.ZIP_STORED,
+                "report.pptx": zipfile.ZIP_STORED,
+                "report.xlsx": zipfile.ZIP_STORED,
+                "report.json": zipfile.ZIP_DEFLATED,
+            },
+        )
+
+    @override_settings(GHOSTWRITER_REPORT_RENDER_WORKERS=0)
+    def test_failed_format_does_not_discard_others(self):
+        create_report_exporter = generation.create_report_exporter
+
+        def fail_docx(report, doc_type, *args, **kwargs):
+            if doc_type == "docx":
+                raise ReportExportError("Broken template")
+            return create_report_exporter(report, doc_type, *args, **kwargs)
+
+        with patch.object(generation, "create_report_exporter", side_effect=fail_docx):
+            errors, names = self._write_bundle()
+
+        self.assertEqual(list(errors), ["docx"])
+        self.assertEqual(names, ["report.json", "report.pptx", "report.xlsx"])
+
+    @override_settings(GHOSTWRITER_REPORT_RENDER_WORKERS=0)
+    def test_render_pool_disabled(self):
+        self.assertIsNone(generation.get_render_pool())
+
+    @override_settings(GHOSTWRITER_REPORT_RENDER_WORKERS=4)
+    def test_render_pool_unavailable_in_daemon_processes(self):
+        with patch.object(generation.multiprocessing, "current_process", return_value=Mock(daemon=True)):
+            self.assertIsNone(generation.get_render_pool())
+
+    def _iter_pooled_bundle(self, pool, profile=None):
+        results = []
+        with patch.object(generation, "get_render_pool", return_value=pool):
+            for doc_type, filename, content, error in generation.iter_report_bundle(
+                self.report, self.members, profile=profile
+            ):
+                results.append((doc_type, filename, error))
+                if content is not None:
+                    self.assertTrue(content)
+                pool.taken.release()
+        return results
+
+    def test_pooled_members_are_yielded_as_they_finish(self):
+        profile = ExportProfile()
+        results = self._iter_pooled_bundle(ReversedRenderPool(len(self.members)), profile)
+        self.assertEqual(
+            results,
+            [
+                ("json", "report.json", None),
+                ("xlsx", "report.xlsx", None),
+                ("pptx", "report.pptx", None),
+                ("docx", "report.docx", None),
+            ],
+        )
+        # The queries made by the members are added to the bundle's profile
+        self.assertGreater(profile.queries, 0)
+
+    def test_failed_pooled_member_does_not_discard_others(self):
+        error = ReportExportError("Broken template")
+        pool = ReversedRenderPool(len(self.members), errors={"pptx": error})
+        results = self._iter_pooled_bundle(pool)
+        self.assertEqual([doc_type for doc_type, _filename, _error in results], ["json", "xlsx", "pptx", "docx"])
+        self.assertEqual(results[2], ("pptx", None, error))
+        pool.shutdown.assert_not_called()
+
+    def test_broken_render_pool_is_discarded(self):
+        error = BrokenProcessPool("A worker died")
+        pool = ReversedRenderPool(len(self.members), errors={"docx": error})
+        with patch.object(generation, "_render_pool", pool):
+            results = self._iter_pooled_bundle(pool)
+            self.assertIsNone(generation._render_pool)
+        self.assertEqual(results[-1], ("docx", None, error))
+        self.assertEqual(len([result for result in results if result[2] is None]), 3)
+        pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    def test_export_errors_survive_pickling(self):
+        error = pickle.loads(pickle.dumps(ReportExportError("Bad filter", "the finding's description", "{{ x }}")))
+        self.assertEqual(error.location, "the finding's description")
+        self.assertEqual(error.code_context, "{{ x }}")
+
+
+@override_settings(GHOSTWRITER_DOCX_TEMPLATE_CACHE_SIZE=2)
+class DocxTemplateCacheTests(TestCase):
+    """Verify parsed DOCX templates are reused without sharing state between exports."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = ReportDocxTemplateFactory()
+
+    def setUp(self):
+        docx_template_cache.clear()
+        self.addCleanup(docx_template_cache.clear)
+
+    def test_template_file_is_parsed_once(self):
+        with patch("ghostwriter.modules.reportwriter.base.docx.Document", wraps=Document) as document:
+            first = docx_template_cache.load(self.template)
+            second = docx_template_cache.load(self.template)
+        self.assertEqual(document.call_count, 1)
+        self.assertEqual(len(docx_template_cache), 1)
+        self.assertIsNot(first.docx, second.docx)
+
+    def test_exports_do_not_share_documents(self):
+        first = docx_template_cache.load(self.template)
+        second = docx_template_cache.load(self.template)
+        paragraphs = len(second.docx.paragraphs)
+
+        first.docx.add_paragraph("Only in the first export")
+
+        self.assertEqual(len(second.docx.paragraphs), paragraphs)
+        self.assertEqual(len(docx_template_cache.load(self.template).docx.paragraphs), paragraphs)
+
+    def test_saving_template_invalidates_cache(self):
+        docx_template_cache.load(self.template)
+        self.template.save()
+        self.assertEqual(len(docx_template_cache), 0)
+
+    def test_deleting_template_invalidates_cache(self):
+        template = ReportDocxTemplateFactory()
+        docx_template_cache.load(template)
+        template.delete()
+        self.assertEqual(len(docx_template_cache), 0)
+
+    @override_settings(GHOSTWRITER_DOCX_TEMPLATE_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        docx_template_cache.load(self.template)
+        self.assertEqual(len(docx_template_cache), 0)
+
+
+class PptxTemplateCacheTests(TestCase):
+    """Verify parsed PPTX templates are reused without sharing state between exports."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.template = ReportPptxTemplateFactory()
+
+    def setUp(self):
+        pptx_template_cache.clear()
+        self.addCleanup(pptx_template_cache.clear)
+
+    def test_template_file_is_parsed_once(self):
+        with patch("ghostwriter.modules.reportwriter.base.pptx.Presentation", wraps=Presentation) as presentation:
+            first = pptx_template_cache.load(self.template)
+            second = pptx_template_cache.load(self.template)
+        self.assertEqual(presentation.call_count, 1)
+        self.assertEqual(len(pptx_template_cache), 1)
+        self.assertIsNot(first.presentation, second.presentation)
+        self.assertIs(first.layout_index, second.layout_index)
+
+    def test_exports_do_not_share_presentations(self):
+        first = pptx_template_cache.load(self.template)
+        second = pptx_template_cache.load(self.template)
+        slides = len(second.presentation.slides)
+
+        first.layout_index.add_slide(first.presentation, first.presentation.slide_layouts[0])
+
+        self.assertEqual(len(second.presentation.slides), slides)
+        self.assertEqual(len(pptx_template_cache.load(self.template).presentation.slides), slides)
+
+    def test_saving_template_invalidates_cache(self):
+        pptx_template_cache.load(self.template)
+        self.template.save()
+        self.assertEqual(len(pptx_template_cache), 0)
+
+    @override_settings(GHOSTWRITER_PPTX_TEMPLATE_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        pptx_template_cache.load(self.template)
+        self.assertEqual(len(pptx_template_cache), 0)
+
+
+class PptxIndexTests(SimpleTestCase):
+    """Verify the PPTX layout and package indexes build the same decks as python-pptx."""
+
+    template_path = "DOCS/sample_reports/template.pptx"
+
+    def build_deck(self, indexed, slides=6):
+        presentation = Presentation(self.template_path)
+        layout_index = PptxLayoutIndex()
+        if indexed:
+            PptxPackageIndex(presentation.part.package).install()
+        image = io.BytesIO()
+        Image.new("RGB", (10, 10), "red").save(image, "PNG")
+        for number in range(slides):
+            layout = presentation.slide_layouts[number % 3]
+            if indexed:
+                slide = layout_index.add_slide(presentation, layout)
+            else:
+                slide = presentation.slides.add_slide(layout)
+            image.seek(0)
+            slide.shapes.add_picture(image, 0, 0)
+            slide.notes_slide.notes_text_frame.text = f"Notes {number}"
+        output = io.BytesIO()
+        presentation.save(output)
+        output.seek(0)
+        return Presentation(output)
+
+    def test_slides_match_python_pptx(self):
+        stock = self.build_deck(indexed=False)
+        indexed = self.build_deck(indexed=True)
+        self.assertEqual(len(stock.slides), len(indexed.slides))
+        for stock_slide, indexed_slide in zip(stock.slides, indexed.slides):
+            self.assertEqual(
+                [(shape.shape_id, shape.name) for shape in stock_slide.shapes],
+                [(shape.shape_id, shape.name) for shape in indexed_slide.shapes],
+            )
+            self.assertEqual(
+                stock_slide.notes_slide.notes_text_frame.text, indexed_slide.notes_slide.notes_text_frame.text
+            )
+
+    def test_part_names_are_unique_and_images_shared(self):
+        def image_partnames(deck):
+            return [part.partname for part in deck.part.package.iter_parts() if part.partname.startswith("/ppt/media/")]
+
+        stock = self.build_deck(indexed=False)
+        indexed = self.build_deck(indexed=True)
+        partnames = [part.partname for part in indexed.part.package.iter_parts()]
+        self.assertEqual(len(partnames), len(set(partnames)))
+        # Every slide adds the same picture, which is stored once
+        self.assertEqual(len(image_partnames(indexed)), len(image_partnames(stock)))
+
+    def test_footer_placeholders(self):
+        presentation = Presentation(self.template_path)
+        layout = presentation.slide_layouts[0]
+        names = [placeholder.name for placeholder in layout.placeholders]
+        footer, slide_number, date = PptxLayoutIndex().footer_placeholders(layout)
+        self.assertEqual(footer, max((i for i, name in enumerate(names) if "Footer" in name), default=-1))
+        self.assertEqual(slide_number, max((i for i, name in enumerate(names) if "Slide Number" in name), default=-1))
+        self.assertEqual(date, max((i for i, name in enumerate(names) if "Date" in name), default=-1))
+
+
+@override_settings(GHOSTWRITER_DOCX_SUBDOC_CACHE_SIZE=100)
+class DocxSubdocCacheTests(TestCase):
+    """Verify re-exports only convert the rich text that changed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.report = ReportFactory(docx_template=ReportDocxTemplateFactory())
+        cls.findings = [
+            ReportFindingLinkFactory(
+                report=cls.report,
+                description=f"<p>Finding {i}</p><ul><li>Item</li><li><a href='https://example.com/{i}'>Link</a></li></ul>",
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        docx_subdoc_cache.clear()
+        self.addCleanup(docx_subdoc_cache.clear)
+
+    def _export(self):
+        """Exports the report, returning the document and how many rich text fields were converted."""
+        report = Report.objects.get(pk=self.report.pk)
+        with patch.object(HtmlToDocxWithEvidence, "run", side_effect=HtmlToDocxWithEvidence.run) as run:
+            out = ExportReportDocx(report, report_template=report.docx_template).run()
+        out.seek(0)
+        return Document(out), run.call_count
+
+    def _numbering_is_defined(self, document):
+        numbering = document.part.numbering_part.element
+        numbering_ids = {num_id.val for num_id in document.element.body.iter(qn("w:numId"))}
+        return all(numbering.xpath(f'w:num[@w:numId="{numbering_id}"]') for numbering_id in numbering_ids)
+
+    def test_reexport_reuses_converted_rich_text(self):
+        first, first_conversions = self._export()
+        second, second_conversions = self._export()
+
+        self.assertGreater(first_conversions, 0)
+        self.assertEqual(second_conversions, 0)
+        self.assertEqual([p.text for p in second.paragraphs], [p.text for p in first.paragraphs])
+        self.assertTrue(self._numbering_is_defined(second))
+        links = [rel.target_ref for rel in second.part.rels.values() if rel.is_external]
+        for i in range(3):
+            self.assertIn(f"https://example.com/{i}", links)
+
+    def test_edited_finding_is_converted_again(self):
+        self._export()
+        ReportFindingLink.objects.filter(pk=self.findings[1].pk).update(description="<p>Edited description</p>")
+
+        document, conversions = self._export()
+
+        self.assertEqual(conversions, 1)
+        self.assertIn("Edited description", [p.text for p in document.paragraphs])
+
+    def test_footnotes_are_not_cached(self):
+        ReportFindingLink.objects.filter(pk=self.findings[0].pk).update(
+            description='<p>Text<span class="footnote">A footnote</span></p>'
+        )
+        self._export()
+        _, conversions = self._export()
+        self.assertEqual(conversions, 1)
+
+    def test_spliced_drawings_and_bookmarks_get_unique_ids(self):
+        image = io.BytesIO()
+        Image.new("RGB", (8, 8)).save(image, format="PNG")
+        EvidenceFactory(
+            report=self.report,
+            friendly_name="Screenshot",
+            document=factory.django.FileField(filename="screenshot.png", data=image.getvalue()),
+        )
+        ReportFindingLink.objects.filter(report=self.report).update(
+            description="<h2 data-bookmark='heading'>Heading</h2><p>{{.Screenshot}}</p>"
+        )
+
+        self._export()
+        document, conversions = self._export()
+
+        self.assertEqual(conversions, 0)
+        body = document.element.body
+        drawing_ids = body.xpath(".//wp:docPr/@id")
+        self.assertEqual(len(drawing_ids), 3)
+        self.assertEqual(len(set(drawing_ids)), 3)
+        bookmark_ids = body.xpath(".//w:bookmarkStart/@w:id")
+        self.assertGreaterEqual(len(bookmark_ids), 3)
+        self.assertEqual(len(set(bookmark_ids)), len(bookmark_ids))
+        self.assertEqual(set(body.xpath(".//w:bookmarkEnd/@w:id")), set(bookmark_ids))
+
+    @override_settings(GHOSTWRITER_DOCX_SUBDOC_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        _, first_conversions = self._export()
+        _, second_conversions = self._export()
+        self.assertEqual(second_conversions, first_conversions)
+        self.assertEqual(len(docx_subdoc_cache), 0)
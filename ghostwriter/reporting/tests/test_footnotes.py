@@ -1,13 +1,24 @@
 """Tests for footnote functionality using local python-docx fork."""
 
+import io
 import os
 import shutil
 import tempfile
+import zipfile
+from unittest.mock import Mock
 
 from django.test import SimpleTestCase
 
 from docx import Document
-
+from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docxtpl import DocxTemplate
+
+from ghostwriter.modules.reportwriter.base.docx import (
+    ExportDocxBase,
+    _footnotes_part,
+    remove_extra_separator_paragraphs,
+)
 from ghostwriter.modules.reportwriter.richtext.docx import HtmlToDocx
 
 
@@ -298,3 +309,51 @@ class FootnoteRichTextConversionTests(SimpleTestCase):
         reopened_doc = Document(output_path)
         actual_footnotes = [fn for fn in reopened_doc.footnotes if fn.id > 0]
         self.assertEqual(len(actual_footnotes), 4, "Expected 4 footnotes in the document")
+
+
+class FootnoteSeparatorCleanupTests(SimpleTestCase):
+    """Test removing extra paragraphs from separator footnotes."""
+
+    FOOTNOTES_XML = (
+        '<w:footnotes xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        '<w:footnote w:type="separator" w:id="-1"><w:p><w:r><w:separator/></w:r></w:p><w:p/><w:p/></w:footnote>'
+        '<w:footnote w:type="continuationSeparator" w:id="0"><w:p><w:r><w:continuationSeparator/></w:r></w:p><w:p/></w:footnote>'
+        '<w:footnote w:id="1"><w:p/><w:p/></w:footnote>'
+        "</w:footnotes>"
+    )
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _paragraph_counts(footnotes):
+        return {footnote.get(qn("w:id")): len(list(footnote.iterchildren(qn("w:p")))) for footnote in footnotes}
+
+    def test_removes_extra_separator_paragraphs(self):
+        footnotes = parse_xml(self.FOOTNOTES_XML)
+        self.assertTrue(remove_extra_separator_paragraphs(footnotes))
+        self.assertEqual(self._paragraph_counts(footnotes), {"-1": 1, "0": 1, "1": 2})
+        self.assertFalse(remove_extra_separator_paragraphs(footnotes))
+
+    def test_cleans_rendered_document_before_saving(self):
+        document = Document()
+        document.add_paragraph("Text with footnote reference").add_footnote().add_paragraph("{{ note }}")
+        separator = next(fn for fn in _footnotes_part(document.part).element if fn.get(qn("w:id")) == "-1")
+        separator.append(parse_xml('<w:p xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>'))
+        template_path = os.path.join(self.temp_dir, "template.docx")
+        document.save(template_path)
+
+        word_doc = DocxTemplate(template_path)
+        word_doc.render({"note": "Rendered note"})
+        ExportDocxBase._cleanup_footnote_separators(Mock(word_doc=word_doc))
+        out = io.BytesIO()
+        word_doc.save(out)
+
+        with zipfile.ZipFile(out) as zf:
+            footnotes_xml = zf.read("word/footnotes.xml")
+        self.assertIn(b"Rendered note", footnotes_xml)
+        counts = self._paragraph_counts(parse_xml(footnotes_xml))
+        self.assertEqual((counts["-1"], counts["0"]), (1, 1))
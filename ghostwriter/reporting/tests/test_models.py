@@ -3,14 +3,18 @@ from datetime import timedelta
 import logging
 import os
 import json
+from io import StringIO
+from unittest import mock
 
 # 3rd Party Libraries
 import factory
 
 # Django Imports
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.db import transaction
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
@@ -24,6 +28,8 @@ from ghostwriter.factories import (
     ClientInviteFactory,
     DocTypeFactory,
     EvidenceFactory,
+    ExtraFieldModelFactory,
+    ExtraFieldSpecFactory,
     FindingFactory,
     FindingNoteFactory,
     FindingTypeFactory,
@@ -40,7 +46,9 @@ from ghostwriter.factories import (
     ReportObservationLinkFactory,
 )
 from ghostwriter.modules.reportwriter.report.json import ExportReportJson
-from ghostwriter.reporting.models import EvidenceImageAlignment, EvidenceImageAlignmentOverride, Report
+from ghostwriter.reporting.linting import queue_stale_template_lints, queue_template_lint, relint_templates
+from ghostwriter.reporting.models import EvidenceImageAlignment, EvidenceImageAlignmentOverride, Report, ReportTemplate
+from ghostwriter.reporting.tasks import lint_report_template
 from ghostwriter.rolodex.models import Project
 
 
@@ -341,6 +349,49 @@ class ReportTemplateModelTests(TestCase):
         except Exception:
             self.fail("ReportTemplate model `get_status` method failed unexpectedly with PPTX template!")
 
+    def test_lint_memoizes_results_by_file_contents(self):
+        self.addCleanup(cache.clear)
+        template = ReportDocxTemplateFactory()
+        other_template = ReportDocxTemplateFactory()
+        self.assertEqual(template.lint_cache_key(), other_template.lint_cache_key())
+
+        template.lint()
+        with mock.patch.object(ReportTemplate, "lint_raw") as lint_raw:
+            results = other_template.lint()
+        lint_raw.assert_not_called()
+        self.assertEqual(other_template.lint_result, template.lint_result)
+        self.assertNotIn("referenced_variables", results)
+
+        with mock.patch.object(ReportTemplate, "lint_raw", return_value=(["Changed"], [], None)) as lint_raw:
+            results = other_template.lint(use_cache=False)
+        lint_raw.assert_called_once()
+        self.assertEqual(results["result"], "warning")
+        self.assertEqual(template.cached_lint_result()["warnings"], ["Changed"])
+
+    def test_lint_cache_key_covers_linter_inputs(self):
+        template = ReportDocxTemplateFactory()
+        key = template.lint_cache_key()
+
+        template.p_style = "Body Text"
+        self.assertNotEqual(template.lint_cache_key(), key)
+        template.p_style = "Normal"
+        self.assertEqual(template.lint_cache_key(), key)
+
+        ExtraFieldSpecFactory(
+            target_model=ExtraFieldModelFactory(model_internal_name=Report._meta.label, model_display_name="Reports")
+        )
+        self.assertNotEqual(template.lint_cache_key(), key)
+
+        self.assertNotEqual(ReportPptxTemplateFactory().lint_cache_key(), key)
+
+    def test_lint_errors_are_not_memoized(self):
+        self.addCleanup(cache.clear)
+        template = ReportDocxTemplateFactory()
+        with mock.patch.object(ReportTemplate, "lint_raw", side_effect=RuntimeError):
+            template.lint()
+        self.assertEqual(template.get_status(), "failed")
+        self.assertIsNone(template.cached_lint_result())
+
     def test_exporter_uses_report_template_for_docx_exports(self):
         report = ReportFactory()
 
@@ -486,6 +537,151 @@ class ReportTemplateModelTests(TestCase):
         self.assertFalse(os.path.exists(template.document.path))
 
 
+@override_settings(GHOSTWRITER_TEMPLATE_LINT_ASYNC=True)
+class ReportTemplateBackgroundLintTests(TestCase):
+    """Collection of tests for linting :model:`reporting.ReportTemplate` files in the background."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_template_is_pending_until_task_runs(self):
+        template = ReportDocxTemplateFactory()
+        with mock.patch("ghostwriter.reporting.linting.async_task") as async_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_template_lint(template)
+        async_task.assert_called_once_with(
+            "ghostwriter.reporting.tasks.lint_report_template",
+            template.pk,
+            template.document.name,
+            use_cache=True,
+            group="Template Linting",
+        )
+        template.refresh_from_db()
+        self.assertEqual(template.get_status(), "pending")
+
+        self.assertEqual(lint_report_template(template.pk, template.document.name), "success")
+        template.refresh_from_db()
+        self.assertEqual(template.get_status(), "success")
+
+    def test_memoized_results_are_applied_without_task(self):
+        ReportDocxTemplateFactory().lint()
+        template = ReportDocxTemplateFactory(lint_result={})
+        with mock.patch("ghostwriter.reporting.linting.async_task") as async_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_template_lint(template)
+        async_task.assert_not_called()
+        template.refresh_from_db()
+        self.assertEqual(template.get_status(), "success")
+
+    def test_task_discards_results_for_replaced_file(self):
+        template = ReportDocxTemplateFactory()
+        with mock.patch("ghostwriter.reporting.linting.async_task"):
+            queue_template_lint(template)
+        self.assertIsNone(lint_report_template(template.pk, "replaced.docx"))
+        template.refresh_from_db()
+        self.assertEqual(template.get_status(), "pending")
+
+    def test_task_ignores_deleted_template(self):
+        self.assertIsNone(lint_report_template(0, "deleted.docx"))
+
+
+class ReportTemplateRelintTests(TestCase):
+    """Collection of tests for re-linting :model:`reporting.ReportTemplate` entries with outdated lint results."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.template = ReportDocxTemplateFactory()
+        self.identical_template = ReportDocxTemplateFactory()
+
+    def counting_linter(self):
+        return mock.patch.object(ReportTemplate, "lint_raw", autospec=True, side_effect=ReportTemplate.lint_raw)
+
+    def test_relint_lints_identical_stale_templates_once(self):
+        with self.counting_linter() as lint_raw:
+            counts = relint_templates()
+        self.assertEqual(lint_raw.call_count, 1)
+        self.assertEqual(counts, {"current": 0, "linted": 2, "discarded": 0})
+        for template in (self.template, self.identical_template):
+            template.refresh_from_db()
+            self.assertEqual(template.get_status(), "success")
+
+        with self.counting_linter() as lint_raw:
+            counts = relint_templates()
+        lint_raw.assert_not_called()
+        self.assertEqual(counts, {"current": 2, "linted": 0, "discarded": 0})
+
+        ExtraFieldSpecFactory(
+            target_model=ExtraFieldModelFactory(model_internal_name=Report._meta.label, model_display_name="Reports")
+        )
+        progress = mock.Mock()
+        with self.counting_linter() as lint_raw:
+            counts = relint_templates(progress_callback=progress)
+        self.assertEqual(lint_raw.call_count, 1)
+        self.assertEqual(counts["linted"], 2)
+        progress.assert_called_once_with(2, 2, "success")
+
+    @override_settings(GHOSTWRITER_TEMPLATE_LINT_ASYNC=True)
+    def test_queue_stale_template_lints(self):
+        with mock.patch("ghostwriter.reporting.linting.async_task") as async_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                counts = queue_stale_template_lints()
+            self.assertEqual(counts, {"current": 0, "memoized": 0, "queued": 2})
+            async_task.assert_called_once_with(
+                "ghostwriter.reporting.tasks.lint_report_template",
+                self.template.pk,
+                self.template.document.name,
+                use_cache=True,
+                group="Template Linting",
+            )
+
+            # Queuing again does not queue templates that are already pending
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_stale_template_lints()
+            async_task.assert_called_once()
+
+        self.identical_template.refresh_from_db()
+        self.assertEqual(self.identical_template.get_status(), "pending")
+        self.assertEqual(lint_report_template(self.template.pk, self.template.document.name), "success")
+        self.identical_template.refresh_from_db()
+        self.assertEqual(self.identical_template.get_status(), "success")
+
+    @override_settings(GHOSTWRITER_TEMPLATE_LINT_ASYNC=True, GHOSTWRITER_TEMPLATE_LINT_PENDING_TIMEOUT=3600)
+    def test_queue_stale_template_lints_requeues_lost_tasks(self):
+        with mock.patch("ghostwriter.reporting.linting.async_task") as async_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                queue_stale_template_lints()
+            async_task.assert_called_once()
+
+            # The task crashed, so the templates are still pending an hour later
+            an_hour_later = timezone.now() + timedelta(hours=1)
+            with mock.patch("ghostwriter.reporting.linting.timezone.now", return_value=an_hour_later):
+                with self.captureOnCommitCallbacks(execute=True):
+                    counts = queue_stale_template_lints()
+            self.assertEqual(counts["queued"], 2)
+            self.assertEqual(async_task.call_count, 2)
+
+        self.assertEqual(lint_report_template(self.template.pk, self.template.document.name), "success")
+        self.identical_template.refresh_from_db()
+        self.assertEqual(self.identical_template.get_status(), "success")
+
+    @override_settings(GHOSTWRITER_TEMPLATE_LINT_ASYNC=True)
+    def test_extra_field_changes_queue_relint(self):
+        report_model = ExtraFieldModelFactory(model_internal_name=Report._meta.label, model_display_name="Reports")
+        with mock.patch("ghostwriter.reporting.linting.async_task") as async_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                ExtraFieldSpecFactory(target_model=report_model)
+        async_task.assert_called_once_with(
+            "ghostwriter.reporting.tasks.relint_report_templates", group="Template Linting"
+        )
+
+    def test_relint_command(self):
+        stdout = StringIO()
+        call_command("relint_templates", "--workers", "1", stdout=stdout)
+        self.assertIn("Linted 2 template(s); 0 were already current.", stdout.getvalue())
+
+
 class ReportModelTests(TestCase):
     """Collection of tests for :model:`reporting.Report`."""
 
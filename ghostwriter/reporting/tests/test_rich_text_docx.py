@@ -3,6 +3,7 @@ import base64
 from io import BytesIO
 import os
 import tempfile
+from unittest.mock import patch
 from zipfile import ZipFile
 
 # Django Imports
@@ -13,12 +14,16 @@ import docx
 from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
+from docx.parts.story import StoryPart
 from lxml import etree
+from PIL import Image
 
 # Ghostwriter Libraries
 from ghostwriter.commandcenter.models import ReportConfiguration
 from ghostwriter.factories import ReportDocxTemplateFactory
+from ghostwriter.modules.reportwriter.images import delete_derivatives, export_image_path
 from ghostwriter.modules.reportwriter.richtext.docx import HtmlToDocx, HtmlToDocxWithEvidence
+from ghostwriter.modules.reportwriter.richtext.ooxml import parse_body_bs4, parse_body_lxml
 from ghostwriter.reporting.models import EvidenceImageAlignment, EvidenceImageAlignmentOverride
 
 WORD_PREFIX = """<?xml version='1.0' encoding='UTF-8' standalone='yes'?>
@@ -994,6 +999,63 @@ class FootnoteToDocxTests(SimpleTestCase):
                 self.assertEqual(sorted(footnote_ids), ["1", "2", "3"])
 
 
+@override_settings(GHOSTWRITER_RICH_TEXT_PARSER="bs4")
+class RichTextToDocxBs4Tests(RichTextToDocxTests):
+    """Runs `RichTextToDocxTests` over BeautifulSoup trees."""
+
+
+@override_settings(GHOSTWRITER_RICH_TEXT_PARSER="bs4")
+class FootnoteToDocxBs4Tests(FootnoteToDocxTests):
+    """Runs `FootnoteToDocxTests` over BeautifulSoup trees."""
+
+
+class HtmlParserTests(SimpleTestCase):
+    """Checks that the `lxml` tree walked by the converters matches the BeautifulSoup tree."""
+
+    @staticmethod
+    def dump(el):
+        return [
+            (child.name, child.attrs, HtmlParserTests.dump(child)) if child.name else str(child) for child in el.children
+        ]
+
+    def assertSameTree(self, html):
+        bs4_body = parse_body_bs4(html)
+        lxml_body = parse_body_lxml(html)
+        self.assertEqual(self.dump(lxml_body), self.dump(bs4_body))
+        self.assertEqual(lxml_body.get_text(), bs4_body.get_text())
+
+    def test_nested_elements_and_tails(self):
+        self.assertSameTree(
+            '<p class="a  b">One <b>two <i>three</i></b> four<br>five</p>'
+            '<ul><li>Item<ul><li>Nested</li></ul></li></ul>'
+            '<table><tbody><tr><td colspan="2">Cell</td></tr></tbody></table>'
+        )
+
+    def test_comments_are_text(self):
+        self.assertSameTree("<p>Before<!-- comment -->after</p>")
+
+    def test_trailing_empty_paragraphs_removed(self):
+        self.assertSameTree("<p>Text</p><p></p>\n<p>&nbsp;</p><p> </p>\n")
+        self.assertSameTree("<p>Text</p><p><br></p><p></p>")
+        self.assertEqual(self.dump(parse_body_lxml("<p>Text</p><p></p>\n<p> </p>")), [("p", {}, ["Text"]), "\n"])
+
+    def test_unclosed_tags(self):
+        self.assertSameTree("<p>One<p>Two <b>bold<td>cell")
+
+    def test_no_body(self):
+        self.assertIsNone(parse_body_lxml(""))
+        self.assertIsNone(parse_body_bs4(""))
+
+    def test_find(self):
+        body = parse_body_lxml(
+            '<div class="collab-table-wrapper"><span class="x collab-table-caption">Cap</span><table></table></div>'
+        )
+        div = body.contents[0]
+        self.assertEqual(div.find("table").name, "table")
+        self.assertEqual(div.find(class_="collab-table-caption").get_text(), "Cap")
+        self.assertIsNone(div.find("caption"))
+
+
 class HtmlToDocxWithEvidenceTests(TestCase):
     ONE_PIXEL_PNG = base64.b64decode(
         "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mP8/x8AAwMCAO+yF9kAAAAASUVORK5CYII="
@@ -1175,6 +1237,51 @@ class HtmlToDocxWithEvidenceTests(TestCase):
 
         self.assertEqual(paragraph.alignment, WD_ALIGN_PARAGRAPH.LEFT)
 
+    def test_image_border_is_added_to_the_new_image_only(self):
+        report_config = ReportConfiguration.get_solo()
+        report_config.enable_borders = True
+        doc = docx.Document()
+        converter = self.build_converter(report_config=report_config, doc=doc)
+
+        with tempfile.NamedTemporaryFile(suffix=".png") as image_file:
+            image_file.write(self.ONE_PIXEL_PNG)
+            image_file.flush()
+            first = doc.add_paragraph()
+            last = doc.add_paragraph()
+            converter._make_image(last, image_file.name)
+            converter._make_image(first, image_file.name)
+
+        for paragraph in (first, last):
+            self.assertEqual(len(paragraph._p.xpath(".//wp:effectExtent")), 1)
+            self.assertEqual(len(paragraph._p.xpath(".//pic:spPr/a:ln")), 1)
+        shape_ids = [int(shape_id) for shape_id in doc.element.body.xpath(".//wp:docPr/@id")]
+        self.assertEqual(len(set(shape_ids)), 2)
+
+    def test_image_insertion_searches_for_drawing_ids_once(self):
+        """Searching the whole part for the highest drawing ID on every image would be quadratic."""
+        report_config = ReportConfiguration.get_solo()
+        report_config.enable_borders = True
+        doc = docx.Document()
+        converter = self.build_converter(report_config=report_config, doc=doc)
+
+        searched = []
+        next_id = StoryPart.next_id
+
+        def counting_next_id(part):
+            searched.append(part)
+            return next_id.fget(part)
+
+        with tempfile.NamedTemporaryFile(suffix=".png") as image_file:
+            image_file.write(self.ONE_PIXEL_PNG)
+            image_file.flush()
+            with patch.object(StoryPart, "next_id", property(counting_next_id)):
+                for _ in range(200):
+                    converter._make_image(doc.add_paragraph(), image_file.name)
+
+        self.assertEqual(searched, [doc.part])
+        shape_ids = [int(shape_id) for shape_id in doc.element.body.xpath(".//wp:docPr/@id")]
+        self.assertEqual(len(set(shape_ids)), 200)
+
     def test_image_width_uses_global_default_when_template_is_blank(self):
         report_template = ReportDocxTemplateFactory(evidence_image_width=None)
         report_config = ReportConfiguration.get_solo()
@@ -1192,3 +1299,103 @@ class HtmlToDocxWithEvidenceTests(TestCase):
         converter = self.build_converter(report_template=report_template, report_config=report_config)
 
         self.assertEqual(converter.image_width, 6.5)
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=100)
+    def test_image_embeds_downscaled_derivative(self):
+        converter = self.build_converter()
+        converter.image_width = 6.5
+        doc = converter.doc
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            image_path = os.path.join(temp_dir, "screenshot.png")
+            Image.frombytes("RGB", (2000, 200), os.urandom(2000 * 200 * 3)).save(image_path)
+            converter._make_image(doc.add_paragraph(), image_path)
+
+        image_part = next(rel.target_part for rel in doc.part.rels.values() if "image" in rel.reltype)
+        with Image.open(BytesIO(image_part.blob)) as embedded:
+            self.assertEqual(embedded.size, (650, 65))
+
+
+@override_settings(GHOSTWRITER_RICH_TEXT_PARSER="bs4")
+class HtmlToDocxWithEvidenceBs4Tests(HtmlToDocxWithEvidenceTests):
+    """Runs `HtmlToDocxWithEvidenceTests` over BeautifulSoup trees."""
+
+
+class EvidenceImageDerivativeTests(SimpleTestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def make_image(self, name, size, image_format="PNG"):
+        path = os.path.join(self.temp_dir.name, name)
+        Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3)).save(path, format=image_format)
+        return path
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=200)
+    def test_large_image_is_downscaled_and_reused(self):
+        image_path = self.make_image("large.png", (3840, 400))
+
+        derivative = export_image_path(image_path, 6.5)
+
+        self.assertNotEqual(derivative, image_path)
+        self.assertLess(os.path.getsize(derivative), os.path.getsize(image_path))
+        with Image.open(derivative) as image:
+            self.assertEqual(image.size, (1300, 135))
+        modified = os.path.getmtime(derivative)
+        self.assertEqual(export_image_path(image_path, 6.5), derivative)
+        self.assertEqual(os.path.getmtime(derivative), modified)
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=200)
+    def test_jpeg_is_downscaled(self):
+        image_path = self.make_image("photo.jpg", (3000, 300), "JPEG")
+
+        derivative = export_image_path(image_path, 4.5)
+
+        self.assertTrue(derivative.endswith("w.jpg"))
+        with Image.open(derivative) as image:
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.width, 900)
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=200)
+    def test_small_image_uses_original(self):
+        image_path = self.make_image("small.png", (800, 100))
+        self.assertEqual(export_image_path(image_path, 6.5), image_path)
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=0)
+    def test_disabled_uses_original(self):
+        image_path = self.make_image("large.png", (3840, 400))
+        self.assertEqual(export_image_path(image_path, 6.5), image_path)
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=200)
+    def test_unreadable_image_uses_original(self):
+        image_path = os.path.join(self.temp_dir.name, "broken.png")
+        with open(image_path, "wb") as image_file:
+            image_file.write(b"not an image")
+        self.assertEqual(export_image_path(image_path, 6.5), image_path)
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=200)
+    def test_replaced_image_gets_new_derivative(self):
+        image_path = self.make_image("large.png", (3840, 400))
+        first = export_image_path(image_path, 6.5)
+
+        self.make_image("large.png", (3840, 800))
+        second = export_image_path(image_path, 6.5)
+
+        self.assertNotEqual(first, second)
+        with Image.open(second) as image:
+            self.assertEqual(image.size, (1300, 271))
+
+    @override_settings(GHOSTWRITER_EVIDENCE_IMAGE_DPI=200)
+    def test_delete_derivatives(self):
+        image_path = self.make_image("large.png", (3840, 400))
+        other_path = self.make_image("large-other.png", (3840, 400))
+        derivatives = [export_image_path(image_path, 6.5), export_image_path(image_path, 4.5)]
+        other_derivative = export_image_path(other_path, 6.5)
+
+        delete_derivatives(image_path)
+
+        for derivative in derivatives:
+            self.assertFalse(os.path.exists(derivative))
+        self.assertTrue(os.path.exists(other_derivative))
+        # A deleted derivative is created again on the next export
+        self.assertTrue(os.path.exists(export_image_path(image_path, 6.5)))
@@ -2,7 +2,7 @@ import pptx
 from io import BytesIO
 from zipfile import ZipFile
 
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, override_settings
 from .test_rich_text_docx import clean_xml
 
 from ghostwriter.modules.reportwriter.richtext.pptx import HtmlToPptx
@@ -705,3 +705,8 @@ class RichTextToPptxTests(SimpleTestCase):
             </a:p>
         """,
     )
+
+
+@override_settings(GHOSTWRITER_RICH_TEXT_PARSER="bs4")
+class RichTextToPptxBs4Tests(RichTextToPptxTests):
+    """Runs `RichTextToPptxTests` over BeautifulSoup trees."""
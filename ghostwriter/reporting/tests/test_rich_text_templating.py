@@ -2,9 +2,11 @@
 from io import StringIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 # Django Imports
-from django.test import SimpleTestCase, TestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
 
 # 3rd Party Libraries
 import jinja2
@@ -21,11 +23,14 @@ from ghostwriter.factories import (
 from ghostwriter.modules.reportwriter import jinja_funcs, prepare_jinja2_env
 from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
 from ghostwriter.modules.reportwriter.base.base import ExportBase
+from ghostwriter.modules.reportwriter.base import html_rich_text
 from ghostwriter.modules.reportwriter.base.html_rich_text import (
     CompiledRichTextTemplate,
     HtmlRichText,
     LazilyRenderedTemplate,
+    RichTextTemplateCache,
     rich_text_template,
+    rich_text_template_cache,
 )
 from ghostwriter.modules.reportwriter.forms import JinjaRichTextField
 from ghostwriter.modules.reportwriter.report.docx import ExportReportDocx
@@ -536,6 +541,102 @@ class RichTextTemplatingTests(SimpleTestCase):
         self.assertIn('data-gw-caption="Here is a Caption"', out)
 
 
+@override_settings(GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE_SIZE=2, GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE=None)
+class RichTextTemplateCacheTests(SimpleTestCase):
+    """Collection of tests for the compiled rich text cache."""
+
+    def setUp(self):
+        rich_text_template_cache.clear()
+        self.addCleanup(rich_text_template_cache.clear)
+
+    def compile_count(self, env, *texts):
+        with patch.object(
+            html_rich_text, "_compile_rich_text", wraps=html_rich_text._compile_rich_text
+        ) as compile_rich_text:
+            templates = [rich_text_template(env, text) for text in texts]
+        return compile_rich_text.call_count, templates
+
+    def test_identical_text_is_compiled_once(self):
+        env = prepare_jinja2_env()
+        count, templates = self.compile_count(env, "<p>{{ name|upper }}</p>", "<p>{{ name|upper }}</p>")
+        self.assertEqual(count, 1)
+        for template in templates:
+            self.assertEqual(template.render({"name": "ghost"}), "<p>GHOST</p>")
+
+    def test_cached_template_binds_to_each_environment(self):
+        env, undefined_variables = prepare_jinja2_env(debug=True)
+        self.compile_count(prepare_jinja2_env(), "<p>{{ missing }}</p>")
+        count, templates = self.compile_count(env, "<p>{{ missing }}</p>")
+        self.assertEqual(count, 0)
+        templates[0].render({})
+        self.assertEqual(undefined_variables, {"missing"})
+
+    def test_literal_fragments_survive_caching(self):
+        env = prepare_jinja2_env()
+        source = '<p>{{ name }} <span data-gw-jinja-literal="true">{{ name }}</span></p>'
+        _, templates = self.compile_count(env, source, source)
+        for template in templates:
+            self.assertEqual(template.render({"name": "ghost"}), "<p>ghost {{ name }}</p>")
+
+    def test_filter_configuration_is_part_of_the_key(self):
+        env = prepare_jinja2_env()
+        other_env = prepare_jinja2_env()
+        other_env.filters["shout"] = str.upper
+        self.assertNotEqual(
+            RichTextTemplateCache.key(env, "<p>text</p>"),
+            RichTextTemplateCache.key(other_env, "<p>text</p>"),
+        )
+
+    def test_syntax_errors_are_not_cached(self):
+        env = prepare_jinja2_env()
+        for _ in range(2):
+            with self.assertRaises(ReportExportTemplateError):
+                rich_text_template(env, "<p>{{ broken </p>")
+        self.assertEqual(len(rich_text_template_cache), 0)
+
+    def test_cache_is_bounded(self):
+        env = prepare_jinja2_env()
+        self.compile_count(env, "<p>1</p>", "<p>2</p>", "<p>3</p>")
+        self.assertEqual(len(rich_text_template_cache), 2)
+        count, _ = self.compile_count(env, "<p>1</p>")
+        self.assertEqual(count, 1)
+
+    @override_settings(GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE_SIZE=0)
+    def test_cache_can_be_disabled(self):
+        env = prepare_jinja2_env()
+        count, _ = self.compile_count(env, "<p>text</p>", "<p>text</p>")
+        self.assertEqual(count, 2)
+
+    @override_settings(GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE="default")
+    def test_only_preprocessed_source_is_shared(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        env = prepare_jinja2_env()
+        source = '<p>{{ name }} <span data-gw-jinja-literal="true">{{ name }}</span></p>'
+        self.compile_count(env, source)
+        shared_source, literal_fragments = cache.get(RichTextTemplateCache.source_key(source))
+        self.assertIsInstance(shared_source, str)
+        self.assertEqual(list(literal_fragments.values()), ["{{ name }}"])
+
+        # Another process preprocesses nothing, but compiles the shared source itself
+        rich_text_template_cache.clear()
+        with patch.object(
+            html_rich_text, "_preprocess_rich_text", wraps=html_rich_text._preprocess_rich_text
+        ) as preprocess_rich_text:
+            count, templates = self.compile_count(env, source)
+        preprocess_rich_text.assert_not_called()
+        self.assertEqual(count, 1)
+        self.assertEqual(templates[0].render({"name": "ghost"}), "<p>ghost {{ name }}</p>")
+
+    @override_settings(GHOSTWRITER_RICH_TEXT_TEMPLATE_CACHE="default")
+    def test_malformed_shared_source_is_ignored(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        cache.set(RichTextTemplateCache.source_key("<p>{{ name }}</p>"), (b"\xe3\x00", {}))
+        template = rich_text_template(prepare_jinja2_env(), "<p>{{ name }}</p>")
+        self.assertEqual(template.render({"name": "ghost"}), "<p>ghost</p>")
+
+
 class RichTextTemplatingExportTests(TestCase):
     def test_create_lazy_template_normalizes_none_to_empty_rich_text(self):
         class DummyExport(ExportBase):
@@ -29,6 +29,7 @@ from ghostwriter.commandcenter.models import (
     ReportConfiguration,
 )
 from ghostwriter.factories import (
+    ArchiveFactory,
     ClientFactory,
     DocTypeFactory,
     EvidenceFactory,
@@ -77,6 +78,7 @@ from ghostwriter.reporting.models import (
     Evidence,
     EvidenceImageAlignmentOverride,
     ReportFindingLink,
+    ReportGenerationJob,
     ReportObservationLink,
 )
 from ghostwriter.reporting.templatetags import report_tags
@@ -4947,6 +4949,40 @@ class ReportTemplateSwapViewTests(TestCase):
         self.assertJSONEqual(force_str(response.content), data)
 
 
+class ArchiveDownloadViewTests(TestCase):
+    """Collection of tests for :view:`reporting.ArchiveDownloadView`."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.archive = ArchiveFactory(report_archive__data=b"PK\x05\x06" + b"\x00" * 18)
+        cls.user = UserFactory(password=PASSWORD)
+        cls.mgr_user = UserFactory(password=PASSWORD, role="manager")
+        cls.uri = reverse("reporting:download_archive", kwargs={"pk": cls.archive.pk})
+
+    def setUp(self):
+        self.client = Client()
+        self.client_auth = Client()
+        self.client_mgr = Client()
+        self.assertTrue(self.client_auth.login(username=self.user.username, password=PASSWORD))
+        self.assertTrue(self.client_mgr.login(username=self.mgr_user.username, password=PASSWORD))
+
+    def test_view_streams_archive(self):
+        response = self.client_mgr.get(self.uri)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.get("Content-Type"), "application/x-zip-compressed")
+        self.assertIn("attachment", response.get("Content-Disposition"))
+        with open(self.archive.report_archive.path, "rb") as archive_file:
+            self.assertEqual(b"".join(response.streaming_content), archive_file.read())
+
+    def test_view_requires_login_and_permissions(self):
+        response = self.client.get(self.uri)
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client_auth.get(self.uri)
+        self.assertEqual(response.status_code, 302)
+
+
 # Tests related to generating report types
 
 
@@ -5000,15 +5036,18 @@ class GenerateReportTests(TestCase):
             namespace = {
                 "xlsx": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
             }
-            shared_strings = ElementTree.fromstring(
-                workbook.read("xl/sharedStrings.xml")
-            )
-            strings = [
-                "".join(
-                    text.text or "" for text in item.findall(".//xlsx:t", namespace)
+            strings = []
+            # Workbooks written in constant memory mode store their strings inline
+            if "xl/sharedStrings.xml" in workbook.namelist():
+                shared_strings = ElementTree.fromstring(
+                    workbook.read("xl/sharedStrings.xml")
                 )
-                for item in shared_strings.findall("xlsx:si", namespace)
-            ]
+                strings = [
+                    "".join(
+                        text.text or "" for text in item.findall(".//xlsx:t", namespace)
+                    )
+                    for item in shared_strings.findall("xlsx:si", namespace)
+                ]
             sheet = ElementTree.fromstring(workbook.read("xl/worksheets/sheet1.xml"))
 
             rows = []
@@ -5020,7 +5059,11 @@ class GenerateReportTests(TestCase):
                         row_values.append("")
 
                     value = cell.find("xlsx:v", namespace)
-                    if value is None:
+                    if cell.get("t") == "inlineStr":
+                        row_values[column_index] = "".join(
+                            text.text or "" for text in cell.findall(".//xlsx:t", namespace)
+                        )
+                    elif value is None:
                         row_values[column_index] = ""
                     elif cell.get("t") == "s":
                         row_values[column_index] = strings[int(value.text)]
@@ -5201,6 +5244,98 @@ class GenerateReportTests(TestCase):
         self.assertEqual(
             response.get("Content-Type"), "application/x-zip-compressed", str(response)
         )
+        self.assertTrue(response.streaming)
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as bundle:
+            self.assertIsNone(bundle.testzip())
+            self.assertEqual(
+                sorted(os.path.splitext(name)[1] for name in bundle.namelist()),
+                [".docx", ".json", ".pptx", ".xlsx"],
+            )
+
+    def test_view_all_lists_formats_that_fail_after_streaming_starts(self):
+        from unittest.mock import patch
+
+        from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
+
+        def results(*args, **kwargs):
+            yield "docx", "report.docx", b"docx", None
+            yield "pptx", None, None, ReportExportTemplateError("Undefined variable: client")
+            yield "json", "report.json", b"{}", None
+
+        with patch("ghostwriter.reporting.views2.report.iter_report_bundle", side_effect=results):
+            response = self.client_mgr.get(self.all_uri)
+            content = b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        with zipfile.ZipFile(io.BytesIO(content)) as bundle:
+            self.assertEqual(bundle.namelist(), ["report.docx", "report.json", "ERRORS.txt"])
+            self.assertEqual(
+                bundle.read("ERRORS.txt").decode(),
+                "The PPTX document could not be generated: Undefined variable: client\n",
+            )
+
+    def test_view_all_logs_incomplete_bundles_as_failed(self):
+        from unittest.mock import patch
+
+        from django.db import connection
+
+        from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
+
+        def results_with_error():
+            yield "docx", "report.docx", b"docx", None
+            yield "pptx", None, None, ReportExportTemplateError("Undefined variable: client")
+            yield "json", "report.json", b"{}", None
+
+        def results():
+            yield "docx", "report.docx", b"docx", None
+            yield "json", "report.json", b"{}", None
+
+        previous_disable_level = logging.root.manager.disable
+        logging.disable(logging.NOTSET)
+        try:
+            with (
+                patch(
+                    "ghostwriter.reporting.views2.report.iter_report_bundle",
+                    side_effect=[results_with_error(), results()],
+                ),
+                self.assertLogs("ghostwriter.reporting.generation", level="INFO") as logs,
+            ):
+                b"".join(self.client_mgr.get(self.all_uri).streaming_content)
+                # The download is closed before the bundle is finished
+                response = self.client_mgr.get(self.all_uri)
+                next(iter(response.streaming_content))
+                # Closing fires `request_finished`, which would close the test's database connection
+                with patch.object(connection, "close_if_unusable_or_obsolete"):
+                    response.close()
+        finally:
+            logging.disable(previous_disable_level)
+        lines = [line for line in logs.output if f"ALL generation for report {self.report.pk} profile" in line]
+        self.assertEqual(len(lines), 2)
+        for line in lines:
+            self.assertIn('"status": "failed"', line)
+
+    def test_views_log_generation_profile(self):
+        previous_disable_level = logging.root.manager.disable
+        logging.disable(logging.NOTSET)
+        try:
+            for export_type, uri in (("json", self.json_uri), ("all", self.all_uri)):
+                with self.subTest(export_type=export_type):
+                    with self.assertLogs("ghostwriter.reporting.generation", level="INFO") as logs:
+                        response = self.client_mgr.get(uri)
+                        if response.streaming:
+                            b"".join(response.streaming_content)
+                    self.assertEqual(response.status_code, 200)
+                    lines = [
+                        line
+                        for line in logs.output
+                        if f"{export_type.upper()} generation for report {self.report.pk} profile" in line
+                    ]
+                    self.assertEqual(len(lines), 1)
+                    self.assertIn('"status": "success"', lines[0])
+                    profile = json.loads(lines[0].split(" profile: ", 1)[1])
+                    self.assertGreater(profile["queries"], 0)
+                    self.assertIn("serialize", [phase["phase"] for phase in profile["phases"]])
+        finally:
+            logging.disable(previous_disable_level)
 
     def test_view_json_requires_login_and_permissions(self):
         response = self.client.get(self.json_uri)
@@ -5376,6 +5511,204 @@ class GenerateReportTests(TestCase):
         self.report.save()
 
 
+class GenerateReportJobTests(TestCase):
+    """Collection of tests for :view:`reporting.GenerateReportJob` and the job status and download views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.report = ReportFactory(
+            docx_template=ReportDocxTemplateFactory(),
+            pptx_template=ReportPptxTemplateFactory(),
+        )
+        ReportFindingLinkFactory(report=cls.report)
+        cls.user = UserFactory(password=PASSWORD)
+        cls.mgr_user = UserFactory(password=PASSWORD, role="manager")
+        cls.json_uri = reverse("reporting:generate_job", kwargs={"pk": cls.report.pk, "export_type": "json"})
+
+    def setUp(self):
+        self.client = Client()
+        self.client_auth = Client()
+        self.client_mgr = Client()
+        self.assertTrue(self.client_auth.login(username=self.user.username, password=PASSWORD))
+        self.assertTrue(self.client_mgr.login(username=self.mgr_user.username, password=PASSWORD))
+
+    def tearDown(self):
+        # Remove any generated files
+        for job in ReportGenerationJob.objects.all():
+            job.delete()
+
+    def test_post_queues_job(self):
+        from unittest.mock import patch
+
+        with patch("ghostwriter.reporting.views2.report.async_task") as mock_async_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client_mgr.post(self.json_uri)
+
+        self.assertEqual(response.status_code, 202)
+        job = ReportGenerationJob.objects.get(pk=response.json()["job"])
+        self.assertEqual(job.status, ReportGenerationJob.Status.PENDING)
+        self.assertEqual(job.export_type, "json")
+        self.assertEqual(job.requested_by, self.mgr_user)
+        mock_async_task.assert_called_once_with(
+            "ghostwriter.reporting.tasks.generate_report_job",
+            job.pk,
+            group="Report Generation",
+        )
+
+    def test_post_rejects_unknown_export_type(self):
+        uri = reverse("reporting:generate_job", kwargs={"pk": self.report.pk, "export_type": "pdf"})
+        response = self.client_mgr.post(uri)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ReportGenerationJob.objects.exists())
+
+    def test_post_requires_permissions(self):
+        response = self.client.post(self.json_uri)
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client_auth.post(self.json_uri)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(ReportGenerationJob.objects.exists())
+
+    def test_task_generates_downloadable_document(self):
+        from ghostwriter.reporting.tasks import generate_report_job
+
+        job = ReportGenerationJob.objects.create(report=self.report, export_type="json", requested_by=self.mgr_user)
+        self.assertEqual(generate_report_job(job.pk), ReportGenerationJob.Status.SUCCESS)
+
+        job.refresh_from_db()
+        self.assertEqual(job.phase, "save")
+        self.assertTrue(job.filename.endswith(".json"))
+        self.assertIsNotNone(job.finished)
+
+        response = self.client_mgr.get(reverse("reporting:report_job_status", kwargs={"pk": job.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "success")
+        self.assertEqual(response.json()["download_url"], job.get_download_url())
+
+        response = self.client_mgr.get(job.get_download_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get("Content-Type"), "application/json")
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(data["findings"]), 1)
+
+    def test_task_records_failure(self):
+        from ghostwriter.reporting.tasks import generate_report_job
+
+        job = ReportGenerationJob.objects.create(report=self.report, export_type="bogus", requested_by=self.mgr_user)
+        self.assertEqual(generate_report_job(job.pk), ReportGenerationJob.Status.FAILED)
+        job.refresh_from_db()
+        self.assertIn("Unknown export type", job.error)
+
+        response = self.client_mgr.get(job.get_download_url())
+        self.assertEqual(response.status_code, 404)
+
+    def test_task_records_profile(self):
+        from ghostwriter.reporting.tasks import generate_report_job
+
+        job = ReportGenerationJob.objects.create(report=self.report, export_type="json", requested_by=self.mgr_user)
+        previous_disable_level = logging.root.manager.disable
+        logging.disable(logging.NOTSET)
+        try:
+            with self.assertLogs("ghostwriter.reporting.generation", level="INFO") as logs:
+                generate_report_job(job.pk)
+        finally:
+            logging.disable(previous_disable_level)
+
+        job.refresh_from_db()
+        self.assertEqual([phase["phase"] for phase in job.profile["phases"]], ["serialize", "save"])
+        self.assertGreater(job.profile["queries"], 0)
+        self.assertTrue(any(f"Report generation job {job.pk} profile" in line for line in logs.output))
+
+    @override_settings(GHOSTWRITER_REPORT_JOB_TTL=3600)
+    def test_cleanup_task_deletes_expired_jobs_and_documents(self):
+        from ghostwriter.reporting.tasks import delete_expired_report_jobs, generate_report_job
+
+        expired = ReportGenerationJob.objects.create(report=self.report, export_type="json")
+        generate_report_job(expired.pk)
+        expired.refresh_from_db()
+        output_path = expired.output.path
+        self.assertTrue(os.path.exists(output_path))
+        ReportGenerationJob.objects.filter(pk=expired.pk).update(
+            finished=datetime.now(timezone.utc) - timedelta(hours=2)
+        )
+        recent = ReportGenerationJob.objects.create(report=self.report, export_type="json")
+        generate_report_job(recent.pk)
+
+        self.assertEqual(delete_expired_report_jobs(), {"failed": 0, "deleted": 1})
+        self.assertFalse(ReportGenerationJob.objects.filter(pk=expired.pk).exists())
+        self.assertFalse(os.path.exists(output_path))
+        self.assertTrue(ReportGenerationJob.objects.filter(pk=recent.pk).exists())
+
+    @override_settings(GHOSTWRITER_REPORT_JOB_STALE_AFTER=3600)
+    def test_cleanup_task_fails_stale_jobs(self):
+        from ghostwriter.reporting.tasks import delete_expired_report_jobs, generate_report_job
+
+        stale_pending = ReportGenerationJob.objects.create(report=self.report, export_type="json")
+        stale_running = ReportGenerationJob.objects.create(
+            report=self.report, export_type="json", status=ReportGenerationJob.Status.RUNNING
+        )
+        ReportGenerationJob.objects.filter(pk__in=[stale_pending.pk, stale_running.pk]).update(
+            created=datetime.now(timezone.utc) - timedelta(hours=2)
+        )
+        recent = ReportGenerationJob.objects.create(report=self.report, export_type="json")
+
+        self.assertEqual(delete_expired_report_jobs(), {"failed": 2, "deleted": 0})
+        for job in (stale_pending, stale_running):
+            job.refresh_from_db()
+            self.assertEqual(job.status, ReportGenerationJob.Status.FAILED)
+            self.assertIsNotNone(job.finished)
+            self.assertIn("did not finish", job.error)
+        recent.refresh_from_db()
+        self.assertEqual(recent.status, ReportGenerationJob.Status.PENDING)
+
+        # A worker that picks up a failed job does not run it
+        self.assertEqual(generate_report_job(stale_pending.pk), ReportGenerationJob.Status.FAILED)
+
+    def test_metrics_sum_up_recent_profiles(self):
+        profile = {
+            "seconds": 1.5,
+            "queries": 4,
+            "phases": [{"phase": "serialize", "seconds": 1.0, "queries": 4}],
+            "sections": [],
+            "slowest_locations": [],
+        }
+        for _ in range(2):
+            ReportGenerationJob.objects.create(
+                report=self.report,
+                export_type="docx",
+                status=ReportGenerationJob.Status.SUCCESS,
+                finished=datetime.now(timezone.utc),
+                profile=profile,
+            )
+        ReportGenerationJob.objects.create(
+            report=self.report,
+            export_type="docx",
+            status=ReportGenerationJob.Status.SUCCESS,
+            finished=datetime.now(timezone.utc) - timedelta(days=1),
+            profile=profile,
+        )
+
+        response = self.client_mgr.get(reverse("reporting:report_job_metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        metrics = response.content.decode()
+        self.assertIn('ghostwriter_report_generation_profiles{export_type="docx",status="success"} 2', metrics)
+        self.assertIn('ghostwriter_report_generation_seconds{export_type="docx",status="success"} 3.0', metrics)
+
+    def test_metrics_require_privileges(self):
+        uri = reverse("reporting:report_job_metrics")
+        response = self.client.get(uri)
+        self.assertEqual(response.status_code, 302)
+        response = self.client_auth.get(uri)
+        self.assertEqual(response.status_code, 403)
+
+    def test_download_requires_permissions(self):
+        job = ReportGenerationJob.objects.create(report=self.report, export_type="json")
+        response = self.client_auth.get(job.get_download_url())
+        self.assertEqual(response.status_code, 302)
+        self.assertRedirects(response, reverse("home:dashboard"))
+
+
 class ReportTemplateFilterTests(TestCase):
     """Collection of tests for custom Jinja2 filters for report templates."""
 
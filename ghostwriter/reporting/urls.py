@@ -342,6 +342,26 @@ urlpatterns += [
         name="generate_json",
     ),
     path("reports/<int:pk>/all/", ghostwriter.reporting.views2.report.GenerateReportAll.as_view(), name="generate_all"),
+    path(
+        "reports/<int:pk>/jobs/<str:export_type>/",
+        ghostwriter.reporting.views2.report.GenerateReportJob.as_view(),
+        name="generate_job",
+    ),
+    path(
+        "reports/jobs/metrics/",
+        ghostwriter.reporting.views2.report.ReportGenerationMetrics.as_view(),
+        name="report_job_metrics",
+    ),
+    path(
+        "reports/jobs/<int:pk>/",
+        ghostwriter.reporting.views2.report.ReportGenerationJobStatus.as_view(),
+        name="report_job_status",
+    ),
+    path(
+        "reports/jobs/<int:pk>/download/",
+        ghostwriter.reporting.views2.report.ReportGenerationJobDownload.as_view(),
+        name="report_job_download",
+    ),
 ]
 
 # URLs for management functions
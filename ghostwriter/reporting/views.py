@@ -346,6 +346,10 @@ class ReportTemplateSwap(RoleBasedAccessControlMixin, SingleObjectMixin, View):
                                 data[
                                     "docx_lint_message"
                                 ] = "Selected Word template failed basic linter checks and can't be used to generate a report."
+                            elif template_status == "pending":
+                                data[
+                                    "docx_lint_message"
+                                ] = "Selected Word template is still being linted. Check the template's linter results before generating a report."
                             else:
                                 data[
                                     "docx_lint_message"
@@ -374,6 +378,10 @@ class ReportTemplateSwap(RoleBasedAccessControlMixin, SingleObjectMixin, View):
                                 data[
                                     "pptx_lint_message"
                                 ] = "Selected PowerPoint template failed basic linter checks and can't be used to generate a report."
+                            elif template_status == "pending":
+                                data[
+                                    "pptx_lint_message"
+                                ] = "Selected PowerPoint template is still being linted. Check the template's linter results before generating a report."
                             else:
                                 data[
                                     "pptx_lint_message"
@@ -470,7 +478,8 @@ class ReportTemplateLint(RoleBasedAccessControlMixin, SingleObjectMixin, View):
 
     def post(self, *args, **kwargs):
         template = self.get_object()
-        data = template.lint()
+        # Run the linter even if the file has memoized results, as the user asked for it
+        data = template.lint(use_cache=False)
         template.save()
         return JsonResponse(data)
 
@@ -1,14 +1,14 @@
 
-from datetime import datetime, timezone as dt_timezone
-import io
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
 import json
 import os
 import logging
 import mimetypes
-import zipfile
 from socket import gaierror
 from asgiref.sync import async_to_sync
 
+from django.db import transaction
 from django.db.models import Q
 from django.http import (
     FileResponse,
@@ -16,6 +16,7 @@ from django.http import (
     HttpResponse,
     HttpResponseRedirect,
     JsonResponse,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -28,28 +29,69 @@ from django.contrib import messages
 from django.utils import dateformat, timezone
 from django.utils.html import strip_tags
 from channels.layers import get_channel_layer
-from ghostwriter.api.utils import RoleBasedAccessControlMixin, get_reports_list, get_templates_list
+from django_q.tasks import async_task
+from ghostwriter.api.utils import (
+    RoleBasedAccessControlMixin,
+    get_reports_list,
+    get_templates_list,
+    verify_user_is_privileged,
+)
 from ghostwriter.commandcenter.models import BloodHoundConfiguration, ExtraFieldSpec, ReportConfiguration
 from ghostwriter.commandcenter.views import CollabModelUpdate, ExtraFieldJsonView, ExtraFieldRichTextPreviewView
 from ghostwriter.modules.exceptions import MissingTemplate
 from ghostwriter.modules.reportwriter import report_generation_queryset
 from ghostwriter.modules.reportwriter.base import ReportExportTemplateError
+from ghostwriter.modules.reportwriter.base.base import PHASE_SERIALIZE
+from ghostwriter.modules.reportwriter.profiling import ExportProfile, format_metrics
+from ghostwriter.modules.reportwriter.report.base import serialize_report_snapshot
 from ghostwriter.modules.reportwriter.report.docx import ExportReportDocx
 from ghostwriter.modules.reportwriter.report.json import ExportReportJson
 from ghostwriter.modules.reportwriter.report.pptx import ExportReportPptx
 from ghostwriter.modules.reportwriter.report.xlsx import ExportReportXlsx
 from ghostwriter.modules.shared import add_content_disposition_header
 from ghostwriter.modules.shared import get_tags_for_queryset
+from ghostwriter.modules.streaming import stream_response
+from ghostwriter.modules.zipstream import stream_zip
 from ghostwriter.oplog.models import Oplog, OplogEntry, _sanitize_rich_field
 from ghostwriter.reporting.archive import archive_report
 from ghostwriter.reporting.filters import ReportFilter, ReportTemplateFilter
 from ghostwriter.reporting.forms import ReportForm, ReportTemplateForm, SelectReportTemplateForm
-from ghostwriter.reporting.models import Archive, Finding, Observation, Report, ReportTemplate
+from ghostwriter.reporting.generation import get_report_template, iter_report_bundle, log_report_generation_profile
+from ghostwriter.reporting.models import (
+    Archive,
+    Finding,
+    Observation,
+    Report,
+    ReportGenerationJob,
+    ReportTemplate,
+)
 from ghostwriter.rolodex.models import Project
 
 logger = logging.getLogger(__name__)
 channel_layer = get_channel_layer()
 
+# Name of the file added to bundle downloads when a format fails after the download started
+BUNDLE_ERRORS_FILENAME = "ERRORS.txt"
+
+
+def _bundle_errors_text(errors: dict[str, Exception]) -> bytes:
+    """Returns the contents of the file that lists the formats left out of a bundle download and why."""
+    lines = [f"The {doc_type.upper()} document could not be generated: {error}" for doc_type, error in errors.items()]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _iter_profiled(iterator, profile: ExportProfile):
+    """Yields the items of `iterator`, recording only the time and queries spent producing each one in `profile`."""
+    try:
+        while True:
+            with profile.capture():
+                item = next(iterator, None)
+            if item is None:
+                return
+            yield item
+    finally:
+        iterator.close()
+
 
 def _outline_value(value):
     """Return plain text content for outline sentences, defaulting blanks to ``N/A``."""
@@ -298,10 +340,9 @@ class ArchiveDownloadView(RoleBasedAccessControlMixin, SingleObjectMixin, View):
         archive_instance = self.get_object()
         file_path = os.path.join(settings.MEDIA_ROOT, archive_instance.report_archive.path)
         if os.path.exists(file_path):
-            with open(file_path, "rb") as archive_file:
-                response = HttpResponse(archive_file.read(), content_type="application/x-zip-compressed")
-                add_content_disposition_header(response, os.path.basename(file_path))
-                return response
+            response = FileResponse(open(file_path, "rb"), content_type="application/x-zip-compressed")
+            add_content_disposition_header(response, os.path.basename(file_path))
+            return stream_response(self.request, response)
         raise Http404
 
 
@@ -982,6 +1023,31 @@ class GenerateReportBase(RoleBasedAccessControlMixin, SingleObjectMixin, View):
         self.include_bloodhound = self.object.include_bloodhound_data
         return super().dispatch(request, *args, **kwargs)
 
+    def log_export_profile(self, export_type: str, profile: ExportProfile, status: str):
+        """Log the profile of generating an ``export_type`` document, like background generation jobs do."""
+        log_report_generation_profile(
+            f"{export_type.upper()} generation for report {self.object.pk}",
+            profile,
+            report=self.object.pk,
+            export_type=export_type,
+            status=status,
+        )
+
+    @contextmanager
+    def export_profile(self, export_type: str):
+        """
+        Profile the generation in the enclosed block and log the profile when it exits (see `log_export_profile`).
+        Yields the `ExportProfile` to pass to the exporter.
+        """
+        profile = ExportProfile()
+        status = ReportGenerationJob.Status.FAILED
+        try:
+            with profile.capture():
+                yield profile
+            status = ReportGenerationJob.Status.SUCCESS
+        finally:
+            self.log_export_profile(export_type, profile, status)
+
 class GenerateReportJSON(GenerateReportBase):
     """Generate a JSON report for an individual :model:`reporting.Report`."""
 
@@ -995,7 +1061,8 @@ class GenerateReportJSON(GenerateReportBase):
             self.request.user,
         )
 
-        json_report = ExportReportJson(obj, include_bloodhound=self.include_bloodhound).run()
+        with self.export_profile("json") as profile:
+            json_report = ExportReportJson(obj, include_bloodhound=self.include_bloodhound, profile=profile).run()
         return HttpResponse(json_report.getvalue(), "application/json")
 
 
@@ -1058,9 +1125,14 @@ class GenerateReportDOCX(GenerateReportBase):
         # Template available and passes linting checks, so proceed with generation
 
         try:
-            exporter = ExportReportDocx(obj, report_template=report_template, include_bloodhound=self.include_bloodhound)
-            report_name = exporter.render_filename(report_template.filename_override or report_config.report_filename)
-            docx = exporter.run()
+            with self.export_profile("docx") as profile:
+                exporter = ExportReportDocx(
+                    obj, report_template=report_template, include_bloodhound=self.include_bloodhound, profile=profile
+                )
+                report_name = exporter.render_filename(
+                    report_template.filename_override or report_config.report_filename
+                )
+                docx = exporter.run()
         except ReportExportTemplateError as error:
             logger.error(
                 "DOCX generation failed for %s %s and user %s: %s",
@@ -1112,9 +1184,10 @@ class GenerateReportXLSX(GenerateReportBase):
 
         try:
             report_config = ReportConfiguration.get_solo()
-            exporter = ExportReportXlsx(obj, include_bloodhound=self.include_bloodhound)
-            report_name = exporter.render_filename(report_config.report_filename, ext="xlsx")
-            output = exporter.run()
+            with self.export_profile("xlsx") as profile:
+                exporter = ExportReportXlsx(obj, include_bloodhound=self.include_bloodhound, profile=profile)
+                report_name = exporter.render_filename(report_config.report_filename, ext="xlsx")
+                output = exporter.run()
             response = HttpResponse(
                 output.getvalue(),
                 content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -1176,9 +1249,14 @@ class GenerateReportPPTX(GenerateReportBase):
                 return HttpResponseRedirect(reverse("reporting:report_detail", kwargs={"pk": obj.pk}) + "#generate")
 
             # Template available and passes linting checks, so proceed with generation
-            exporter = ExportReportPptx(obj, report_template=report_template, include_bloodhound=self.include_bloodhound)
-            report_name = exporter.render_filename(report_template.filename_override or report_config.report_filename)
-            pptx = exporter.run()
+            with self.export_profile("pptx") as profile:
+                exporter = ExportReportPptx(
+                    obj, report_template=report_template, include_bloodhound=self.include_bloodhound, profile=profile
+                )
+                report_name = exporter.render_filename(
+                    report_template.filename_override or report_config.report_filename
+                )
+                pptx = exporter.run()
             response = HttpResponse(
                 pptx.getvalue(),
                 content_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
@@ -1251,38 +1329,77 @@ class GenerateReportAll(GenerateReportBase):
             if not pptx_template.user_can_apply_to_report(self.request.user, obj, "pptx"):
                 return _unavailable_template_response(self.request, obj)
 
-            exporters_and_filename_templates = [
-                (
-                    ExportReportDocx(obj, report_template=docx_template, include_bloodhound=self.include_bloodhound),
-                    docx_template.filename_override or report_config.report_filename,
-                ),
-                (
-                    ExportReportPptx(obj, report_template=pptx_template, include_bloodhound=self.include_bloodhound),
-                    pptx_template.filename_override or report_config.report_filename,
-                ),
-                (ExportReportXlsx(obj, include_bloodhound=self.include_bloodhound), report_config.report_filename),
-                (ExportReportJson(obj, include_bloodhound=self.include_bloodhound), report_config.report_filename),
+            members = [
+                ("docx", docx_template, docx_template.filename_override or report_config.report_filename),
+                ("pptx", pptx_template, pptx_template.filename_override or report_config.report_filename),
+                ("xlsx", None, report_config.report_filename),
+                ("json", None, report_config.report_filename),
             ]
 
-            zip_filename = exporters_and_filename_templates[0][0].render_filename(
-                report_config.report_filename, ext="zip"
+            # The documents are generated while the response streams, so the profile is logged once it ends
+            profile = ExportProfile()
+            with profile.capture():
+                # Serialize the report once and share it between all of the exporters
+                profile.start_phase(PHASE_SERIALIZE)
+                snapshot = serialize_report_snapshot(obj, include_bloodhound=self.include_bloodhound)
+                zip_filename = ExportReportJson(
+                    obj, include_bloodhound=self.include_bloodhound, snapshot=snapshot
+                ).render_filename(report_config.report_filename, ext="zip")
+
+            results = _iter_profiled(
+                iter_report_bundle(
+                    obj,
+                    members,
+                    include_bloodhound=self.include_bloodhound,
+                    snapshot=snapshot,
+                    profile=profile,
+                ),
+                profile,
             )
 
-            # Create a zip file in memory and add the reports to it
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, "a") as zf:
-                for (exporter, filename_template) in exporters_and_filename_templates:
-                    filename = exporter.render_filename(filename_template)
-                    doc = exporter.run()
-                    zf.writestr(filename, doc.getvalue())
-            zip_buffer.seek(0)
-
-            # Return the buffer in the HTTP response
-            response = HttpResponse(content_type="application/x-zip-compressed")
+            # Wait for the first document before responding, so the user can still be redirected with an
+            # error if every format fails
+            errors = {}
+            first_document = None
+            for doc_type, filename, content, error in results:
+                if error is not None:
+                    errors[doc_type] = error
+                    continue
+                first_document = (filename, content)
+                break
+            if first_document is None:
+                self.log_export_profile("all", profile, ReportGenerationJob.Status.FAILED)
+                raise next(iter(errors.values()))
+            for doc_type, error in errors.items():
+                messages.warning(
+                    self.request,
+                    f"The {doc_type.upper()} document was left out of the download: {error}",
+                    extra_tags="alert-warning",
+                )
+
+            def documents():
+                # Stream the Zip file while the remaining documents are generated; formats that fail from here
+                # on can only be reported inside the download
+                # Bundles that left a format out and downloads closed before the end are logged as failed
+                status = ReportGenerationJob.Status.FAILED
+                try:
+                    yield first_document
+                    for doc_type, filename, content, error in results:
+                        if error is not None:
+                            errors[doc_type] = error
+                            continue
+                        yield filename, content
+                    if errors:
+                        yield BUNDLE_ERRORS_FILENAME, _bundle_errors_text(errors)
+                    else:
+                        status = ReportGenerationJob.Status.SUCCESS
+                finally:
+                    self.log_export_profile("all", profile, status)
+
+            response = StreamingHttpResponse(stream_zip(documents()), content_type="application/x-zip-compressed")
             add_content_disposition_header(response, os.path.basename(zip_filename))
-            response.write(zip_buffer.read())
 
-            return response
+            return stream_response(self.request, response)
         except ReportExportTemplateError as error:
             logger.exception(
                 "All report generation failed unexpectedly for %s %s and user %s",
@@ -1311,6 +1428,160 @@ class GenerateReportAll(GenerateReportBase):
         return HttpResponseRedirect(reverse("reporting:report_detail", kwargs={"pk": obj.pk}) + "#generate")
 
 
+class GenerateReportJob(GenerateReportBase):
+    """
+    Queue a background :model:`reporting.ReportGenerationJob` for an individual
+    :model:`reporting.Report` and return the job's ID.
+
+    Progress is sent to the report's WebSocket group as ``status_update`` messages and the
+    finished document is served by :view:`reporting.ReportGenerationJobDownload`.
+    """
+
+    def handle_no_permission(self):
+        return JsonResponse(
+            {"result": "error", "message": "You do not have permission to access that."},
+            status=403,
+        )
+
+    def post(self, *args, **kwargs):
+        obj = self.object
+        export_type = self.kwargs["export_type"]
+        if export_type not in ReportGenerationJob.ExportType.values:
+            return JsonResponse({"result": "error", "message": "Unknown export type."}, status=400)
+
+        try:
+            for doc_type in ("docx", "pptx"):
+                if export_type not in (doc_type, "all"):
+                    continue
+                report_template = get_report_template(obj, doc_type)
+                if not report_template.user_can_apply_to_report(self.request.user, obj, doc_type):
+                    return self.handle_no_permission()
+                if report_template.get_status() in ("error", "failed"):
+                    return JsonResponse(
+                        {
+                            "result": "error",
+                            "message": "The selected report template has linting errors and cannot be used.",
+                        },
+                        status=400,
+                    )
+        except MissingTemplate:
+            return JsonResponse(
+                {
+                    "result": "error",
+                    "message": "You do not have a template selected and have not configured a default template.",
+                },
+                status=400,
+            )
+
+        job = ReportGenerationJob.objects.create(
+            report=obj,
+            export_type=export_type,
+            requested_by=self.request.user,
+        )
+        logger.info(
+            "Queued %s generation job %s for %s %s by request of %s",
+            export_type,
+            job.pk,
+            obj.__class__.__name__,
+            obj.id,
+            self.request.user,
+        )
+        # Queue the task only once the job is visible to the worker
+        transaction.on_commit(
+            lambda: async_task(
+                "ghostwriter.reporting.tasks.generate_report_job",
+                job.pk,
+                group="Report Generation",
+            )
+        )
+        return JsonResponse(
+            {
+                "result": "success",
+                "job": job.pk,
+                "status_url": reverse("reporting:report_job_status", kwargs={"pk": job.pk}),
+                "download_url": job.get_download_url(),
+            },
+            status=202,
+        )
+
+
+class ReportGenerationJobStatus(RoleBasedAccessControlMixin, SingleObjectMixin, View):
+    """Return the current status of an individual :model:`reporting.ReportGenerationJob`."""
+
+    model = ReportGenerationJob
+
+    def test_func(self):
+        return self.get_object().user_can_view(self.request.user)
+
+    def handle_no_permission(self):
+        return JsonResponse(
+            {"result": "error", "message": "You do not have permission to access that."},
+            status=403,
+        )
+
+    def get(self, *args, **kwargs):
+        job = self.get_object()
+        data = {
+            "job": job.pk,
+            "status": job.status,
+            "phase": job.phase,
+            "error": job.error,
+        }
+        if job.status == ReportGenerationJob.Status.SUCCESS:
+            data["download_url"] = job.get_download_url()
+        return JsonResponse(data)
+
+
+class ReportGenerationJobDownload(RoleBasedAccessControlMixin, SingleObjectMixin, View):
+    """Return the document generated by a finished :model:`reporting.ReportGenerationJob`."""
+
+    model = ReportGenerationJob
+
+    def test_func(self):
+        return self.get_object().user_can_view(self.request.user)
+
+    def handle_no_permission(self):
+        messages.error(self.request, "You do not have permission to access that.")
+        return redirect("home:dashboard")
+
+    def get(self, *args, **kwargs):
+        job = self.get_object()
+        if job.status != ReportGenerationJob.Status.SUCCESS or not job.output:
+            raise Http404
+        try:
+            output = job.output.open("rb")
+        except FileNotFoundError as err:
+            raise Http404 from err
+        content_type, _ = mimetypes.guess_type(job.filename)
+        response = FileResponse(output, content_type=content_type or "application/octet-stream")
+        add_content_disposition_header(response, job.filename)
+        return response
+
+
+class ReportGenerationMetrics(RoleBasedAccessControlMixin, View):
+    """
+    Return the profiles of the :model:`reporting.ReportGenerationJob` entries finished in the last
+    ``GHOSTWRITER_REPORT_METRICS_WINDOW`` minutes, summed up in the Prometheus text format.
+    """
+
+    def test_func(self):
+        return verify_user_is_privileged(self.request.user)
+
+    def handle_no_permission(self):
+        return HttpResponse("You do not have permission to access that.", status=403, content_type="text/plain")
+
+    def get(self, *args, **kwargs):
+        since = timezone.now() - timedelta(minutes=settings.GHOSTWRITER_REPORT_METRICS_WINDOW)
+        jobs = ReportGenerationJob.objects.filter(finished__gte=since, profile__isnull=False).values_list(
+            "export_type", "status", "profile"
+        )
+        metrics = format_metrics(
+            ({"export_type": export_type, "status": status}, profile)
+            for export_type, status, profile in jobs.iterator()
+        )
+        return HttpResponse(metrics, content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 def zip_directory(path, zip_handler):
     """Compress the target directory as a Zip file for archiving."""
     # Walk the target directory
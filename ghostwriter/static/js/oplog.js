@@ -1145,39 +1145,39 @@ $(document).ready(function () {
                 }
                 editEntry(message.entry_id, true);
                 displayToastTop({ type: 'success', string: 'Successfully added a log entry.', title: 'Oplog Update' });
-            } else if (message.action === 'create') {
-                let entry = message.data;
-                let entryId = entry.id;
+            } else if (message.action === 'create' || message.action === 'bulk_create') {
+                // Integrations that send entries in bulk get one message for the whole batch
+                let entries = message.action === 'create' ? [message.data] : message.data;
 
                 if ($searchInput.val() !== '') {
                     fetch(true);
                     return;
                 }
 
-                entryDataStore[entryId] = entry;
-
-                let $existing = $(`#entry-${entryId}`);
-                if ($existing.length > 0) {
-                    // Update existing row
-                    let newHtml = generateRow(entry);
-                    $existing.replaceWith(newHtml);
-                    hideColumns();
-                    $table.trigger('update');
-                    // If this is the selected entry, re-render detail
-                    if (selectedEntryId === entryId) {
-                        renderDetail(entry);
+                let $newRows = $();
+                entries.forEach(entry => {
+                    let entryId = entry.id;
+                    entryDataStore[entryId] = entry;
+
+                    let $existing = $(`#entry-${entryId}`);
+                    if ($existing.length > 0) {
+                        // Update existing row
+                        $existing.replaceWith(generateRow(entry));
+                        // If this is the selected entry, re-render detail
+                        if (selectedEntryId === entryId) {
+                            renderDetail(entry);
+                        }
+                    } else {
+                        // New entry: prepend to DOM first, then rebuild the tablesorter
+                        // cache from DOM order so the row stays at the top when no sort
+                        // is active. Using addRows with resort=true causes tablesorter to
+                        // sort by its internal cache order (new row appended last = bottom).
+                        $newRows = $newRows.add($(generateRow(entry)).prependTo($tableBody).hide());
                     }
-                } else {
-                    // New entry: prepend to DOM first, then rebuild the tablesorter
-                    // cache from DOM order so the row stays at the top when no sort
-                    // is active. Using addRows with resort=true causes tablesorter to
-                    // sort by its internal cache order (new row appended last = bottom).
-                    let $newRow = $(generateRow(entry)).prependTo($tableBody);
-                    $newRow.hide();
-                    hideColumns();
-                    $table.trigger('update', [true]);
-                    $newRow.fadeIn(400);
-                }
+                });
+                hideColumns();
+                $table.trigger('update', $newRows.length > 0 ? [true] : []);
+                $newRows.fadeIn(400);
                 updatePlaceholder();
             } else if (message.action === 'fetch_entry') {
                 // Deep-link: entry fetched for detail pane display.
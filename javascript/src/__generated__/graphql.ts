@@ -37,22 +37,33 @@ export type Boolean_Comparison_Exp = {
   _nin?: InputMaybe<Array<Scalars['Boolean']['input']>>;
 };
 
+export type BulkCreateOplogEntriesResult = {
+  __typename?: 'BulkCreateOplogEntriesResult';
+  created: Scalars['Int']['output'];
+  entryIds: Array<Scalars['Int']['output']>;
+  updated: Scalars['Int']['output'];
+};
+
 export type DownloadEvidenceResponse = {
   __typename?: 'DownloadEvidenceResponse';
   downloadUrl: Scalars['String']['output'];
   evidenceId: Scalars['Int']['output'];
-  fileBase64: Scalars['String']['output'];
+  fileBase64?: Maybe<Scalars['String']['output']>;
   filename: Scalars['String']['output'];
   friendlyName: Scalars['String']['output'];
+  signedUrl?: Maybe<Scalars['String']['output']>;
+  signedUrlExpiresAt?: Maybe<Scalars['String']['output']>;
 };
 
 export type DownloadRecordingResponse = {
   __typename?: 'DownloadRecordingResponse';
   downloadUrl: Scalars['String']['output'];
-  fileBase64: Scalars['String']['output'];
+  fileBase64?: Maybe<Scalars['String']['output']>;
   filename: Scalars['String']['output'];
   oplogEntryId: Scalars['Int']['output'];
   recordingId: Scalars['Int']['output'];
+  signedUrl?: Maybe<Scalars['String']['output']>;
+  signedUrlExpiresAt?: Maybe<Scalars['String']['output']>;
 };
 
 export type ExtraFieldSpecOutput = {
@@ -119,6 +130,23 @@ export type LoginResponse = {
   token: Scalars['String']['output'];
 };
 
+export type OplogEntryBulkInput = {
+  command?: InputMaybe<Scalars['String']['input']>;
+  comments?: InputMaybe<Scalars['String']['input']>;
+  description?: InputMaybe<Scalars['String']['input']>;
+  destIp?: InputMaybe<Scalars['String']['input']>;
+  endDate?: InputMaybe<Scalars['timestamptz']['input']>;
+  entryIdentifier?: InputMaybe<Scalars['String']['input']>;
+  extraFields?: InputMaybe<Scalars['jsonb']['input']>;
+  operatorName?: InputMaybe<Scalars['String']['input']>;
+  output?: InputMaybe<Scalars['String']['input']>;
+  sourceIp?: InputMaybe<Scalars['String']['input']>;
+  startDate?: InputMaybe<Scalars['timestamptz']['input']>;
+  tags?: InputMaybe<Array<Scalars['String']['input']>>;
+  tool?: InputMaybe<Scalars['String']['input']>;
+  userContext?: InputMaybe<Scalars['String']['input']>;
+};
+
 export type ReportResponse = {
   __typename?: 'ReportResponse';
   docxUrl: Scalars['String']['output'];
@@ -11117,6 +11145,8 @@ export type Mutation_Root = {
   __typename?: 'mutation_root';
   /** Attach a finding from the library to a report */
   attachFinding?: Maybe<AttachFindingResponse>;
+  /** Create or update a batch of oplog entries in one transaction */
+  bulkCreateOplogEntries: BulkCreateOplogEntriesResult;
   /** Attempt to checkout a domain for a project */
   checkoutDomain?: Maybe<CheckoutResponse>;
   /** Attempt to checkout a server for a project */
@@ -12117,6 +12147,13 @@ export type Mutation_RootAttachFindingArgs = {
 };
 
 
+/** mutation root */
+export type Mutation_RootBulkCreateOplogEntriesArgs = {
+  entries: Array<OplogEntryBulkInput>;
+  oplogId: Scalars['Int']['input'];
+};
+
+
 /** mutation root */
 export type Mutation_RootCheckoutDomainArgs = {
   activityTypeId: Scalars['Int']['input'];